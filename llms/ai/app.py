@@ -12,7 +12,9 @@ Features:
 """
 
 import asyncio
+import json
 import logging
+import os
 import time
 import uuid
 from contextlib import asynccontextmanager
@@ -42,6 +44,7 @@ from api.schemas import (
     LegacyGenerateResponse,
 )
 from services.model_manager import ModelManager
+from services.request_scheduler import SchedulerOverloadedError
 from services.langchain_agent import create_agent_with_tools
 
 # Import output parser for cleaning LLM responses
@@ -78,9 +81,20 @@ model_manager: Optional[ModelManager] = None
 langchain_agent = None
 
 # Concurrency control
+# Direct generation is queued/batched by the ModelManager scheduler; this
+# semaphore only bounds concurrent LangChain agent runs.
 MAX_CONCURRENT_REQUESTS = 4
 request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
+# Scheduler knobs
+SCHEDULER_MAX_BATCH_SIZE = int(os.getenv("SCHEDULER_MAX_BATCH_SIZE", "8"))
+SCHEDULER_MAX_WAIT_MS = float(os.getenv("SCHEDULER_MAX_WAIT_MS", "10"))
+SCHEDULER_MAX_QUEUE_SIZE = int(os.getenv("SCHEDULER_MAX_QUEUE_SIZE", "64"))
+SCHEDULER_MAX_INFLIGHT = int(os.getenv("SCHEDULER_MAX_INFLIGHT", "4"))
+
+# How often to check whether a non-streaming client has gone away
+DISCONNECT_POLL_INTERVAL = 0.5
+
 # ============================================================================
 # Prometheus Metrics
 # ============================================================================
@@ -125,12 +139,15 @@ async def lifespan(app: FastAPI):
             max_model_len=8196,  # Updated for NVIDIA A30 GPU capability
             gpu_memory_utilization=0.9,
             lora_adapter_path="./saved_lora_adapters",
+            max_batch_size=SCHEDULER_MAX_BATCH_SIZE,
+            max_batch_wait_ms=SCHEDULER_MAX_WAIT_MS,
+            max_queue_size=SCHEDULER_MAX_QUEUE_SIZE,
+            max_inflight=SCHEDULER_MAX_INFLIGHT,
         )
 
         await model_manager.initialize()
 
         # Initialize LangChain agent with tools
-        import os
         enable_search = os.getenv("ENABLE_SEARCH_TOOL", "true").lower() == "true"
         enable_python = os.getenv("ENABLE_PYTHON_REPL", "false").lower() == "true"
         enable_wikipedia = os.getenv("ENABLE_WIKIPEDIA_TOOL", "true").lower() == "true"
@@ -153,6 +170,10 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down AI Service")
+    if model_manager is not None:
+        await model_manager.scheduler.stop()
+        if model_manager.engine_loop is not None:
+            model_manager.engine_loop.stop()
     if torch.cuda.is_available():
         torch.cuda.empty_cache()
 
@@ -225,7 +246,7 @@ async def list_models():
 # Chat Completion Endpoints
 # ============================================================================
 @app.post("/v1/chat/completions")
-async def chat_completions(request: ChatCompletionRequest):
+async def chat_completions(request: ChatCompletionRequest, http_request: Request):
     """
     OpenAI-compatible chat completion endpoint.
 
@@ -241,7 +262,7 @@ async def chat_completions(request: ChatCompletionRequest):
     # Streaming response
     if request.stream:
         return StreamingResponse(
-            stream_chat_completion(request),
+            stream_chat_completion(request, http_request),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -251,11 +272,61 @@ async def chat_completions(request: ChatCompletionRequest):
         )
 
     # Non-streaming response
-    return await non_streaming_chat_completion(request)
+    return await non_streaming_chat_completion(request, http_request)
+
+
+async def _generate_until_disconnect(
+    http_request: Optional[Request],
+    **generate_kwargs
+) -> tuple:
+    """
+    Run model_manager.generate, cancelling it if the client disconnects.
+
+    Cancellation propagates into the scheduler, so a request that is still
+    queued never reaches the GPU.
+    """
+    generation = asyncio.create_task(model_manager.generate(**generate_kwargs))
+    if http_request is None:
+        return await generation
+
+    try:
+        while True:
+            done, _ = await asyncio.wait({generation}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return generation.result()
+            if await http_request.is_disconnected():
+                logger.info("🔌 Client disconnected - cancelling generation")
+                generation.cancel()
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        if not generation.done():
+            generation.cancel()
+
+
+async def _stream_until_disconnect(
+    http_request: Optional[Request],
+    **generate_kwargs
+) -> AsyncIterator[str]:
+    """
+    Stream tokens from model_manager.generate_stream until the client goes away.
+
+    The model stream is closed explicitly on exit, which aborts the request
+    in the engine (and frees the scheduler slot on the 4-bit fallback).
+    """
+    stream = model_manager.generate_stream(**generate_kwargs)
+    try:
+        async for chunk in stream:
+            if http_request is not None and await http_request.is_disconnected():
+                logger.info("🔌 Client disconnected - stopping stream")
+                break
+            yield chunk
+    finally:
+        await stream.aclose()
 
 
 async def non_streaming_chat_completion(
-    request: ChatCompletionRequest
+    request: ChatCompletionRequest,
+    http_request: Optional[Request] = None
 ) -> ChatCompletionResponse:
     """
     Handle non-streaming chat completion.
@@ -263,74 +334,81 @@ async def non_streaming_chat_completion(
     start_time = time.time()
 
     try:
-        async with request_semaphore:
-            # Convert messages to dict format
-            messages = [
-                {"role": msg.role.value, "content": msg.content}
-                for msg in request.messages
-            ]
+        # Convert messages to dict format
+        messages = [
+            {"role": msg.role.value, "content": msg.content}
+            for msg in request.messages
+        ]
 
-            # Check if we should use tools
-            use_tools = request.tools is not None or _should_use_tools(messages)
+        # Check if we should use tools
+        use_tools = request.tools is not None or _should_use_tools(messages)
 
-            if use_tools and langchain_agent:
-                # Use LangChain agent with tools
+        if use_tools and langchain_agent:
+            # Use LangChain agent with tools
+            async with request_semaphore:
                 result = await langchain_agent.run_with_messages(
                     messages=messages,
                     use_tools=True
                 )
-                raw_output = result["output"]
-                tokens_used = result.get("tokens_used", 0) or len(raw_output.split())
-            else:
-                # Direct generation without tools
-                raw_output, tokens_used = await model_manager.generate(
-                    messages=messages,
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                    top_p=request.top_p,
-                    reasoning_effort=request.reasoning_effort,
-                )
-
-            # Parse output to remove thinking sections
-            if OUTPUT_PARSER_AVAILABLE:
-                output = parse_llm_output(raw_output)
-                logger.info(f"📝 Output parsed: {len(raw_output)} -> {len(output)} chars")
-            else:
-                output = raw_output
+            raw_output = result["output"]
+            tokens_used = result.get("tokens_used", 0) or len(raw_output.split())
+        else:
+            # Direct generation without tools (queued and batched by the scheduler)
+            raw_output, tokens_used = await _generate_until_disconnect(
+                http_request,
+                messages=messages,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+                top_p=request.top_p,
+                reasoning_effort=request.reasoning_effort,
+            )
 
-            # Create response
-            completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
-            created = int(time.time())
+        # Parse output to remove thinking sections
+        if OUTPUT_PARSER_AVAILABLE:
+            output = parse_llm_output(raw_output)
+            logger.info(f"📝 Output parsed: {len(raw_output)} -> {len(output)} chars")
+        else:
+            output = raw_output
 
-            response = ChatCompletionResponse(
-                id=completion_id,
-                created=created,
-                model=request.model,
-                choices=[
-                    ChatCompletionResponseChoice(
-                        index=0,
-                        message=ChatMessage(
-                            role=Role.ASSISTANT,
-                            content=output
-                        ),
-                        finish_reason="stop"
-                    )
-                ],
-                usage=UsageInfo(
-                    prompt_tokens=_estimate_tokens(messages),
-                    completion_tokens=tokens_used,
-                    total_tokens=_estimate_tokens(messages) + tokens_used
+        # Create response
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        response = ChatCompletionResponse(
+            id=completion_id,
+            created=created,
+            model=request.model,
+            choices=[
+                ChatCompletionResponseChoice(
+                    index=0,
+                    message=ChatMessage(
+                        role=Role.ASSISTANT,
+                        content=output
+                    ),
+                    finish_reason="stop"
                 )
+            ],
+            usage=UsageInfo(
+                prompt_tokens=_estimate_tokens(messages),
+                completion_tokens=tokens_used,
+                total_tokens=_estimate_tokens(messages) + tokens_used
             )
+        )
 
-            # Metrics
-            duration = time.time() - start_time
-            request_counter.labels(endpoint="chat_completions", status="success").inc()
-            request_duration.labels(endpoint="chat_completions").observe(duration)
-            tokens_generated.labels(model=request.model).inc(tokens_used)
+        # Metrics
+        duration = time.time() - start_time
+        request_counter.labels(endpoint="chat_completions", status="success").inc()
+        request_duration.labels(endpoint="chat_completions").observe(duration)
+        tokens_generated.labels(model=request.model).inc(tokens_used)
 
-            return response
+        return response
 
+    except SchedulerOverloadedError as e:
+        logger.warning(f"Chat completion rejected: {e}")
+        request_counter.labels(endpoint="chat_completions", status="rejected").inc()
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Chat completion failed: {e}")
         request_counter.labels(endpoint="chat_completions", status="error").inc()
@@ -338,7 +416,8 @@ async def non_streaming_chat_completion(
 
 
 async def stream_chat_completion(
-    request: ChatCompletionRequest
+    request: ChatCompletionRequest,
+    http_request: Optional[Request] = None
 ) -> AsyncIterator[str]:
     """
     Handle streaming chat completion with Server-Sent Events.
@@ -354,70 +433,81 @@ async def stream_chat_completion(
     streaming_parser = create_streaming_parser() if OUTPUT_PARSER_AVAILABLE else None
 
     try:
-        async with request_semaphore:
-            # Convert messages
-            messages = [
-                {"role": msg.role.value, "content": msg.content}
-                for msg in request.messages
-            ]
-
-            # Stream generation with thinking section filtering
-            async for chunk in model_manager.generate_stream(
-                messages=messages,
-                max_tokens=request.max_tokens,
-                temperature=request.temperature,
-                top_p=request.top_p,
-                reasoning_effort=request.reasoning_effort,
-            ):
-                # Filter thinking sections if parser available
-                if streaming_parser:
-                    clean_chunk, in_thinking = streaming_parser.process_chunk(chunk)
-                    if in_thinking or not clean_chunk:
-                        # Skip chunks inside thinking sections
-                        continue
-                    chunk = clean_chunk
-
-                # Create SSE chunk
-                stream_chunk = ChatCompletionStreamResponse(
-                    id=completion_id,
-                    created=created,
-                    model=request.model,
-                    choices=[
-                        ChatCompletionStreamResponseChoice(
-                            index=0,
-                            delta=ChatCompletionStreamResponseDelta(
-                                content=chunk
-                            ),
-                            finish_reason=None
-                        )
-                    ]
-                )
-
-                # Yield as SSE
-                yield f"data: {stream_chunk.model_dump_json()}\n\n"
+        # Convert messages
+        messages = [
+            {"role": msg.role.value, "content": msg.content}
+            for msg in request.messages
+        ]
 
-            # Send final chunk with finish_reason
-            final_chunk = ChatCompletionStreamResponse(
+        # Stream generation with thinking section filtering
+        async for chunk in _stream_until_disconnect(
+            http_request,
+            messages=messages,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+            top_p=request.top_p,
+            reasoning_effort=request.reasoning_effort,
+        ):
+            # Filter thinking sections if parser available
+            if streaming_parser:
+                clean_chunk, in_thinking = streaming_parser.process_chunk(chunk)
+                if in_thinking or not clean_chunk:
+                    # Skip chunks inside thinking sections
+                    continue
+                chunk = clean_chunk
+
+            # Create SSE chunk
+            stream_chunk = ChatCompletionStreamResponse(
                 id=completion_id,
                 created=created,
                 model=request.model,
                 choices=[
                     ChatCompletionStreamResponseChoice(
                         index=0,
-                        delta=ChatCompletionStreamResponseDelta(content=""),
-                        finish_reason="stop"
+                        delta=ChatCompletionStreamResponseDelta(
+                            content=chunk
+                        ),
+                        finish_reason=None
                     )
                 ]
             )
-            yield f"data: {final_chunk.model_dump_json()}\n\n"
-            yield "data: [DONE]\n\n"
-
-            # Metrics
-            duration = time.time() - start_time
-            request_counter.labels(endpoint="chat_completions_stream", status="success").inc()
-            request_duration.labels(endpoint="chat_completions_stream").observe(duration)
-            logger.info(f"✅ Streaming completed in {duration:.2f}s")
 
+            # Yield as SSE
+            yield f"data: {stream_chunk.model_dump_json()}\n\n"
+
+        # Send final chunk with finish_reason
+        final_chunk = ChatCompletionStreamResponse(
+            id=completion_id,
+            created=created,
+            model=request.model,
+            choices=[
+                ChatCompletionStreamResponseChoice(
+                    index=0,
+                    delta=ChatCompletionStreamResponseDelta(content=""),
+                    finish_reason="stop"
+                )
+            ]
+        )
+        yield f"data: {final_chunk.model_dump_json()}\n\n"
+        yield "data: [DONE]\n\n"
+
+        # Metrics
+        duration = time.time() - start_time
+        request_counter.labels(endpoint="chat_completions_stream", status="success").inc()
+        request_duration.labels(endpoint="chat_completions_stream").observe(duration)
+        logger.info(f"✅ Streaming completed in {duration:.2f}s")
+
+    except SchedulerOverloadedError as e:
+        logger.warning(f"Streaming rejected: {e}")
+        request_counter.labels(endpoint="chat_completions_stream", status="rejected").inc()
+        error_data = {
+            "error": {
+                "message": str(e),
+                "type": "server_overloaded",
+                "code": "overloaded"
+            }
+        }
+        yield f"data: {json.dumps(error_data)}\n\n"
     except Exception as e:
         logger.error(f"Streaming failed: {e}")
         request_counter.labels(endpoint="chat_completions_stream", status="error").inc()
@@ -494,7 +584,7 @@ THINKING_LEVEL_CONFIG = {
 
 
 @app.post("/generate", response_model=LegacyGenerateResponse)
-async def legacy_generate(request: LegacyGenerateRequest):
+async def legacy_generate(request: LegacyGenerateRequest, http_request: Request):
     """
     Legacy generate endpoint for backward compatibility.
     Used by simorgh-agent backend for non-streaming requests.
@@ -539,8 +629,9 @@ async def legacy_generate(request: LegacyGenerateRequest):
             if tool_calls:
                 logger.info(f"🔧 Agent used {len(tool_calls)} tool(s): {[tc['tool'] for tc in tool_calls]}")
         else:
-            # Direct generation without tools
-            raw_output, tokens_used = await model_manager.generate(
+            # Direct generation without tools (queued and batched by the scheduler)
+            raw_output, tokens_used = await _generate_until_disconnect(
+                http_request,
                 messages=messages,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -560,13 +651,18 @@ async def legacy_generate(request: LegacyGenerateRequest):
             thinking_level=request.thinking_level
         )
 
+    except SchedulerOverloadedError as e:
+        logger.warning(f"Legacy generate rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Legacy generate failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/generate-stream")
-async def legacy_generate_stream(request: LegacyGenerateRequest):
+async def legacy_generate_stream(request: LegacyGenerateRequest, http_request: Request):
     """
     Legacy streaming endpoint for backward compatibility.
     Used by simorgh-agent backend for streaming requests.
@@ -580,7 +676,7 @@ async def legacy_generate_stream(request: LegacyGenerateRequest):
         raise HTTPException(status_code=400, detail="Stream parameter must be true")
 
     return StreamingResponse(
-        legacy_stream_generation(request),
+        legacy_stream_generation(request, http_request),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -590,7 +686,10 @@ async def legacy_generate_stream(request: LegacyGenerateRequest):
     )
 
 
-async def legacy_stream_generation(request: LegacyGenerateRequest) -> AsyncIterator[str]:
+async def legacy_stream_generation(
+    request: LegacyGenerateRequest,
+    http_request: Optional[Request] = None
+) -> AsyncIterator[str]:
     """
     Stream generation in legacy SSE format.
 
@@ -699,7 +798,8 @@ async def legacy_stream_generation(request: LegacyGenerateRequest) -> AsyncItera
             full_output = ""
             clean_output = ""
 
-            async for chunk in model_manager.generate_stream(
+            async for chunk in _stream_until_disconnect(
+                http_request,
                 messages=messages,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -1,10 +1,13 @@
 """Services module"""
 from .model_manager import ModelManager, ModelPrecision
+from .request_scheduler import RequestScheduler, SchedulerOverloadedError
 from .langchain_agent import LangChainAgent, create_agent_with_tools
 
 __all__ = [
     "ModelManager",
     "ModelPrecision",
+    "RequestScheduler",
+    "SchedulerOverloadedError",
     "LangChainAgent",
     "create_agent_with_tools",
 ]
@@ -0,0 +1,228 @@
+"""
+Engine Loop - One shared step loop for the vLLM engine
+
+Responsibilities:
+- Own the engine: a single thread calls ``add_request`` / ``step`` / ``abort_request``
+- Let requests join and leave the running batch between decode steps
+- Route each step's outputs to per-request asyncio queues
+- Abort requests whose consumer went away
+
+Streaming and non-streaming requests both go through the same loop, so they
+share decode steps instead of taking turns on the GPU. The loop only needs
+an engine exposing ``add_request``, ``step``, ``abort_request`` and
+``has_unfinished_requests`` (vLLM's ``LLMEngine``), so it can be exercised on
+CPU with a stub engine.
+"""
+
+import asyncio
+import logging
+import threading
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EngineRequest:
+    """Handle of one request queued in the shared engine loop"""
+
+    def __init__(self, engine_loop: "EngineLoop", request_id: str, queue: asyncio.Queue):
+        self.engine_loop = engine_loop
+        self.request_id = request_id
+        self._queue = queue
+        self.finished = False
+
+    async def outputs(self) -> AsyncIterator[Any]:
+        """
+        Yield the engine outputs of this request as they are produced.
+
+        Closing the iterator before the request finished aborts it in the
+        engine, so an abandoned request stops consuming decode steps.
+        """
+        try:
+            while not self.finished:
+                item = await self._queue.get()
+                if isinstance(item, BaseException):
+                    self.finished = True
+                    raise item
+                self.finished = bool(item.finished)
+                yield item
+        finally:
+            if not self.finished:
+                self.engine_loop.abort(self.request_id)
+
+    async def result(self) -> Any:
+        """Wait for the final output of this request"""
+        outputs = self.outputs()
+        final = None
+        try:
+            async for output in outputs:
+                final = output
+        finally:
+            await outputs.aclose()
+        return final
+
+
+class EngineLoop:
+    """
+    Background step loop shared by every request on one engine.
+
+    New requests are handed to the engine between steps, so a request that
+    arrives while others are decoding joins the running batch at the next
+    step (continuous batching) instead of waiting for them to finish.
+    """
+
+    def __init__(self, engine: Any):
+        self.engine = engine
+
+        self._work = threading.Condition()
+        self._pending: List[Tuple[str, Any, Any]] = []
+        self._aborts: List[str] = []
+        self._sinks: Dict[str, Callable[[Any], None]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # Stats
+        self._stats = {
+            "requests": 0,
+            "aborted": 0,
+            "steps": 0,
+            "max_running": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        """Start the step thread lazily"""
+        with self._work:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(
+                    target=self._run, name="engine-loop", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the step thread and fail every request still running"""
+        with self._work:
+            self._stopped = True
+            self._work.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def add(self, prompt: Any, sampling_params: Any, request_id: Optional[str] = None) -> EngineRequest:
+        """
+        Queue a request for the engine.
+
+        Must be called from the event loop that consumes the returned
+        handle; outputs are delivered to it thread-safely.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        request_id = request_id or f"req-{uuid.uuid4().hex}"
+
+        def sink(item: Any):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        self._ensure_started()
+        with self._work:
+            self._sinks[request_id] = sink
+            self._pending.append((request_id, prompt, sampling_params))
+            self._stats["requests"] += 1
+            self._work.notify()
+
+        return EngineRequest(self, request_id, queue)
+
+    def abort(self, request_id: str):
+        """Abort a queued or running request; its outputs are dropped"""
+        with self._work:
+            if self._sinks.pop(request_id, None) is None:
+                return
+            self._aborts.append(request_id)
+            self._stats["aborted"] += 1
+            self._work.notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine loop statistics"""
+        with self._work:
+            running = len(self._sinks)
+        return {"running": running, **self._stats}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        """Step loop: admit new requests, step the engine, route outputs"""
+        while True:
+            with self._work:
+                while (
+                    not self._stopped
+                    and not self._pending
+                    and not self._aborts
+                    and not self.engine.has_unfinished_requests()
+                ):
+                    self._work.wait()
+                if self._stopped:
+                    break
+                pending, self._pending = self._pending, []
+                aborts, self._aborts = self._aborts, []
+
+            for request_id, prompt, sampling_params in pending:
+                try:
+                    self.engine.add_request(request_id, prompt, sampling_params)
+                except Exception as e:
+                    logger.error(f"❌ Engine rejected request {request_id}: {e}")
+                    self._finish(request_id, e)
+
+            if aborts:
+                logger.info(f"🛑 Aborting {len(aborts)} engine request(s)")
+                self.engine.abort_request(aborts)
+
+            if not self.engine.has_unfinished_requests():
+                continue
+
+            with self._work:
+                self._stats["max_running"] = max(self._stats["max_running"], len(self._sinks))
+
+            try:
+                outputs = self.engine.step()
+            except Exception as e:
+                logger.error(f"❌ Engine step failed: {e}")
+                self._fail_all(e, abort=True)
+                continue
+
+            self._stats["steps"] += 1
+            for output in outputs:
+                with self._work:
+                    sink = self._sinks.get(output.request_id)
+                    if sink is not None and output.finished:
+                        del self._sinks[output.request_id]
+                if sink is not None:
+                    sink(output)
+
+        self._fail_all(RuntimeError("Engine loop stopped"), abort=False)
+
+    def _finish(self, request_id: str, item: Any):
+        with self._work:
+            sink = self._sinks.pop(request_id, None)
+        if sink is not None:
+            sink(item)
+
+    def _fail_all(self, error: BaseException, abort: bool):
+        with self._work:
+            sinks, self._sinks = self._sinks, {}
+        if abort and sinks:
+            try:
+                self.engine.abort_request(list(sinks))
+            except Exception as e:
+                logger.warning(f"Failed to abort engine requests: {e}")
+        for sink in sinks.values():
+            sink(error)
@@ -7,19 +7,29 @@ Responsibilities:
 - vLLM initialization (16-bit preferred)
 - Fallback to 4-bit unsloth loader
 - Async generation interface
+- Admission control via RequestScheduler
+- Continuous batching via a shared vLLM EngineLoop
 """
 
 import os
 import asyncio
 import logging
+import threading
 import traceback
-from typing import Optional, Dict, Any, List, AsyncIterator
+import uuid
+from typing import Optional, Dict, Any, List, AsyncIterator, Callable
 from enum import Enum
 import torch
 import gc
 
+from .engine_loop import EngineLoop, EngineRequest
+from .request_scheduler import RequestScheduler
+
 logger = logging.getLogger(__name__)
 
+# Sentinel marking the end of a threaded token stream
+_STREAM_END = object()
+
 
 class ModelPrecision(Enum):
     """Model precision options"""
@@ -40,6 +50,10 @@ class ModelManager:
         max_model_len: int = 4096,
         gpu_memory_utilization: float = 0.9,
         lora_adapter_path: Optional[str] = None,
+        max_batch_size: int = 8,
+        max_batch_wait_ms: float = 10.0,
+        max_queue_size: int = 64,
+        max_inflight: int = 4,
     ):
         self.model_name = model_name
         self.model_path = model_path
@@ -51,7 +65,21 @@ class ModelManager:
         self.tokenizer = None
         self.precision: Optional[ModelPrecision] = None
         self.is_vllm = False
-        self._generation_lock = asyncio.Lock()
+
+        # vLLM requests are all stepped by one thread; batches and streams
+        # join the running engine batch between decode steps.
+        self.engine_loop: Optional[EngineLoop] = None
+
+        # Requests are queued and batched instead of serialized behind a lock.
+        # With vLLM several batches / streams can be in the engine at once;
+        # the 4-bit fallback drops this to 1 (its model is not thread-safe).
+        self.scheduler = RequestScheduler(
+            batch_fn=self._execute_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_batch_wait_ms,
+            max_queue_size=max_queue_size,
+            max_inflight=max_inflight,
+        )
 
     async def initialize(self):
         """
@@ -157,6 +185,7 @@ class ModelManager:
         self.model, self.tokenizer = await loop.run_in_executor(None, _init_vllm)
         self.precision = ModelPrecision.FP16
         self.is_vllm = True
+        self.engine_loop = EngineLoop(self.model.llm_engine)
 
         logger.info("✅ vLLM initialization successful (16-bit)")
         self._log_gpu_stats()
@@ -197,6 +226,8 @@ class ModelManager:
         self.model, self.tokenizer = await loop.run_in_executor(None, _init_4bit)
         self.precision = ModelPrecision.INT4
         self.is_vllm = False
+        # HF generate runs one request at a time
+        self.scheduler.max_inflight = 1
 
         logger.info("✅ 4-bit fallback initialization successful")
         self._log_gpu_stats()
@@ -284,6 +315,7 @@ class ModelManager:
             top_p: Nucleus sampling parameter
             stream: Whether to stream (not used in this method)
             **kwargs: Additional generation parameters
+                (``request_id`` is used for scheduler cancellation)
 
         Returns:
             Tuple of (generated_text, tokens_used)
@@ -291,15 +323,15 @@ class ModelManager:
         if self.model is None:
             raise RuntimeError("Model not initialized")
 
-        async with self._generation_lock:
-            if self.is_vllm:
-                return await self._generate_vllm(
-                    messages, max_tokens, temperature, top_p, **kwargs
-                )
-            else:
-                return await self._generate_4bit(
-                    messages, max_tokens, temperature, top_p, **kwargs
-                )
+        request_id = kwargs.pop("request_id", None)
+        payload = {
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "kwargs": kwargs,
+        }
+        return await self.scheduler.submit(payload, request_id=request_id)
 
     async def generate_stream(
         self,
@@ -312,23 +344,71 @@ class ModelManager:
         """
         Generate text response with streaming.
 
+        Tokens are yielded as soon as they are decoded. Closing the iterator
+        (e.g. on client disconnect) stops decoding on the GPU.
+
+        With vLLM the scheduler slot only gates admission: it is released as
+        soon as the request is queued in the engine loop, which multiplexes
+        concurrent streams over shared decode steps. The 4-bit model holds
+        the slot until the stream ends.
+
         Yields:
             Text chunks as they are generated
         """
         if self.model is None:
             raise RuntimeError("Model not initialized")
 
-        async with self._generation_lock:
-            if self.is_vllm:
-                async for chunk in self._generate_vllm_stream(
-                    messages, max_tokens, temperature, top_p, **kwargs
-                ):
+        request_id = kwargs.pop("request_id", None)
+        if self.is_vllm:
+            async with self.scheduler.admit(request_id=request_id):
+                handle = self._add_vllm_request(messages, max_tokens, temperature, top_p)
+
+            stream = self._stream_vllm_deltas(handle)
+            try:
+                async for chunk in stream:
                     yield chunk
-            else:
-                async for chunk in self._generate_4bit_stream(
-                    messages, max_tokens, temperature, top_p, **kwargs
-                ):
+            finally:
+                await stream.aclose()
+                if not handle.finished:
+                    self.engine_loop.abort(handle.request_id)
+            return
+
+        async with self.scheduler.admit(request_id=request_id):
+            stream = self._generate_4bit_stream(
+                messages, max_tokens, temperature, top_p, **kwargs
+            )
+
+            try:
+                async for chunk in stream:
                     yield chunk
+            finally:
+                # Close explicitly so decoding stops before the slot is released
+                await stream.aclose()
+
+    async def _execute_batch(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Scheduler batch callback.
+
+        vLLM queues the whole batch in the shared engine loop; the 4-bit
+        model runs the batch members back to back. Per-request failures are
+        returned as exceptions so one bad request doesn't fail the batch.
+        """
+        if self.is_vllm:
+            return await self._generate_vllm_batch(payloads)
+
+        results: List[Any] = []
+        for payload in payloads:
+            try:
+                results.append(await self._generate_4bit(
+                    payload["messages"],
+                    payload["max_tokens"],
+                    payload["temperature"],
+                    payload["top_p"],
+                    **payload["kwargs"],
+                ))
+            except Exception as e:
+                results.append(e)
+        return results
 
     async def _generate_vllm(
         self,
@@ -338,62 +418,118 @@ class ModelManager:
         top_p: float,
         **kwargs
     ) -> tuple[str, int]:
-        """Generate with vLLM (non-streaming)"""
+        """Generate with vLLM (non-streaming, single request)"""
+        results = await self._generate_vllm_batch([{
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "kwargs": kwargs,
+        }])
+        return results[0]
+
+    async def _generate_vllm_batch(
+        self,
+        payloads: List[Dict[str, Any]],
+    ) -> List[tuple[str, int]]:
+        """
+        Generate a batch of requests through the shared engine loop.
+
+        All prompts are queued in the engine together; they decode alongside
+        any streams or other batches already running.
+        """
         from vllm import SamplingParams
 
-        # Format messages into prompt using Harmony encoding
-        prompt = self._format_messages(messages)
-        logger.info(f"🤖 vLLM generation - Prompt length: {len(prompt)} chars, max_tokens: {max_tokens}")
+        # Format messages into prompts using Harmony encoding
+        prompts = [self._format_messages(p["messages"]) for p in payloads]
+        sampling_params = [
+            SamplingParams(
+                max_tokens=p["max_tokens"],
+                temperature=p["temperature"],
+                top_p=p["top_p"],
+            )
+            for p in payloads
+        ]
+        logger.info(
+            f"🤖 vLLM generation - batch of {len(prompts)}, "
+            f"prompt lengths: {[len(p) for p in prompts]} chars"
+        )
 
-        sampling_params = SamplingParams(
-            max_tokens=max_tokens,
-            temperature=temperature,
-            top_p=top_p,
+        handles = [
+            self.engine_loop.add(prompt, params)
+            for prompt, params in zip(prompts, sampling_params)
+        ]
+        outputs = await asyncio.gather(
+            *(handle.result() for handle in handles), return_exceptions=True
         )
 
-        loop = asyncio.get_event_loop()
+        results: List[Any] = []
+        for output in outputs:
+            if isinstance(output, BaseException):
+                results.append(output)
+                continue
 
-        def _generate():
-            outputs = self.model.generate([prompt], sampling_params)
-            output_text = outputs[0].outputs[0].text
-            tokens_used = len(outputs[0].outputs[0].token_ids)
+            output_text = output.outputs[0].text
+            tokens_used = len(output.outputs[0].token_ids)
 
             logger.info(f"✅ vLLM generated {tokens_used} tokens, text length: {len(output_text)} chars")
             logger.info(f"📤 Output (first 200 chars): {output_text[:200]}")
-            
-            # Detect garbage output
-            unique_chars = set(output_text.replace(' ', '').replace('\n', ''))
-            if len(unique_chars) <= 5 and len(output_text) > 100:
-                logger.error(f"🚨 GARBAGE OUTPUT DETECTED! Only {len(unique_chars)} unique chars: {unique_chars}")
-                # Return error message instead of garbage
-                error_msg = (
-                    "I apologize, but I encountered a technical issue generating a response. "
-                    "This may be due to a model configuration issue. Please try again or contact support."
-                )
-                return error_msg, tokens_used
-            
-            return output_text, tokens_used
 
-        return await loop.run_in_executor(None, _generate)
+            results.append((self._guard_garbage_output(output_text), tokens_used))
+        return results
+
+    def _guard_garbage_output(self, output_text: str) -> str:
+        """Replace degenerate (near-constant) output with an error message"""
+        unique_chars = set(output_text.replace(' ', '').replace('\n', ''))
+        if len(unique_chars) <= 5 and len(output_text) > 100:
+            logger.error(f"🚨 GARBAGE OUTPUT DETECTED! Only {len(unique_chars)} unique chars: {unique_chars}")
+            # Return error message instead of garbage
+            return (
+                "I apologize, but I encountered a technical issue generating a response. "
+                "This may be due to a model configuration issue. Please try again or contact support."
+            )
+        return output_text
 
-    async def _generate_vllm_stream(
+    def _add_vllm_request(
         self,
         messages: List[Dict[str, str]],
         max_tokens: int,
         temperature: float,
         top_p: float,
-        **kwargs
-    ) -> AsyncIterator[str]:
-        """Generate with vLLM (streaming)"""
-        # Note: vLLM doesn't support true async streaming yet
-        # This is a workaround that generates and yields chunks
-        text, _ = await self._generate_vllm(messages, max_tokens, temperature, top_p, **kwargs)
+    ) -> EngineRequest:
+        """
+        Queue a streaming request in the shared engine loop.
+
+        The loop steps the engine behind the offline ``LLM`` wrapper, so
+        streaming needs no separate async engine (which would load a second
+        copy of the weights). Read the deltas with ``_stream_vllm_deltas``.
+        """
+        from vllm import SamplingParams
+
+        prompt = self._format_messages(messages)
+        sampling_params = SamplingParams(
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+        )
+        logger.info(f"🤖 vLLM streaming - Prompt length: {len(prompt)} chars, max_tokens: {max_tokens}")
+
+        return self.engine_loop.add(
+            prompt, sampling_params, request_id=f"stream-{uuid.uuid4().hex}"
+        )
 
-        # Simulate streaming by yielding chunks
-        chunk_size = 10
-        for i in range(0, len(text), chunk_size):
-            yield text[i:i + chunk_size]
-            await asyncio.sleep(0.01)  # Small delay to simulate streaming
+    async def _stream_vllm_deltas(self, handle: EngineRequest) -> AsyncIterator[str]:
+        """Yield the new text of every engine output of a queued request"""
+        outputs = handle.outputs()
+        sent = 0
+        try:
+            async for output in outputs:
+                text = output.outputs[0].text
+                if len(text) > sent:
+                    yield text[sent:]
+                    sent = len(text)
+        finally:
+            await outputs.aclose()
 
     async def _generate_4bit(
         self,
@@ -447,14 +583,96 @@ class ModelManager:
         top_p: float,
         **kwargs
     ) -> AsyncIterator[str]:
-        """Generate with 4-bit model (streaming simulation)"""
-        text, _ = await self._generate_4bit(messages, max_tokens, temperature, top_p, **kwargs)
+        """
+        Generate with 4-bit model (streaming).
+
+        Uses a TextStreamer callback to forward decoded text as soon as
+        ``generate`` produces it, and a stopping criterion to end decoding
+        when the consumer goes away.
+        """
+        from transformers import TextStreamer, StoppingCriteria, StoppingCriteriaList
+
+        class _CallbackStreamer(TextStreamer):
+            def __init__(self, tokenizer, callback):
+                super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+                self.callback = callback
+
+            def on_finalized_text(self, text: str, stream_end: bool = False):
+                if text:
+                    self.callback(text)
+
+        class _StopOnEvent(StoppingCriteria):
+            def __init__(self, event: threading.Event):
+                self.event = event
+
+            def __call__(self, input_ids, scores, **kw) -> bool:
+                return self.event.is_set()
+
+        def _produce(emit: Callable[[str], None], stop_event: threading.Event):
+            inputs = self.tokenizer.apply_chat_template(
+                messages,
+                add_generation_prompt=True,
+                return_tensors="pt",
+                return_dict=True,
+                reasoning_effort=kwargs.get("reasoning_effort", "medium"),
+            ).to(self.model.device)
+
+            self.model.generate(
+                **inputs,
+                max_new_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                do_sample=True,
+                streamer=_CallbackStreamer(self.tokenizer, emit),
+                stopping_criteria=StoppingCriteriaList([_StopOnEvent(stop_event)]),
+            )
+
+        async for chunk in self._stream_from_thread(_produce):
+            yield chunk
+
+    async def _stream_from_thread(
+        self,
+        producer: Callable[[Callable[[str], None], threading.Event], None],
+    ) -> AsyncIterator[str]:
+        """
+        Bridge a blocking token producer into an async iterator.
+
+        ``producer(emit, stop_event)`` runs in the default executor and calls
+        ``emit(text)`` for each decoded chunk; it must return promptly once
+        ``stop_event`` is set. The event is set when this iterator is closed,
+        and closing waits for the producer so the GPU is idle afterwards.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop_event = threading.Event()
+
+        def emit(chunk: str):
+            loop.call_soon_threadsafe(queue.put_nowait, chunk)
+
+        def _run():
+            try:
+                producer(emit, stop_event)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _STREAM_END)
+
+        worker = loop.run_in_executor(None, _run)
 
-        # Simulate streaming by yielding chunks
-        chunk_size = 10
-        for i in range(0, len(text), chunk_size):
-            yield text[i:i + chunk_size]
-            await asyncio.sleep(0.01)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop_event.set()
+            try:
+                await worker
+            except Exception as e:
+                logger.warning(f"Stream producer ended with error: {e}")
 
     def _format_messages(self, messages: List[Dict[str, str]]) -> str:
         """
@@ -525,7 +743,10 @@ class ModelManager:
             "engine": "vllm" if self.is_vllm else "unsloth-4bit",
             "model_loaded": self.model is not None,
             "max_model_len": self.max_model_len,
+            "scheduler": self.scheduler.get_stats(),
         }
+        if self.engine_loop is not None:
+            status["engine_loop"] = self.engine_loop.get_stats()
 
         if torch.cuda.is_available():
             status["gpu_memory_allocated_gb"] = round(
@@ -0,0 +1,371 @@
+"""
+Request Scheduler - Continuous batching for model generation
+
+Responsibilities:
+- Queue incoming generation requests
+- Admission control (bounded queue, 503 instead of unbounded waiting)
+- Batch formation with max-batch and max-wait knobs
+- Bounded number of in-flight batches / streaming sessions
+- Per-request cancellation (queued requests are dropped, in-flight results discarded)
+
+The scheduler is backend agnostic: it only knows how to call an async
+``batch_fn(payloads) -> results`` coroutine, so it can be exercised on CPU
+with a stub model.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerOverloadedError(RuntimeError):
+    """Raised when the scheduler queue is full and a request is rejected"""
+
+
+@dataclass
+class ScheduledRequest:
+    """A single queued unit of work"""
+    payload: Any
+    future: asyncio.Future
+    request_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    stream: bool = False
+    enqueued_at: float = field(default_factory=time.monotonic)
+    cancelled: bool = False
+
+
+BatchFn = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class RequestScheduler:
+    """
+    Continuous-batching scheduler.
+
+    Non-streaming requests are collected into batches of up to
+    ``max_batch_size`` (waiting at most ``max_wait_ms`` for a batch to fill)
+    and handed to ``batch_fn``. Streaming requests are admitted one by one and
+    hold an in-flight slot until the consumer finishes iterating.
+
+    At most ``max_inflight`` batches / streams run at the same time; as soon
+    as one finishes, the next batch is formed from whatever is queued.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        max_queue_size: int = 64,
+        max_inflight: int = 1,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be >= 1")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue_size = max_queue_size
+        self.max_inflight = max_inflight
+
+        self._queue: Deque[ScheduledRequest] = deque()
+        self._requests: Dict[str, ScheduledRequest] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight_tasks: set = set()
+
+        # Stats
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "cancelled": 0,
+            "failed": 0,
+            "batches": 0,
+            "batched_requests": 0,
+            "streams": 0,
+            "total_queue_wait_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        """Start the scheduling loop lazily on the running event loop"""
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_inflight)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the scheduling loop and fail all queued requests"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while self._queue:
+            req = self._queue.popleft()
+            self._requests.pop(req.request_id, None)
+            if not req.future.done():
+                req.future.set_exception(RuntimeError("Scheduler stopped"))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def submit(self, payload: Any, request_id: Optional[str] = None) -> Any:
+        """
+        Queue a non-streaming request and wait for its batched result.
+
+        Cancelling the awaiting task cancels the request: if it is still
+        queued it never reaches the model, otherwise its result is discarded.
+
+        Raises:
+            SchedulerOverloadedError: If the queue is full
+        """
+        req = self._enqueue(payload, request_id, stream=False)
+        try:
+            return await req.future
+        except asyncio.CancelledError:
+            self.cancel(req.request_id)
+            raise
+        finally:
+            self._requests.pop(req.request_id, None)
+
+    @asynccontextmanager
+    async def admit(self, payload: Any = None, request_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Wait for an in-flight slot for a streaming request.
+
+        The slot is held for the duration of the ``async with`` block and
+        released on exit, including when the client disconnects.
+
+        Yields:
+            The request id (can be passed to ``cancel``)
+
+        Raises:
+            SchedulerOverloadedError: If the queue is full
+        """
+        req = self._enqueue(payload, request_id, stream=True)
+        try:
+            release = await req.future
+        except asyncio.CancelledError:
+            # The slot may have been granted just before we were cancelled
+            if req.future.done() and not req.future.cancelled():
+                req.future.result()()
+            self.cancel(req.request_id)
+            self._requests.pop(req.request_id, None)
+            raise
+
+        try:
+            yield req.request_id
+        finally:
+            self._requests.pop(req.request_id, None)
+            release()
+
+    def cancel(self, request_id: str) -> bool:
+        """
+        Cancel a queued or in-flight request.
+
+        Returns:
+            True if the request was known to the scheduler
+        """
+        req = self._requests.get(request_id)
+        if req is None or req.cancelled:
+            return False
+
+        req.cancelled = True
+        self._stats["cancelled"] += 1
+        try:
+            self._queue.remove(req)
+        except ValueError:
+            pass  # Already dispatched
+        if not req.future.done():
+            req.future.cancel()
+        return True
+
+    def is_cancelled(self, request_id: str) -> bool:
+        """Check whether a request has been cancelled"""
+        req = self._requests.get(request_id)
+        return req is not None and req.cancelled
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics"""
+        batches = self._stats["batches"]
+        dispatched = self._stats["batched_requests"] + self._stats["streams"]
+        return {
+            "queue_depth": len(self._queue),
+            "inflight": len(self._inflight_tasks),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "max_queue_size": self.max_queue_size,
+            "max_inflight": self.max_inflight,
+            "submitted": self._stats["submitted"],
+            "completed": self._stats["completed"],
+            "rejected": self._stats["rejected"],
+            "cancelled": self._stats["cancelled"],
+            "failed": self._stats["failed"],
+            "batches": batches,
+            "streams": self._stats["streams"],
+            "avg_batch_size": round(self._stats["batched_requests"] / batches, 2) if batches else 0.0,
+            "avg_queue_wait_ms": round(self._stats["total_queue_wait_ms"] / dispatched, 2) if dispatched else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, payload: Any, request_id: Optional[str], stream: bool) -> ScheduledRequest:
+        self._ensure_started()
+
+        if len(self._queue) >= self.max_queue_size:
+            self._stats["rejected"] += 1
+            raise SchedulerOverloadedError(
+                f"Scheduler queue full ({self.max_queue_size} pending requests)"
+            )
+
+        req = ScheduledRequest(
+            payload=payload,
+            future=asyncio.get_running_loop().create_future(),
+            stream=stream,
+        )
+        if request_id:
+            req.request_id = request_id
+
+        self._queue.append(req)
+        self._requests[req.request_id] = req
+        self._stats["submitted"] += 1
+        self._wakeup.set()
+        return req
+
+    def _record_wait(self, req: ScheduledRequest):
+        self._stats["total_queue_wait_ms"] += (time.monotonic() - req.enqueued_at) * 1000
+
+    async def _run(self):
+        """Scheduling loop: form batches and dispatch them as slots free up"""
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            await self._slots.acquire()
+            if not self._queue:
+                # Everything queued was cancelled while we waited for a slot
+                self._slots.release()
+                continue
+
+            # Streaming requests at the head of the queue are admitted individually
+            head = self._queue[0]
+            if head.stream:
+                self._queue.popleft()
+                self._dispatch_stream(head)
+                continue
+
+            # Give the batch a short window to fill up
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            while self._count_batchable() < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = self._take_batch()
+            if not batch:
+                self._slots.release()
+                continue
+
+            task = asyncio.get_running_loop().create_task(self._execute_batch(batch))
+            self._inflight_tasks.add(task)
+            task.add_done_callback(self._inflight_tasks.discard)
+
+    def _count_batchable(self) -> int:
+        return sum(1 for req in self._queue if not req.stream and not req.cancelled)
+
+    def _take_batch(self) -> List[ScheduledRequest]:
+        """Pop up to max_batch_size non-streaming requests, keeping queue order for the rest"""
+        batch: List[ScheduledRequest] = []
+        remaining: Deque[ScheduledRequest] = deque()
+
+        while self._queue:
+            req = self._queue.popleft()
+            if req.cancelled or req.future.done():
+                continue
+            if not req.stream and len(batch) < self.max_batch_size:
+                batch.append(req)
+            else:
+                remaining.append(req)
+
+        self._queue = remaining
+        return batch
+
+    def _dispatch_stream(self, req: ScheduledRequest):
+        if req.cancelled or req.future.done():
+            self._slots.release()
+            return
+
+        self._record_wait(req)
+        self._stats["streams"] += 1
+
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self._stats["completed"] += 1
+                self._slots.release()
+
+        req.future.set_result(release)
+
+    async def _execute_batch(self, batch: List[ScheduledRequest]):
+        """Run one batch through the backend and resolve the request futures"""
+        for req in batch:
+            self._record_wait(req)
+        self._stats["batches"] += 1
+        self._stats["batched_requests"] += len(batch)
+
+        try:
+            results = await self.batch_fn([req.payload for req in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"batch_fn returned {len(results)} results for {len(batch)} requests"
+                )
+
+            for req, result in zip(batch, results):
+                if req.future.done():
+                    continue  # Cancelled while in flight - discard the result
+                if isinstance(result, BaseException):
+                    self._stats["failed"] += 1
+                    req.future.set_exception(result)
+                else:
+                    self._stats["completed"] += 1
+                    req.future.set_result(result)
+
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} requests failed: {e}")
+            for req in batch:
+                if not req.future.done():
+                    self._stats["failed"] += 1
+                    req.future.set_exception(e)
+
+        finally:
+            self._slots.release()
+            self._wakeup.set()
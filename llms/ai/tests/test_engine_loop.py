@@ -0,0 +1,131 @@
+"""
+Unit tests for EngineLoop (CPU only, stub engine)
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from services.engine_loop import EngineLoop
+
+
+class StubEngine:
+    """
+    Stub of vLLM's LLMEngine: every step decodes one token for each running
+    request, and requests finish after ``max_tokens`` tokens.
+    """
+
+    def __init__(self, step_delay: float = 0.005):
+        self.step_delay = step_delay
+        self.running = {}
+        self.steps = []
+        self.aborted = []
+        self.thread_ids = set()
+
+    def add_request(self, request_id, prompt, sampling_params):
+        self.thread_ids.add(threading.get_ident())
+        self.running[request_id] = {"prompt": prompt, "max_tokens": sampling_params.max_tokens, "tokens": []}
+
+    def abort_request(self, request_ids):
+        self.thread_ids.add(threading.get_ident())
+        for request_id in request_ids:
+            if self.running.pop(request_id, None) is not None:
+                self.aborted.append(request_id)
+
+    def has_unfinished_requests(self):
+        return bool(self.running)
+
+    def step(self):
+        self.thread_ids.add(threading.get_ident())
+        time.sleep(self.step_delay)
+        self.steps.append(sorted(self.running))
+        outputs = []
+        for request_id, state in list(self.running.items()):
+            state["tokens"].append(f"{state['prompt']}{len(state['tokens'])} ")
+            finished = len(state["tokens"]) >= state["max_tokens"]
+            if finished:
+                del self.running[request_id]
+            outputs.append(SimpleNamespace(
+                request_id=request_id,
+                finished=finished,
+                outputs=[SimpleNamespace(text="".join(state["tokens"]), token_ids=list(state["tokens"]))],
+            ))
+        return outputs
+
+
+def params(max_tokens):
+    return SimpleNamespace(max_tokens=max_tokens)
+
+
+class TestEngineLoop:
+    """Test EngineLoop continuous batching, routing and aborts"""
+
+    @pytest.mark.asyncio
+    async def test_request_result(self):
+        """A request resolves with its final output"""
+        engine = StubEngine()
+        loop = EngineLoop(engine)
+
+        output = await loop.add("a", params(3)).result()
+
+        assert output.finished
+        assert output.outputs[0].text == "a0 a1 a2 "
+        loop.stop()
+
+    @pytest.mark.asyncio
+    async def test_late_request_joins_running_batch(self):
+        """A request added while another decodes shares its steps"""
+        engine = StubEngine()
+        loop = EngineLoop(engine)
+
+        first = asyncio.create_task(loop.add("a", params(20)).result())
+        await asyncio.sleep(0.02)
+        second = await loop.add("b", params(3)).result()
+
+        assert not first.done()
+        assert second.outputs[0].text == "b0 b1 b2 "
+        assert any(len(step) == 2 for step in engine.steps)
+        assert (await first).outputs[0].text.startswith("a0 a1 ")
+        assert loop.get_stats()["max_running"] == 2
+        loop.stop()
+
+    @pytest.mark.asyncio
+    async def test_engine_is_only_driven_by_loop_thread(self):
+        """Concurrent callers never touch the engine themselves"""
+        engine = StubEngine()
+        loop = EngineLoop(engine)
+
+        await asyncio.gather(*(loop.add(str(i), params(2)).result() for i in range(4)))
+
+        assert len(engine.thread_ids) == 1
+        assert threading.get_ident() not in engine.thread_ids
+        loop.stop()
+
+    @pytest.mark.asyncio
+    async def test_closing_outputs_aborts_request(self):
+        """Closing a request's output iterator early aborts it in the engine"""
+        engine = StubEngine()
+        loop = EngineLoop(engine)
+
+        handle = loop.add("a", params(1000))
+        outputs = handle.outputs()
+        await outputs.__anext__()
+        await outputs.aclose()
+        await asyncio.sleep(0.05)
+
+        assert engine.aborted == [handle.request_id]
+        assert not engine.has_unfinished_requests()
+        loop.stop()
+
+    @pytest.mark.asyncio
+    async def test_step_failure_fails_running_requests(self):
+        """An engine error is raised to every running request"""
+        engine = StubEngine()
+        engine.step = lambda: (_ for _ in ()).throw(RuntimeError("GPU on fire"))
+        loop = EngineLoop(engine)
+
+        with pytest.raises(RuntimeError, match="GPU on fire"):
+            await loop.add("a", params(3)).result()
+        loop.stop()
@@ -2,6 +2,7 @@
 Unit tests for ModelManager
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from services.model_manager import ModelManager, ModelPrecision
@@ -138,26 +139,19 @@ class TestModelManager:
         # Create garbage output
         garbage_output = "!" * 120  # 120 exclamation marks
         
-        # Mock the vLLM generate call
+        # Mock the engine loop result
         mock_output = Mock()
         mock_output.outputs = [Mock()]
         mock_output.outputs[0].text = garbage_output
         mock_output.outputs[0].token_ids = [1] * 100  # 100 tokens
-        model_manager.model.generate.return_value = [mock_output]
+        model_manager.engine_loop = Mock()
+        model_manager.engine_loop.add.return_value.result = AsyncMock(return_value=mock_output)
         
         messages = [{"role": "user", "content": "test"}]
         
-        # Patch vLLM imports and asyncio
+        # Patch vLLM imports
         with patch('services.model_manager.SamplingParams'):
-            with patch('asyncio.get_event_loop') as mock_loop:
-                # Set up the event loop mock
-                mock_event_loop = Mock()
-                async def mock_executor(executor, func):
-                    return func()
-                mock_event_loop.run_in_executor = AsyncMock(side_effect=mock_executor)
-                mock_loop.return_value = mock_event_loop
-                
-                result, tokens = await model_manager._generate_vllm(messages, 100, 0.7, 0.95)
+            result, tokens = await model_manager._generate_vllm(messages, 100, 0.7, 0.95)
         
         # Verify that error message was returned instead of garbage
         assert "technical issue" in result
@@ -177,26 +171,19 @@ class TestModelManager:
         # Create normal output
         normal_output = "This is a normal response with good diversity in characters and words."
         
-        # Mock the vLLM generate call
+        # Mock the engine loop result
         mock_output = Mock()
         mock_output.outputs = [Mock()]
         mock_output.outputs[0].text = normal_output
         mock_output.outputs[0].token_ids = [1] * 15  # 15 tokens
-        model_manager.model.generate.return_value = [mock_output]
+        model_manager.engine_loop = Mock()
+        model_manager.engine_loop.add.return_value.result = AsyncMock(return_value=mock_output)
         
         messages = [{"role": "user", "content": "test"}]
         
-        # Patch vLLM imports and asyncio
+        # Patch vLLM imports
         with patch('services.model_manager.SamplingParams'):
-            with patch('asyncio.get_event_loop') as mock_loop:
-                # Set up the event loop mock
-                mock_event_loop = Mock()
-                async def mock_executor(executor, func):
-                    return func()
-                mock_event_loop.run_in_executor = AsyncMock(side_effect=mock_executor)
-                mock_loop.return_value = mock_event_loop
-                
-                result, tokens = await model_manager._generate_vllm(messages, 100, 0.7, 0.95)
+            result, tokens = await model_manager._generate_vllm(messages, 100, 0.7, 0.95)
         
         # Verify that normal output was returned
         assert result == normal_output
@@ -253,6 +240,36 @@ class TestModelManager:
         assert status["model_loaded"] is False
         assert status["precision"] == "uninitialized"
 
+    @pytest.mark.asyncio
+    async def test_stream_from_thread_yields_incrementally(self, model_manager):
+        """Test that chunks emitted by the producer thread are yielded in order"""
+        def producer(emit, stop_event):
+            for token in ["Hel", "lo", " world"]:
+                emit(token)
+
+        chunks = [c async for c in model_manager._stream_from_thread(producer)]
+        assert chunks == ["Hel", "lo", " world"]
+
+    @pytest.mark.asyncio
+    async def test_stream_from_thread_stops_producer_on_close(self, model_manager):
+        """Test that closing the stream signals the producer to stop decoding"""
+        import time
+        observed = {}
+
+        def producer(emit, stop_event):
+            for i in range(1000):
+                if stop_event.is_set():
+                    observed["stopped_at"] = i
+                    return
+                emit(str(i))
+                time.sleep(0.001)
+
+        stream = model_manager._stream_from_thread(producer)
+        assert await stream.__anext__() == "0"
+        await stream.aclose()
+
+        assert observed["stopped_at"] < 1000
+
     @pytest.mark.asyncio
     async def test_generate_not_initialized(self, model_manager):
         """Test generation fails when model not initialized"""
@@ -291,3 +308,46 @@ class TestModelManagerIntegration:
         This test requires actual GPU and model availability.
         """
         pytest.skip("Requires actual vLLM installation and model files")
+
+
+class TestModelManagerStreaming:
+    """Test vLLM streams multiplexed through the shared engine loop"""
+
+    @pytest.fixture
+    def model_manager(self):
+        """vLLM ModelManager backed by a CPU stub engine and a single scheduler slot"""
+        from services.engine_loop import EngineLoop
+        from tests.test_engine_loop import StubEngine
+
+        manager = ModelManager(model_name="test-model", max_inflight=1)
+        manager.model = Mock()
+        manager.is_vllm = True
+        manager.engine_loop = EngineLoop(StubEngine())
+        manager._format_messages = lambda messages: messages[-1]["content"]
+        yield manager
+        manager.engine_loop.stop()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_streams_interleave(self, model_manager):
+        """Test two streams decode together instead of one after the other"""
+        import sys
+        from types import SimpleNamespace
+
+        received = []
+
+        async def consume(name):
+            async for chunk in model_manager.generate_stream(
+                messages=[{"role": "user", "content": name}], max_tokens=5
+            ):
+                received.append(chunk)
+
+        vllm = SimpleNamespace(SamplingParams=lambda **kw: SimpleNamespace(**kw))
+        with patch.dict(sys.modules, {"vllm": vllm}):
+            await asyncio.wait_for(asyncio.gather(consume("a"), consume("b")), timeout=5)
+
+        assert sorted(received) == sorted([f"a{i} " for i in range(5)] + [f"b{i} " for i in range(5)])
+        first_b = received.index("b0 ")
+        last_a = received.index("a4 ")
+        assert first_b < last_a
+        assert model_manager.engine_loop.get_stats()["max_running"] == 2
+        assert model_manager.scheduler.get_stats()["streams"] == 2
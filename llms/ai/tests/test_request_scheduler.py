@@ -0,0 +1,130 @@
+"""
+Unit tests for RequestScheduler (CPU only, stub model)
+"""
+
+import asyncio
+import pytest
+from services.request_scheduler import RequestScheduler, SchedulerOverloadedError
+
+
+class StubModel:
+    """Stub batch backend that records the batches it receives"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.batches = []
+
+    async def generate_batch(self, payloads):
+        self.batches.append(list(payloads))
+        await asyncio.sleep(self.delay)
+        return [f"echo:{p}" for p in payloads]
+
+
+class TestRequestScheduler:
+    """Test RequestScheduler batching, admission control and cancellation"""
+
+    @pytest.mark.asyncio
+    async def test_single_request(self):
+        """A lone request is executed after the batch window"""
+        stub = StubModel()
+        scheduler = RequestScheduler(stub.generate_batch, max_batch_size=4, max_wait_ms=5)
+
+        result = await scheduler.submit("hello")
+
+        assert result == "echo:hello"
+        assert stub.batches == [["hello"]]
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_batched(self):
+        """Concurrent requests share one backend call and keep their own results"""
+        stub = StubModel()
+        scheduler = RequestScheduler(stub.generate_batch, max_batch_size=4, max_wait_ms=50)
+
+        results = await asyncio.gather(*(scheduler.submit(i) for i in range(4)))
+
+        assert results == [f"echo:{i}" for i in range(4)]
+        assert len(stub.batches) == 1
+        assert scheduler.get_stats()["avg_batch_size"] == 4
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_respected(self):
+        """Batches never exceed max_batch_size"""
+        stub = StubModel()
+        scheduler = RequestScheduler(stub.generate_batch, max_batch_size=2, max_wait_ms=20)
+
+        results = await asyncio.gather(*(scheduler.submit(i) for i in range(5)))
+
+        assert results == [f"echo:{i}" for i in range(5)]
+        assert all(len(batch) <= 2 for batch in stub.batches)
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_queue_full_rejected(self):
+        """Requests beyond max_queue_size are rejected immediately"""
+        stub = StubModel(delay=0.2)
+        scheduler = RequestScheduler(
+            stub.generate_batch, max_batch_size=1, max_wait_ms=0, max_queue_size=1
+        )
+
+        first = asyncio.create_task(scheduler.submit("a"))
+        await asyncio.sleep(0.05)  # "a" is now in flight
+        second = asyncio.create_task(scheduler.submit("b"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(SchedulerOverloadedError):
+            await scheduler.submit("c")
+
+        assert await first == "echo:a"
+        assert await second == "echo:b"
+        assert scheduler.get_stats()["rejected"] == 1
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_never_reaches_model(self):
+        """Cancelling a queued request removes it before dispatch"""
+        stub = StubModel(delay=0.1)
+        scheduler = RequestScheduler(stub.generate_batch, max_batch_size=1, max_wait_ms=0)
+
+        first = asyncio.create_task(scheduler.submit("a"))
+        await asyncio.sleep(0.02)
+        queued = asyncio.create_task(scheduler.submit("b", request_id="req-b"))
+        await asyncio.sleep(0)
+
+        assert scheduler.cancel("req-b") is True
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        assert await first == "echo:a"
+        await asyncio.sleep(0.05)
+        assert stub.batches == [["a"]]
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_propagates(self):
+        """A failing backend call fails every request of the batch"""
+        async def failing_batch(payloads):
+            raise RuntimeError("GPU on fire")
+
+        scheduler = RequestScheduler(failing_batch, max_batch_size=2, max_wait_ms=5)
+
+        with pytest.raises(RuntimeError, match="GPU on fire"):
+            await scheduler.submit("a")
+        assert scheduler.get_stats()["failed"] == 1
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_stream_admission_holds_slot(self):
+        """A streaming request blocks batches until its slot is released"""
+        stub = StubModel()
+        scheduler = RequestScheduler(stub.generate_batch, max_batch_size=4, max_wait_ms=0)
+
+        async with scheduler.admit():
+            pending = asyncio.create_task(scheduler.submit("a"))
+            await asyncio.sleep(0.05)
+            assert not pending.done()
+
+        assert await pending == "echo:a"
+        assert scheduler.get_stats()["streams"] == 1
+        await scheduler.stop()
@@ -12,6 +12,8 @@ import openai
 import os
 import json
 
+from intent_classifier import IntentClassifier
+
 class GraphRetrieval:
     """
     Intelligent graph retrieval using Neo4j for RAG system.
@@ -24,6 +26,11 @@ class GraphRetrieval:
         """Initialize Neo4j connection"""
         self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
         self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.intent_classifier = IntentClassifier(
+            llm_classify=self._classify_intent_llm,
+            rule_threshold=float(os.getenv("INTENT_RULE_THRESHOLD", "0.9")),
+            knn_threshold=float(os.getenv("INTENT_KNN_THRESHOLD", "0.55"))
+        )
     
     def close(self):
         """Close Neo4j connection"""
@@ -37,14 +44,24 @@ class GraphRetrieval:
         """
         Classify user question intent and extract entities.
         
+        Tries regex rules, then a local kNN classifier, and only calls the
+        LLM when neither is confident (see intent_classifier.py). Results
+        are cached by normalized question.
+        
         Returns:
         {
             "intent": str,  # "equipment_spec", "load_tracing", "circuit_topology", etc.
             "entities": list,  # Extracted entity mentions
-            "confidence": float
+            "confidence": float,
+            "tier": str  # "rules", "knn" or "llm"
         }
         """
         
+        return self.intent_classifier.classify(question)
+    
+    def _classify_intent_llm(self, question: str) -> Dict[str, Any]:
+        """Classify intent and extract entities with gpt-4o-mini (fallback tier)"""
+        
         response = self.openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{
@@ -142,7 +159,7 @@ class GraphRetrieval:
             
             RETURN 
                 e AS equipment,
-                labels(e)[0] AS equipment_type,
+                [l IN labels(e) WHERE l <> 'Searchable'][0] AS equipment_type,
                 COLLECT(DISTINCT {name: p.name, value: p.value, unit: p.unit, tolerance: p.tolerance}) AS parameters,
                 COLLECT(DISTINCT {room: room.name, building: building.name}) AS location,
                 COLLECT(DISTINCT std.standard_id) AS standards,
@@ -293,10 +310,10 @@ class GraphRetrieval:
             
             RETURN 
                 loc,
-                labels(loc)[0] AS location_type,
+                [l IN labels(loc) WHERE l <> 'Searchable'][0] AS location_type,
                 COLLECT(DISTINCT {
                     equipment: equipment,
-                    type: labels(equipment)[0],
+                    type: [l IN labels(equipment) WHERE l <> 'Searchable'][0],
                     parameters: COLLECT(DISTINCT {name: param.name, value: param.value, unit: param.unit})
                 }) AS equipment_list
             LIMIT 1
@@ -339,7 +356,7 @@ class GraphRetrieval:
                 
                 RETURN 
                     equipment,
-                    labels(equipment)[0] AS equipment_type,
+                    [l IN labels(equipment) WHERE l <> 'Searchable'][0] AS equipment_type,
                     COLLECT(DISTINCT std) AS standards,
                     COLLECT(DISTINCT param) AS requirements
                 """
@@ -356,7 +373,7 @@ class GraphRetrieval:
                     std,
                     COLLECT(DISTINCT {
                         equipment: equipment,
-                        type: labels(equipment)[0]
+                        type: [l IN labels(equipment) WHERE l <> 'Searchable'][0]
                     }) AS compliant_equipment
                 """
                 result = session.run(query, std_id=standard_id)
@@ -403,7 +420,7 @@ class GraphRetrieval:
                 RETURN 
                     io,
                     equipment,
-                    labels(equipment)[0] AS equipment_type,
+                    [l IN labels(equipment) WHERE l <> 'Searchable'][0] AS equipment_type,
                     panel
                 """
                 result = session.run(query, id=io_id)
@@ -421,7 +438,7 @@ class GraphRetrieval:
                     COLLECT(DISTINCT {
                         io: io,
                         equipment: equipment,
-                        equipment_type: labels(equipment)[0]
+                        equipment_type: [l IN labels(equipment) WHERE l <> 'Searchable'][0]
                     }) AS io_points
                 """
                 result = session.run(query, panel_id=panel_id)
@@ -478,7 +495,7 @@ class GraphRetrieval:
             
             RETURN 
                 equipment,
-                labels(equipment)[0] AS equipment_type,
+                [l IN labels(equipment) WHERE l <> 'Searchable'][0] AS equipment_type,
                 COLLECT(DISTINCT {
                     document: doc,
                     document_type: doc.document_type,
@@ -491,7 +508,7 @@ class GraphRetrieval:
                 COLLECT(DISTINCT req) AS requirements,
                 COLLECT(DISTINCT {
                     node: connected,
-                    type: labels(connected)[0]
+                    type: [l IN labels(connected) WHERE l <> 'Searchable'][0]
                 }) AS connections
             """
             
@@ -0,0 +1,469 @@
+"""
+Tiered Intent Classifier for the Graph Retrieval Engine
+
+Classifies a question into one of the GraphRetrieval intents and extracts
+entity mentions without an LLM round trip whenever possible:
+
+1. Rules - regex matchers for equipment IDs (MDB-01, TR-01, DI-101, ...),
+   standards and locations, plus intent keywords; a keyword hit is only
+   accepted when the kNN neighbours support the same intent
+2. kNN - cosine similarity over a small local bag-of-n-grams embedding,
+   trained from labelled example questions
+3. LLM - only when neither tier is confident enough, or when no entity
+   could be found for an intent that needs one
+
+Results are cached by normalized question.
+"""
+
+import re
+from collections import Counter, OrderedDict
+from math import sqrt
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+INTENTS = (
+    "equipment_spec",
+    "load_tracing",
+    "circuit_topology",
+    "equipment_location",
+    "compliance_check",
+    "power_flow",
+    "io_mapping",
+    "cross_reference",
+    "proximity_search",
+    "comparison",
+)
+
+# Intents that can be answered without a specific entity
+ENTITYLESS_INTENTS = {"comparison", "power_flow"}
+
+
+# ============================================================================
+# TIER 1: RULES
+# ============================================================================
+
+# (pattern, entity type) - earlier patterns win when matches overlap
+ENTITY_PATTERNS = [
+    (re.compile(r"\b(?:IEC|IEEE|NFPA|NEC|BS|EN|UL)\s?\d{2,5}(?:-\d+)*\b", re.IGNORECASE), "Standard"),
+    (re.compile(r"\b(?:DI|DO|AI|AO)-?\d{2,4}\b", re.IGNORECASE), "IOPoint"),
+    (re.compile(r"\bTR-?\d+[A-Z]?\b", re.IGNORECASE), "Transformer"),
+    (re.compile(r"\b(?:MDB|SMDB|SDB|MCC|DB|PLC|LVSB|MVSB|SWGR|PNL|PP|LP)-?\d+[A-Z]?\b", re.IGNORECASE), "Panel"),
+    (re.compile(r"\bM-\d+[A-Z]?\b"), "Motor"),
+    (re.compile(r"\b(?:Building|Room|Substation|Area)\s+[A-Z0-9][\w-]*", re.IGNORECASE), "Location"),
+    (re.compile(r"\b[A-Z]{1,5}-\d{2,4}[A-Z]?\b"), "Equipment"),
+]
+
+# Equipment named without a tag ("the switchgear", "all motors"); only used
+# when a question has no specific entity
+GENERIC_ENTITY_PATTERNS = [
+    (re.compile(r"\b(?:MV|LV|HV|electrical|control|switch)\s+room\b", re.IGNORECASE), "Location"),
+    (re.compile(r"\b(?:main\s+)?(?:switchgear|switchboard)s?\b", re.IGNORECASE), "Switchgear"),
+    (re.compile(r"\b(?:control\s+|distribution\s+)?panels?\b", re.IGNORECASE), "Panel"),
+    (re.compile(r"\btransformers?\b", re.IGNORECASE), "Transformer"),
+    (re.compile(r"\bmotors?\b", re.IGNORECASE), "Motor"),
+    (re.compile(r"\b(?:PLC|control system)s?\b", re.IGNORECASE), "ControlSystem"),
+]
+
+# A type word right before an ID overrides the pattern's type ("Load ABC-123")
+TYPE_WORDS = {
+    "panel": "Panel",
+    "load": "Load",
+    "motor": "Motor",
+    "transformer": "Transformer",
+    "switchgear": "Switchgear",
+    "circuit": "Circuit",
+    "breaker": "CircuitBreaker",
+    "pump": "Pump",
+}
+
+# (intent, keyword pattern) in priority order
+INTENT_RULES = [
+    ("io_mapping", re.compile(r"\b(?:io|i/o|io points?|control points?|io list|monitors?|signals?|wired|(?:digital|analog) (?:inputs?|outputs?)|inputs?|outputs?)\b")),
+    ("power_flow", re.compile(r"\b(?:power flow|power path|trace power|distribution path|distributed|power distribution|power reach|single line)\b")),
+    ("load_tracing", re.compile(r"\b(?:feeds?|feeding|fed|supplies|supplying|supply|powers|get its power|connected to|upstream|source of)\b")),
+    ("comparison", re.compile(r"\b(?:compare|comparison|highest|lowest|largest|smallest|larger|smaller|most|least|rank|versus|vs)\b")),
+    ("compliance_check", re.compile(r"\b(?:comply|complies|compliance|compliant|conform\w*|certified|standards?|tested against)\b")),
+    ("circuit_topology", re.compile(r"\b(?:(?<!short )circuits?|outgoing|feeders|circuit schedule)\b")),
+    ("cross_reference", re.compile(r"\b(?:all information|everything about|aggregate|combine|collect|gather|summarize|overview|all documents|documents say|across documents|references to)\b")),
+    ("equipment_location", re.compile(r"\b(?:where is|where's|where are|where can i find|location of|houses|what equipment is in|in which (?:building|room|area|substation)|(?:room|building) of)\b")),
+    ("proximity_search", re.compile(r"\b(?:(?:what|panels?)(?:'s| is| are)? in|inside|installed in|located in|near|nearby)\b")),
+    ("equipment_spec", re.compile(r"\b(?:specs?|specifications?|ratings?|rated|voltage|current|parameters?|properties|capacity|nameplate)\b")),
+]
+
+
+def normalize_question(question: str) -> str:
+    """Cache key of a question: lowercase, single spaces, no trailing punctuation"""
+    return re.sub(r"\s+", " ", question.strip().lower()).rstrip("?!. ")
+
+
+def extract_entities(question: str) -> List[Dict[str, str]]:
+    """Find equipment IDs, standards and locations in a question"""
+    entities = _match_entities(question, ENTITY_PATTERNS)
+    return entities or _match_entities(question, GENERIC_ENTITY_PATTERNS)
+
+
+def _match_entities(question: str, patterns: List[Tuple[Any, str]]) -> List[Dict[str, str]]:
+    entities = []
+    taken: List[Tuple[int, int]] = []
+
+    for pattern, entity_type in patterns:
+        for match in pattern.finditer(question):
+            start, end = match.span()
+            if any(start < t_end and end > t_start for t_start, t_end in taken):
+                continue
+            taken.append((start, end))
+
+            if entity_type == "Location":
+                entity_type_found = match.group(0).split()[0].capitalize()
+            else:
+                preceding = question[:start].split()
+                type_word = preceding[-1].lower() if preceding else ""
+                entity_type_found = TYPE_WORDS.get(type_word, entity_type)
+
+            entities.append({
+                "text": match.group(0),
+                "type": entity_type_found,
+                "_start": start,
+            })
+
+    entities.sort(key=lambda e: e.pop("_start"))
+    return entities
+
+
+def match_intent_rules(question: str, entities: List[Dict[str, str]]) -> Tuple[Optional[str], float]:
+    """
+    Tier 1: keyword rules
+
+    A single keyword is not proof of the intent ("Which circuit is load
+    XYZ-200 connected to?" is load tracing), so rule confidences stay below
+    the default rule threshold and a rule hit needs the kNN to agree.
+
+    Returns:
+        (intent, confidence) - higher when exactly one intent matched, lower
+        when several did (the highest-priority one is returned)
+    """
+    matched = matched_intent_rules(question, entities)
+    if not matched:
+        return None, 0.0
+    return matched[0], 0.8 if len(matched) == 1 else 0.6
+
+
+def matched_intent_rules(question: str, entities: List[Dict[str, str]]) -> List[str]:
+    """Every intent whose keywords appear in the question, in priority order"""
+    text = normalize_question(question)
+    matched = [intent for intent, pattern in INTENT_RULES if pattern.search(text)]
+
+    # Entity types imply an intent when no keyword does
+    if not matched:
+        types = {e["type"] for e in entities}
+        if "IOPoint" in types:
+            matched = ["io_mapping"]
+        elif "Standard" in types:
+            matched = ["compliance_check"]
+
+    return matched
+
+
+# ============================================================================
+# TIER 2: LOCAL EMBEDDING kNN
+# ============================================================================
+
+# Labelled examples; entity IDs are masked before embedding, so one example
+# covers every panel, load, etc.
+INTENT_EXAMPLES = {
+    "equipment_spec": [
+        "What's the voltage of Panel MDB-01?",
+        "Show specs for Transformer TR-01",
+        "What is the rated current of MCC-02?",
+        "Give me the parameters of the switchgear",
+        "What is the short circuit rating of SWGR-1?",
+        "What is the capacity of transformer TR-02?",
+        "Show the nameplate data of motor M-12",
+        "What breaking capacity does MVSB-1 have?",
+        "Tell me the properties of PNL-4",
+    ],
+    "load_tracing": [
+        "Which panel feeds Load ABC-123?",
+        "What supplies power to Motor M-01?",
+        "Where does pump P-101 get its power from?",
+        "Which circuit is load XYZ-200 connected to?",
+        "What is feeding pump P-204?",
+        "Where does the supply for MCC-03 come from?",
+        "Which breaker supplies motor M-07?",
+        "Trace the upstream source of load LD-15",
+    ],
+    "circuit_topology": [
+        "Show all circuits from Panel MCC-02",
+        "List circuits in Building A",
+        "What outgoing feeders does MDB-01 have?",
+        "How many circuits are on panel DB-3?",
+        "Show the circuit schedule of LP-2",
+        "Which outgoing circuits leave SMDB-4?",
+        "List the feeders of switchboard MDB-02",
+        "What are the downstream circuits of PP-1?",
+    ],
+    "equipment_location": [
+        "Where is Transformer TR-01?",
+        "What equipment is in Room 101?",
+        "In which building is panel MDB-01 installed?",
+        "Find the room of switchgear SWGR-2",
+        "Where are the transformers installed?",
+        "Where can I find panel SDB-7?",
+        "What is the location of MCC-04?",
+        "Which room houses PLC-02?",
+    ],
+    "compliance_check": [
+        "Does the switchgear comply with IEC 62271?",
+        "What standards apply?",
+        "Which standards does TR-01 meet?",
+        "Is panel MDB-01 certified to IEC 61439?",
+        "Does TR-02 conform to IEEE C57?",
+        "Is the MV switchgear compliant with the project standards?",
+        "Check compliance of MCC-01 with IEC 61439-2",
+        "Which standard is SWGR-3 tested against?",
+    ],
+    "power_flow": [
+        "Trace power from transformer to load",
+        "Show power flow for Building A",
+        "How is power distributed from the main switchboard?",
+        "Show the single line path from the utility to MCC-01",
+        "How does power reach the lighting panels?",
+        "Show the distribution path from the substation",
+        "Trace the power path to the pumps",
+        "Explain the power distribution of the plant",
+    ],
+    "io_mapping": [
+        "What does IO point DI-101 monitor?",
+        "Show all IO for Panel PLC-01",
+        "Which signal is wired to AI-205?",
+        "List the digital inputs of the control panel",
+        "Show the IO list of PLC-03",
+        "Which analog outputs does the PLC have?",
+        "What is connected to input DI-12?",
+        "Which signals does the control system monitor?",
+    ],
+    "cross_reference": [
+        "Find all information about Transformer TR-01",
+        "Aggregate specs for all motors",
+        "Collect everything the documents say about MDB-01",
+        "Combine data from all documents for switchgear SWGR-1",
+        "Summarize all data about MCC-02 across documents",
+        "Give me a complete overview of transformer TR-03",
+        "What do all the documents say about PNL-8?",
+        "Gather all references to motor M-20",
+    ],
+    "proximity_search": [
+        "What's in Building A?",
+        "List all panels in Room MV-101",
+        "Which equipment is installed in substation 2?",
+        "Show everything located in the MV room",
+        "What is inside substation 1?",
+        "Which panels are in Building B?",
+        "List equipment near Room 204",
+        "What else is installed in Area 3?",
+    ],
+    "comparison": [
+        "Compare voltage ratings of all transformers",
+        "Which panel has highest rating?",
+        "Compare MDB-01 and MDB-02",
+        "Which motor draws the most current?",
+        "Compare the ratings of TR-01 and TR-02",
+        "Which transformer has the lowest impedance?",
+        "Rank the panels by rated current",
+        "Which is larger, MDB-01 or MDB-02?",
+    ],
+}
+
+
+def embed_question(question: str, entities: Optional[List[Dict[str, str]]] = None) -> Dict[str, float]:
+    """
+    Small local embedding: L2-normalized counts of words, word bigrams and
+    character trigrams, with entity mentions replaced by their type
+    """
+    text = question
+    for entity in entities if entities is not None else extract_entities(question):
+        text = text.replace(entity["text"], f" <{entity['type'].lower()}> ")
+
+    words = re.findall(r"<\w+>|[a-z0-9']+", text.lower())
+    features = Counter(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        if not word.startswith("<"):
+            padded = f"#{word}#"
+            features.update(f"~{padded[i:i + 3]}" for i in range(len(padded) - 2))
+
+    norm = sqrt(sum(v * v for v in features.values())) or 1.0
+    return {feature: count / norm for feature, count in features.items()}
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(feature, 0.0) for feature, value in a.items())
+
+
+class KNNIntentClassifier:
+    """Cosine kNN over embedded example questions"""
+
+    def __init__(self, examples: Optional[Dict[str, List[str]]] = None, k: int = 5):
+        self.k = k
+        self._examples: List[Tuple[Dict[str, float], str]] = []
+        self.add_examples(examples or INTENT_EXAMPLES)
+
+    def add_examples(self, examples: Dict[str, List[str]]):
+        """Add labelled questions (intent -> questions)"""
+        for intent, questions in examples.items():
+            for question in questions:
+                self._examples.append((embed_question(question), intent))
+
+    def votes(self, question: str, entities: Optional[List[Dict[str, str]]] = None) -> Dict[str, Tuple[float, float]]:
+        """
+        Returns:
+            intent -> (similarity-weighted vote share, best similarity) over
+            the k nearest examples; intents without a neighbour are absent
+        """
+        if not self._examples:
+            return {}
+
+        vector = embed_question(question, entities)
+        neighbours = sorted(
+            ((_cosine(vector, example), intent) for example, intent in self._examples),
+            reverse=True
+        )[:self.k]
+
+        votes: Dict[str, float] = {}
+        best: Dict[str, float] = {}
+        for similarity, intent in neighbours:
+            if similarity > 0:
+                votes[intent] = votes.get(intent, 0.0) + similarity
+                best[intent] = max(best.get(intent, 0.0), similarity)
+
+        total = sum(votes.values())
+        return {intent: (vote / total, best[intent]) for intent, vote in votes.items()}
+
+    def predict(self, question: str, entities: Optional[List[Dict[str, str]]] = None) -> Tuple[Optional[str], float]:
+        """
+        Returns:
+            (intent, confidence) - confidence is the similarity-weighted vote
+            share of the winning intent, scaled by its best similarity
+        """
+        return self.best(self.votes(question, entities))
+
+    @staticmethod
+    def best(votes: Dict[str, Tuple[float, float]]) -> Tuple[Optional[str], float]:
+        """Winning intent of a votes() result and its confidence"""
+        if not votes:
+            return None, 0.0
+
+        intent = max(votes, key=lambda i: votes[i][0])
+        share, similarity = votes[intent]
+        # Similarities of short questions rarely exceed ~0.6, rescale so a close match counts as confident
+        return intent, share * min(1.0, similarity / 0.5)
+
+
+# ============================================================================
+# TIERED CLASSIFIER
+# ============================================================================
+
+class IntentClassifier:
+    """
+    Rules -> kNN -> LLM intent classifier with a question cache
+
+    The result has the same shape as the LLM classification
+    ({"intent", "entities", "confidence"}) plus the "tier" that produced it.
+    """
+
+    def __init__(self, llm_classify: Optional[Callable[[str], Dict[str, Any]]] = None,
+                 rule_threshold: float = 0.9,
+                 knn_threshold: float = 0.55,
+                 min_agreement: float = 0.2,
+                 cache_size: int = 1024,
+                 examples: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            llm_classify: Fallback classifier (question -> classification dict)
+            rule_threshold: Minimum confidence to accept a rule match the kNN
+                disagrees with (rule confidences stay below the default)
+            knn_threshold: Minimum confidence to accept a kNN prediction
+            min_agreement: Minimum kNN vote share of a rule intent for the
+                kNN to count as agreeing with the rule
+            cache_size: Number of normalized questions to remember
+            examples: Labelled questions for the kNN tier (default: INTENT_EXAMPLES)
+        """
+        self.llm_classify = llm_classify
+        self.rule_threshold = rule_threshold
+        self.knn_threshold = knn_threshold
+        self.min_agreement = min_agreement
+        self.cache_size = cache_size
+        self.knn = KNNIntentClassifier(examples)
+
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats = Counter()
+
+    def classify(self, question: str) -> Dict[str, Any]:
+        """Classify a question, using the cheapest tier that is confident enough"""
+        key = normalize_question(question)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return dict(cached)
+
+        result = self._classify_uncached(question)
+        self.stats[result["tier"]] += 1
+
+        self._cache[key] = result
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return dict(result)
+
+    def _classify_uncached(self, question: str) -> Dict[str, Any]:
+        entities = extract_entities(question)
+
+        rule_intent, rule_confidence = match_intent_rules(question, entities)
+        votes = self.knn.votes(question, entities)
+        knn_intent, knn_confidence = self.knn.best(votes)
+
+        # A rule hit counts when the kNN agrees: the intent holds at least
+        # min_agreement of the neighbour vote. Among several hits the
+        # best-supported one wins, and the confidence reflects its support.
+        agreed = [
+            i for i in matched_intent_rules(question, entities)
+            if i in votes and votes[i][0] >= self.min_agreement
+        ]
+
+        if agreed:
+            rule_intent = max(agreed, key=lambda i: votes[i][0])
+            intent, confidence, tier = rule_intent, (rule_confidence + votes[rule_intent][0]) / 2, "rules"
+        elif rule_intent and rule_confidence >= self.rule_threshold:
+            intent, confidence, tier = rule_intent, rule_confidence, "rules"
+        elif knn_intent and knn_confidence >= self.knn_threshold:
+            intent, confidence, tier = knn_intent, knn_confidence, "knn"
+        else:
+            intent, confidence, tier = None, max(rule_confidence, knn_confidence), "rules"
+
+        needs_entities = intent not in ENTITYLESS_INTENTS
+        if intent and (entities or not needs_entities):
+            return {"intent": intent, "entities": entities, "confidence": round(confidence, 2), "tier": tier}
+
+        if self.llm_classify is None:
+            return {
+                "intent": intent or "cross_reference",
+                "entities": entities,
+                "confidence": round(confidence, 2),
+                "tier": tier if intent else "default",
+            }
+
+        result = self.llm_classify(question)
+        if not result.get("entities"):
+            result["entities"] = entities
+        result["tier"] = "llm"
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Classifications per tier and cache hits"""
+        classified = sum(self.stats[tier] for tier in ("rules", "knn", "llm", "default"))
+        return {
+            **self.stats,
+            "cached_questions": len(self._cache),
+            "llm_rate": self.stats["llm"] / classified if classified else 0.0,
+        }
@@ -470,6 +470,7 @@ class CocoIndexDataflowManager:
         user_id: Optional[str] = None,
         limit: int = 5,
         score_threshold: float = 0.6,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Perform semantic search in Qdrant.
@@ -481,6 +482,7 @@ class CocoIndexDataflowManager:
             user_id: User identifier
             limit: Maximum results
             score_threshold: Minimum similarity
+            query_embedding: Optional precomputed embedding of query
 
         Returns:
             List of search results
@@ -500,6 +502,7 @@ class CocoIndexDataflowManager:
                     limit=limit,
                     score_threshold=score_threshold,
                     project_oenum=project_id,
+                    query_embedding=query_embedding,
                 )
             elif chat_id:
                 results = self.qdrant.semantic_search(
@@ -508,6 +511,7 @@ class CocoIndexDataflowManager:
                     limit=limit,
                     score_threshold=score_threshold,
                     session_id=chat_id,
+                    query_embedding=query_embedding,
                 )
             else:
                 results = []
@@ -659,6 +659,7 @@ class MemoryManager:
         user_id: Optional[str] = None,
         limit: int = 5,
         score_threshold: float = 0.6,
+        query_embedding: Optional[List[float]] = None,
     ) -> MemoryReadResult:
         """
         Perform semantic search in Qdrant.
@@ -674,6 +675,7 @@ class MemoryManager:
             user_id: User identifier
             limit: Maximum results
             score_threshold: Minimum similarity score
+            query_embedding: Optional precomputed embedding of query
 
         Returns:
             MemoryReadResult with search results
@@ -690,6 +692,7 @@ class MemoryManager:
                     user_id=user_id,
                     limit=limit,
                     score_threshold=score_threshold,
+                    query_embedding=query_embedding,
                 )
 
                 return MemoryReadResult(
@@ -731,6 +734,7 @@ class MemoryManager:
         include_semantic: bool = True,
         history_limit: int = 20,
         semantic_limit: int = 5,
+        query_embedding: Optional[List[float]] = None,
     ) -> Dict[str, Any]:
         """
         Build complete LLM context from all memory sources.
@@ -752,6 +756,7 @@ class MemoryManager:
             include_semantic: Whether to include semantic search results
             history_limit: Max history messages
             semantic_limit: Max semantic search results
+            query_embedding: Optional precomputed embedding of current_query
 
         Returns:
             Dict with aggregated context
@@ -808,6 +813,7 @@ class MemoryManager:
                 project_id=project_id,
                 user_id=user_id,
                 limit=semantic_limit,
+                query_embedding=query_embedding,
             )
             if semantic_result.success and semantic_result.data:
                 context["semantic_results"] = semantic_result.data
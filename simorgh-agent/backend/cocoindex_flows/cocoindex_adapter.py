@@ -14,9 +14,12 @@ Author: Simorgh Industrial Assistant
 """
 
 import os
+import copy
 import logging
 import json
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from neo4j import GraphDatabase, Driver
 from neo4j.exceptions import ServiceUnavailable, Neo4jError
@@ -24,6 +27,27 @@ from neo4j.exceptions import ServiceUnavailable, Neo4jError
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# PROJECT TPMS CONTEXT CACHE
+# =============================================================================
+
+# In-process tier in front of Redis, shared by all adapter instances:
+# project -> (graph version, context)
+_tpms_context_cache: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+_tpms_context_lock = threading.Lock()
+_TPMS_CONTEXT_CACHE_SIZE = int(os.getenv("TPMS_CONTEXT_CACHE_SIZE", "256"))
+# Safety net only; entries are invalidated by the graph version
+_TPMS_CONTEXT_REDIS_TTL = int(os.getenv("TPMS_CONTEXT_CACHE_TTL", "86400"))
+
+_tpms_context_stats = {"local_hits": 0, "redis_hits": 0, "neo4j_reads": 0, "uncached_reads": 0}
+
+
+def get_tpms_context_cache_stats() -> Dict[str, Any]:
+    """Get hit counts of the project TPMS context cache"""
+    with _tpms_context_lock:
+        return {**_tpms_context_stats, "local_entries": len(_tpms_context_cache)}
+
+
 class CoCoIndexAdapter:
     """
     Unified Neo4j access layer for CoCoIndex flows.
@@ -37,7 +61,8 @@ class CoCoIndexAdapter:
         uri: str = None,
         user: str = None,
         password: str = None,
-        driver: Driver = None
+        driver: Driver = None,
+        redis_service=None
     ):
         """
         Initialize adapter with Neo4j connection.
@@ -47,7 +72,9 @@ class CoCoIndexAdapter:
             user: Neo4j username
             password: Neo4j password
             driver: Existing Neo4j driver (optional, for sharing connections)
+            redis_service: Optional RedisService for the project context cache
         """
+        self.redis_service = redis_service
         if driver:
             self.driver = driver
             self._owns_driver = False
@@ -159,18 +186,76 @@ class CoCoIndexAdapter:
         record = result.single()
         return dict(record["project"]) if record else None
 
-    def get_project_tpms_context(self, project_number: str) -> Optional[Dict[str, Any]]:
+    def get_project_tpms_context(
+        self,
+        project_number: str,
+        redis_service=None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get full project TPMS context from Neo4j for LLM.
 
         Returns project info, panels, and feeder summary from synced TPMS data.
 
+        Read-through cache keyed by the project's graph version (bumped by
+        ProjectSyncService after each sync that changed the graph): an
+        in-process tier, then the Redis project context cache, then Neo4j.
+        Without Redis the version is unknown and Neo4j is always queried.
+        Every call returns its own copy of the context.
+
         Args:
             project_number: Project OENUM
+            redis_service: RedisService to use (default: the adapter's)
 
         Returns:
             Dict with project_info, panels, feeders_summary, counts
         """
+        redis = redis_service or self.redis_service
+        version = redis.get_project_graph_version(project_number) if redis else None
+
+        if version is None:
+            with _tpms_context_lock:
+                _tpms_context_stats["uncached_reads"] += 1
+            return self._fetch_project_tpms_context(project_number)
+
+        # 1. In-process tier
+        with _tpms_context_lock:
+            entry = _tpms_context_cache.get(project_number)
+            if entry and entry[0] == version:
+                _tpms_context_cache.move_to_end(project_number)
+                _tpms_context_stats["local_hits"] += 1
+                # Callers may modify the context; the cached one stays intact
+                return copy.deepcopy(entry[1])
+
+        # 2. Redis tier
+        context = redis.get_cached_project_tpms_context(project_number, graph_version=version)
+        if context:
+            with _tpms_context_lock:
+                _tpms_context_stats["redis_hits"] += 1
+        else:
+            # 3. Neo4j
+            context = self._fetch_project_tpms_context(project_number)
+            with _tpms_context_lock:
+                _tpms_context_stats["neo4j_reads"] += 1
+            if not context:
+                return None
+
+            redis.cache_project_tpms_context(
+                project_number, context, ttl=_TPMS_CONTEXT_REDIS_TTL, graph_version=version
+            )
+            # Also cache panels separately for quick panel lookups
+            if context.get("panels"):
+                redis.cache_project_panels(project_number, context["panels"], ttl=_TPMS_CONTEXT_REDIS_TTL)
+
+        with _tpms_context_lock:
+            _tpms_context_cache[project_number] = (version, copy.deepcopy(context))
+            _tpms_context_cache.move_to_end(project_number)
+            while len(_tpms_context_cache) > _TPMS_CONTEXT_CACHE_SIZE:
+                _tpms_context_cache.popitem(last=False)
+
+        return context
+
+    def _fetch_project_tpms_context(self, project_number: str) -> Optional[Dict[str, Any]]:
+        """Read the project TPMS context from Neo4j (uncached)"""
         try:
             with self.driver.session() as session:
                 # Get project info
@@ -345,6 +430,7 @@ class CoCoIndexAdapter:
         ON MATCH SET
             e += $properties,
             e.updated_at = datetime()
+        SET e:Searchable
         MERGE (e)-[:BELONGS_TO_PROJECT]->(proj)
         RETURN e {{.*, labels: labels(e)}} as entity
         """
@@ -833,6 +919,7 @@ class CoCoIndexAdapter:
             MERGE (e:{entity_type} {{entity_id: $entity_id, project_number: $project_number}})
             ON CREATE SET e += $properties, e.created_at = datetime()
             ON MATCH SET e += $properties, e.updated_at = datetime()
+            SET e:Searchable
             MERGE (e)-[:BELONGS_TO_PROJECT]->(proj)
             """
 
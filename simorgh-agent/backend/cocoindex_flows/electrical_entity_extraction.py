@@ -151,7 +151,8 @@ class Neo4jElectricalStorage(Neo4jStorage):
         MATCH (doc:Document {id: $document_id})
 
         MERGE (eq:Equipment {id: $eq_id, project_number: $project_oenum})
-        SET eq.name = $name,
+        SET eq:Searchable,
+            eq.name = $name,
             eq.type = $type,
             eq.voltage = $voltage,
             eq.current = $current,
@@ -221,7 +222,8 @@ class Neo4jElectricalStorage(Neo4jStorage):
         MATCH (p:Project {project_number: $project_oenum})
 
         MERGE (loc:Location {name: $name, project_number: $project_oenum})
-        SET loc.type = $type,
+        SET loc:Searchable,
+            loc.type = $type,
             loc.updated_at = datetime()
 
         MERGE (loc)-[:PART_OF_PROJECT]->(p)
@@ -465,10 +465,25 @@ class IndustrialElectricalFlow:
             batch_size=100
         )
 
-        # Batch create relationships
+        # Batch create relationships; endpoint labels let Neo4j resolve them by index
+        entity_types = {
+            entity["entity_id"]: entity.get("entity_type")
+            for entity in entities if entity.get("entity_id")
+        }
+        neo4j_relationships = [
+            {
+                "from_id": rel["from_entity_id"],
+                "to_id": rel["to_entity_id"],
+                "from_type": entity_types.get(rel["from_entity_id"]),
+                "to_type": entity_types.get(rel["to_entity_id"]),
+                "type": rel["relationship_type"],
+                "properties": rel.get("properties") or {}
+            }
+            for rel in relationships
+        ]
         relationship_count = neo4j.batch_create_relationships(
             project_number=self.project_number,
-            relationships=relationships,
+            relationships=neo4j_relationships,
             batch_size=100
         )
 
@@ -10,13 +10,22 @@ This flow:
 3. Creates graph structure with categories, fields, and values
 4. Links to project-level extraction guides
 
+Categories are extracted concurrently (SPEC_FLOW_CONCURRENCY). A category
+whose fields are all resolved by the regex pass skips the LLM, and category
+results are cached by document hash and category schema, so re-running the
+flow after a schema change only re-extracts the categories that changed.
+
 Author: Simorgh Industrial Assistant
 """
 
 import os
 import re
 import json
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
@@ -210,6 +219,40 @@ SPEC_EXTRACTION_SCHEMA = {
 }
 
 
+# =============================================================================
+# CATEGORY RESULT CACHE
+# =============================================================================
+
+# Shared by all flow instances (flows are created per request)
+_category_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_category_cache_lock = threading.Lock()
+_CATEGORY_CACHE_SIZE = int(os.getenv("SPEC_FLOW_CACHE_SIZE", "1024"))
+
+
+def _category_cache_key(document_hash: str, item_data: Dict[str, Any], llm_mode: Optional[str]) -> str:
+    """Cache key of one category of one document (changes when the category's schema changes)"""
+    signature = json.dumps(
+        [item_data["category_name"], item_data["item_number"], item_data["fields"], llm_mode or ""]
+    )
+    return f"{document_hash}:{hashlib.sha256(signature.encode('utf-8')).hexdigest()}"
+
+
+def _category_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    with _category_cache_lock:
+        result = _category_cache.get(key)
+        if result is not None:
+            _category_cache.move_to_end(key)
+        return result
+
+
+def _category_cache_put(key: str, result: Dict[str, Any]) -> None:
+    with _category_cache_lock:
+        _category_cache[key] = result
+        _category_cache.move_to_end(key)
+        while len(_category_cache) > _CATEGORY_CACHE_SIZE:
+            _category_cache.popitem(last=False)
+
+
 # =============================================================================
 # SPECIFICATION FLOW IMPLEMENTATION
 # =============================================================================
@@ -221,6 +264,15 @@ class SpecificationFlow(BaseDocumentFlow):
     Handles ITEM 1-13 extraction for Siemens LV/MV switchgear specifications.
     """
 
+    def __init__(
+        self,
+        cocoindex_adapter,
+        llm_service=None,
+        qdrant_service=None
+    ):
+        super().__init__(cocoindex_adapter, llm_service=llm_service, qdrant_service=qdrant_service)
+        self.max_concurrent = int(os.getenv("SPEC_FLOW_CONCURRENCY", "4"))
+
     @property
     def document_type(self) -> str:
         return "Specification"
@@ -333,20 +385,14 @@ class SpecificationFlow(BaseDocumentFlow):
             )
             entities.append(doc_entity)
 
+            # Extract all categories (concurrently, cached, regex first)
+            category_results, category_stats = self._extract_all_categories(content, llm_mode)
+
             # Process each category
             for item_key, item_data in SPEC_EXTRACTION_SCHEMA.items():
                 category_name = item_data["category_name"]
                 item_number = item_data["item_number"]
-                fields = item_data["fields"]
-
-                # Extract values for this category
-                category_result = self._extract_category(
-                    content=content,
-                    category_name=category_name,
-                    item_number=item_number,
-                    fields=fields,
-                    llm_mode=llm_mode
-                )
+                category_result = category_results[item_key]
 
                 if category_result.get("success"):
                     # Create category entity
@@ -429,7 +475,10 @@ class SpecificationFlow(BaseDocumentFlow):
                 document_type=self.document_type,
                 entities=entities,
                 relationships=relationships,
-                metadata={"categories_processed": len(SPEC_EXTRACTION_SCHEMA)}
+                metadata={
+                    "categories_processed": len(SPEC_EXTRACTION_SCHEMA),
+                    **category_stats
+                }
             )
 
         except Exception as e:
@@ -444,6 +493,74 @@ class SpecificationFlow(BaseDocumentFlow):
                 errors=errors
             )
 
+    def _extract_all_categories(
+        self,
+        content: str,
+        llm_mode: str = None
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+        """
+        Extract every schema category of a document.
+
+        Cached categories are reused; categories the regex pass resolves
+        completely skip the LLM; the rest run concurrently.
+
+        Returns:
+            (item key -> category result, counts per resolution path)
+        """
+        document_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, str] = {}  # item key -> cache key
+        stats = {"categories_cached": 0, "categories_pattern_only": 0, "categories_llm": 0}
+
+        for item_key, item_data in SPEC_EXTRACTION_SCHEMA.items():
+            cache_key = _category_cache_key(document_hash, item_data, llm_mode)
+            cached = _category_cache_get(cache_key)
+            if cached is not None:
+                results[item_key] = cached
+                stats["categories_cached"] += 1
+                continue
+
+            pattern_result = self._pattern_extract_category(
+                content, item_data["category_name"], item_data["fields"]
+            )
+            if self.llm_service is None or all(f.get("value") for f in pattern_result["fields"]):
+                results[item_key] = pattern_result
+                _category_cache_put(cache_key, pattern_result)
+                stats["categories_pattern_only"] += 1
+            else:
+                pending[item_key] = cache_key
+
+        if pending:
+            max_workers = max(1, min(self.max_concurrent, len(pending)))
+            logger.info(
+                f"Extracting {len(pending)} spec categories with LLM ({max_workers} concurrent, "
+                f"{stats['categories_cached']} cached, {stats['categories_pattern_only']} resolved by patterns)"
+            )
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spec-flow") as executor:
+                futures = {
+                    item_key: executor.submit(
+                        self._extract_category,
+                        content=content,
+                        category_name=SPEC_EXTRACTION_SCHEMA[item_key]["category_name"],
+                        item_number=SPEC_EXTRACTION_SCHEMA[item_key]["item_number"],
+                        fields=SPEC_EXTRACTION_SCHEMA[item_key]["fields"],
+                        llm_mode=llm_mode
+                    )
+                    for item_key in pending
+                }
+
+                for item_key, future in futures.items():
+                    category_result = future.result()
+                    results[item_key] = category_result
+                    stats["categories_llm"] += 1
+
+                    # Pattern fallbacks after an LLM failure are not cached so the LLM is retried next run
+                    if not category_result.get("fallback"):
+                        _category_cache_put(pending[item_key], category_result)
+
+        return results, stats
+
     def _extract_category(
         self,
         content: str,
@@ -536,7 +653,10 @@ Extract all values for **{category_name}** (ITEM {item_number}).
 
         except Exception as e:
             logger.error(f"LLM extraction failed for {category_name}: {e}")
-            return self._pattern_extract_category(content, category_name, fields)
+            return {
+                **self._pattern_extract_category(content, category_name, fields),
+                "fallback": True
+            }
 
     def _pattern_extract_category(
         self,
@@ -24,12 +24,14 @@ import logging
 import os
 import uuid
 import json
+import asyncio
 
 # Import our services
 from services.neo4j_service import get_neo4j_service, Neo4jService
 from services.redis_service import get_redis_service, RedisService
 from services.sql_auth_service import get_sql_auth_service, SQLAuthService
 from services.tpms_auth_service import get_tpms_auth_service, TPMSAuthService
+from services.mysql_pool import close_mysql_pools
 from services.llm_service import (
     get_llm_service,
     LLMService,
@@ -50,6 +52,8 @@ from services.unified_memory_service import (
     get_unified_memory_service,
     init_unified_memory_service
 )
+from services.query_context import QueryContext
+from services.retrieval_orchestrator import RetrievalOrchestrator
 from models.ontology import *
 
 # Import authentication routes and utilities
@@ -66,6 +70,7 @@ from middleware.security import (
     SecurityHeadersMiddleware,
     RequestValidationMiddleware
 )
+from middleware.rate_limiter import get_rate_limiter
 
 # Import chatbot_core for enhanced session management
 from chatbot_core.startup import (
@@ -227,6 +232,13 @@ async def startup_event():
     neo4j_service = get_neo4j_service()
     logger.info("✅ Neo4j service initialized")
 
+    # Fulltext index for graph start-node lookup (populates in the background)
+    try:
+        from services.graph_rag_service import GraphRAGService
+        GraphRAGService(neo4j_service.driver).ensure_fulltext_index(migrate=True)
+    except Exception as e:
+        logger.warning(f"⚠️ Graph fulltext index setup failed (non-fatal): {e}")
+
     # Initialize SQL Auth (legacy)
     sql_auth_service = get_sql_auth_service()
     logger.info("✅ SQL Auth service initialized")
@@ -324,6 +336,12 @@ async def shutdown_event():
     if redis_service:
         redis_service.close()
 
+    if llm_service:
+        await llm_service.aclose()
+
+    close_mysql_pools()
+    await get_rate_limiter().aclose()
+
     logger.info("✅ Shutdown complete")
 
 
@@ -413,7 +431,8 @@ async def health_check(
             "redis": redis.health_check(),
             "sql_auth": sql_auth.health_check(),
             "llm": llm.health_check()
-        }
+        },
+        "rate_limiter": get_rate_limiter().get_stats()
     }
 
     # Determine overall status
@@ -930,10 +949,10 @@ async def create_chat(
             if not chat.project_number.isdigit():
                 logger.info(f"🔍 Detected OENUM format: {chat.project_number}, looking up IDProjectMain...")
                 # Try to get project by OENUM to find the IDProjectMain
-                oenum_project = tpms.get_project_by_oenum(chat.project_number[-5:])
+                oenum_project = await tpms.aget_project_by_oenum(chat.project_number[-5:])
                 if not oenum_project:
                     # Try exact OENUM match using search
-                    search_results = tpms.search_oenum_autocomplete(chat.project_number, limit=1)
+                    search_results = await tpms.asearch_oenum_autocomplete(chat.project_number, limit=1)
                     if search_results:
                         project_id_for_auth = str(search_results[0]["IDProjectMain"])
                         logger.info(f"✅ Found IDProjectMain via search: {project_id_for_auth} for OENUM {chat.project_number}")
@@ -949,7 +968,7 @@ async def create_chat(
                 logger.info(f"🔍 Detected IDProjectMain format: {chat.project_number}")
 
             # Step 1: Validate project access (lookup + permission check)
-            has_access, error_code, error_message = tpms.validate_project_access(
+            has_access, error_code, error_message = await tpms.avalidate_project_access(
                 username=current_user,
                 project_id=project_id_for_auth
             )
@@ -963,7 +982,7 @@ async def create_chat(
                     raise HTTPException(status_code=500, detail=error_message)
 
             # Step 2: Get project details from View_Project_Main
-            project = tpms.get_project_by_id(project_id_for_auth)
+            project = await tpms.aget_project_by_id(project_id_for_auth)
             if not project:
                 # This should not happen after validate_project_access, but safety check
                 raise HTTPException(
@@ -1556,7 +1575,7 @@ Rules:
 
 Title:"""
 
-        result = llm.generate(
+        result = await llm.agenerate(
             messages=[
                 {"role": "system", "content": "You are an expert at creating concise, descriptive titles."},
                 {"role": "user", "content": title_prompt}
@@ -2363,6 +2382,17 @@ async def send_chat_message(
         document_overview_context = ""
         context_used = False
 
+        # Embed the user message once and share the vector with every retriever
+        # (the first retrieval stage that needs it computes it, the rest reuse it)
+        query_context = QueryContext(_content, get_qdrant_service())
+        qdrant = get_qdrant_service()
+
+        # Retrieval stages are independent - run them concurrently so the turn
+        # waits for the slowest stage, not the sum of all of them
+        retrieval = RetrievalOrchestrator()
+        section_retriever = None
+        graph_rag = None
+
         # Handle general chats (no project) - retrieve document context from per-chat collection
         if not project_number and chat_type == "general":
             logger.info(f"🔍 Retrieving document context for general chat {_chat_id}")
@@ -2370,7 +2400,6 @@ async def send_chat_message(
                 from services.section_retriever import SectionRetriever
                 from services.document_overview_service import DocumentOverviewService
 
-                qdrant = get_qdrant_service()
                 section_retriever = SectionRetriever(
                     llm_service=llm_service,
                     qdrant_service=qdrant
@@ -2381,27 +2410,27 @@ async def send_chat_message(
                 general_chat_key = f"general_{_chat_id}"
 
                 # Get document overview for this chat
-                document_overview_context = doc_overview.generate_overview(
+                retrieval.add_stage(
+                    "document_overview",
+                    doc_overview.generate_overview,
                     chat_id=_chat_id,
-                    max_documents=10
+                    max_documents=10,
+                    default=""
                 )
 
                 # Retrieve relevant sections from uploaded documents
-                sections_result = section_retriever.retrieve_relevant_sections(
-                    project_number=general_chat_key,
-                    query=_content,
-                    limit=5,
-                    score_threshold=0.3
+                retrieval.add_stage(
+                    "sections",
+                    lambda: section_retriever.retrieve_relevant_sections(
+                        project_number=general_chat_key,
+                        query=_content,
+                        limit=5,
+                        score_threshold=0.3,
+                        query_embedding=query_context.try_embedding()
+                    ),
+                    default={}
                 )
 
-                if sections_result.get("success") and sections_result.get("sections"):
-                    graph_context = section_retriever.format_sections_for_context(
-                        sections=sections_result["sections"],
-                        max_sections=3
-                    )
-                    context_used = True
-                    logger.info(f"📄 Retrieved {len(sections_result['sections'])} sections for general chat")
-
             except Exception as e:
                 logger.warning(f"⚠️ General chat context retrieval failed: {e}", exc_info=True)
 
@@ -2416,28 +2445,128 @@ async def send_chat_message(
                 doc_overview = DocumentOverviewService(redis_service=redis)
 
                 # 0. DOCUMENT OVERVIEW: Always provide overview of uploaded documents
-                logger.info(f"📚 Generating document overview for project")
-                document_overview_context = doc_overview.generate_overview(
+                retrieval.add_stage(
+                    "document_overview",
+                    doc_overview.generate_overview,
                     project_number=project_number,
-                    max_documents=10
+                    max_documents=10,
+                    default=""
                 )
 
-                # Build rich context from multiple sources
-                context_parts = []
-
                 # 1. GRAPH SPECIFICATIONS: Query specs from Neo4j
                 # Special handling for common queries
                 if any(word in _content.lower() for word in ['protection', 'protections', 'protective', 'relay', 'trip']):
                     # Get all protection-related specs
-                    graph_result = graph_rag.get_protection_specifications(project_number=project_number)
+                    retrieval.add_stage(
+                        "graph_specs",
+                        graph_rag.get_protection_specifications,
+                        project_number=project_number,
+                        default={}
+                    )
                 else:
                     # General query
-                    graph_result = graph_rag.search_by_natural_query(
+                    retrieval.add_stage(
+                        "graph_specs",
+                        graph_rag.search_by_natural_query,
                         project_number=project_number,
-                        query=_content
+                        query=_content,
+                        default={}
                     )
 
+                # 2. KNOWLEDGE GRAPH BFS: Find related subgraph
+                retrieval.add_stage(
+                    "subgraph",
+                    graph_rag.find_related_subgraph,
+                    project_number=project_number,
+                    query=_content,
+                    max_depth=2,
+                    default={}
+                )
+
+                # 3. ENHANCED VECTOR SEARCH: Section-based search with FULL content
+                # IMPORTANT: Documents are stored with user_id="system" during upload
+                # so we must search with the same user_id to find them
+                retrieval.add_stage(
+                    "section_search",
+                    lambda: qdrant.search_section_summaries(
+                        user_id="system",  # Must match how documents are stored in section_retriever
+                        project_oenum=project_number,
+                        query=_content,
+                        limit=5,
+                        score_threshold=0.3,
+                        query_embedding=query_context.try_embedding()
+                    ),
+                    default=[]
+                )
+
+            except Exception as e:
+                logger.warning(f"⚠️ Enhanced context retrieval failed: {e}", exc_info=True)
+                # Continue without context rather than failing
+
+        # 🧠 USER MEMORY: Retrieve similar past conversations from Qdrant (session-isolated)
+        retrieval.add_stage(
+            "user_memory",
+            lambda: qdrant.retrieve_similar_conversations(
+                user_id=_user_id,
+                current_query=_content,
+                limit=5,  # Get top 5 semantically similar conversations
+                score_threshold=0.65,  # Only include relevant conversations
+                project_filter=project_number if project_number else None,
+                chat_id=_chat_id,  # Filter by current chat for session isolation
+                fallback_to_recent=True,  # Fallback to recent if no semantic matches
+                fallback_limit=10,  # Return last 10 conversations as fallback
+                query_embedding=query_context.try_embedding()
+            ),
+            default=[]
+        )
+
+        # 🆕 ENHANCED: Get recent chat history from Redis for conversation continuity
+        # For PROJECT chats: Use cross-chat memory (all chats in the project)
+        # For GENERAL chats: Use single-chat memory (current chat only)
+        if chat_type == "project" and project_id_for_memory:
+            # PROJECT CHAT: Get cross-chat memory from all project chats
+            logger.info(f"🔗 Using project-wide memory for project {project_id_for_memory}")
+            retrieval.add_stage(
+                "chat_history",
+                redis.get_project_chat_history,
+                user_id=_user_id,
+                project_number=project_id_for_memory,
+                current_chat_id=_chat_id,
+                limit=30,  # More messages since we're aggregating from multiple chats
+                include_current_chat=True,
+                default=[]
+            )
+        else:
+            # GENERAL CHAT: Use current chat history only (isolated)
+            retrieval.add_stage("chat_history", redis.get_chat_history, _chat_id, limit=10, default=[])
+
+        await retrieval.run()
+
+        if section_retriever is not None:
+            try:
+                document_overview_context = retrieval.value("document_overview", "")
+
+                sections_result = retrieval.value("sections", {})
+                if sections_result.get("success") and sections_result.get("sections"):
+                    graph_context = section_retriever.format_sections_for_context(
+                        sections=sections_result["sections"],
+                        max_sections=3
+                    )
+                    context_used = True
+                    logger.info(f"📄 Retrieved {len(sections_result['sections'])} sections for general chat")
+
+            except Exception as e:
+                logger.warning(f"⚠️ General chat context retrieval failed: {e}", exc_info=True)
+
+        elif graph_rag is not None:
+            try:
+                document_overview_context = retrieval.value("document_overview", "")
+
+                # Build rich context from multiple sources
+                context_parts = []
+
                 # Add graph specifications if found
+                graph_result = retrieval.value("graph_specs", {})
                 if graph_result.get("success"):
                     # Handle protection specs (different key)
                     specs_list = graph_result.get("protections") or graph_result.get("specs")
@@ -2456,34 +2585,15 @@ async def send_chat_message(
                         else:
                             logger.warning(f"⚠️ Retrieved {len(specs_list)} specs but all values are empty/not specified")
 
-                # 2. KNOWLEDGE GRAPH BFS: Find related subgraph
-                logger.info(f"🕸️ Performing BFS graph traversal")
-                subgraph = graph_rag.find_related_subgraph(
-                    project_number=project_number,
-                    query=_content,
-                    max_depth=2
-                )
-
+                subgraph = retrieval.value("subgraph", {})
                 if subgraph.get("success") and subgraph.get("nodes"):
                     subgraph_context = graph_rag.format_subgraph_for_context(subgraph)
                     if subgraph_context:
                         context_parts.append(subgraph_context)
                         logger.info(f"🕸️ Retrieved subgraph: {subgraph.get('node_count', 0)} nodes, {subgraph.get('relationship_count', 0)} relationships")
 
-                # 3. ENHANCED VECTOR SEARCH: Section-based search with FULL content
-                # IMPORTANT: Documents are stored with user_id="system" during upload
-                # so we must search with the same user_id to find them
-                logger.info(f"🔍 Performing enhanced section-based search")
-                qdrant = get_qdrant_service()
-                vector_results = qdrant.search_section_summaries(
-                    user_id="system",  # Must match how documents are stored in section_retriever
-                    project_oenum=project_number,
-                    query=_content,
-                    limit=5,
-                    score_threshold=0.3
-                )
-
                 # Add vector search results with FULL sections (NO truncation!)
+                vector_results = retrieval.value("section_search", [])
                 if vector_results:
                     vector_context = "\n\n## 📄 Related Document Sections (Semantic Search)\n"
                     for idx, result in enumerate(vector_results[:3], 1):
@@ -2512,50 +2622,33 @@ async def send_chat_message(
                 logger.warning(f"⚠️ Enhanced context retrieval failed: {e}", exc_info=True)
                 # Continue without context rather than failing
 
-        # 🧠 USER MEMORY: Retrieve similar past conversations from Qdrant (session-isolated)
         user_memory_context = ""
-        try:
-            qdrant = get_qdrant_service()
-            similar_conversations = qdrant.retrieve_similar_conversations(
-                user_id=_user_id,
-                current_query=_content,
-                limit=5,  # Get top 5 semantically similar conversations
-                score_threshold=0.65,  # Only include relevant conversations
-                project_filter=project_number if project_number else None,
-                chat_id=_chat_id,  # Filter by current chat for session isolation
-                fallback_to_recent=True,  # Fallback to recent if no semantic matches
-                fallback_limit=10  # Return last 10 conversations as fallback
-            )
-
-            if similar_conversations:
-                # Check if these are fallback results (recent conversations)
-                is_fallback = similar_conversations[0].get("is_fallback", False)
+        similar_conversations = retrieval.value("user_memory", [])
+        if similar_conversations:
+            # Check if these are fallback results (recent conversations)
+            is_fallback = similar_conversations[0].get("is_fallback", False)
+
+            if is_fallback:
+                user_memory_context = "\n\n## 📚 Your Recent Conversation History\n"
+                user_memory_context += "Here are your most recent conversations (no specific semantic match found):\n\n"
+            else:
+                user_memory_context = "\n\n## 💭 Your Past Relevant Conversations\n"
+                user_memory_context += "Here are some of your previous related discussions:\n\n"
 
+            for idx, conv in enumerate(similar_conversations, 1):
                 if is_fallback:
-                    user_memory_context = "\n\n## 📚 Your Recent Conversation History\n"
-                    user_memory_context += "Here are your most recent conversations (no specific semantic match found):\n\n"
+                    # For fallback, show timestamp instead of relevance score
+                    user_memory_context += f"**{idx}. Previous Q&A**\n"
                 else:
-                    user_memory_context = "\n\n## 💭 Your Past Relevant Conversations\n"
-                    user_memory_context += "Here are some of your previous related discussions:\n\n"
+                    user_memory_context += f"**{idx}. Previous Q&A** (Relevance: {conv['score']:.0%})\n"
 
-                for idx, conv in enumerate(similar_conversations, 1):
-                    if is_fallback:
-                        # For fallback, show timestamp instead of relevance score
-                        user_memory_context += f"**{idx}. Previous Q&A**\n"
-                    else:
-                        user_memory_context += f"**{idx}. Previous Q&A** (Relevance: {conv['score']:.0%})\n"
-
-                    user_memory_context += f"  - You asked: \"{conv['user_message'][:150]}{'...' if len(conv['user_message']) > 150 else ''}\"\n"
-                    user_memory_context += f"  - I responded: \"{conv['assistant_response'][:200]}{'...' if len(conv['assistant_response']) > 200 else ''}\"\n\n"
+                user_memory_context += f"  - You asked: \"{conv['user_message'][:150]}{'...' if len(conv['user_message']) > 150 else ''}\"\n"
+                user_memory_context += f"  - I responded: \"{conv['assistant_response'][:200]}{'...' if len(conv['assistant_response']) > 200 else ''}\"\n\n"
 
-                logger.info(f"🧠 Retrieved {len(similar_conversations)} {'recent' if is_fallback else 'semantically similar'} past conversations for user memory context")
-                context_used = True
-            else:
-                logger.info(f"🧠 No past conversations found for user {_user_id}")
-
-        except Exception as e:
-            logger.warning(f"⚠️ User memory retrieval failed: {e}")
-            # Continue without user memory context rather than failing
+            logger.info(f"🧠 Retrieved {len(similar_conversations)} {'recent' if is_fallback else 'semantically similar'} past conversations for user memory context")
+            context_used = True
+        elif retrieval.results["user_memory"].ok:
+            logger.info(f"🧠 No past conversations found for user {_user_id}")
 
         # Build LLM messages
         system_prompt = """You are an expert industrial electrical engineer assistant specializing in Siemens LV/MV systems.
@@ -2589,29 +2682,15 @@ You may reference past conversations when relevant (e.g., if user asks about som
 but ALWAYS prioritize technical specifications and project data over conversation history.
 If there's any conflict between conversation history and project specifications, the specifications are correct."""
 
-        # 🆕 ENHANCED: Get recent chat history from Redis for conversation continuity
-        # For PROJECT chats: Use cross-chat memory (all chats in the project)
-        # For GENERAL chats: Use single-chat memory (current chat only)
         llm_messages = [{"role": "system", "content": system_prompt}]
 
         try:
-            if chat_type == "project" and project_id_for_memory:
-                # PROJECT CHAT: Get cross-chat memory from all project chats
-                logger.info(f"🔗 Using project-wide memory for project {project_id_for_memory}")
-                recent_messages = redis.get_project_chat_history(
-                    user_id=_user_id,
-                    project_number=project_id_for_memory,
-                    current_chat_id=_chat_id,
-                    limit=30,  # More messages since we're aggregating from multiple chats
-                    include_current_chat=True
-                )
+            recent_messages = retrieval.value("chat_history", [])
 
+            if chat_type == "project" and project_id_for_memory:
                 # Count source chats for logging
                 source_chats = set(m.get('source_chat_id', _chat_id) for m in recent_messages)
                 logger.info(f"📚 Retrieved {len(recent_messages)} messages from {len(source_chats)} project chat(s)")
-            else:
-                # GENERAL CHAT: Use current chat history only (isolated)
-                recent_messages = redis.get_chat_history(_chat_id, limit=10)
 
             if recent_messages:
                 # Add historical messages to context
@@ -2639,11 +2718,17 @@ If there's any conflict between conversation history and project specifications,
         # Generate response
         logger.info(f"💬 Generating LLM response - Mode: {_llm_mode or 'default'}, Chat: {_chat_id}")
 
-        result = llm.generate(
+        # Project chats also use the semantic cache: the same spec question asked in
+        # another chat over the same retrieved project context reuses the answer.
+        # Chat history and user memory are left out of the cache context on purpose.
+        result = await llm.agenerate(
             messages=llm_messages,
             mode=_llm_mode,
             temperature=0.7,
-            use_cache=True
+            use_cache=True,
+            semantic_cache=bool(project_number),
+            project_number=project_number,
+            cache_context=f"{file_context}{document_overview_context}{graph_context}"
         )
 
         logger.info(f"✅ LLM response generated - Actual mode used: {result.get('mode')}, Tokens: {result.get('tokens', {}).get('total', 0)}")
@@ -2659,7 +2744,8 @@ If there's any conflict between conversation history and project specifications,
                 "tokens": result.get("tokens", {}).get("total", 0)
             }
 
-            qdrant.store_user_conversation(
+            await asyncio.to_thread(
+                qdrant.store_user_conversation,
                 user_id=_user_id,
                 user_message=_content,
                 assistant_response=ai_response,
@@ -2746,7 +2832,8 @@ If there's any conflict between conversation history and project specifications,
             "llm_mode": result.get("mode"),
             "context_used": context_used,
             "cached_response": result.get("cached", False),
-            "tokens": result.get("tokens")
+            "tokens": result.get("tokens"),
+            "retrieval_timings": retrieval.get_timings()
         }
 
         # Include spec task ID if spec extraction was triggered
@@ -2844,41 +2931,53 @@ async def send_chat_message_stream(
     # For memory lookups, use project_id_main (IDProjectMain) since that's what the index uses
     project_id_for_memory = chat_metadata.get("project_id_main") or project_number
 
-    # Build graph context if project chat
+    # Embed the user message once and share the vector with every retriever
+    query_context = QueryContext(message.content, get_qdrant_service())
+
+    # Build graph context if project chat - graph and vector lookups run concurrently
     graph_context = ""
     if project_number and message.use_graph_context:
-        try:
-            # Get graph entities
-            entities = neo4j.semantic_search(
-                project_number=project_number,
-                filters=None,
-                limit=10
-            )
-            if entities:
-                graph_context = "\n\n## Project Knowledge Graph\n"
-                for entity in entities[:5]:
-                    graph_context += f"- {entity.get('entity_type')}: {entity.get('description', 'N/A')}\n"
+        qdrant = get_qdrant_service()
+        retrieval = RetrievalOrchestrator()
 
-            # Get vector context from Qdrant
-            try:
-                qdrant = get_qdrant_service()
-                vector_results = qdrant.search_section_summaries(
-                    user_id="system",
-                    project_oenum=project_number,
-                    query=message.content,
-                    limit=3,
-                    score_threshold=0.3
-                )
-                if vector_results:
-                    graph_context += "\n\n## Relevant Document Sections\n"
-                    for idx, result in enumerate(vector_results[:3], 1):
-                        graph_context += f"\n**{idx}. {result.get('section_title', 'Section')}** (Score: {result.get('score', 0):.2f})\n"
-                        graph_context += f"{result.get('full_content', '')[:1000]}\n"
-            except Exception as e:
-                logger.warning(f"Vector context retrieval failed: {e}")
+        # Get graph entities
+        retrieval.add_stage(
+            "graph_entities",
+            neo4j.semantic_search,
+            project_number=project_number,
+            filters=None,
+            limit=10,
+            default=[]
+        )
 
-        except Exception as e:
-            logger.warning(f"Graph context retrieval failed: {e}")
+        # Get vector context from Qdrant
+        retrieval.add_stage(
+            "section_search",
+            lambda: qdrant.search_section_summaries(
+                user_id="system",
+                project_oenum=project_number,
+                query=message.content,
+                limit=3,
+                score_threshold=0.3,
+                query_embedding=query_context.try_embedding()
+            ),
+            default=[]
+        )
+
+        await retrieval.run()
+
+        entities = retrieval.value("graph_entities", [])
+        if entities:
+            graph_context = "\n\n## Project Knowledge Graph\n"
+            for entity in entities[:5]:
+                graph_context += f"- {entity.get('entity_type')}: {entity.get('description', 'N/A')}\n"
+
+        vector_results = retrieval.value("section_search", [])
+        if vector_results:
+            graph_context += "\n\n## Relevant Document Sections\n"
+            for idx, result in enumerate(vector_results[:3], 1):
+                graph_context += f"\n**{idx}. {result.get('section_title', 'Section')}** (Score: {result.get('score', 0):.2f})\n"
+                graph_context += f"{result.get('full_content', '')[:1000]}\n"
 
     # Get full context using unified memory service
     system_prompt = """You are an expert industrial electrical engineer assistant specializing in Siemens LV/MV systems.
@@ -2894,7 +2993,8 @@ Provide accurate, technical responses based on IEC and IEEE standards."""
             system_prompt=system_prompt,
             graph_context=graph_context,
             use_semantic_memory=True,
-            use_summary=True
+            use_summary=True,
+            query_embedding=await asyncio.to_thread(query_context.try_embedding)
         )
         llm_messages = context_result["messages"]
         context_metadata = context_result.get("metadata", {})
@@ -2907,7 +3007,7 @@ Provide accurate, technical responses based on IEC and IEEE standards."""
         ]
         context_metadata = {"fallback": True}
 
-    def event_stream():
+    async def event_stream():
         try:
             context_used = context_metadata.get("has_graph_context", False) or \
                           context_metadata.get("recent_message_count", 0) > 0 or \
@@ -2935,7 +3035,7 @@ Provide accurate, technical responses based on IEC and IEEE standards."""
             think_open_pattern = re.compile(r'<think(?:ing)?>', re.IGNORECASE)
             think_close_pattern = re.compile(r'</think(?:ing)?>', re.IGNORECASE)
 
-            for chunk in llm.generate_stream(
+            async for chunk in llm.astream(
                 messages=llm_messages,
                 mode=llm_mode,
                 temperature=0.7
@@ -3003,7 +3103,8 @@ Provide accurate, technical responses based on IEC and IEEE standards."""
             try:
                 qdrant = get_qdrant_service()
                 if qdrant:
-                    qdrant.store_user_conversation(
+                    await asyncio.to_thread(
+                        qdrant.store_user_conversation,
                         user_id=message.user_id,
                         user_message=message.content,
                         assistant_response=clean_response,
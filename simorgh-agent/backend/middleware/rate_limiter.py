@@ -0,0 +1,248 @@
+# middleware/rate_limiter.py
+"""
+Rate Limiter
+============
+Token-bucket rate limiting shared by all uvicorn workers.
+
+Each (endpoint class, client) pair owns one bucket holding at most `limit`
+tokens that refill continuously at `limit / window` tokens per second; a
+request takes one token. A bucket is a two-field Redis hash updated by an
+atomic Lua script and expires once it would be full again, so memory is O(1)
+per active client and idle clients cost nothing.
+
+When Redis is unreachable the limiter falls back to the same algorithm in
+process memory (per worker, LRU-bounded) and retries Redis after a backoff.
+
+Configuration:
+- REDIS_URL: Redis server (the limiter uses its own logical database)
+- RATE_LIMIT_REDIS_DB: Database number (default: 6)
+- RATE_LIMIT_REDIS_RETRY: Seconds before retrying Redis after a failure (default: 30)
+
+Author: Simorgh Industrial Assistant
+"""
+
+import os
+import time
+import math
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit"
+
+# KEYS[1] = bucket key
+# ARGV[1] = capacity (tokens), ARGV[2] = window in milliseconds
+# Returns {allowed (0/1), tokens left, milliseconds until a token is available}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local rate = capacity / window_ms
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_ms = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_ms = math.ceil((1 - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1000)
+
+return {allowed, math.floor(tokens), retry_ms}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of taking a token from a bucket"""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0  # seconds until the next token
+
+
+class LocalTokenBucketLimiter:
+    """
+    In-process token buckets (fallback when Redis is unavailable)
+
+    Buckets live in an LRU map capped at max_keys; buckets idle for a full
+    window are back at capacity and are dropped, so memory stays bounded.
+    Not shared between workers. Only called from the event loop, so no lock.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (tokens, updated_at, window)
+
+    def hit(self, key: str, limit: int, window_seconds: float) -> RateLimitResult:
+        """Take one token from a bucket"""
+        now = time.monotonic()
+        rate = limit / window_seconds
+
+        tokens, updated_at, _ = self._buckets.pop(key, (limit, now, window_seconds))
+        tokens = min(limit, tokens + (now - updated_at) * rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            result = RateLimitResult(True, limit, int(tokens))
+        else:
+            result = RateLimitResult(False, limit, 0, (1 - tokens) / rate)
+
+        self._buckets[key] = (tokens, now, window_seconds)
+        self._evict(now)
+        return result
+
+    def _evict(self, now: float) -> None:
+        """Drop least recently used buckets that are full again, or over the cap"""
+        while self._buckets:
+            key, (_, updated_at, window) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_keys and now - updated_at < window:
+                break
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class DistributedRateLimiter:
+    """
+    Redis token-bucket limiter with an in-process fallback
+
+    Usage:
+        limiter = DistributedRateLimiter()
+        result = await limiter.hit("api:user:alice", limit=100, window_seconds=60)
+        if not result.allowed:
+            ...  # respond 429, Retry-After: result.retry_after
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        redis_db: Optional[int] = None,
+        retry_seconds: Optional[float] = None,
+        local_max_keys: int = 100_000
+    ):
+        """
+        Initialize limiter (Redis is connected lazily)
+
+        Args:
+            redis_url: Redis URL (default: REDIS_URL)
+            redis_db: Logical database for buckets (default: RATE_LIMIT_REDIS_DB or 6)
+            retry_seconds: Backoff before retrying Redis (default: RATE_LIMIT_REDIS_RETRY or 30)
+            local_max_keys: Bucket limit of the in-process fallback
+        """
+        base_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+        db = redis_db if redis_db is not None else int(os.getenv("RATE_LIMIT_REDIS_DB", "6"))
+        self.retry_seconds = retry_seconds or float(os.getenv("RATE_LIMIT_REDIS_RETRY", "30"))
+
+        self.redis = aioredis.Redis.from_url(
+            f"{base_url.rsplit('/', 1)[0]}/{db}",
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+        self._script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self.local = LocalTokenBucketLimiter(max_keys=local_max_keys)
+        self._redis_down_until = 0.0
+
+        self.stats = {
+            "checks": 0,
+            "rejected": 0,
+            "redis_checks": 0,
+            "local_checks": 0,
+            "redis_errors": 0,
+        }
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> RateLimitResult:
+        """
+        Take one token from the bucket of key
+
+        Args:
+            key: Bucket key, e.g. "<endpoint class>:<client>"
+            limit: Bucket capacity (requests per window)
+            window_seconds: Time to refill an empty bucket
+        """
+        self.stats["checks"] += 1
+        result = None
+
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                allowed, remaining, retry_ms = await self._script(
+                    keys=[f"{KEY_PREFIX}:{key}"],
+                    args=[limit, int(window_seconds * 1000)]
+                )
+                result = RateLimitResult(bool(allowed), limit, int(remaining), int(retry_ms) / 1000)
+                self.stats["redis_checks"] += 1
+            except (RedisError, OSError) as e:
+                self.stats["redis_errors"] += 1
+                self._redis_down_until = time.monotonic() + self.retry_seconds
+                logger.warning(
+                    f"⚠️ Rate limiter Redis unavailable, using per-worker limits "
+                    f"for {self.retry_seconds:.0f}s: {e}"
+                )
+
+        if result is None:
+            result = self.local.hit(key, limit, window_seconds)
+            self.stats["local_checks"] += 1
+
+        if not result.allowed:
+            self.stats["rejected"] += 1
+        return result
+
+    @property
+    def using_redis(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        return {
+            **self.stats,
+            "backend": "redis" if self.using_redis else "local",
+            "local_buckets": len(self.local),
+        }
+
+    async def aclose(self) -> None:
+        """Close the Redis connection pool"""
+        await self.redis.aclose()
+
+
+def retry_after_seconds(result: RateLimitResult) -> int:
+    """Whole seconds for a Retry-After header (at least 1)"""
+    return max(1, math.ceil(result.retry_after))
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_rate_limiter_instance: Optional[DistributedRateLimiter] = None
+
+
+def get_rate_limiter() -> DistributedRateLimiter:
+    """Get or create the shared rate limiter"""
+    global _rate_limiter_instance
+
+    if _rate_limiter_instance is None:
+        _rate_limiter_instance = DistributedRateLimiter()
+
+    return _rate_limiter_instance
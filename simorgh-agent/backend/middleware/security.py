@@ -10,11 +10,19 @@ from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
-import asyncio
+from typing import Dict, Optional
 import logging
 
+from jose import JWTError, jwt
+
+from services.auth_utils import SECRET_KEY, ALGORITHM
+from middleware.rate_limiter import (
+    DistributedRateLimiter,
+    RateLimitResult,
+    get_rate_limiter,
+    retry_after_seconds,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +34,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     - Auth endpoints: 10 requests per minute
     - General API: 100 requests per minute
     - File uploads: 20 requests per minute
+
+    Authenticated requests are limited per user (with optional per-user
+    limits per endpoint type), anonymous ones per client IP. Buckets live in
+    Redis so the limits hold across workers; see middleware/rate_limiter.py.
     """
 
     def __init__(
@@ -34,17 +46,18 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         auth_limit: int = 10,
         api_limit: int = 100,
         upload_limit: int = 20,
-        window_seconds: int = 60
+        window_seconds: int = 60,
+        user_limits: Optional[Dict[str, int]] = None,
+        limiter: Optional[DistributedRateLimiter] = None
     ):
         super().__init__(app)
         self.auth_limit = auth_limit
         self.api_limit = api_limit
         self.upload_limit = upload_limit
         self.window_seconds = window_seconds
+        self.user_limits = user_limits or {}
 
-        # Track requests: {ip: {endpoint_type: [(timestamp, count)]}}
-        self.requests: Dict[str, Dict[str, list]] = defaultdict(lambda: defaultdict(list))
-        self._lock = asyncio.Lock()
+        self.limiter = limiter or get_rate_limiter()
 
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP from request, handling proxies."""
@@ -58,6 +71,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         return request.client.host if request.client else "unknown"
 
+    def _get_username(self, request: Request) -> Optional[str]:
+        """Username of a valid bearer token, None for anonymous requests."""
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            return None
+        try:
+            payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return None
+        return payload.get("sub")
+
     def _get_endpoint_type(self, path: str) -> str:
         """Categorize endpoint for rate limiting."""
         if "/auth" in path:
@@ -66,8 +90,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return "upload"
         return "api"
 
-    def _get_limit(self, endpoint_type: str) -> int:
+    def _get_limit(self, endpoint_type: str, username: Optional[str] = None) -> int:
         """Get rate limit for endpoint type."""
+        if username and endpoint_type in self.user_limits:
+            return self.user_limits[endpoint_type]
+
         limits = {
             "auth": self.auth_limit,
             "upload": self.upload_limit,
@@ -75,61 +102,47 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         }
         return limits.get(endpoint_type, self.api_limit)
 
-    async def _check_rate_limit(self, client_ip: str, endpoint_type: str) -> Tuple[bool, int]:
-        """
-        Check if request is within rate limit.
-        Returns (allowed, remaining_requests).
-        """
-        async with self._lock:
-            current_time = time.time()
-            window_start = current_time - self.window_seconds
+    async def _check_rate_limit(self, request: Request, endpoint_type: str) -> RateLimitResult:
+        """Take one request from the caller's quota for an endpoint type."""
+        username = self._get_username(request)
+        client = f"user:{username}" if username else f"ip:{self._get_client_ip(request)}"
 
-            # Clean old requests
-            self.requests[client_ip][endpoint_type] = [
-                ts for ts in self.requests[client_ip][endpoint_type]
-                if ts > window_start
-            ]
-
-            # Check limit
-            limit = self._get_limit(endpoint_type)
-            request_count = len(self.requests[client_ip][endpoint_type])
-
-            if request_count >= limit:
-                return False, 0
-
-            # Record request
-            self.requests[client_ip][endpoint_type].append(current_time)
-            return True, limit - request_count - 1
+        return await self.limiter.hit(
+            f"{endpoint_type}:{client}",
+            self._get_limit(endpoint_type, username),
+            self.window_seconds
+        )
 
     async def dispatch(self, request: Request, call_next):
         # Skip rate limiting for health checks
         if request.url.path in ["/health", "/", "/docs", "/openapi.json"]:
             return await call_next(request)
 
-        client_ip = self._get_client_ip(request)
         endpoint_type = self._get_endpoint_type(request.url.path)
+        result = await self._check_rate_limit(request, endpoint_type)
 
-        allowed, remaining = await self._check_rate_limit(client_ip, endpoint_type)
-
-        if not allowed:
-            logger.warning(f"Rate limit exceeded for {client_ip} on {endpoint_type} endpoints")
+        if not result.allowed:
+            retry_after = retry_after_seconds(result)
+            logger.warning(
+                f"Rate limit exceeded for {self._get_client_ip(request)} on {endpoint_type} endpoints"
+            )
             return Response(
                 content='{"detail": "Too many requests. Please try again later."}',
                 status_code=429,
                 media_type="application/json",
                 headers={
-                    "Retry-After": str(self.window_seconds),
-                    "X-RateLimit-Limit": str(self._get_limit(endpoint_type)),
+                    "Retry-After": str(retry_after),
+                    "X-RateLimit-Limit": str(result.limit),
                     "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(time.time() + self.window_seconds))
+                    "X-RateLimit-Reset": str(int(time.time() + retry_after))
                 }
             )
 
         response = await call_next(request)
 
         # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(self._get_limit(endpoint_type))
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        response.headers["X-RateLimit-Limit"] = str(result.limit)
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
 
         return response
 
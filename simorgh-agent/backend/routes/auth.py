@@ -92,7 +92,7 @@ async def login(
     ```
     """
     # Authenticate user
-    user = tpms_auth.authenticate_user(request.username, request.password)
+    user = await tpms_auth.aauthenticate_user(request.username, request.password)
 
     if not user:
         raise HTTPException(
@@ -140,7 +140,7 @@ async def get_current_user(
     if not username:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    user = tpms_auth.get_user_by_username(username)
+    user = await tpms_auth.aget_user_by_username(username)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -206,7 +206,7 @@ async def check_project_permission(
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
     # Check permission
-    has_access = tpms_auth.check_project_permission(username, request.project_id)
+    has_access = await tpms_auth.acheck_project_permission(username, request.project_id)
 
     return PermissionCheckResponse(
         has_access=has_access,
@@ -244,7 +244,7 @@ async def get_my_projects(
     if not username:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    projects = tpms_auth.get_user_projects(username)
+    projects = await tpms_auth.aget_user_projects(username)
 
     return {
         "username": username,
@@ -293,7 +293,7 @@ async def search_oenum(
 
     try:
         # If query is empty, fetch all OENUMs; otherwise search with filter
-        results = tpms_auth.search_oenum_autocomplete(query.strip() if query else "", limit=0)
+        results = await tpms_auth.asearch_oenum_autocomplete(query.strip() if query else "", limit=0)
 
         logger.info(f"✅ User {username} searched OENUMs: query='{query}', found={len(results)}")
 
@@ -345,7 +345,7 @@ async def validate_project_permission(
         id_project_main = request.id_project_main
 
         # Check user permission in draft_permission table
-        has_access, error_code, error_message = tpms_auth.validate_project_access(
+        has_access, error_code, error_message = await tpms_auth.avalidate_project_access(
             username=username,
             project_id=id_project_main
         )
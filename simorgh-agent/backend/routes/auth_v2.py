@@ -729,7 +729,7 @@ async def legacy_login(
     Legacy login endpoint for TPMS username/password authentication.
     Use this for existing users who haven't migrated to the new system.
     """
-    user = tpms_auth.authenticate_user(request.username, request.password)
+    user = await tpms_auth.aauthenticate_user(request.username, request.password)
 
     if not user:
         raise HTTPException(status_code=401, detail="Invalid username or password")
@@ -281,7 +281,7 @@ async def process_and_index_document(
                         )
 
                         if guide_result.get("success"):
-                            extracted_count = guide_result.get('extracted_count', 0)
+                            extracted_count = guide_result.get('successful_extractions', 0)
                             logger.info(f"✅ Extracted {extracted_count} spec values using guides")
                     except Exception as e:
                         logger.warning(f"⚠️ Guide execution failed: {e}")
@@ -501,7 +501,7 @@ Be conversational and maintain context from past discussions."""
 
         # ✅ STEP 4: Generate response with cancellation support
         logger.info(f"🤖 Generating response with {len(results)} docs + {len(relevant_conversations)} past convs")
-        result = llm_service.generate(
+        result = await llm_service.agenerate(
             messages=llm_messages,
             mode=chat_request.llm_mode,
             temperature=0.7,
@@ -717,7 +717,7 @@ Be conversational and maintain context from past project discussions."""
 
         # ✅ STEP 4: Generate response with cancellation support
         logger.info(f"🤖 Generating project response with graph context + {len(relevant_conversations)} past convs")
-        llm_result = llm_service.generate(
+        llm_result = await llm_service.agenerate(
             messages=llm_messages,
             mode=chat_request.llm_mode,
             temperature=0.7,
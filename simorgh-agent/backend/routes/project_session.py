@@ -154,7 +154,7 @@ async def select_project(
         # Start sync (can run in background for large projects)
         if request.force_sync or not db_status.get("all_ready"):
             # Run sync synchronously for now (can be made async)
-            sync_result = await sync_service.sync_project(oenum)
+            sync_result = await sync_service.sync_project(oenum, full=request.force_sync)
             sync_status = sync_result.get("status", "unknown")
             missing_count = len(sync_result.get("missing_data", []))
         else:
@@ -190,16 +190,18 @@ async def select_project(
 @router.post("/sync/{oenum}")
 async def sync_project(
     oenum: str,
+    full: bool = False,
     current_user: str = Depends(get_current_user),
     sync_service: ProjectSyncService = Depends(get_sync_service),
 ):
     """
-    Manually trigger a full sync for a project.
+    Manually trigger a sync for a project.
 
-    Use this to refresh project data from TPMS.
+    Use this to refresh project data from TPMS. Only changed entities are
+    written unless full=true is passed.
     """
     try:
-        result = await sync_service.sync_project(oenum)
+        result = await sync_service.sync_project(oenum, full=full)
         return result
     except Exception as e:
         logger.error(f"Sync failed for {oenum}: {e}", exc_info=True)
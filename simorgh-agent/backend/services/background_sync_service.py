@@ -6,7 +6,7 @@ Real-time synchronization service for TPMS data.
 Features:
 - Periodic background sync for active projects
 - Webhook endpoint support for TPMS notifications
-- Delta sync (only changed data)
+- Delta sync (only changed data, periodic full resync)
 - Project-level sync tracking
 
 Author: Simorgh Industrial Assistant
@@ -41,6 +41,7 @@ class BackgroundSyncService:
         redis_service: RedisService = None,
         sync_interval_seconds: int = 300,  # 5 minutes default
         max_concurrent_syncs: int = 3,
+        full_sync_interval_seconds: int = 86400,  # daily full resync
     ):
         """
         Initialize background sync service.
@@ -50,15 +51,20 @@ class BackgroundSyncService:
             redis_service: RedisService for tracking and caching
             sync_interval_seconds: Interval between sync checks
             max_concurrent_syncs: Max concurrent sync operations
+            full_sync_interval_seconds: Interval between forced full resyncs;
+                syncs in between only apply changed entities
         """
         self.sync_service = sync_service
         self.redis = redis_service
         self.sync_interval = sync_interval_seconds
         self.max_concurrent = max_concurrent_syncs
+        self.full_sync_interval = full_sync_interval_seconds
 
         # Tracking
         self._active_projects: Set[str] = set()
         self._last_sync: Dict[str, datetime] = {}
+        self._last_full_sync: Dict[str, datetime] = {}
+        self._last_delta: Dict[str, Dict[str, Any]] = {}
         self._running = False
         self._task: Optional[asyncio.Task] = None
 
@@ -67,7 +73,8 @@ class BackgroundSyncService:
 
         logger.info(
             f"BackgroundSyncService initialized "
-            f"(interval: {sync_interval_seconds}s, max_concurrent: {max_concurrent_syncs})"
+            f"(interval: {sync_interval_seconds}s, full resync: {full_sync_interval_seconds}s, "
+            f"max_concurrent: {max_concurrent_syncs})"
         )
 
     def set_neo4j_service(self, neo4j_service):
@@ -153,16 +160,46 @@ class BackgroundSyncService:
 
         return None
 
-    def _update_last_sync(self, oenum: str, sync_time: datetime = None):
-        """Update last sync time for a project."""
+    def get_last_full_sync_time(self, oenum: str) -> Optional[datetime]:
+        """Get last full sync time for a project."""
+        if oenum in self._last_full_sync:
+            return self._last_full_sync[oenum]
+
+        if self.redis:
+            try:
+                data = self.redis.get(f"sync:last_sync:{oenum}", db="project")
+                if data and data.get("full_synced_at"):
+                    return datetime.fromisoformat(data["full_synced_at"])
+            except Exception:
+                pass
+
+        return None
+
+    def _needs_full_sync(self, oenum: str) -> bool:
+        """Whether the periodic full resync of a project is due."""
+        last_full = self.get_last_full_sync_time(oenum)
+        return not last_full or (datetime.utcnow() - last_full) > timedelta(seconds=self.full_sync_interval)
+
+    def _update_last_sync(self, oenum: str, sync_time: datetime = None, result: Dict[str, Any] = None):
+        """Update last sync time (and full sync time / delta size) for a project."""
         sync_time = sync_time or datetime.utcnow()
         self._last_sync[oenum] = sync_time
 
+        delta = (result or {}).get("delta")
+        if delta:
+            self._last_delta[oenum] = delta
+            if delta.get("mode") == "full":
+                self._last_full_sync[oenum] = sync_time
+
         if self.redis:
             try:
+                last_full = self._last_full_sync.get(oenum)
                 self.redis.set(
                     f"sync:last_sync:{oenum}",
-                    {"synced_at": sync_time.isoformat()},
+                    {
+                        "synced_at": sync_time.isoformat(),
+                        "full_synced_at": last_full.isoformat() if last_full else None,
+                    },
                     ttl=86400 * 7,  # 7 days
                     db="project"
                 )
@@ -251,12 +288,16 @@ class BackgroundSyncService:
             # Get or create sync service
             sync_service = self.sync_service or get_project_sync_service()
 
-            # Run sync
-            result = await sync_service.sync_project(oenum)
+            # Run sync (incremental, with a periodic full resync as a safety net)
+            result = await sync_service.sync_project(oenum, full=self._needs_full_sync(oenum))
 
             if result["status"] == "success":
-                self._update_last_sync(oenum)
-                logger.info(f"✅ Background sync completed: {oenum}")
+                self._update_last_sync(oenum, result=result)
+                delta = result.get("delta", {})
+                logger.info(
+                    f"✅ Background sync completed: {oenum} "
+                    f"({delta.get('mode', 'full')}, delta: {delta.get('size', '?')} entities)"
+                )
             else:
                 logger.warning(f"⚠️ Background sync issues: {oenum} - {result.get('errors', [])}")
 
@@ -327,7 +368,7 @@ class BackgroundSyncService:
     # MANUAL SYNC TRIGGER
     # ==========================================================================
 
-    async def trigger_sync(self, oenum: str) -> Dict[str, Any]:
+    async def trigger_sync(self, oenum: str, full: bool = False) -> Dict[str, Any]:
         """
         Manually trigger sync for a project.
 
@@ -335,6 +376,7 @@ class BackgroundSyncService:
 
         Args:
             oenum: Project OENUM
+            full: Rewrite every entity instead of applying only the delta
 
         Returns:
             Sync result
@@ -348,10 +390,10 @@ class BackgroundSyncService:
             self.sync_service.set_neo4j_service(self._neo4j)
 
         sync_service = self.sync_service or get_project_sync_service()
-        result = await sync_service.sync_project(oenum)
+        result = await sync_service.sync_project(oenum, full=full)
 
         if result["status"] == "success":
-            self._update_last_sync(oenum)
+            self._update_last_sync(oenum, result=result)
 
         return result
 
@@ -364,12 +406,17 @@ class BackgroundSyncService:
         return {
             "running": self._running,
             "sync_interval_seconds": self.sync_interval,
+            "full_sync_interval_seconds": self.full_sync_interval,
             "max_concurrent_syncs": self.max_concurrent,
             "active_projects": len(self._active_projects),
             "projects": list(self._active_projects),
             "last_syncs": {
                 k: v.isoformat() for k, v in self._last_sync.items()
-            }
+            },
+            "last_full_syncs": {
+                k: v.isoformat() for k, v in self._last_full_sync.items()
+            },
+            "last_deltas": self._last_delta,
         }
 
 
@@ -398,10 +445,12 @@ def get_background_sync_service(
     if _background_sync is None:
         interval = sync_interval or int(os.getenv("TPMS_SYNC_INTERVAL", "300"))
         max_concurrent = int(os.getenv("TPMS_SYNC_MAX_CONCURRENT", "3"))
+        full_interval = int(os.getenv("TPMS_FULL_SYNC_INTERVAL", "86400"))
 
         _background_sync = BackgroundSyncService(
             sync_interval_seconds=interval,
             max_concurrent_syncs=max_concurrent,
+            full_sync_interval_seconds=full_interval,
         )
 
     # Update services if provided
@@ -7,8 +7,9 @@ Maintains context while reducing token usage.
 Author: Simorgh Industrial Assistant
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 import json
 
@@ -74,6 +75,11 @@ Generate the updated summary now:"""
         """
         self.llm = llm_service
         self.redis = redis_service
+
+        # Background summary tasks, one per chat at a time
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._summarizing: Set[str] = set()
+
         logger.info("ConversationSummarizer initialized")
 
     def set_services(self, llm_service=None, redis_service=None):
@@ -129,6 +135,79 @@ Generate the updated summary now:"""
         except Exception:
             return 0
 
+    def load_summary(self, chat_id: str) -> Tuple[Optional[str], int]:
+        """
+        Read the stored summary and its summarized message count (blocking).
+
+        Args:
+            chat_id: Chat identifier
+
+        Returns:
+            (summary or None, summarized message count)
+        """
+        if not self.redis:
+            return None, 0
+
+        try:
+            summary_data = self.redis.get(f"chat:{chat_id}:summary", db="chat")
+        except Exception as e:
+            logger.error(f"Failed to retrieve summary: {e}")
+            return None, 0
+
+        if not summary_data:
+            return None, 0
+        if isinstance(summary_data, dict):
+            return summary_data.get("summary", ""), summary_data.get("message_count", 0)
+        return str(summary_data), 0
+
+    def summary_due(
+        self,
+        message_count: int,
+        current_summary: Optional[str],
+        summarized_count: int,
+        force: bool = False
+    ) -> bool:
+        """Whether a conversation of message_count messages should be (re)summarized"""
+        if not message_count:
+            return False
+        return (
+            force or
+            message_count - summarized_count >= self.SUMMARY_THRESHOLD or
+            (message_count > 20 and not current_summary)
+        )
+
+    def schedule_summary(self, chat_id: str, messages: List[Dict[str, Any]]) -> bool:
+        """
+        Summarize a conversation in the background.
+
+        Summary generation is an LLM call, so it stays out of latency-bounded
+        context retrieval: the current turn uses the stored summary and the
+        next turn picks up the updated one. At most one summary task runs per
+        chat.
+
+        Args:
+            chat_id: Chat identifier
+            messages: All messages in the conversation
+
+        Returns:
+            True if a task was started
+        """
+        if chat_id in self._summarizing:
+            return False
+
+        self._summarizing.add(chat_id)
+        task = asyncio.ensure_future(self.maybe_summarize(chat_id, messages))
+        self._background_tasks.add(task)
+
+        def done(finished: asyncio.Task):
+            self._background_tasks.discard(finished)
+            self._summarizing.discard(chat_id)
+            if not finished.cancelled() and finished.exception():
+                logger.warning(f"Background summarization failed for chat {chat_id}: {finished.exception()}")
+
+        task.add_done_callback(done)
+        return True
+
     async def maybe_summarize(
         self,
         chat_id: str,
@@ -155,20 +234,12 @@ Generate the updated summary now:"""
             return None
 
         # Get current summary state
-        current_summary = await self.get_summary(chat_id)
-        summarized_count = await self.get_summarized_message_count(chat_id)
+        current_summary, summarized_count = await asyncio.to_thread(self.load_summary, chat_id)
 
         # Calculate unsummarized messages
         unsummarized_count = len(messages) - summarized_count
 
-        # Check if we should summarize
-        should_summarize = (
-            force or
-            unsummarized_count >= self.SUMMARY_THRESHOLD or
-            (len(messages) > 20 and not current_summary)
-        )
-
-        if not should_summarize:
+        if not self.summary_due(len(messages), current_summary, summarized_count, force):
             logger.debug(f"Skipping summarization: {unsummarized_count} unsummarized messages (threshold: {self.SUMMARY_THRESHOLD})")
             return current_summary
 
@@ -228,8 +299,8 @@ Generate the updated summary now:"""
                 new_messages=formatted_messages
             )
 
-            # Generate summary using LLM
-            result = self.llm.generate(
+            # Generate summary using LLM, without blocking the event loop
+            result = await self.llm.agenerate(
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that creates concise conversation summaries."},
                     {"role": "user", "content": prompt}
@@ -334,7 +405,8 @@ Generate the updated summary now:"""
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            self.redis.set(
+            await asyncio.to_thread(
+                self.redis.set,
                 f"chat:{chat_id}:summary",
                 summary_data,
                 db="chat",
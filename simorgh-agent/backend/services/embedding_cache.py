@@ -0,0 +1,292 @@
+"""
+Embedding Cache Service
+=======================
+Content-addressed, two-tier cache for embedding vectors.
+
+Tiers:
+- L1: in-process LRU, evicted by total byte size
+- L2: Redis (DB 5), vectors stored as compact float32/float16 binary blobs
+
+Keys are (model, SHA-256 of normalized text), so identical text embedded by
+the same model is only sent to the embedding backend once - across document
+re-uploads, repeated queries and all embedding call sites.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import os
+import re
+import struct
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# struct format characters for the supported blob encodings
+_DTYPE_FORMATS = {
+    "float32": "f",
+    "float16": "e",
+}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing (unicode form, whitespace runs, outer whitespace)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def encode_vector(vector: List[float], dtype: str = "float32") -> bytes:
+    """Pack an embedding into a little-endian binary blob"""
+    return struct.pack(f"<{len(vector)}{_DTYPE_FORMATS[dtype]}", *vector)
+
+
+def decode_vector(blob: bytes, dtype: str = "float32") -> List[float]:
+    """Unpack a binary blob produced by encode_vector"""
+    fmt = _DTYPE_FORMATS[dtype]
+    count = len(blob) // struct.calcsize(fmt)
+    return list(struct.unpack(f"<{count}{fmt}", blob))
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache
+
+    Features:
+    - Content-addressed keys: (model, normalized-text hash)
+    - In-process LRU bounded by bytes, not entry count
+    - Optional Redis tier with TTL, shared across workers
+    - Batch lookups (single MGET) for bulk indexing
+    - Hit-rate statistics per tier
+    """
+
+    def __init__(
+        self,
+        redis_service=None,
+        max_memory_bytes: Optional[int] = None,
+        dtype: Optional[str] = None,
+        ttl: Optional[int] = None
+    ):
+        """
+        Initialize embedding cache
+
+        Args:
+            redis_service: Optional RedisService for the shared L2 tier
+            max_memory_bytes: L1 size limit (default: EMBEDDING_CACHE_MAX_MB or 64 MB)
+            dtype: Blob encoding, "float32" or "float16" (default: EMBEDDING_CACHE_DTYPE or float32)
+            ttl: L2 TTL in seconds (default: EMBEDDING_CACHE_TTL or 7 days)
+        """
+        self.redis_service = redis_service
+        self.max_memory_bytes = max_memory_bytes or int(
+            float(os.getenv("EMBEDDING_CACHE_MAX_MB", "64")) * 1024 * 1024
+        )
+        self.dtype = dtype or os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+        if self.dtype not in _DTYPE_FORMATS:
+            raise ValueError(f"Unsupported embedding cache dtype: {self.dtype}")
+        self.ttl = ttl or int(os.getenv("EMBEDDING_CACHE_TTL", str(7 * 24 * 3600)))
+
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "lookups": 0,
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+        logger.info(
+            f"✅ Embedding cache initialized (L1: {self.max_memory_bytes // (1024 * 1024)} MB, "
+            f"dtype: {self.dtype}, redis: {'on' if redis_service else 'off'})"
+        )
+
+    # =========================================================================
+    # KEYS
+    # =========================================================================
+
+    def make_key(self, model: str, text: str) -> str:
+        """Build the cache key for text embedded by model"""
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"emb:{model}:{self.dtype}:{digest}"
+
+    # =========================================================================
+    # LOOKUP / STORE
+    # =========================================================================
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Look up a single embedding"""
+        return self.get_many(model, [text])[0]
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for many texts
+
+        Returns:
+            One entry per text: the cached vector, or None on a miss
+        """
+        keys = [self.make_key(model, text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        redis_lookups: List[int] = []
+
+        with self._lock:
+            self.stats["lookups"] += len(keys)
+            for i, key in enumerate(keys):
+                blob = self._lru.get(key)
+                if blob is not None:
+                    self._lru.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    results[i] = decode_vector(blob, self.dtype)
+                else:
+                    redis_lookups.append(i)
+
+        if redis_lookups and self.redis_service:
+            blobs = self.redis_service.get_cached_embeddings([keys[i] for i in redis_lookups])
+            for i, blob in zip(redis_lookups, blobs):
+                if blob is not None:
+                    results[i] = decode_vector(blob, self.dtype)
+                    self._remember(keys[i], blob)
+                    with self._lock:
+                        self.stats["redis_hits"] += 1
+
+        with self._lock:
+            self.stats["misses"] += sum(1 for r in results if r is None)
+
+        return results
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        """Store a single embedding"""
+        self.put_many(model, [text], [vector])
+
+    def put_many(self, model: str, texts: List[str], vectors: List[List[float]]) -> None:
+        """Store embeddings for many texts in both tiers"""
+        entries: Dict[str, bytes] = {}
+        for text, vector in zip(texts, vectors):
+            key = self.make_key(model, text)
+            blob = encode_vector(vector, self.dtype)
+            entries[key] = blob
+            self._remember(key, blob)
+
+        if entries and self.redis_service:
+            self.redis_service.cache_embeddings(entries, ttl=self.ttl)
+
+    def get_or_compute(
+        self,
+        model: str,
+        text: str,
+        compute: Callable[[str], List[float]]
+    ) -> List[float]:
+        """Return the cached embedding for text, computing and storing it on a miss"""
+        cached = self.get(model, text)
+        if cached is not None:
+            return cached
+
+        vector = compute(text)
+        self.put(model, text, vector)
+        return vector
+
+    def get_or_compute_many(
+        self,
+        model: str,
+        texts: List[str],
+        compute_many: Callable[[List[str]], List[List[float]]]
+    ) -> List[List[float]]:
+        """
+        Return embeddings for texts, computing only the misses in one call
+
+        Duplicate texts within the batch are computed once.
+        """
+        results = self.get_many(model, texts)
+
+        missing: Dict[str, List[int]] = {}
+        for i, vector in enumerate(results):
+            if vector is None:
+                missing.setdefault(normalize_text(texts[i]), []).append(i)
+
+        if missing:
+            to_compute = [texts[indices[0]] for indices in missing.values()]
+            vectors = compute_many(to_compute)
+            self.put_many(model, to_compute, vectors)
+            for indices, vector in zip(missing.values(), vectors):
+                for i in indices:
+                    results[i] = vector
+
+        return results
+
+    def clear(self) -> None:
+        """Clear the in-process tier"""
+        with self._lock:
+            self._lru.clear()
+            self._memory_bytes = 0
+
+    # =========================================================================
+    # INTERNALS
+    # =========================================================================
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        """Insert into the L1 LRU, evicting least recently used entries by size"""
+        size = len(blob)
+        if size > self.max_memory_bytes:
+            return
+
+        with self._lock:
+            previous = self._lru.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+
+            self._lru[key] = blob
+            self._memory_bytes += size
+
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._lru.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self.stats["evictions"] += 1
+
+    # =========================================================================
+    # STATISTICS
+    # =========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.stats["lookups"]
+            hits = self.stats["memory_hits"] + self.stats["redis_hits"]
+            return {
+                **self.stats,
+                "hit_rate": hits / lookups if lookups else 0,
+                "memory_hit_rate": self.stats["memory_hits"] / lookups if lookups else 0,
+                "entries": len(self._lru),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "dtype": self.dtype,
+            }
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_embedding_cache_instance: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache(redis_service=None) -> EmbeddingCache:
+    """
+    Get or create the shared embedding cache
+
+    The Redis tier is attached the first time a redis_service is supplied,
+    so call sites created before Redis is available share the same cache.
+    """
+    global _embedding_cache_instance
+
+    if _embedding_cache_instance is None:
+        _embedding_cache_instance = EmbeddingCache(redis_service=redis_service)
+    elif redis_service is not None and _embedding_cache_instance.redis_service is None:
+        _embedding_cache_instance.redis_service = redis_service
+
+    return _embedding_cache_instance
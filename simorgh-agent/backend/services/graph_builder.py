@@ -14,6 +14,12 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Relationship endpoints are matched by name on the Searchable label that every
+# node written here carries; indexed so each row seeks instead of scanning
+NAME_INDEX_NAME = "searchable_name_idx"
+
+_name_index_ensured = False
+
 
 class GraphBuilder:
     """
@@ -230,155 +236,165 @@ Analyze the document and extract all equipment, systems, specifications, and the
                 actual_filename = doc_record["filename"]
                 logger.info(f"✅ Found document in graph: {actual_filename} (id: {doc_record['id']})")
 
-                # Create equipment nodes
-                for equip in equipment_list:
-                    equip_name = equip.get("name", "")
-                    if not equip_name:
-                        continue
+                actual_doc_id = doc_record["id"] or document_id
+
+                # One UNWIND statement per node kind instead of a round trip per item
+                equipment_rows = [
+                    {
+                        "name": equip["name"],
+                        "type": equip.get("type", ""),
+                        "specs": equip.get("specifications", [])
+                    }
+                    for equip in equipment_list if equip.get("name")
+                ]
+                if equipment_rows:
                     session.run("""
                         MATCH (doc:Document {filename: $filename, project_number: $project_number})
-                        MERGE (eq:Equipment {name: $name, project_number: $project_number})
-                        SET eq.type = $type,
-                            eq.specifications = $specs
+                        UNWIND $rows AS row
+                        MERGE (eq:Equipment {name: row.name, project_number: $project_number})
+                        SET eq:Searchable,
+                            eq.type = row.type,
+                            eq.specifications = row.specs
                         MERGE (doc)-[:HAS_EQUIPMENT]->(eq)
                     """, {
                         "filename": actual_filename,
                         "project_number": project_number,
-                        "name": equip_name,
-                        "type": equip.get("type", ""),
-                        "specs": equip.get("specifications", [])
-                    })
-                    logger.debug(f"  Created equipment: {equip_name}")
+                        "rows": equipment_rows
+                    }).consume()
+                    logger.debug(f"  Created {len(equipment_rows)} equipment nodes")
 
-                # Create system nodes
-                for system in systems_list:
-                    system_name = system.get("name", "")
-                    if not system_name:
-                        continue
+                system_rows = [
+                    {
+                        "name": system["name"],
+                        "type": system.get("type", ""),
+                        "description": system.get("description", ""),
+                        "components": system.get("components", [])
+                    }
+                    for system in systems_list if system.get("name")
+                ]
+                if system_rows:
                     session.run("""
                         MATCH (doc:Document {filename: $filename, project_number: $project_number})
-                        MERGE (sys:System {name: $name, project_number: $project_number})
-                        SET sys.type = $type,
-                            sys.description = $description,
-                            sys.components = $components
+                        UNWIND $rows AS row
+                        MERGE (sys:System {name: row.name, project_number: $project_number})
+                        SET sys:Searchable,
+                            sys.type = row.type,
+                            sys.description = row.description,
+                            sys.components = row.components
                         MERGE (doc)-[:HAS_SYSTEM]->(sys)
                     """, {
                         "filename": actual_filename,
                         "project_number": project_number,
-                        "name": system_name,
-                        "type": system.get("type", ""),
-                        "description": system.get("description", ""),
-                        "components": system.get("components", [])
-                    })
-                    logger.debug(f"  Created system: {system_name}")
+                        "rows": system_rows
+                    }).consume()
+                    logger.debug(f"  Created {len(system_rows)} system nodes")
 
                 # Create specification categories and fields
-                for spec_cat in spec_categories:
-                    category_name = spec_cat.get("category", "")
-                    if not category_name:
-                        continue
-
-                    # Create category node
+                category_names = [cat["category"] for cat in spec_categories if cat.get("category")]
+                field_rows = [
+                    {
+                        "category": spec_cat["category"],
+                        "field_name": field["name"],
+                        "value": field.get("value", ""),
+                        "unit": field.get("unit", ""),
+                        "description": field.get("description", "")
+                    }
+                    for spec_cat in spec_categories if spec_cat.get("category")
+                    for field in spec_cat.get("fields", []) if field.get("name")
+                ]
+
+                if category_names:
                     session.run("""
                         MATCH (doc:Document {filename: $filename, project_number: $project_number})
-                        MERGE (cat:SpecCategory {name: $category, project_number: $project_number})
+                        UNWIND $categories AS category
+                        MERGE (cat:SpecCategory {name: category, project_number: $project_number})
+                        SET cat:Searchable
                         MERGE (doc)-[:HAS_SPEC_CATEGORY]->(cat)
                     """, {
                         "filename": actual_filename,
                         "project_number": project_number,
-                        "category": category_name
-                    })
-                    logger.debug(f"  Created spec category: {category_name}")
-
-                    # Create field nodes
-                    for field in spec_cat.get("fields", []):
-                        field_name = field.get("name", "")
-                        if not field_name:
-                            continue
-                        value = field.get("value", "")
-                        unit = field.get("unit", "")
-                        description = field.get("description", "")
-
-                        session.run("""
-                            MATCH (doc:Document {id: $doc_id, project_number: $project_number})
-                            MATCH (cat:SpecCategory {name: $category, project_number: $project_number})
-
-                            // Create field with document_id for uniqueness
-                            MERGE (field:SpecField {
-                                name: $field_name,
-                                category_name: $category,
-                                document_id: $doc_id,
-                                project_number: $project_number
-                            })
-                            SET field.description = $description,
-                                field.updated_at = datetime()
-                            MERGE (cat)-[:HAS_FIELD]->(field)
-
-                            // Try to link to project-level ExtractionGuide if exists
-                            OPTIONAL MATCH (guide:ExtractionGuide {
-                                field_name: $field_name,
-                                category_name: $category,
-                                project_number: $project_number
-                            })
-                            WHERE guide.document_id IS NULL
-                            FOREACH (_ IN CASE WHEN guide IS NOT NULL THEN [1] ELSE [] END |
-                                MERGE (field)-[:REFERENCES_GUIDE]->(guide)
-                                MERGE (doc)-[:USES_GUIDE]->(guide)
-                                MERGE (guide)-[:USED_IN_DOCUMENT]->(doc)
-                            )
-
-                            // Create value node if value exists (with document_id in unique key)
-                            FOREACH (v IN CASE WHEN $value <> '' THEN [1] ELSE [] END |
-                                MERGE (value:ActualValue {
-                                    field_name: $field_name,
-                                    category_name: $category,
-                                    document_id: $doc_id,
-                                    project_number: $project_number
-                                })
-                                SET value.extracted_value = $value,
-                                    value.unit = $unit,
-                                    value.extraction_method = 'llm_entity_extraction',
-                                    value.updated_at = datetime()
-                                MERGE (field)-[:HAS_VALUE]->(value)
-                            )
+                        "categories": category_names
+                    }).consume()
+                    logger.debug(f"  Created {len(category_names)} spec categories")
 
-                            // Link value to guide if both exist
-                            WITH field, guide, $value as val
-                            WHERE guide IS NOT NULL AND val <> ''
-                            MATCH (field)-[:HAS_VALUE]->(value:ActualValue {
-                                field_name: $field_name,
-                                category_name: $category,
+                if field_rows:
+                    session.run("""
+                        MATCH (doc:Document {id: $doc_id, project_number: $project_number})
+                        UNWIND $rows AS row
+                        MATCH (cat:SpecCategory {name: row.category, project_number: $project_number})
+
+                        // Create field with document_id for uniqueness
+                        MERGE (field:SpecField {
+                            name: row.field_name,
+                            category_name: row.category,
+                            document_id: $doc_id,
+                            project_number: $project_number
+                        })
+                        SET field:Searchable,
+                            field.description = row.description,
+                            field.updated_at = datetime()
+                        MERGE (cat)-[:HAS_FIELD]->(field)
+
+                        // Try to link to project-level ExtractionGuide if exists
+                        WITH doc, row, field
+                        OPTIONAL MATCH (guide:ExtractionGuide {
+                            field_name: row.field_name,
+                            category_name: row.category,
+                            project_number: $project_number
+                        })
+                        WHERE guide.document_id IS NULL
+                        FOREACH (_ IN CASE WHEN guide IS NOT NULL THEN [1] ELSE [] END |
+                            MERGE (field)-[:REFERENCES_GUIDE]->(guide)
+                            MERGE (doc)-[:USES_GUIDE]->(guide)
+                            MERGE (guide)-[:USED_IN_DOCUMENT]->(doc)
+                        )
+
+                        // Create value node if value exists (with document_id in unique key)
+                        FOREACH (v IN CASE WHEN row.value <> '' THEN [1] ELSE [] END |
+                            MERGE (value:ActualValue {
+                                field_name: row.field_name,
+                                category_name: row.category,
                                 document_id: $doc_id,
                                 project_number: $project_number
                             })
-                            MERGE (value)-[:EXTRACTED_BY_GUIDE]->(guide)
-                        """, {
-                            "category": category_name,
-                            "field_name": field_name,
-                            "value": value,
-                            "unit": unit,
-                            "description": description,
-                            "doc_id": actual_doc_id,
-                            "project_number": project_number
-                        })
-                        logger.debug(f"    Created field: {field_name} = {value}")
+                            SET value.extracted_value = row.value,
+                                value.unit = row.unit,
+                                value.extraction_method = 'llm_entity_extraction',
+                                value.updated_at = datetime()
+                            MERGE (field)-[:HAS_VALUE]->(value)
+                            FOREACH (g IN CASE WHEN guide IS NOT NULL THEN [guide] ELSE [] END |
+                                MERGE (value)-[:EXTRACTED_BY_GUIDE]->(g)
+                            )
+                        )
+                    """, {
+                        "rows": field_rows,
+                        "doc_id": actual_doc_id,
+                        "project_number": project_number
+                    }).consume()
+                    logger.debug(f"  Created {len(field_rows)} spec fields")
 
-                # Create relationships
+                # Create relationships, one statement per relationship type
+                # (flexible - works for any node types)
+                relationship_groups: Dict[str, List[Dict[str, str]]] = {}
                 for rel in relationships:
-                    from_entity = rel.get("from", "")
-                    to_entity = rel.get("to", "")
-                    rel_type = rel.get("type", "RELATED_TO")
+                    relationship_groups.setdefault(rel.get("type", "RELATED_TO"), []).append({
+                        "from_name": rel.get("from", ""),
+                        "to_name": rel.get("to", "")
+                    })
 
-                    # Create relationship (flexible - works for any node types)
+                # Endpoints are looked up by name on the indexed Searchable label
+                if relationship_groups:
+                    self._ensure_name_index(session)
+                for rel_type, rows in relationship_groups.items():
                     session.run(f"""
-                        MATCH (from {{name: $from_name, project_number: $project_number}})
-                        MATCH (to {{name: $to_name, project_number: $project_number}})
-                        MERGE (from)-[:{rel_type}]->(to)
+                        UNWIND $rows AS row
+                        MATCH (from:Searchable {{name: row.from_name, project_number: $project_number}})
+                        MATCH (to:Searchable {{name: row.to_name, project_number: $project_number}})
+                        MERGE (from)-[:`{rel_type.replace('`', '')}`]->(to)
                     """, {
-                        "from_name": from_entity,
-                        "to_name": to_entity,
+                        "rows": rows,
                         "project_number": project_number
-                    })
+                    }).consume()
 
             logger.info(f"✅ Graph structure built successfully for document {actual_doc_id}: "
                         f"{len(equipment_list)} equipment, {len(systems_list)} systems, "
@@ -389,6 +405,21 @@ Analyze the document and extract all equipment, systems, specifications, and the
             logger.error(f"❌ Failed to build graph structure: {e}", exc_info=True)
             return False
 
+    def _ensure_name_index(self, session) -> None:
+        """Create the Searchable (name, project_number) lookup index (once per process)"""
+        global _name_index_ensured
+        if _name_index_ensured:
+            return
+
+        try:
+            session.run(
+                f"CREATE INDEX {NAME_INDEX_NAME} IF NOT EXISTS "
+                "FOR (n:Searchable) ON (n.name, n.project_number)"
+            ).consume()
+            _name_index_ensured = True
+        except Exception as e:
+            logger.warning(f"⚠️ Could not create index {NAME_INDEX_NAME}: {e}")
+
     def build_graph_for_document(
         self,
         project_number: str,
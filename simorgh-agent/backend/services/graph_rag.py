@@ -245,12 +245,12 @@ Return JSON format:
             collect(DISTINCT {
                 id: item.id,
                 name: item.name,
-                type: labels(item)[0],
+                type: [l IN labels(item) WHERE l <> 'Searchable'][0],
                 properties: properties(item)
             }) as items,
             collect(DISTINCT {
                 name: entity.name,
-                type: labels(entity)[0],
+                type: [l IN labels(entity) WHERE l <> 'Searchable'][0],
                 properties: properties(entity)
             }) as entities
         LIMIT 100
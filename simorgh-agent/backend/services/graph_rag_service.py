@@ -7,13 +7,35 @@ for answering user queries using structured specification data.
 Author: Simorgh Industrial Assistant
 """
 
+import os
+import time
 import logging
+import threading
 from typing import Dict, Any, List, Optional
 from neo4j import Driver
 import re
 
 logger = logging.getLogger(__name__)
 
+# Fulltext index over node name/type/description used for start-node lookup.
+# Graph writers add SEARCHABLE_LABEL to every named project node, so the index
+# is defined once over that label and never rebuilt when new labels appear.
+FULLTEXT_INDEX_NAME = "searchable_node_text"
+FULLTEXT_PROPERTIES = ["name", "type", "description", "project_number"]
+SEARCHABLE_LABEL = "Searchable"
+
+# Per-label index created by earlier versions; dropped by the startup migration
+LEGACY_FULLTEXT_INDEX_NAME = "graph_node_text"
+
+# How long to wait before re-checking a missing index (seconds)
+FULLTEXT_RETRY_INTERVAL = int(os.getenv("GRAPH_FULLTEXT_RETRY_INTERVAL", "300"))
+
+_LUCENE_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+# Index state is per process; GraphRAGService is created per request
+_fulltext_state = {"checked_at": 0.0, "ready": False}
+_fulltext_lock = threading.Lock()
+
 
 class GraphRAGService:
     """
@@ -570,27 +592,8 @@ class GraphRAGService:
             keywords = self._extract_keywords(query)
             logger.info(f"📝 Extracted keywords: {keywords}")
 
-            # Find matching nodes
-            with self.driver.session() as session:
-                # Search for nodes matching keywords
-                keyword_pattern = '|'.join([f'(?i){kw}' for kw in keywords])
-
-                node_search_query = """
-                MATCH (n {project_number: $project_number})
-                WHERE n.name =~ $keyword_pattern
-                   OR (n.type IS NOT NULL AND n.type =~ $keyword_pattern)
-                   OR (n.description IS NOT NULL AND n.description =~ $keyword_pattern)
-                RETURN DISTINCT n.name as name
-                LIMIT 10
-                """
-
-                result = session.run(
-                    node_search_query,
-                    project_number=project_number,
-                    keyword_pattern=keyword_pattern
-                )
-
-                start_nodes = [record["name"] for record in result if record["name"]]
+            # Find matching nodes (ranked fulltext lookup, regex scan as fallback)
+            start_nodes = self.find_start_nodes(project_number, keywords, limit=10)
 
             if not start_nodes:
                 logger.warning(f"⚠️ No matching nodes found for keywords: {keywords}")
@@ -621,6 +624,170 @@ class GraphRAGService:
                 "relationships": []
             }
 
+    # =========================================================================
+    # START-NODE LOOKUP
+    # =========================================================================
+
+    def ensure_fulltext_index(self, migrate: bool = False) -> bool:
+        """
+        Make sure the node fulltext index exists
+
+        The index covers the single SEARCHABLE_LABEL, so creating it is
+        idempotent and it is never dropped at runtime. With migrate=True
+        (service startup) existing named project nodes are labelled and the
+        legacy per-label index is removed.
+
+        Returns:
+            True if the index exists
+        """
+        now = time.time()
+        if not migrate:
+            if _fulltext_state["ready"]:
+                return True
+            if now - _fulltext_state["checked_at"] < FULLTEXT_RETRY_INTERVAL:
+                return False
+
+        with _fulltext_lock:
+            if _fulltext_state["ready"] and not migrate:
+                return True
+
+            _fulltext_state["checked_at"] = now
+            try:
+                with self.driver.session() as session:
+                    properties = ", ".join(f"n.{prop}" for prop in FULLTEXT_PROPERTIES)
+                    session.run(
+                        f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX_NAME} IF NOT EXISTS "
+                        f"FOR (n:{SEARCHABLE_LABEL}) ON EACH [{properties}]"
+                    ).consume()
+
+                    if migrate:
+                        summary = session.run(
+                            f"""
+                            MATCH (n)
+                            WHERE n.project_number IS NOT NULL AND n.name IS NOT NULL
+                              AND NOT n:{SEARCHABLE_LABEL}
+                            CALL {{ WITH n SET n:{SEARCHABLE_LABEL} }} IN TRANSACTIONS OF 10000 ROWS
+                            """
+                        ).consume()
+                        labelled = summary.counters.labels_added
+                        if labelled:
+                            logger.info(f"🏷️ Labelled {labelled} existing nodes as {SEARCHABLE_LABEL}")
+                        session.run(f"DROP INDEX {LEGACY_FULLTEXT_INDEX_NAME} IF EXISTS").consume()
+
+                _fulltext_state["ready"] = True
+                logger.info(f"✅ Fulltext index '{FULLTEXT_INDEX_NAME}' ready on :{SEARCHABLE_LABEL}")
+                return True
+
+            except Exception as e:
+                _fulltext_state["ready"] = False
+                logger.warning(f"⚠️ Fulltext index unavailable, using regex node lookup: {e}")
+                return False
+
+    def find_start_nodes(
+        self,
+        project_number: str,
+        keywords: List[str],
+        limit: int = 10
+    ) -> List[str]:
+        """
+        Find graph nodes matching query keywords, best matches first
+
+        Uses the fulltext index (ranked, no full scan); falls back to the
+        regex scan if the index is missing or still populating.
+
+        Args:
+            project_number: Project OE number
+            keywords: Keywords from _extract_keywords
+            limit: Maximum number of start nodes
+
+        Returns:
+            Node names
+        """
+        if not keywords:
+            return []
+
+        if self.ensure_fulltext_index():
+            try:
+                return self._find_start_nodes_fulltext(project_number, keywords, limit)
+            except Exception as e:
+                logger.warning(f"⚠️ Fulltext node lookup failed, using regex scan: {e}")
+
+        return self._find_start_nodes_regex(project_number, keywords, limit)
+
+    def _find_start_nodes_fulltext(
+        self,
+        project_number: str,
+        keywords: List[str],
+        limit: int
+    ) -> List[str]:
+        """Ranked start-node lookup through the fulltext index"""
+        lucene_query = self._build_lucene_query(project_number, keywords)
+
+        with self.driver.session() as session:
+            result = session.run(
+                """
+                CALL db.index.fulltext.queryNodes($index_name, $lucene_query) YIELD node, score
+                WHERE node.project_number = $project_number AND node.name IS NOT NULL
+                RETURN DISTINCT node.name AS name, score
+                ORDER BY score DESC
+                LIMIT $limit
+                """,
+                index_name=FULLTEXT_INDEX_NAME,
+                lucene_query=lucene_query,
+                project_number=project_number,
+                limit=limit
+            )
+            return [record["name"] for record in result]
+
+    def _find_start_nodes_regex(
+        self,
+        project_number: str,
+        keywords: List[str],
+        limit: int
+    ) -> List[str]:
+        """Unindexed regex scan over all project nodes (fallback)"""
+        keyword_pattern = '|'.join([f'(?i){kw}' for kw in keywords])
+
+        with self.driver.session() as session:
+            result = session.run(
+                """
+                MATCH (n {project_number: $project_number})
+                WHERE n.name =~ $keyword_pattern
+                   OR (n.type IS NOT NULL AND n.type =~ $keyword_pattern)
+                   OR (n.description IS NOT NULL AND n.description =~ $keyword_pattern)
+                RETURN DISTINCT n.name as name
+                LIMIT $limit
+                """,
+                project_number=project_number,
+                keyword_pattern=keyword_pattern,
+                limit=limit
+            )
+            return [record["name"] for record in result if record["name"]]
+
+    def _build_lucene_query(self, project_number: str, keywords: List[str]) -> str:
+        """
+        Translate extracted keywords into a Lucene query
+
+        Regex-style expansions such as 'rated.*voltage' become sloppy phrases;
+        plain keywords also match as prefixes ('breaker' -> 'breakers').
+        The project clause narrows candidates inside the index; exact project
+        equality is still checked in Cypher.
+        """
+        clauses = []
+        for keyword in keywords:
+            terms = [_LUCENE_SPECIAL_RE.sub(r'\\\1', term) for term in keyword.split('.*') if term]
+            if not terms:
+                continue
+            if len(terms) > 1:
+                clauses.append(f'"{" ".join(terms)}"~3')
+            else:
+                clauses.append(f'{terms[0]} OR {terms[0]}*')
+
+        project_phrase = _LUCENE_SPECIAL_RE.sub(r'\\\1', project_number)
+        keyword_query = " OR ".join(f"({clause})" for clause in clauses)
+        fields = " OR ".join(f"{field}:({keyword_query})" for field in ("name", "type", "description"))
+        return f'+project_number:"{project_phrase}" +({fields})'
+
     def format_subgraph_for_context(
         self,
         subgraph: Dict[str, Any]
@@ -647,7 +814,7 @@ class GraphRAGService:
         # Group nodes by type
         nodes_by_type = {}
         for node in nodes:
-            labels = node.get("labels", [])
+            labels = [label for label in node.get("labels", []) if label != SEARCHABLE_LABEL]
             node_type = labels[0] if labels else "Unknown"
 
             if node_type not in nodes_by_type:
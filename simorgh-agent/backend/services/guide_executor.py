@@ -10,11 +10,22 @@ Each guide node acts like a "mini query":
 3. Use LLM to extract specific parameter
 4. Store extracted value in entity node
 
+execute_all_guides() plans the whole set instead of running the guides one
+by one: all guide queries are embedded in one batched request, guides whose
+top match is the same section are grouped, and every field of a group is
+extracted with a single structured LLM call. Groups run concurrently under
+GUIDE_EXECUTOR_CONCURRENCY, so a full spec extraction costs one embedding
+request plus one LLM call per distinct section instead of two round trips
+per guide.
+
 Author: Simorgh Industrial Assistant
 """
 
+import os
+import time
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
 import json
 import re
 
@@ -44,6 +55,12 @@ class GuideExecutor:
         self.qdrant_service = qdrant_service
         self.neo4j_driver = neo4j_driver
 
+        self.max_concurrent = int(os.getenv("GUIDE_EXECUTOR_CONCURRENCY", "4"))
+        # Upper bound on fields per structured call, keeps prompts and answers small
+        self.fields_per_call = int(os.getenv("GUIDE_FIELDS_PER_CALL", "12"))
+
+        self.last_run_stats: Dict[str, Any] = {}
+
     def get_extraction_guides(
         self,
         project_number: str,
@@ -141,8 +158,9 @@ class GuideExecutor:
         Returns:
             Extraction result dictionary
         """
+        field_name = guide.get("field_name", "")
+
         try:
-            field_name = guide.get("field_name", "")
             instruction = guide.get("instruction", "")
             definition = guide.get("definition", "")
             common_values = guide.get("common_values", "")
@@ -150,12 +168,10 @@ class GuideExecutor:
             logger.info(f"🔍 Executing guide for field: {field_name}")
 
             # STEP 1: Semantic search using guide instruction
-            search_results = self.qdrant_service.search_section_summaries(
+            search_results = self._search_sections(
+                query=self._guide_query(guide),
                 project_number=project_number,
-                query=instruction,
-                limit=3,
-                document_id=document_id,
-                score_threshold=0.3
+                document_id=document_id
             )
 
             if not search_results:
@@ -163,6 +179,7 @@ class GuideExecutor:
                 return {
                     "success": False,
                     "field_name": field_name,
+                    "category": guide.get("category", ""),
                     "extracted_value": None,
                     "error": "No relevant sections found"
                 }
@@ -189,6 +206,7 @@ class GuideExecutor:
             return {
                 "success": True,
                 "field_name": field_name,
+                "category": guide.get("category", ""),
                 "extracted_value": extraction_result.get("value"),
                 "confidence": extraction_result.get("confidence", "medium"),
                 "source_section": section_title,
@@ -200,6 +218,7 @@ class GuideExecutor:
             return {
                 "success": False,
                 "field_name": field_name,
+                "category": guide.get("category", ""),
                 "extracted_value": None,
                 "error": str(e)
             }
@@ -270,20 +289,7 @@ Extract the value for: **{field_name}**
                 use_cache=True
             )
 
-            response_text = result["response"]
-
-            # Parse JSON response
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                else:
-                    raise ValueError("No JSON found in LLM response")
-
-            extraction = json.loads(json_str)
+            extraction = self._parse_json_response(result["response"])
 
             value = extraction.get("value", "NOT_FOUND")
             if value == "NOT_FOUND":
@@ -305,21 +311,296 @@ Extract the value for: **{field_name}**
                 "explanation": f"Extraction failed: {str(e)}"
             }
 
+    # =========================================================================
+    # SEARCH AND PARSING HELPERS
+    # =========================================================================
+
+    @staticmethod
+    def _guide_query(guide: Dict[str, Any]) -> str:
+        """Search query of a guide (its instruction, else name and definition)"""
+        instruction = (guide.get("instruction") or "").strip()
+        if instruction:
+            return instruction
+        return f"{guide.get('field_name', '')}: {guide.get('definition', '')}".strip()
+
+    def _search_sections(
+        self,
+        query: str,
+        project_number: str,
+        document_id: str,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search the project's section summaries of one document"""
+        return self.qdrant_service.search_section_summaries(
+            user_id="system",  # System-level for project documents
+            query=query,
+            limit=3,
+            document_id=document_id,
+            score_threshold=0.3,
+            project_oenum=project_number,
+            query_embedding=query_embedding
+        )
+
+    @staticmethod
+    def _parse_json_response(response_text: str) -> Dict[str, Any]:
+        """
+        Extract the JSON object from an LLM response
+
+        Raises:
+            ValueError: If the response contains no JSON object
+        """
+        json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', response_text, re.DOTALL)
+        if json_match:
+            json_str = json_match.group(1)
+        else:
+            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            if json_match:
+                json_str = json_match.group(0)
+            else:
+                raise ValueError("No JSON found in LLM response")
+
+        return json.loads(json_str)
+
+    # =========================================================================
+    # SECTION-GROUPED EXECUTION
+    # =========================================================================
+
+    def plan_guides(
+        self,
+        guides: List[Dict[str, Any]],
+        project_number: str,
+        document_id: str
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Group guides by the section that answers them
+
+        All guide queries are embedded in one batched request and searched
+        in one Qdrant batch search; each guide is then assigned to its
+        top-matching section.
+
+        Args:
+            guides: Extraction guides
+            project_number: Project OE number
+            document_id: Document unique identifier
+
+        Returns:
+            (groups, unmatched) - groups are dictionaries with the matched
+            "section" and the "guide_indices" it answers; unmatched holds the
+            indices of guides without a relevant section
+        """
+        queries = [self._guide_query(guide) for guide in guides]
+
+        try:
+            embeddings = self.qdrant_service.generate_embeddings(queries)
+            all_results = self.qdrant_service.search_section_summaries_batch(
+                user_id="system",  # System-level for project documents
+                query_embeddings=embeddings,
+                limit=3,
+                document_id=document_id,
+                score_threshold=0.3,
+                project_oenum=project_number
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding guide queries failed: {e}")
+            all_results = None
+
+        if all_results is None:
+            # Per-guide searches embed their own query
+            logger.warning("⚠️ Batch search of guide queries failed, searching per guide")
+            all_results = [
+                self._search_sections(query, project_number, document_id)
+                for query in queries
+            ]
+
+        groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        unmatched: List[int] = []
+
+        for idx, search_results in enumerate(all_results):
+            if not search_results:
+                unmatched.append(idx)
+                continue
+
+            section = search_results[0]
+            key = (
+                section.get("document_id") or document_id,
+                section.get("section_id") or section.get("section_title", "")
+            )
+            group = groups.setdefault(key, {"section": section, "guide_indices": []})
+            group["guide_indices"].append(idx)
+
+        return list(groups.values()), unmatched
+
+    def _extract_fields_with_llm(
+        self,
+        guides: List[Dict[str, Any]],
+        section_content: str,
+        section_title: str,
+        llm_mode: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract several fields from one section in a single structured LLM call
+
+        Args:
+            guides: Guides whose fields are answered by this section
+            section_content: Full section text
+            section_title: Section title
+            llm_mode: Optional LLM mode
+
+        Returns:
+            Extraction results (value, confidence, explanation) in guide order
+
+        Raises:
+            ValueError: If the response is not the expected JSON structure
+        """
+        field_specs = []
+        for number, guide in enumerate(guides, start=1):
+            spec = f"""[{number}] **{guide.get('field_name', '')}**
+    Definition: {guide.get('definition', '')}
+    Common Values: {guide.get('common_values', '')}"""
+            if guide.get("instruction"):
+                spec += f"\n    Instruction: {guide['instruction']}"
+            field_specs.append(spec)
+
+        system_prompt = """You are an expert electrical specification extractor.
+
+Your task is to extract several parameters from one document section.
+
+For every numbered field, extract the exact value from the provided section.
+If a value is not explicitly stated, use "NOT_FOUND".
+
+Provide your response in this JSON format, with one entry per field number:
+{
+    "fields": {
+        "1": {"value": "extracted value here or NOT_FOUND", "confidence": "high|medium|low", "explanation": "brief explanation"},
+        "2": {...}
+    }
+}"""
+
+        user_prompt = f"""**Section:** {section_title}
+
+**Content:**
+{section_content}
+
+---
+
+Extract the values for these fields:
+
+""" + "\n\n".join(field_specs)
+
+        result = self.llm_service.generate(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            mode=llm_mode,
+            temperature=0.1,  # Very low temperature for precise extraction
+            use_cache=True
+        )
+
+        extraction = self._parse_json_response(result["response"])
+        fields = extraction.get("fields", extraction)
+        if not isinstance(fields, dict):
+            raise ValueError("LLM response has no 'fields' object")
+
+        results = []
+        for number, guide in enumerate(guides, start=1):
+            entry = fields.get(str(number)) or fields.get(guide.get("field_name", "")) or {}
+            if not isinstance(entry, dict):
+                entry = {"value": entry}
+
+            value = entry.get("value", "NOT_FOUND")
+            if value in ("NOT_FOUND", "", None):
+                value = None
+
+            results.append({
+                "value": value,
+                "confidence": entry.get("confidence", "medium"),
+                "explanation": entry.get("explanation", "")
+            })
+
+        return results
+
+    def _execute_section_group(
+        self,
+        guides: List[Dict[str, Any]],
+        section: Dict[str, Any],
+        llm_mode: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Extract every field of a section group
+
+        Fields are sent in chunks of fields_per_call. If a structured call
+        cannot be parsed, its fields are extracted one by one instead.
+
+        Returns:
+            (results in guide order, number of LLM calls made)
+        """
+        section_content = section.get("full_content", "")
+        section_title = section.get("section_title", "")
+        relevance_score = section.get("score", 0.0)
+
+        results: List[Dict[str, Any]] = []
+        llm_calls = 0
+
+        for chunk_start in range(0, len(guides), max(1, self.fields_per_call)):
+            chunk = guides[chunk_start:chunk_start + max(1, self.fields_per_call)]
+
+            try:
+                llm_calls += 1
+                extractions = self._extract_fields_with_llm(chunk, section_content, section_title, llm_mode)
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ Structured extraction failed for section '{section_title}', "
+                    f"falling back to {len(chunk)} single-field calls: {e}"
+                )
+                extractions = []
+                for guide in chunk:
+                    llm_calls += 1
+                    extractions.append(self._extract_parameter_with_llm(
+                        field_name=guide.get("field_name", ""),
+                        definition=guide.get("definition", ""),
+                        instruction=guide.get("instruction", ""),
+                        common_values=guide.get("common_values", ""),
+                        section_content=section_content,
+                        section_title=section_title,
+                        llm_mode=llm_mode
+                    ))
+
+            for guide, extraction in zip(chunk, extractions):
+                results.append({
+                    "success": True,
+                    "field_name": guide.get("field_name", ""),
+                    "category": guide.get("category", ""),
+                    "extracted_value": extraction.get("value"),
+                    "confidence": extraction.get("confidence", "medium"),
+                    "source_section": section_title,
+                    "relevance_score": relevance_score
+                })
+
+        return results, llm_calls
+
     def execute_all_guides(
         self,
         project_number: str,
         document_id: str,
         category: Optional[str] = None,
-        llm_mode: Optional[str] = None
+        llm_mode: Optional[str] = None,
+        max_concurrent: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Execute all extraction guides for a document
 
+        Guides are planned (batched embedding, grouped by top-matching
+        section) and each section group is extracted with one structured
+        LLM call; groups run concurrently. Results keep the guide order.
+        Call counts of the run are kept in last_run_stats.
+
         Args:
             project_number: Project OE number
             document_id: Document unique identifier
             category: Optional filter by category
             llm_mode: Optional LLM mode
+            max_concurrent: Maximum concurrent section groups (default: GUIDE_EXECUTOR_CONCURRENCY or 4)
 
         Returns:
             Execution results with extracted values
@@ -339,27 +620,90 @@ Extract the value for: **{field_name}**
                 "error": "No extraction guides available"
             }
 
-        # Execute each guide
-        results = []
-        for guide in guides:
-            result = self.execute_guide(
-                guide=guide,
-                project_number=project_number,
-                document_id=document_id,
-                llm_mode=llm_mode
-            )
-            results.append(result)
+        max_concurrent = max(1, max_concurrent or self.max_concurrent)
+        start_time = time.perf_counter()
+
+        # Plan: one embedding request, guides grouped by section
+        groups, unmatched = self.plan_guides(guides, project_number, document_id)
+
+        logger.info(
+            f"🗂️ Planned {len(guides)} guides into {len(groups)} section groups "
+            f"({len(unmatched)} without a relevant section, {max_concurrent} concurrent)"
+        )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(guides)
+
+        for idx in unmatched:
+            logger.warning(f"⚠️ No relevant sections found for guide: {guides[idx].get('field_name', '')}")
+            results[idx] = {
+                "success": False,
+                "field_name": guides[idx].get("field_name", ""),
+                "category": guides[idx].get("category", ""),
+                "extracted_value": None,
+                "error": "No relevant sections found"
+            }
+
+        # Extract: one structured call per section group, groups in parallel
+        llm_calls = 0
+        with ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="guide-executor") as executor:
+            futures = {
+                executor.submit(
+                    self._execute_section_group,
+                    [guides[idx] for idx in group["guide_indices"]],
+                    group["section"],
+                    llm_mode
+                ): group
+                for group in groups
+            }
+
+            for future in as_completed(futures):
+                group = futures[future]
+                section_title = group["section"].get("section_title", "")
+
+                try:
+                    group_results, group_calls = future.result()
+                    llm_calls += group_calls
+                except Exception as e:
+                    logger.error(f"❌ Guide execution failed for section '{section_title}': {e}")
+                    group_results = [
+                        {
+                            "success": False,
+                            "field_name": guides[idx].get("field_name", ""),
+                            "category": guides[idx].get("category", ""),
+                            "extracted_value": None,
+                            "error": str(e)
+                        }
+                        for idx in group["guide_indices"]
+                    ]
+
+                for idx, result in zip(group["guide_indices"], group_results):
+                    results[idx] = result
+
+                logger.info(f"📄 Extracted {len(group_results)} fields from section '{section_title}'")
 
         # Count successes
         successful_extractions = sum(1 for r in results if r.get("success") and r.get("extracted_value"))
+        elapsed = time.perf_counter() - start_time
+
+        self.last_run_stats = {
+            "guides": len(guides),
+            "section_groups": len(groups),
+            "unmatched": len(unmatched),
+            "llm_calls": llm_calls,
+            "seconds": round(elapsed, 2),
+        }
 
-        logger.info(f"✅ Guide execution complete: {successful_extractions}/{len(results)} values extracted")
+        logger.info(
+            f"✅ Guide execution complete: {successful_extractions}/{len(results)} values extracted "
+            f"with {llm_calls} LLM calls in {elapsed:.1f}s"
+        )
 
         return {
             "success": True,
             "total_guides": len(guides),
             "successful_extractions": successful_extractions,
-            "results": results
+            "results": results,
+            "stats": self.last_run_stats
         }
 
     def store_extracted_values(
@@ -7,9 +7,10 @@ Features:
 - Online mode: OpenAI API (gpt-4o, etc.)
 - Offline mode: Local LLM servers (192.168.1.61, 192.168.1.62)
 - Automatic fallback on failure
-- Response caching via Redis
+- Response caching via Redis, plus an optional semantic (near-duplicate) cache
 - Token usage tracking
 - Streaming support
+- Async API (agenerate/astream/aembed) on a pooled keep-alive HTTP client
 
 Author: Simorgh Industrial Assistant
 """
@@ -18,13 +19,19 @@ import os
 import logging
 import hashlib
 import json
+import re
 import asyncio
-from typing import List, Dict, Any, Optional, Iterator, Union
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator, Union
 from enum import Enum
+import httpx
 import openai
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout
 
+from services.embedding_cache import get_embedding_cache
+from services.semantic_cache import get_semantic_cache
+
 # Import output parser for extracting clean responses
 try:
     from utils.output_parser import OutputParser, parse_llm_output, parse_streaming_chunk
@@ -70,6 +77,136 @@ class LLMMode(str, Enum):
     AUTO = "auto"  # Try online first, fallback to offline
 
 
+# =============================================================================
+# LOCAL LLM STREAM PARSING
+# =============================================================================
+
+_THINK_OPEN_PATTERN = re.compile(r'<think(?:ing)?>', re.IGNORECASE)
+_THINK_CLOSE_PATTERN = re.compile(r'</think(?:ing)?>', re.IGNORECASE)
+
+
+def _parse_sse_line(line: Union[bytes, str]) -> Optional[Dict[str, Any]]:
+    """Decode one SSE line from the local LLM ("data: {...}"), None if not JSON"""
+    if isinstance(line, bytes):
+        line = line.decode('utf-8')
+    if line.startswith('data: '):
+        line = line[6:]
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+class _LocalLLMResponseAccumulator:
+    """
+    Aggregates a local LLM /generate-stream response into one answer
+
+    Shared by the sync (requests) and async (httpx) transports.
+    """
+
+    def __init__(self):
+        self.full_response = ""
+        self.line_count = 0
+        self.chunk_count = 0
+        self.is_completed = False  # Track if stream completed normally
+
+    def feed(self, line: Union[bytes, str]) -> None:
+        if not line:
+            return
+
+        self.line_count += 1
+        data = _parse_sse_line(line)
+        if data is None:
+            logger.warning(f"⚠️ JSON decode error on line {self.line_count}, Raw: {line[:100]}")
+            return
+
+        logger.debug(f"📦 Parsed JSON keys: {list(data.keys())}")
+
+        # Handle different response formats
+        if "chunk" in data:
+            # Incremental chunk format
+            self.chunk_count += 1
+            self.full_response += data["chunk"]
+        elif "output" in data:
+            # Complete output format (status: completed)
+            self.full_response = data["output"]
+            self.is_completed = True
+            logger.info(f"✅ Received complete output (length: {len(self.full_response)})")
+        elif "text" in data:
+            # Alternative chunk format
+            self.chunk_count += 1
+            self.full_response += data["text"]
+        else:
+            # Check for completion status
+            if data.get('status') == 'completed':
+                self.is_completed = True
+                logger.info(f"✅ Stream completed successfully")
+            logger.debug(f"ℹ️ Status update: {data.get('status', 'unknown')}")
+
+
+class _LocalLLMStreamFilter:
+    """
+    Turns local LLM stream lines into user-facing chunks, hiding thinking sections
+
+    Shared by the sync (requests) and async (httpx) transports.
+    """
+
+    def __init__(self, extract_final_answer):
+        self.extract_final_answer = extract_final_answer
+        self.in_thinking = False
+        self.thinking_depth = 0  # Track nested thinking tags
+        self.chunks_yielded = False  # Track if any chunks have been yielded
+
+    def feed(self, line: Union[bytes, str]) -> Optional[str]:
+        """Process one line, returning the chunk to emit (or None)"""
+        if not line:
+            return None
+
+        data = _parse_sse_line(line)
+        if data is None:
+            return None
+
+        # Handle different response formats
+        if "chunk" in data:
+            chunk = data["chunk"]
+        elif "output" in data:
+            # Complete output format - only yield if no chunks were sent
+            # This prevents duplication when both chunks AND output are sent
+            if not self.chunks_yielded:
+                return self.extract_final_answer(data["output"])
+            return None
+        elif "text" in data:
+            chunk = data["text"]
+        else:
+            # Skip status updates without content
+            return None
+
+        if not chunk:
+            return None
+
+        # Check for thinking tag transitions
+        self.thinking_depth += len(_THINK_OPEN_PATTERN.findall(chunk))
+        self.thinking_depth -= len(_THINK_CLOSE_PATTERN.findall(chunk))
+        self.thinking_depth = max(0, self.thinking_depth)  # Prevent negative
+
+        # If we're inside thinking section, don't yield
+        if self.thinking_depth > 0:
+            self.in_thinking = True
+            return None
+
+        # Clean any stray or remaining thinking tags from chunk
+        just_exited = self.in_thinking
+        self.in_thinking = False
+        clean_chunk = _THINK_OPEN_PATTERN.sub('', chunk)
+        clean_chunk = _THINK_CLOSE_PATTERN.sub('', clean_chunk)
+
+        # Right after a thinking section, skip whitespace-only leftovers
+        if (clean_chunk.strip() if just_exited else clean_chunk):
+            self.chunks_yielded = True
+            return clean_chunk
+        return None
+
+
 class LLMService:
     """
     Unified LLM Service
@@ -80,6 +217,10 @@ class LLMService:
     - Response caching
     - Token tracking
     - Streaming responses
+
+    Sync methods (generate, generate_stream, generate_embedding) are kept for
+    code running in worker threads and scripts; async endpoints should use
+    agenerate / astream / aembed, which never block the event loop.
     """
 
     def __init__(
@@ -119,15 +260,92 @@ class LLMService:
         # Redis for caching (optional)
         self.redis_service = redis_service
 
+        # Content-addressed embedding cache (shared with Qdrant/VectorRAG)
+        self.embedding_cache = get_embedding_cache(redis_service)
+
+        # Near-duplicate response cache, dropped per project when project data changes
+        self.semantic_cache = get_semantic_cache()
+        if redis_service:
+            redis_service.add_project_invalidation_listener(self.semantic_cache.invalidate_project)
+
+        # Pooled HTTP connections to the local LLM (keep-alive, bounded)
+        self.http_max_connections = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "50"))
+        self.http_max_keepalive = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+        self.http_keepalive_expiry = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30"))
+        self.http_connect_timeout = float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "10"))
+        self.http_read_timeout = float(os.getenv("LLM_HTTP_READ_TIMEOUT", "180"))
+
+        # Sync adapter: one requests.Session instead of a new connection per call
+        self.http_session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.http_max_connections
+        )
+        self.http_session.mount("http://", adapter)
+        self.http_session.mount("https://", adapter)
+
+        # Async client is bound to an event loop - created lazily on first use
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_openai: Optional[openai.AsyncOpenAI] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
         # Statistics
         self.stats = {
             "total_requests": 0,
             "online_requests": 0,
             "offline_requests": 0,
             "cache_hits": 0,
+            "semantic_cache_hits": 0,
             "failures": 0
         }
 
+    # =========================================================================
+    # HTTP CLIENTS
+    # =========================================================================
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Shared pooled async HTTP client for the running event loop"""
+        loop = asyncio.get_running_loop()
+
+        if self._async_client is None or self._async_client.is_closed or self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.http_max_connections,
+                    max_keepalive_connections=self.http_max_keepalive,
+                    keepalive_expiry=self.http_keepalive_expiry
+                ),
+                timeout=httpx.Timeout(self.http_read_timeout, connect=self.http_connect_timeout)
+            )
+            self._async_openai = None
+            self._async_loop = loop
+            logger.info(
+                f"✅ Async LLM HTTP pool created (max connections: {self.http_max_connections}, "
+                f"keep-alive: {self.http_max_keepalive})"
+            )
+
+        return self._async_client
+
+    def _get_async_openai(self) -> openai.AsyncOpenAI:
+        """Async OpenAI client sharing the pooled HTTP client"""
+        if not self.openai_api_key:
+            raise LLMOnlineError("OpenAI API key not configured")
+
+        http_client = self._get_async_client()
+        if self._async_openai is None:
+            self._async_openai = openai.AsyncOpenAI(
+                api_key=self.openai_api_key,
+                http_client=http_client
+            )
+        return self._async_openai
+
+    async def aclose(self):
+        """Close pooled HTTP connections"""
+        if self._async_client is not None and not self._async_client.is_closed:
+            await self._async_client.aclose()
+        self._async_client = None
+        self._async_openai = None
+        self.http_session.close()
+
     def health_check(self) -> Dict[str, Any]:
         """Check health of all LLM endpoints"""
         health = {
@@ -219,7 +437,7 @@ Please answer the current question, keeping in mind the context from our previou
     def _check_local_llm_health(self, url: str) -> Dict[str, Any]:
         """Check local LLM server health"""
         try:
-            response = requests.get(f"{url}/health", timeout=5)
+            response = self.http_session.get(f"{url}/health", timeout=5)
             if response.status_code == 200:
                 return {
                     "status": "healthy",
@@ -252,7 +470,10 @@ Please answer the current question, keeping in mind the context from our previou
         use_cache: bool = True,
         cache_ttl: int = 3600,
         inject_knowledge: bool = False,
-        cancellation_token: Optional[Any] = None
+        cancellation_token: Optional[Any] = None,
+        semantic_cache: bool = False,
+        project_number: Optional[str] = None,
+        cache_context: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate LLM response (synchronous)
@@ -269,6 +490,10 @@ Please answer the current question, keeping in mind the context from our previou
             cache_ttl: Cache lifetime in seconds
             inject_knowledge: If True, inject electrical knowledge base into system prompt
             cancellation_token: Optional (not currently used - for future async support)
+            semantic_cache: Also serve/store near-duplicate questions (requires use_cache)
+            project_number: Project the answer is grounded in (semantic cache invalidation)
+            cache_context: Retrieved context the answer depends on (default: system message);
+                leave out per-turn noise such as chat history
 
         Returns:
             {
@@ -287,48 +512,34 @@ Please answer the current question, keeping in mind the context from our previou
 
         # Inject electrical knowledge base if requested
         if inject_knowledge:
-            try:
-                from knowledge.electrical_anthology import get_knowledge_context
-                knowledge = get_knowledge_context()
-
-                # Find system message and append knowledge
-                system_message_found = False
-                for msg in messages:
-                    if msg.get("role") == "system":
-                        # Append knowledge to existing system message
-                        msg["content"] += f"\n\n## Reference Knowledge Base\n{knowledge}"
-                        system_message_found = True
-                        logger.info("✅ Injected electrical knowledge into existing system message")
-                        break
-
-                if not system_message_found:
-                    # No system message exists, add one with knowledge
-                    messages.insert(0, {
-                        "role": "system",
-                        "content": f"You are Simorgh, an expert electrical engineering assistant.\n\n## Reference Knowledge Base\n{knowledge}"
-                    })
-                    logger.info("✅ Injected electrical knowledge in new system message")
-
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to inject knowledge base: {e}")
-                # Continue without knowledge injection
+            self._inject_knowledge(messages)
 
         # Determine mode
         effective_mode = LLMMode(mode) if mode else self.default_mode
         logger.info(f"🎯 LLM Generate - Input mode: {mode}, Effective mode: {effective_mode.value}, Default mode: {self.default_mode.value}")
 
         # Check cache
-        if use_cache and self.redis_service:
-            cache_key = self._generate_cache_key(
-                messages, effective_mode, temperature, max_tokens
-            )
-            cached = self.redis_service.get_cached_llm_response(cache_key)
+        cache_key, cached = self._get_cached_response(
+            messages, effective_mode, temperature, max_tokens, use_cache
+        )
+        if cached:
+            return cached
 
-            if cached:
-                self.stats["cache_hits"] += 1
-                cached["cached"] = True
-                logger.debug("Using cached LLM response")
-                return cached
+        semantic_request = None
+        if use_cache and semantic_cache:
+            semantic_request = self._semantic_cache_request(
+                messages, effective_mode, temperature, project_number, cache_context
+            )
+            if semantic_request:
+                try:
+                    embedding = self.generate_embedding(semantic_request[1], mode=effective_mode.value)
+                    semantic_request += (embedding,)
+                    cached = self._semantic_cache_lookup(semantic_request)
+                    if cached:
+                        return cached
+                except Exception as e:
+                    logger.debug(f"Semantic cache skipped, question embedding failed: {e}")
+                    semantic_request = None
 
         # Generate response based on mode
         try:
@@ -356,20 +567,8 @@ Please answer the current question, keeping in mind the context from our previou
                 raise ValueError(f"Invalid LLM mode: {effective_mode}")
 
             result["cached"] = False
-
-            # Cache the response
-            if use_cache and self.redis_service:
-                self.redis_service.cache_llm_response(
-                    cache_key,
-                    result["response"],
-                    metadata={
-                        "mode": result["mode"],
-                        "model": result["model"],
-                        "tokens": result.get("tokens")
-                    },
-                    ttl=cache_ttl
-                )
-
+            self._store_cached_response(cache_key, result, cache_ttl)
+            self._semantic_cache_store(semantic_request, result, project_number)
             return result
 
         except Exception as e:
@@ -377,6 +576,143 @@ Please answer the current question, keeping in mind the context from our previou
             logger.error(f"LLM generation failed: {e}")
             raise
 
+    def _inject_knowledge(self, messages: List[Dict[str, str]]) -> None:
+        """Inject the electrical knowledge base into the system message (in place)"""
+        try:
+            from knowledge.electrical_anthology import get_knowledge_context
+            knowledge = get_knowledge_context()
+
+            # Find system message and append knowledge
+            system_message_found = False
+            for msg in messages:
+                if msg.get("role") == "system":
+                    # Append knowledge to existing system message
+                    msg["content"] += f"\n\n## Reference Knowledge Base\n{knowledge}"
+                    system_message_found = True
+                    logger.info("✅ Injected electrical knowledge into existing system message")
+                    break
+
+            if not system_message_found:
+                # No system message exists, add one with knowledge
+                messages.insert(0, {
+                    "role": "system",
+                    "content": f"You are Simorgh, an expert electrical engineering assistant.\n\n## Reference Knowledge Base\n{knowledge}"
+                })
+                logger.info("✅ Injected electrical knowledge in new system message")
+
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to inject knowledge base: {e}")
+            # Continue without knowledge injection
+
+    def _get_cached_response(
+        self,
+        messages: List[Dict[str, str]],
+        effective_mode: LLMMode,
+        temperature: float,
+        max_tokens: Optional[int],
+        use_cache: bool
+    ) -> tuple:
+        """
+        Look up a cached response
+
+        Returns:
+            Tuple of (cache_key or None, cached result or None)
+        """
+        if not (use_cache and self.redis_service):
+            return None, None
+
+        cache_key = self._generate_cache_key(
+            messages, effective_mode, temperature, max_tokens
+        )
+        cached = self.redis_service.get_cached_llm_response(cache_key)
+
+        if cached:
+            self.stats["cache_hits"] += 1
+            cached["cached"] = True
+            logger.debug("Using cached LLM response")
+
+        return cache_key, cached
+
+    def _store_cached_response(
+        self,
+        cache_key: Optional[str],
+        result: Dict[str, Any],
+        cache_ttl: int
+    ) -> None:
+        """Cache a generated response (no-op when caching is off for the request)"""
+        if cache_key is None:
+            return
+
+        self.redis_service.cache_llm_response(
+            cache_key,
+            result["response"],
+            metadata={
+                "mode": result["mode"],
+                "model": result["model"],
+                "tokens": result.get("tokens")
+            },
+            ttl=cache_ttl
+        )
+
+    def _semantic_cache_request(
+        self,
+        messages: List[Dict[str, str]],
+        effective_mode: LLMMode,
+        temperature: float,
+        project_number: Optional[str],
+        cache_context: Optional[str]
+    ) -> Optional[tuple]:
+        """
+        Build the semantic cache request for a generation
+
+        Project answers are scoped by the project's graph version in Redis,
+        so a sync run by any worker makes every worker miss.
+
+        Returns:
+            Tuple of (scope, normalized question), or None if the cache doesn't apply
+        """
+        if not self.semantic_cache.enabled:
+            return None
+
+        project_version = None
+        if project_number and self.redis_service:
+            project_version = self.redis_service.get_project_graph_version(project_number)
+            if project_version is None:
+                # Redis unavailable: can't tell whether another worker synced the project
+                return None
+
+        scope, question = self.semantic_cache.make_scope(
+            messages,
+            project_number=project_number,
+            context=cache_context,
+            project_version=project_version,
+            mode=effective_mode.value,
+            model=self.openai_model if effective_mode != LLMMode.OFFLINE else "local",
+            temperature=temperature
+        )
+        return (scope, question) if question else None
+
+    def _semantic_cache_lookup(self, semantic_request: tuple) -> Optional[Dict[str, Any]]:
+        """Look up a near-duplicate answer for (scope, question, embedding)"""
+        scope, _, embedding = semantic_request
+        cached = self.semantic_cache.lookup(scope, embedding)
+        if cached:
+            self.stats["cache_hits"] += 1
+            self.stats["semantic_cache_hits"] += 1
+        return cached
+
+    def _semantic_cache_store(
+        self,
+        semantic_request: Optional[tuple],
+        result: Dict[str, Any],
+        project_number: Optional[str]
+    ) -> None:
+        """Store a generated answer under (scope, question, embedding)"""
+        if not semantic_request:
+            return
+        scope, question, embedding = semantic_request
+        self.semantic_cache.store(scope, question, embedding, result, project_number=project_number)
+
     def _generate_online(
         self,
         messages: List[Dict[str, str]],
@@ -494,26 +830,13 @@ Please answer the current question, keeping in mind the context from our previou
         max_tokens: Optional[int]
     ) -> Dict[str, Any]:
         """Call a local LLM server endpoint (non-streaming - consumes stream internally)"""
-
-        # Format messages for local LLM API (includes conversation history)
-        system_prompt, user_prompt = self._format_messages_for_local_llm(messages)
-
-        payload = {
-            "system_prompt": system_prompt,
-            "user_prompt": user_prompt,
-            "thinking_level": "medium",
-            "stream": True  # Must be True for /generate-stream endpoint
-        }
-
-        full_url = f"{url.rstrip('/')}/generate-stream"
-        logger.info(f"🔧 _call_local_llm - Full URL: {full_url}")
-        logger.info(f"🔧 Payload: system_prompt length={len(system_prompt)}, user_prompt length={len(user_prompt)}, history_included={'Previous Conversation' in user_prompt}")
+        full_url, payload = self._local_llm_request(url, messages)
 
         try:
-            response = requests.post(
+            response = self.http_session.post(
                 full_url,
                 json=payload,
-                timeout=180,
+                timeout=(self.http_connect_timeout, self.http_read_timeout),
                 headers={"Content-Type": "application/json"},
                 stream=True  # Enable streaming
             )
@@ -521,77 +844,69 @@ Please answer the current question, keeping in mind the context from our previou
             response.raise_for_status()
 
             # Consume the entire stream and aggregate chunks (SSE format)
-            full_response = ""
-            line_count = 0
-            chunk_count = 0
-            is_completed = False  # Track if stream completed normally
-
+            accumulator = _LocalLLMResponseAccumulator()
             for line in response.iter_lines():
-                if line:
-                    line_count += 1
-                    try:
-                        decoded_line = line.decode('utf-8')
-
-                        # Handle SSE format: strip "data: " prefix
-                        if decoded_line.startswith('data: '):
-                            decoded_line = decoded_line[6:]  # Remove "data: " prefix
-
-                        logger.debug(f"📥 Stream line {line_count}: {decoded_line[:100]}...")
-
-                        data = json.loads(decoded_line)
-                        logger.debug(f"📦 Parsed JSON keys: {list(data.keys())}")
-
-                        # Handle different response formats
-                        if "chunk" in data:
-                            # Incremental chunk format
-                            chunk_count += 1
-                            full_response += data["chunk"]
-                        elif "output" in data:
-                            # Complete output format (status: completed)
-                            full_response = data["output"]
-                            is_completed = True
-                            logger.info(f"✅ Received complete output (length: {len(full_response)})")
-                        elif "text" in data:
-                            # Alternative chunk format
-                            chunk_count += 1
-                            full_response += data["text"]
-                        else:
-                            # Check for completion status
-                            if data.get('status') == 'completed':
-                                is_completed = True
-                                logger.info(f"✅ Stream completed successfully")
-                            logger.debug(f"ℹ️ Status update: {data.get('status', 'unknown')}")
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"⚠️ JSON decode error on line {line_count}: {e}, Raw: {line[:100]}")
-                        continue
-
-            logger.info(f"✅ Local LLM response received - Lines: {line_count}, Chunks: {chunk_count}, Response length: {len(full_response)}, Completed: {is_completed}")
-
-            # Extract only the final answer (strip reasoning/analysis)
-            clean_response = self._extract_final_answer(full_response)
-            logger.info(f"🎯 Extracted final answer - Original: {len(full_response)} chars, Clean: {len(clean_response)} chars")
+                accumulator.feed(line)
 
-            # Determine finish reason based on completion status
-            finish_reason = "stop" if is_completed else "length"
-
-            return {
-                "response": clean_response,
-                "mode": "offline",
-                "model": "local-llm",
-                "finish_reason": finish_reason,
-                "tokens": {
-                    "prompt": 0,
-                    "completion": 0,
-                    "total": 0
-                },
-                "server": url
-            }
+            return self._finish_local_llm_response(url, accumulator)
 
         except Timeout:
             raise LLMTimeoutError(f"Local LLM server timed out: {url}")
         except RequestException as e:
             raise Exception(f"Local LLM request failed: {url} - {str(e)}")
 
+    def _local_llm_request(
+        self,
+        url: str,
+        messages: List[Dict[str, str]]
+    ) -> tuple:
+        """Build the /generate-stream URL and payload for the local LLM API"""
+
+        # Format messages for local LLM API (includes conversation history)
+        system_prompt, user_prompt = self._format_messages_for_local_llm(messages)
+
+        payload = {
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "thinking_level": "medium",
+            "stream": True  # Must be True for /generate-stream endpoint
+        }
+
+        full_url = f"{url.rstrip('/')}/generate-stream"
+        logger.info(f"🔧 Local LLM request - Full URL: {full_url}")
+        logger.info(f"🔧 Payload: system_prompt length={len(system_prompt)}, user_prompt length={len(user_prompt)}, history_included={'Previous Conversation' in user_prompt}")
+
+        return full_url, payload
+
+    def _finish_local_llm_response(
+        self,
+        url: str,
+        accumulator: _LocalLLMResponseAccumulator
+    ) -> Dict[str, Any]:
+        """Build the generate() result from a fully consumed local LLM stream"""
+        full_response = accumulator.full_response
+        logger.info(f"✅ Local LLM response received - Lines: {accumulator.line_count}, Chunks: {accumulator.chunk_count}, Response length: {len(full_response)}, Completed: {accumulator.is_completed}")
+
+        # Extract only the final answer (strip reasoning/analysis)
+        clean_response = self._extract_final_answer(full_response)
+        logger.info(f"🎯 Extracted final answer - Original: {len(full_response)} chars, Clean: {len(clean_response)} chars")
+
+        # Determine finish reason based on completion status
+        finish_reason = "stop" if accumulator.is_completed else "length"
+
+        return {
+            "response": clean_response,
+            "mode": "offline",
+            "model": "local-llm",
+            "finish_reason": finish_reason,
+            "tokens": {
+                "prompt": 0,
+                "completion": 0,
+                "total": 0
+            },
+            "server": url
+        }
+
     def _extract_final_answer(self, raw_response: str) -> str:
         """
         Extract only the final user-facing answer from local LLM response.
@@ -750,16 +1065,7 @@ Please answer the current question, keeping in mind the context from our previou
         while continuation_count < max_continuations:
             continuation_count += 1
 
-            # Create continuation prompt
-            continuation_messages = original_messages.copy()
-            continuation_messages.append({
-                "role": "assistant",
-                "content": full_response
-            })
-            continuation_messages.append({
-                "role": "user",
-                "content": "Please continue from where you left off. Complete your previous response."
-            })
+            continuation_messages = self._continuation_messages(original_messages, full_response)
 
             logger.info(f"🔄 Continuation attempt {continuation_count}/{max_continuations}")
 
@@ -799,6 +1105,23 @@ Please answer the current question, keeping in mind the context from our previou
 
         return full_response
 
+    def _continuation_messages(
+        self,
+        original_messages: List[Dict[str, str]],
+        partial_response: str
+    ) -> List[Dict[str, str]]:
+        """Create continuation prompt for a truncated response"""
+        continuation_messages = original_messages.copy()
+        continuation_messages.append({
+            "role": "assistant",
+            "content": partial_response
+        })
+        continuation_messages.append({
+            "role": "user",
+            "content": "Please continue from where you left off. Complete your previous response."
+        })
+        return continuation_messages
+
     # =========================================================================
     # STREAMING SUPPORT
     # =========================================================================
@@ -864,109 +1187,23 @@ Please answer the current question, keeping in mind the context from our previou
     ) -> Iterator[str]:
         """Stream from local LLM via nginx load balancer with thinking section filtering"""
 
-        # Format messages for local LLM API (includes conversation history)
-        system_prompt, user_prompt = self._format_messages_for_local_llm(messages)
-
         # Call load-balanced endpoint (nginx handles failover between .61/.62)
         try:
-            url = f"{self.local_llm_url.rstrip('/')}/generate-stream"
-
-            payload = {
-                "system_prompt": system_prompt,
-                "user_prompt": user_prompt,
-                "thinking_level": "medium",
-                "stream": True
-            }
+            url, payload = self._local_llm_request(self.local_llm_url, messages)
 
-            logger.info(f"🔧 _stream_offline - history_included={'Previous Conversation' in user_prompt}, user_prompt_length={len(user_prompt)}")
-
-            response = requests.post(
+            response = self.http_session.post(
                 url,
                 json=payload,
                 stream=True,
-                timeout=180
+                timeout=(self.http_connect_timeout, self.http_read_timeout)
             )
             response.raise_for_status()
 
-            # State for tracking thinking sections during streaming
-            accumulated_text = ""
-            in_thinking = False
-            thinking_depth = 0  # Track nested thinking tags
-            chunks_yielded = False  # Track if any chunks have been yielded
-
-            # Patterns for detecting thinking sections
-            import re
-            think_open_pattern = re.compile(r'<think(?:ing)?>', re.IGNORECASE)
-            think_close_pattern = re.compile(r'</think(?:ing)?>', re.IGNORECASE)
-
+            stream_filter = _LocalLLMStreamFilter(self._extract_final_answer)
             for line in response.iter_lines():
-                if line:
-                    try:
-                        decoded_line = line.decode('utf-8')
-
-                        # Handle SSE format: strip "data: " prefix
-                        if decoded_line.startswith('data: '):
-                            decoded_line = decoded_line[6:]
-
-                        data = json.loads(decoded_line)
-                        chunk = ""
-
-                        # Handle different response formats
-                        if "chunk" in data:
-                            chunk = data["chunk"]
-                        elif "output" in data:
-                            # Complete output format - only yield if no chunks were sent
-                            # This prevents duplication when both chunks AND output are sent
-                            if not chunks_yielded:
-                                raw_output = data["output"]
-                                clean_output = self._extract_final_answer(raw_output)
-                                yield clean_output
-                            continue
-                        elif "text" in data:
-                            chunk = data["text"]
-                        else:
-                            # Skip status updates without content
-                            continue
-
-                        if not chunk:
-                            continue
-
-                        # Track accumulated text for context
-                        accumulated_text += chunk
-
-                        # Check for thinking tag transitions
-                        open_matches = think_open_pattern.findall(chunk)
-                        close_matches = think_close_pattern.findall(chunk)
-
-                        thinking_depth += len(open_matches)
-                        thinking_depth -= len(close_matches)
-                        thinking_depth = max(0, thinking_depth)  # Prevent negative
-
-                        # If we're inside thinking section, don't yield
-                        if thinking_depth > 0:
-                            in_thinking = True
-                            continue
-
-                        # If we just exited thinking section
-                        if in_thinking and thinking_depth == 0:
-                            in_thinking = False
-                            # Clean any remaining thinking tags from chunk
-                            clean_chunk = think_open_pattern.sub('', chunk)
-                            clean_chunk = think_close_pattern.sub('', clean_chunk)
-                            if clean_chunk.strip():
-                                chunks_yielded = True
-                                yield clean_chunk
-                            continue
-
-                        # Normal chunk - yield after cleaning any stray tags
-                        clean_chunk = think_open_pattern.sub('', chunk)
-                        clean_chunk = think_close_pattern.sub('', clean_chunk)
-                        if clean_chunk:
-                            chunks_yielded = True
-                            yield clean_chunk
-
-                    except json.JSONDecodeError:
-                        continue
+                chunk = stream_filter.feed(line)
+                if chunk:
+                    yield chunk
 
         except Exception as e:
             logger.error(f"Local LLM streaming failed: {e}")
@@ -1100,20 +1337,30 @@ Return a JSON array of relationships:
         # Determine mode
         effective_mode = LLMMode(mode) if mode else self.default_mode
 
+        cache_model = self._embedding_cache_model(effective_mode, model)
+        cached = self.embedding_cache.get(cache_model, text)
+        if cached is not None:
+            return cached
+
         try:
             if effective_mode == LLMMode.ONLINE or effective_mode == LLMMode.AUTO:
                 # Use OpenAI embeddings API
-                return self._generate_embedding_online(text, model)
+                embedding = self._generate_embedding_online(text, model)
+                self.embedding_cache.put(cache_model, text, embedding)
+                return embedding
 
             elif effective_mode == LLMMode.OFFLINE:
                 # Use local LLM embeddings endpoint
-                return self._generate_embedding_offline(text)
+                embedding = self._generate_embedding_offline(text)
+                self.embedding_cache.put(cache_model, text, embedding)
+                return embedding
 
             else:
                 raise ValueError(f"Invalid LLM mode for embeddings: {effective_mode}")
 
         except Exception as e:
             # If AUTO mode and online fails, try offline
+            # (not cached: the offline vector may not match the online model's space)
             if effective_mode == LLMMode.AUTO:
                 try:
                     logger.warning(f"Online embedding failed, falling back to offline: {e}")
@@ -1123,6 +1370,189 @@ Return a JSON array of relationships:
                     raise LLMError(f"Embedding generation failed: {offline_error}")
             raise LLMError(f"Embedding generation failed: {e}")
 
+    def generate_embeddings(
+        self,
+        texts: List[str],
+        mode: Optional[str] = None,
+        model: Optional[str] = None,
+        batch_size: int = 64
+    ) -> List[List[float]]:
+        """
+        Generate embedding vectors for many texts with batched requests
+
+        Sends ``batch_size`` texts per request (OpenAI ``input=[...]`` online,
+        multi-input ``/embeddings`` offline) instead of one round trip per text.
+
+        Args:
+            texts: Input texts to embed
+            mode: "online", "offline", or None (uses default)
+            model: Optional specific embedding model (online mode only)
+            batch_size: Texts per request
+
+        Returns:
+            Embedding vectors in the same order as texts
+
+        Raises:
+            LLMError: If embedding generation fails
+        """
+        if not texts:
+            return []
+
+        effective_mode = LLMMode(mode) if mode else self.default_mode
+
+        # Only texts missing from the cache are sent to the embedding backend
+        cache_model = self._embedding_cache_model(effective_mode, model)
+        embeddings = self.embedding_cache.get_many(cache_model, texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            vectors, used_fallback = self._generate_embeddings_uncached(
+                missing_texts, effective_mode, model, batch_size
+            )
+            # Offline fallback vectors may not match the online model's space
+            if not used_fallback:
+                self.embedding_cache.put_many(cache_model, missing_texts, vectors)
+            for i, vector in zip(missing, vectors):
+                embeddings[i] = vector
+
+        return embeddings
+
+    def _generate_embeddings_uncached(
+        self,
+        texts: List[str],
+        effective_mode: LLMMode,
+        model: Optional[str],
+        batch_size: int
+    ) -> tuple:
+        """
+        Generate embeddings in batched requests, bypassing the cache
+
+        Returns:
+            Tuple of (embeddings, whether the AUTO offline fallback was used)
+        """
+        embeddings: List[List[float]] = []
+        used_fallback = False
+
+        for offset in range(0, len(texts), batch_size):
+            batch = texts[offset:offset + batch_size]
+            try:
+                if effective_mode == LLMMode.ONLINE or effective_mode == LLMMode.AUTO:
+                    embeddings.extend(self._generate_embeddings_online(batch, model))
+                elif effective_mode == LLMMode.OFFLINE:
+                    embeddings.extend(self._generate_embeddings_offline(batch))
+                else:
+                    raise ValueError(f"Invalid LLM mode for embeddings: {effective_mode}")
+
+            except Exception as e:
+                # If AUTO mode and online fails, try offline
+                if effective_mode == LLMMode.AUTO:
+                    try:
+                        logger.warning(f"Online batch embedding failed, falling back to offline: {e}")
+                        embeddings.extend(self._generate_embeddings_offline(batch))
+                        used_fallback = True
+                        continue
+                    except Exception as offline_error:
+                        logger.error(f"Both online and offline batch embedding failed: {offline_error}")
+                        raise LLMError(f"Embedding generation failed: {offline_error}")
+                raise LLMError(f"Embedding generation failed: {e}")
+
+        logger.debug(f"✅ Generated {len(embeddings)} embeddings in batches of {batch_size}")
+        return embeddings, used_fallback
+
+    def _embedding_cache_model(self, mode: LLMMode, model: Optional[str] = None) -> str:
+        """Model identifier used in embedding cache keys"""
+        if mode == LLMMode.OFFLINE:
+            return "local-llm"
+        return model or "text-embedding-3-large"
+
+    def _generate_embeddings_online(
+        self,
+        texts: List[str],
+        model: Optional[str] = None
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for a batch of texts with one OpenAI request
+
+        Args:
+            texts: Input texts
+            model: Optional specific model (default: text-embedding-3-large)
+
+        Returns:
+            Embedding vectors in input order
+        """
+        if not self.openai_api_key:
+            raise LLMOnlineError("OpenAI API key not configured")
+
+        embedding_model = model or "text-embedding-3-large"
+
+        try:
+            response = openai.embeddings.create(
+                model=embedding_model,
+                input=texts
+            )
+
+            # Results carry their input index; don't rely on response order
+            data = sorted(response.data, key=lambda item: item.index)
+            return [item.embedding for item in data]
+
+        except Exception as e:
+            logger.error(f"❌ OpenAI batch embedding failed: {e}")
+            raise LLMOnlineError(f"OpenAI batch embedding failed: {e}")
+
+    def _generate_embeddings_offline(
+        self,
+        texts: List[str],
+        timeout: int = 60
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for a batch of texts with one local LLM request
+
+        Sends ``{"input": [...]}`` to the embeddings endpoint. Servers that
+        don't accept list input are handled by embedding text by text.
+
+        Args:
+            texts: Input texts
+            timeout: Request timeout in seconds
+
+        Returns:
+            Embedding vectors in input order
+        """
+        try:
+            response = self.http_session.post(
+                f"{self.local_llm_url}/embeddings",
+                json={"input": texts},
+                timeout=timeout,
+                headers={"Content-Type": "application/json"}
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+
+                if "data" in data and len(data["data"]) == len(texts):
+                    # OpenAI-compatible format
+                    items = sorted(data["data"], key=lambda item: item.get("index", 0))
+                    return [item["embedding"] for item in items]
+                if "embeddings" in data and len(data["embeddings"]) == len(texts):
+                    return data["embeddings"]
+
+                logger.warning(
+                    f"⚠️ Local embedding endpoint returned no batch result for "
+                    f"{len(texts)} inputs, embedding individually"
+                )
+            else:
+                logger.warning(
+                    f"⚠️ Local batch embedding failed: HTTP {response.status_code}, embedding individually"
+                )
+
+        except requests.exceptions.Timeout:
+            raise LLMTimeoutError(f"Local LLM batch embedding timeout after {timeout}s")
+
+        except RequestException as e:
+            logger.warning(f"Local LLM batch embedding request failed: {e}, embedding individually")
+
+        return [self._generate_embedding_offline(text) for text in texts]
+
     def _generate_embedding_online(
         self,
         text: str,
@@ -1183,7 +1613,7 @@ Return a JSON array of relationships:
             # The endpoint should accept: {"input": "text"}
             # And return: {"embedding": [float, ...]}
 
-            response = requests.post(
+            response = self.http_session.post(
                 f"{self.local_llm_url}/embeddings",
                 json={"input": text},
                 timeout=timeout,
@@ -1280,6 +1710,481 @@ Return only the JSON array, nothing else."""
             logger.error(f"❌ Fallback embedding generation failed: {e}")
             raise LLMOfflineError(f"Fallback embedding failed: {e}")
 
+    # =========================================================================
+    # ASYNC API
+    # =========================================================================
+
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        mode: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        cache_ttl: int = 3600,
+        inject_knowledge: bool = False,
+        cancellation_token: Optional[Any] = None,
+        semantic_cache: bool = False,
+        project_number: Optional[str] = None,
+        cache_context: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate LLM response without blocking the event loop
+
+        Same arguments and result as generate(). The HTTP call runs on the
+        shared pooled async client, and if a cancellation_token is given the
+        request is aborted as soon as the client disconnects.
+
+        Raises:
+            asyncio.CancelledError: If cancelled via cancellation_token
+        """
+        self.stats["total_requests"] += 1
+
+        if inject_knowledge:
+            self._inject_knowledge(messages)
+
+        effective_mode = LLMMode(mode) if mode else self.default_mode
+        logger.info(f"🎯 LLM Generate (async) - Input mode: {mode}, Effective mode: {effective_mode.value}")
+
+        cache_key, cached = self._get_cached_response(
+            messages, effective_mode, temperature, max_tokens, use_cache
+        )
+        if cached:
+            return cached
+
+        semantic_request = None
+        if use_cache and semantic_cache:
+            semantic_request = self._semantic_cache_request(
+                messages, effective_mode, temperature, project_number, cache_context
+            )
+            if semantic_request:
+                try:
+                    embedding = await self.aembed(semantic_request[1], mode=effective_mode.value)
+                    semantic_request += (embedding,)
+                    cached = self._semantic_cache_lookup(semantic_request)
+                    if cached:
+                        return cached
+                except Exception as e:
+                    logger.debug(f"Semantic cache skipped, question embedding failed: {e}")
+                    semantic_request = None
+
+        try:
+            if effective_mode == LLMMode.ONLINE:
+                result = await self._with_cancellation(
+                    self._agenerate_online(messages, temperature, max_tokens), cancellation_token
+                )
+                self.stats["online_requests"] += 1
+
+            elif effective_mode == LLMMode.OFFLINE:
+                result = await self._with_cancellation(
+                    self._agenerate_offline(messages, temperature, max_tokens), cancellation_token
+                )
+                self.stats["offline_requests"] += 1
+
+            elif effective_mode == LLMMode.AUTO:
+                # Try online first, fallback to offline
+                try:
+                    result = await self._with_cancellation(
+                        self._agenerate_online(messages, temperature, max_tokens), cancellation_token
+                    )
+                    self.stats["online_requests"] += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Online LLM failed, falling back to offline: {e}")
+                    result = await self._with_cancellation(
+                        self._agenerate_offline(messages, temperature, max_tokens), cancellation_token
+                    )
+                    self.stats["offline_requests"] += 1
+
+            else:
+                raise ValueError(f"Invalid LLM mode: {effective_mode}")
+
+            result["cached"] = False
+            self._store_cached_response(cache_key, result, cache_ttl)
+            self._semantic_cache_store(semantic_request, result, project_number)
+            return result
+
+        except asyncio.CancelledError:
+            logger.info("🚫 LLM generation cancelled")
+            raise
+        except Exception as e:
+            self.stats["failures"] += 1
+            logger.error(f"LLM generation failed: {e}")
+            raise
+
+    async def _with_cancellation(self, coro, cancellation_token: Optional[Any], poll_interval: float = 0.5):
+        """Await coro, aborting it if cancellation_token reports a cancellation"""
+        if cancellation_token is None:
+            return await coro
+
+        task = asyncio.ensure_future(coro)
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=poll_interval)
+                if done:
+                    return task.result()
+                if await cancellation_token.is_cancelled():
+                    raise asyncio.CancelledError("Operation cancelled by user")
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def _agenerate_online(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> Dict[str, Any]:
+        """Generate response using the async OpenAI client"""
+        client = self._get_async_openai()
+
+        try:
+            response = await client.chat.completions.create(
+                model=self.openai_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=60
+            )
+
+            finish_reason = response.choices[0].finish_reason
+            logger.info(f"✅ OpenAI response received - Tokens: {response.usage.total_tokens}, Finish reason: {finish_reason}")
+
+            response_text = response.choices[0].message.content
+
+            # Handle truncation (finish_reason = "length" means hit token limit)
+            if finish_reason == "length" and max_tokens is None:
+                logger.warning(f"⚠️ Response truncated due to token limit, attempting continuation...")
+                response_text = await self._acontinue_truncated_response(
+                    messages, response_text, temperature, "online"
+                )
+
+            return {
+                "response": response_text,
+                "mode": "online",
+                "model": self.openai_model,
+                "tokens": {
+                    "prompt": response.usage.prompt_tokens,
+                    "completion": response.usage.completion_tokens,
+                    "total": response.usage.total_tokens
+                },
+                "finish_reason": finish_reason
+            }
+
+        except openai.APITimeoutError as e:
+            logger.error(f"OpenAI API timeout: {e}")
+            raise LLMTimeoutError(f"OpenAI API request timed out: {str(e)}")
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise LLMOnlineError(f"OpenAI API unavailable: {str(e)}")
+
+    async def _agenerate_offline(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        _disable_continuation: bool = False
+    ) -> Dict[str, Any]:
+        """Generate response from the local LLM on the pooled async client"""
+        url = self.local_llm_url
+        full_url, payload = self._local_llm_request(url, messages)
+
+        try:
+            accumulator = _LocalLLMResponseAccumulator()
+            async with self._get_async_client().stream("POST", full_url, json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    accumulator.feed(line)
+
+            result = self._finish_local_llm_response(url, accumulator)
+
+        except httpx.TimeoutException:
+            raise LLMTimeoutError(f"Local LLM server timed out: {url}")
+        except Exception as e:
+            logger.error(f"❌ Local LLM endpoint failed: {e}")
+            raise LLMOfflineError(f"Local LLM unavailable (load-balanced endpoint: {url})")
+
+        # Handle truncation (finish_reason = "length" means stream didn't complete)
+        if result["finish_reason"] == "length" and max_tokens is None and not _disable_continuation:
+            logger.warning(f"⚠️ Response truncated (stream incomplete), attempting continuation...")
+            result["response"] = await self._acontinue_truncated_response(
+                messages, result["response"], temperature, "offline"
+            )
+            result["finish_reason"] = "stop"  # Mark as completed after continuation
+
+        return result
+
+    async def _acontinue_truncated_response(
+        self,
+        original_messages: List[Dict[str, str]],
+        partial_response: str,
+        temperature: float,
+        mode: str,
+        max_continuations: int = 3
+    ) -> str:
+        """Async counterpart of _continue_truncated_response"""
+        full_response = partial_response
+
+        for continuation_count in range(1, max_continuations + 1):
+            continuation_messages = self._continuation_messages(original_messages, full_response)
+            logger.info(f"🔄 Continuation attempt {continuation_count}/{max_continuations}")
+
+            try:
+                if mode == "online":
+                    continuation_result = await self._agenerate_online(
+                        continuation_messages, temperature, max_tokens=None
+                    )
+                else:
+                    # Disable further continuation to prevent infinite recursion
+                    continuation_result = await self._agenerate_offline(
+                        continuation_messages, temperature, max_tokens=None,
+                        _disable_continuation=True
+                    )
+
+                full_response += continuation_result["response"]
+
+                if continuation_result.get("finish_reason", "stop") == "stop":
+                    logger.info(f"✅ Response completed after {continuation_count} continuation(s)")
+                    return full_response
+
+                logger.warning(f"⚠️ Continuation {continuation_count} also truncated, trying again...")
+
+            except Exception as e:
+                logger.error(f"❌ Continuation failed: {e}")
+                return full_response
+
+        logger.warning(f"⚠️ Reached max continuations ({max_continuations}), returning partial response")
+        return full_response
+
+    async def astream(
+        self,
+        messages: List[Dict[str, str]],
+        mode: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate streaming LLM response without blocking the event loop
+
+        Yields:
+            Response chunks as they arrive
+        """
+        effective_mode = LLMMode(mode) if mode else self.default_mode
+
+        if effective_mode == LLMMode.ONLINE:
+            stream = self._astream_online(messages, temperature, max_tokens)
+        else:
+            stream = self._astream_offline(messages, temperature, max_tokens)
+
+        async for chunk in stream:
+            yield chunk
+
+    async def _astream_online(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> AsyncIterator[str]:
+        """Stream from OpenAI API on the async client"""
+        client = self._get_async_openai()
+
+        try:
+            stream = await client.chat.completions.create(
+                model=self.openai_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            logger.error(f"OpenAI streaming error: {e}")
+            raise
+
+    async def _astream_offline(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> AsyncIterator[str]:
+        """Stream from local LLM on the pooled async client with thinking section filtering"""
+        url, payload = self._local_llm_request(self.local_llm_url, messages)
+
+        try:
+            stream_filter = _LocalLLMStreamFilter(self._extract_final_answer)
+            async with self._get_async_client().stream("POST", url, json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    chunk = stream_filter.feed(line)
+                    if chunk:
+                        yield chunk
+
+        except httpx.TimeoutException:
+            raise LLMTimeoutError(f"Local LLM server timed out: {url}")
+        except Exception as e:
+            logger.error(f"Local LLM streaming failed: {e}")
+            raise
+
+    async def aembed(
+        self,
+        text: str,
+        mode: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> List[float]:
+        """Async counterpart of generate_embedding"""
+        embeddings = await self.aembed_many([text], mode=mode, model=model)
+        return embeddings[0]
+
+    async def aembed_many(
+        self,
+        texts: List[str],
+        mode: Optional[str] = None,
+        model: Optional[str] = None,
+        batch_size: int = 64
+    ) -> List[List[float]]:
+        """
+        Async counterpart of generate_embeddings
+
+        Cache hits are served directly; misses are embedded in batched
+        requests on the pooled async client.
+        """
+        if not texts:
+            return []
+
+        effective_mode = LLMMode(mode) if mode else self.default_mode
+
+        cache_model = self._embedding_cache_model(effective_mode, model)
+        embeddings = self.embedding_cache.get_many(cache_model, texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            vectors, used_fallback = await self._aembed_uncached(
+                missing_texts, effective_mode, model, batch_size
+            )
+            # Offline fallback vectors may not match the online model's space
+            if not used_fallback:
+                self.embedding_cache.put_many(cache_model, missing_texts, vectors)
+            for i, vector in zip(missing, vectors):
+                embeddings[i] = vector
+
+        return embeddings
+
+    async def _aembed_uncached(
+        self,
+        texts: List[str],
+        effective_mode: LLMMode,
+        model: Optional[str],
+        batch_size: int
+    ) -> tuple:
+        """
+        Async counterpart of _generate_embeddings_uncached
+
+        Returns:
+            Tuple of (embeddings, whether the AUTO offline fallback was used)
+        """
+        embeddings: List[List[float]] = []
+        used_fallback = False
+
+        for offset in range(0, len(texts), batch_size):
+            batch = texts[offset:offset + batch_size]
+            try:
+                if effective_mode == LLMMode.ONLINE or effective_mode == LLMMode.AUTO:
+                    embeddings.extend(await self._aembed_online(batch, model))
+                elif effective_mode == LLMMode.OFFLINE:
+                    embeddings.extend(await self._aembed_offline(batch))
+                else:
+                    raise ValueError(f"Invalid LLM mode for embeddings: {effective_mode}")
+
+            except Exception as e:
+                # If AUTO mode and online fails, try offline
+                if effective_mode == LLMMode.AUTO:
+                    try:
+                        logger.warning(f"Online batch embedding failed, falling back to offline: {e}")
+                        embeddings.extend(await self._aembed_offline(batch))
+                        used_fallback = True
+                        continue
+                    except Exception as offline_error:
+                        logger.error(f"Both online and offline batch embedding failed: {offline_error}")
+                        raise LLMError(f"Embedding generation failed: {offline_error}")
+                raise LLMError(f"Embedding generation failed: {e}")
+
+        return embeddings, used_fallback
+
+    async def _aembed_online(
+        self,
+        texts: List[str],
+        model: Optional[str] = None
+    ) -> List[List[float]]:
+        """Embed a batch of texts with one async OpenAI request"""
+        client = self._get_async_openai()
+
+        try:
+            response = await client.embeddings.create(
+                model=model or "text-embedding-3-large",
+                input=texts
+            )
+
+            # Results carry their input index; don't rely on response order
+            data = sorted(response.data, key=lambda item: item.index)
+            return [item.embedding for item in data]
+
+        except Exception as e:
+            logger.error(f"❌ OpenAI batch embedding failed: {e}")
+            raise LLMOnlineError(f"OpenAI batch embedding failed: {e}")
+
+    async def _aembed_offline(
+        self,
+        texts: List[str],
+        timeout: int = 60
+    ) -> List[List[float]]:
+        """
+        Embed a batch of texts with one local LLM request on the async client
+
+        Servers without list input fall back to the sync per-text path
+        in a worker thread.
+        """
+        try:
+            response = await self._get_async_client().post(
+                f"{self.local_llm_url}/embeddings",
+                json={"input": texts},
+                timeout=timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+
+                if "data" in data and len(data["data"]) == len(texts):
+                    # OpenAI-compatible format
+                    items = sorted(data["data"], key=lambda item: item.get("index", 0))
+                    return [item["embedding"] for item in items]
+                if "embeddings" in data and len(data["embeddings"]) == len(texts):
+                    return data["embeddings"]
+
+                logger.warning(
+                    f"⚠️ Local embedding endpoint returned no batch result for "
+                    f"{len(texts)} inputs, embedding individually"
+                )
+            else:
+                logger.warning(
+                    f"⚠️ Local batch embedding failed: HTTP {response.status_code}, embedding individually"
+                )
+
+        except httpx.TimeoutException:
+            raise LLMTimeoutError(f"Local LLM batch embedding timeout after {timeout}s")
+
+        except httpx.HTTPError as e:
+            logger.warning(f"Local LLM batch embedding request failed: {e}, embedding individually")
+
+        return await asyncio.to_thread(
+            lambda: [self._generate_embedding_offline(text) for text in texts]
+        )
+
     # =========================================================================
     # UTILITIES
     # =========================================================================
@@ -1310,7 +2215,9 @@ Return only the JSON array, nothing else."""
             "cache_hit_rate": (
                 self.stats["cache_hits"] / self.stats["total_requests"]
                 if self.stats["total_requests"] > 0 else 0
-            )
+            ),
+            "embedding_cache": self.embedding_cache.get_stats(),
+            "semantic_cache": self.semantic_cache.get_stats()
         }
 
     def reset_stats(self):
@@ -1320,6 +2227,7 @@ Return only the JSON array, nothing else."""
             "online_requests": 0,
             "offline_requests": 0,
             "cache_hits": 0,
+            "semantic_cache_hits": 0,
             "failures": 0
         }
 
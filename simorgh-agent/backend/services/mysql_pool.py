@@ -0,0 +1,393 @@
+"""
+MySQL Connection Pool
+=====================
+Shared, bounded pool of PyMySQL connections to the TPMS database.
+
+TPMSProjectDataService, PropertyResolver, TPMSAuthService and SQLAuthService
+used to open a new connection (TCP + auth handshake) for every query; they
+now borrow one from a pool shared per database, so a project fetch or a
+login reuses warm connections.
+
+- Bounded: at most MYSQL_POOL_SIZE connections; callers wait up to
+  MYSQL_POOL_TIMEOUT seconds for one to become free
+- Health checks: connections idle for longer than MYSQL_POOL_PING_INTERVAL
+  are pinged before reuse, broken ones are replaced transparently
+- Recycling: connections older than MYSQL_POOL_RECYCLE are closed (kept well
+  below the server's wait_timeout)
+- Metrics: get_stats() reports usage, waits and reconnects
+
+Pooled connections behave like plain PyMySQL connections; close() returns
+them to the pool instead of closing the socket, so existing
+"connection.close()" call sites need no changes.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pymysql
+import pymysql.cursors
+
+logger = logging.getLogger(__name__)
+
+
+class MySQLPoolTimeout(pymysql.err.OperationalError):
+    """No pooled connection became available within the acquire timeout"""
+
+
+class _PoolEntry:
+    """A raw connection plus its bookkeeping"""
+
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class PooledConnection:
+    """
+    Proxy for a pooled PyMySQL connection
+
+    Attribute access is forwarded to the underlying connection; close()
+    (or leaving a ``with`` block) hands it back to the pool.
+    """
+
+    def __init__(self, pool: "MySQLPool", entry: _PoolEntry):
+        self._pool = pool
+        self._entry = entry
+
+    def __getattr__(self, name):
+        if self._entry is None:
+            raise pymysql.err.InterfaceError("Connection already returned to the pool")
+        return getattr(self._entry.conn, name)
+
+    def close(self):
+        """Return the connection to the pool"""
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool._release(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Safety net for call sites that skip close() on an exception path
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class MySQLPool:
+    """
+    Thread-safe bounded connection pool
+
+    Usage:
+        pool = get_mysql_pool(host, port, user, password, database)
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        max_size: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+        recycle_seconds: Optional[float] = None,
+        ping_interval: Optional[float] = None,
+        connect_timeout: int = 10,
+        read_timeout: int = 30,
+        write_timeout: int = 30
+    ):
+        """
+        Initialize pool (connections are opened lazily)
+
+        Args:
+            host, port, user, password, database: Connection parameters
+            max_size: Maximum open connections (default: MYSQL_POOL_SIZE or 10)
+            acquire_timeout: Seconds to wait for a free connection (default: MYSQL_POOL_TIMEOUT or 10)
+            recycle_seconds: Maximum connection age (default: MYSQL_POOL_RECYCLE or 1800)
+            ping_interval: Idle seconds after which a connection is pinged before reuse
+                (default: MYSQL_POOL_PING_INTERVAL or 30)
+        """
+        self.connect_kwargs = {
+            "host": host,
+            "port": port,
+            "user": user,
+            "password": password,
+            "database": database,
+            "charset": "utf8mb4",
+            "connect_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+            "write_timeout": write_timeout,
+            "cursorclass": pymysql.cursors.DictCursor,
+        }
+        self.max_size = max_size or int(os.getenv("MYSQL_POOL_SIZE", "10"))
+        self.acquire_timeout = acquire_timeout or float(os.getenv("MYSQL_POOL_TIMEOUT", "10"))
+        self.recycle_seconds = recycle_seconds or float(os.getenv("MYSQL_POOL_RECYCLE", "1800"))
+        self.ping_interval = ping_interval or float(os.getenv("MYSQL_POOL_PING_INTERVAL", "30"))
+
+        self._idle: deque = deque()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+
+        self.stats = {
+            "checkouts": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "connections_recycled": 0,
+            "health_check_failures": 0,
+            "connection_errors": 0,
+            "acquire_timeouts": 0,
+            "peak_in_use": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+        logger.info(f"✅ MySQL pool initialized for {host}:{port}/{database} (max {self.max_size} connections)")
+
+    # =========================================================================
+    # CHECKOUT / RETURN
+    # =========================================================================
+
+    def connection(self) -> PooledConnection:
+        """
+        Borrow a connection; close() it (or use ``with``) to return it
+
+        Raises:
+            MySQLPoolTimeout: No connection freed up within acquire_timeout
+            pymysql.Error: A new connection could not be opened
+        """
+        wait_start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self.stats["acquire_timeouts"] += 1
+            raise MySQLPoolTimeout(
+                f"No MySQL connection available within {self.acquire_timeout:.0f}s "
+                f"(pool size {self.max_size})"
+            )
+        wait_ms = (time.perf_counter() - wait_start) * 1000
+
+        try:
+            entry = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self.stats["checkouts"] += 1
+            self.stats["peak_in_use"] = max(self.stats["peak_in_use"], self._in_use)
+            self.stats["wait_ms_total"] += wait_ms
+            self.stats["wait_ms_max"] = max(self.stats["wait_ms_max"], wait_ms)
+
+        return PooledConnection(self, entry)
+
+    @contextmanager
+    def acquire(self):
+        """Context manager form of connection()"""
+        conn = self.connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _checkout(self) -> _PoolEntry:
+        """Take a healthy idle connection or open a new one (caller holds a slot)"""
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                break
+
+            now = time.monotonic()
+            if now - entry.created_at > self.recycle_seconds:
+                self._discard(entry, "connections_recycled")
+                continue
+
+            if now - entry.last_used > self.ping_interval:
+                try:
+                    entry.conn.ping(reconnect=False)
+                except Exception:
+                    self._discard(entry, "health_check_failures")
+                    continue
+
+            with self._lock:
+                self.stats["connections_reused"] += 1
+            return entry
+
+        try:
+            conn = pymysql.connect(**self.connect_kwargs)
+        except pymysql.Error:
+            with self._lock:
+                self.stats["connection_errors"] += 1
+            raise
+
+        with self._lock:
+            self.stats["connections_created"] += 1
+        return _PoolEntry(conn)
+
+    def _release(self, entry: _PoolEntry) -> None:
+        """Return a connection, ending any open transaction"""
+        try:
+            if entry.conn.open:
+                # Ends the transaction so the next borrower gets a fresh snapshot
+                entry.conn.rollback()
+                entry.last_used = time.monotonic()
+                with self._lock:
+                    self._idle.append(entry)
+            else:
+                self._discard(entry, "health_check_failures")
+        except Exception:
+            self._discard(entry, "health_check_failures")
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def _discard(self, entry: _PoolEntry, reason: str) -> None:
+        with self._lock:
+            self.stats[reason] += 1
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    def close_all(self) -> None:
+        """Close all idle connections (borrowed ones close when returned)"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for entry in idle:
+            try:
+                entry.conn.close()
+            except Exception:
+                pass
+
+    # =========================================================================
+    # STATISTICS
+    # =========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics"""
+        with self._lock:
+            checkouts = self.stats["checkouts"]
+            return {
+                **self.stats,
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "reuse_rate": self.stats["connections_reused"] / checkouts if checkouts else 0,
+                "wait_ms_avg": self.stats["wait_ms_total"] / checkouts if checkouts else 0,
+                "database": self.connect_kwargs["database"],
+                "host": self.connect_kwargs["host"],
+            }
+
+
+class AsyncMySQLPool:
+    """
+    Async facade over a MySQLPool for the FastAPI request path
+
+    Blocking work runs in worker threads; an asyncio semaphore sized to the
+    pool makes excess requests wait on the event loop instead of occupying
+    threadpool workers that would only block on the pool.
+
+    Usage:
+        async_pool = AsyncMySQLPool(pool)
+        row = await async_pool.fetchone("SELECT ... WHERE id = %s", (user_id,))
+        user = await async_pool.run(tpms_auth.authenticate_user, username, password)
+    """
+
+    def __init__(self, pool: MySQLPool):
+        self.pool = pool
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop_id = id(asyncio.get_running_loop())
+        if loop_id not in self._semaphores:
+            self._semaphores[loop_id] = asyncio.Semaphore(self.pool.max_size)
+        return self._semaphores[loop_id]
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking function that uses the pool in a worker thread"""
+        async with self._semaphore():
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def fetchone(self, query: str, params: Optional[Tuple] = None) -> Optional[Dict[str, Any]]:
+        """Execute a query on a pooled connection and return the first row"""
+        return await self.run(self._execute, query, params, False)
+
+    async def fetchall(self, query: str, params: Optional[Tuple] = None) -> list:
+        """Execute a query on a pooled connection and return all rows"""
+        return await self.run(self._execute, query, params, True)
+
+    def _execute(self, query: str, params: Optional[Tuple], fetch_all: bool):
+        with self.pool.acquire() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall() if fetch_all else cursor.fetchone()
+            finally:
+                cursor.close()
+
+
+# =============================================================================
+# SHARED POOLS
+# =============================================================================
+
+_pools: Dict[Tuple[str, int, str, str], MySQLPool] = {}
+_async_pools: Dict[Tuple[str, int, str, str], AsyncMySQLPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_mysql_pool(host: str, port: int, user: str, password: str, database: str) -> MySQLPool:
+    """Get or create the shared pool for a database (one per host/port/user/database)"""
+    key = (host, int(port), user, database)
+
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = MySQLPool(host, int(port), user, password, database)
+        return _pools[key]
+
+
+def get_async_mysql_pool(host: str, port: int, user: str, password: str, database: str) -> AsyncMySQLPool:
+    """Get or create the async facade of a shared pool"""
+    pool = get_mysql_pool(host, port, user, password, database)
+    key = (host, int(port), user, database)
+
+    with _pools_lock:
+        if key not in _async_pools:
+            _async_pools[key] = AsyncMySQLPool(pool)
+        return _async_pools[key]
+
+
+def get_mysql_pool_stats() -> Dict[str, Any]:
+    """Get statistics of every shared pool"""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {f"{host}:{port}/{database}": pool.get_stats() for (host, port, _, database), pool in pools.items()}
+
+
+def close_mysql_pools() -> None:
+    """Close idle connections of every shared pool"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
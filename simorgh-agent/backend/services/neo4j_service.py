@@ -8,9 +8,11 @@ Author: Simorgh Industrial Assistant
 """
 
 import os
+import re
+import time
 import logging
 import json
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 from neo4j import GraphDatabase, Driver, Session
 from neo4j.exceptions import ServiceUnavailable, Neo4jError
@@ -18,6 +20,17 @@ from neo4j.exceptions import ServiceUnavailable, Neo4jError
 logger = logging.getLogger(__name__)
 
 
+def _quote_identifier(name: str) -> str:
+    """Backtick-quote a label or relationship type for Cypher interpolation"""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _chunks(rows: List[Any], size: int) -> Iterator[List[Any]]:
+    """Split rows into consecutive batches of at most size items"""
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
 class Neo4jService:
     """
     Neo4j Graph Database Service with Project Isolation
@@ -41,6 +54,7 @@ class Neo4jService:
         self.password = password or os.getenv("NEO4J_PASSWORD", "password")
 
         self.driver: Optional[Driver] = None
+        self._ensured_labels: set = set()
         self._connect()
 
     def _connect(self):
@@ -201,7 +215,7 @@ class Neo4jService:
             MATCH (p:Project {project_number: $project_number})
             OPTIONAL MATCH (p)<-[:BELONGS_TO_PROJECT]-(entity)
             WITH p, count(entity) as entity_count, labels(entity) as entity_labels
-            UNWIND entity_labels as label
+            UNWIND [l IN entity_labels WHERE l <> 'Searchable'] as label
             RETURN
                 p.project_number as project_number,
                 p.project_name as project_name,
@@ -365,6 +379,7 @@ class Neo4jService:
             ON MATCH SET
                 e += $properties,
                 e.updated_at = datetime()
+            SET e:Searchable
             MERGE (e)-[:BELONGS_TO_PROJECT]->(proj)
             RETURN e
             """
@@ -675,15 +690,218 @@ class Neo4jService:
                 "relationships": relationships
             }
 
+    # =========================================================================
+    # SCHEMA
+    # =========================================================================
+
+    def ensure_entity_schema(self, labels: Iterable[str]) -> None:
+        """
+        Ensure every entity label has its MERGE key indexed
+
+        Entities are MERGEd on (entity_id, project_number); without an index
+        each MERGE is a full label scan. A composite uniqueness constraint is
+        preferred, with a plain composite index as fallback when the constraint
+        cannot be created (e.g. duplicates already present). Labels are only
+        checked once per service instance.
+
+        Args:
+            labels: Entity labels about to be written
+        """
+        missing = [label for label in set(labels) if label not in self._ensured_labels]
+        if not missing:
+            return
+
+        with self.driver.session() as session:
+            if not self._ensured_labels:
+                try:
+                    session.run(
+                        "CREATE INDEX project_number_idx IF NOT EXISTS "
+                        "FOR (p:Project) ON (p.project_number)"
+                    ).consume()
+                except Neo4jError as e:
+                    logger.debug(f"Project index not created (likely covered by a constraint): {e}")
+
+            for label in missing:
+                name = re.sub(r"\W", "_", label).lower()
+                try:
+                    session.run(
+                        f"CREATE CONSTRAINT entity_key_{name} IF NOT EXISTS "
+                        f"FOR (e:{_quote_identifier(label)}) REQUIRE (e.entity_id, e.project_number) IS UNIQUE"
+                    ).consume()
+                except Neo4jError as e:
+                    logger.warning(f"⚠️ Uniqueness constraint for {label} not created, using an index instead: {e}")
+                    session.run(
+                        f"CREATE INDEX entity_key_{name}_idx IF NOT EXISTS "
+                        f"FOR (e:{_quote_identifier(label)}) ON (e.entity_id, e.project_number)"
+                    ).consume()
+                self._ensured_labels.add(label)
+
+        logger.info(f"✅ Entity schema ensured for labels: {', '.join(sorted(missing))}")
+
     # =========================================================================
     # BATCH OPERATIONS
     # =========================================================================
 
+    def bulk_create_entities(
+        self,
+        project_number: str,
+        entities: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> Dict[str, Any]:
+        """
+        Create entities with one UNWIND statement per label and batch
+
+        Args:
+            project_number: Project context
+            entities: List of {entity_type, entity_id, properties} dicts
+            batch_size: Rows per UNWIND statement (one transaction each)
+
+        Returns:
+            {"total", "elapsed_ms", "batches": [{"label", "count", "elapsed_ms"}]}
+        """
+        start_time = time.perf_counter()
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for entity in entities:
+            if not entity.get("entity_id"):
+                continue
+            groups.setdefault(entity["entity_type"], []).append({
+                "entity_id": entity["entity_id"],
+                "properties": entity.get("properties") or {}
+            })
+
+        batches = []
+        if groups:
+            # Ensure project exists
+            self.create_project(project_number, f"Project {project_number}")
+            self.ensure_entity_schema(groups.keys())
+
+            with self.driver.session() as session:
+                for label, rows in groups.items():
+                    query = f"""
+                    MATCH (proj:Project {{project_number: $project_number}})
+                    UNWIND $rows AS row
+                    MERGE (e:{_quote_identifier(label)} {{entity_id: row.entity_id, project_number: $project_number}})
+                    ON CREATE SET e += row.properties, e.created_at = datetime()
+                    SET e:Searchable
+                    MERGE (e)-[:BELONGS_TO_PROJECT]->(proj)
+                    RETURN count(e) AS count
+                    """
+                    for batch in _chunks(rows, batch_size):
+                        batches.append(self._run_bulk_write(session, query, project_number, batch, label))
+
+        return self._bulk_result("entities", batches, start_time)
+
+    def bulk_create_relationships(
+        self,
+        project_number: str,
+        relationships: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> Dict[str, Any]:
+        """
+        Create relationships with one UNWIND statement per type and batch
+
+        Endpoints are resolved once for the whole call and each batch then
+        looks nodes up by element id. Endpoints with a known label
+        (``from_type`` / ``to_type``, the entity_type they were created with)
+        are resolved through that label's entity key index; the rest are
+        found from the indexed Project node over BELONGS_TO_PROJECT, so no
+        lookup scans every node in the database.
+
+        Args:
+            project_number: Project context
+            relationships: List of {from_id, to_id, type, properties} dicts,
+                optionally with from_type / to_type
+            batch_size: Rows per UNWIND statement (one transaction each)
+
+        Returns:
+            {"total", "elapsed_ms", "batches": [{"type", "count", "elapsed_ms"}]}
+        """
+        start_time = time.perf_counter()
+
+        ids_by_label: Dict[Optional[str], set] = {}
+        for rel in relationships:
+            for id_key, type_key in (("from_id", "from_type"), ("to_id", "to_type")):
+                if rel.get(id_key):
+                    ids_by_label.setdefault(rel.get(type_key), set()).add(rel[id_key])
+
+        batches = []
+        if ids_by_label:
+            with self.driver.session() as session:
+                node_ids = self._resolve_entity_nodes(session, project_number, ids_by_label)
+
+                groups: Dict[str, List[Dict[str, Any]]] = {}
+                for rel in relationships:
+                    from_node = node_ids.get(rel.get("from_id"))
+                    to_node = node_ids.get(rel.get("to_id"))
+                    if from_node is None or to_node is None:
+                        continue
+                    groups.setdefault(rel["type"], []).append({
+                        "from": from_node,
+                        "to": to_node,
+                        "properties": rel.get("properties") or {}
+                    })
+
+                for rel_type, rows in groups.items():
+                    query = f"""
+                    UNWIND $rows AS row
+                    MATCH (from) WHERE elementId(from) = row.from
+                    MATCH (to) WHERE elementId(to) = row.to
+                    MERGE (from)-[r:{_quote_identifier(rel_type)}]->(to)
+                    SET r += row.properties
+                    RETURN count(r) AS count
+                    """
+                    for batch in _chunks(rows, batch_size):
+                        batches.append(self._run_bulk_write(session, query, project_number, batch, rel_type, key="type"))
+
+        return self._bulk_result("relationships", batches, start_time)
+
+    def _resolve_entity_nodes(
+        self,
+        session,
+        project_number: str,
+        ids_by_label: Dict[Optional[str], set]
+    ) -> Dict[str, str]:
+        """
+        Map entity ids to element ids with index-backed lookups
+
+        Args:
+            session: Open Neo4j session
+            project_number: Project context
+            ids_by_label: Entity ids grouped by label (None = label unknown)
+
+        Returns:
+            {entity_id: element_id}
+        """
+        labels = [label for label in ids_by_label if label]
+        if labels:
+            self.ensure_entity_schema(labels)
+
+        node_ids: Dict[str, str] = {}
+        for label, entity_ids in ids_by_label.items():
+            if label:
+                query = f"""
+                    MATCH (n:{_quote_identifier(label)})
+                    WHERE n.entity_id IN $entity_ids AND n.project_number = $project_number
+                    RETURN n.entity_id AS entity_id, elementId(n) AS node_id
+                """
+            else:
+                query = """
+                    MATCH (:Project {project_number: $project_number})<-[:BELONGS_TO_PROJECT]-(n)
+                    WHERE n.entity_id IN $entity_ids
+                    RETURN n.entity_id AS entity_id, elementId(n) AS node_id
+                """
+            result = session.run(query, {"project_number": project_number, "entity_ids": list(entity_ids)})
+            for record in result:
+                node_ids.setdefault(record["entity_id"], record["node_id"])
+
+        return node_ids
+
     def batch_create_entities(
         self,
         project_number: str,
         entities: List[Dict[str, Any]],
-        batch_size: int = 100
+        batch_size: int = 1000
     ) -> int:
         """
         Efficiently create multiple entities in batches
@@ -696,48 +914,13 @@ class Neo4jService:
         Returns:
             Total number of entities created
         """
-        total = 0
-
-        with self.driver.session() as session:
-            # Ensure project exists
-            self.create_project(project_number, f"Project {project_number}")
-
-            for i in range(0, len(entities), batch_size):
-                batch = entities[i:i + batch_size]
-
-                def create_batch(tx, batch_data):
-                    count = 0
-                    for entity in batch_data:
-                        entity_type = entity["entity_type"]
-                        entity_id = entity["entity_id"]
-                        props = entity.get("properties", {})
-
-                        query = f"""
-                        MATCH (proj:Project {{project_number: $project_number}})
-                        MERGE (e:{entity_type} {{entity_id: $entity_id, project_number: $project_number}})
-                        ON CREATE SET e += $properties, e.created_at = datetime()
-                        MERGE (e)-[:BELONGS_TO_PROJECT]->(proj)
-                        """
-
-                        tx.run(query, {
-                            "project_number": project_number,
-                            "entity_id": entity_id,
-                            "properties": props
-                        })
-                        count += 1
-                    return count
-
-                total += session.execute_write(create_batch, batch)
-                logger.info(f"Batch {i // batch_size + 1}: Created {len(batch)} entities")
-
-        logger.info(f"✅ Total entities created: {total}")
-        return total
+        return self.bulk_create_entities(project_number, entities, batch_size)["total"]
 
     def batch_create_relationships(
         self,
         project_number: str,
         relationships: List[Dict[str, Any]],
-        batch_size: int = 100
+        batch_size: int = 1000
     ) -> int:
         """
         Efficiently create multiple relationships in batches
@@ -750,41 +933,46 @@ class Neo4jService:
         Returns:
             Total number of relationships created
         """
-        total = 0
+        return self.bulk_create_relationships(project_number, relationships, batch_size)["total"]
 
-        with self.driver.session() as session:
-            for i in range(0, len(relationships), batch_size):
-                batch = relationships[i:i + batch_size]
-
-                def create_batch(tx, batch_data):
-                    count = 0
-                    for rel in batch_data:
-                        rel_type = rel["type"]
-                        from_id = rel["from_id"]
-                        to_id = rel["to_id"]
-                        props = rel.get("properties", {})
-
-                        query = f"""
-                        MATCH (from {{entity_id: $from_id, project_number: $project_number}})
-                        MATCH (to {{entity_id: $to_id, project_number: $project_number}})
-                        MERGE (from)-[r:{rel_type}]->(to)
-                        SET r += $properties
-                        """
-
-                        tx.run(query, {
-                            "project_number": project_number,
-                            "from_id": from_id,
-                            "to_id": to_id,
-                            "properties": props
-                        })
-                        count += 1
-                    return count
-
-                total += session.execute_write(create_batch, batch)
-                logger.info(f"Batch {i // batch_size + 1}: Created {len(batch)} relationships")
-
-        logger.info(f"✅ Total relationships created: {total}")
-        return total
+    @staticmethod
+    def _run_bulk_write(
+        session: Session,
+        query: str,
+        project_number: str,
+        rows: List[Dict[str, Any]],
+        group: str,
+        key: str = "label"
+    ) -> Dict[str, Any]:
+        """Run one UNWIND batch in its own write transaction and time it"""
+        batch_start = time.perf_counter()
+
+        def write(tx):
+            record = tx.run(query, {"project_number": project_number, "rows": rows}).single()
+            return record["count"] if record else 0
+
+        count = session.execute_write(write)
+        return {
+            key: group,
+            "count": count,
+            "elapsed_ms": round((time.perf_counter() - batch_start) * 1000, 1)
+        }
+
+    @staticmethod
+    def _bulk_result(kind: str, batches: List[Dict[str, Any]], start_time: float) -> Dict[str, Any]:
+        """Summarize bulk write batches"""
+        total = sum(batch["count"] for batch in batches)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        logger.info(
+            f"✅ Bulk created {total} {kind} in {len(batches)} batches, {elapsed_ms:.0f}ms"
+            + (f" ({total / (elapsed_ms / 1000):.0f}/s)" if total and elapsed_ms else "")
+        )
+        return {
+            "total": total,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "batches": batches
+        }
 
     # =========================================================================
     # UTILITIES
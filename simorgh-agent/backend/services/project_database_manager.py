@@ -494,6 +494,15 @@ class ProjectDatabaseManager:
                 status VARCHAR(20)  -- 'success', 'partial', 'failed'
             );
 
+            -- Per-entity content hashes of the last successful sync (delta detection)
+            CREATE TABLE IF NOT EXISTS sync_entity_state (
+                entity_type VARCHAR(50),
+                entity_key VARCHAR(255),
+                content_hash CHAR(64),
+                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (entity_type, entity_key)
+            );
+
             -- Create indexes
             CREATE INDEX IF NOT EXISTS idx_project_main_oenum ON project_main(oenum);
             CREATE INDEX IF NOT EXISTS idx_panel_project_scope ON technical_panel_identity(id_project_scope);
@@ -13,6 +13,19 @@ from neo4j import Driver
 
 logger = logging.getLogger(__name__)
 
+# Lookup keys of the per-document spec structure, indexed so the UNWIND
+# writers below seek instead of scanning each label
+SPEC_INDEXES = {
+    "document_id_idx": ("Document", ("id", "project_number")),
+    "document_filename_idx": ("Document", ("filename", "project_number")),
+    "spec_category_idx": ("SpecCategory", ("document_id", "name")),
+    "spec_field_idx": ("SpecField", ("document_id", "category_name", "name")),
+    "actual_value_idx": ("ActualValue", ("document_id", "category_name", "field_name")),
+    "extraction_guide_idx": ("ExtractionGuide", ("project_number", "category_name", "field_name")),
+}
+
+_spec_indexes_ensured = False
+
 
 class ProjectGraphInitializer:
     """
@@ -28,6 +41,23 @@ class ProjectGraphInitializer:
         """
         self.driver = driver
 
+    def ensure_spec_indexes(self) -> None:
+        """Create the spec structure lookup indexes (once per process)"""
+        global _spec_indexes_ensured
+        if _spec_indexes_ensured:
+            return
+
+        with self.driver.session() as session:
+            for index_name, (label, properties) in SPEC_INDEXES.items():
+                props = ", ".join(f"n.{prop}" for prop in properties)
+                try:
+                    session.run(f"CREATE INDEX {index_name} IF NOT EXISTS FOR (n:{label}) ON ({props})").consume()
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not create index {index_name}: {e}")
+
+        _spec_indexes_ensured = True
+        logger.info(f"✅ Spec structure indexes ensured ({len(SPEC_INDEXES)})")
+
     def initialize_project_structure(self, project_oenum: str, project_name: str) -> Dict[str, Any]:
         """
         Create complete base graph structure for a project
@@ -410,6 +440,7 @@ class ProjectGraphInitializer:
             Success boolean
         """
         logger.info(f"📊 Adding spec structure to document {document_id}")
+        self.ensure_spec_indexes()
 
         with self.driver.session() as session:
             try:
@@ -447,9 +478,6 @@ class ProjectGraphInitializer:
         - ActualValues are linked to both SpecFields and ExtractionGuides
         """
 
-        # Import extraction guides
-        from services.extraction_guides_data import get_extraction_guide
-
         # First create the category node
         query_category = """
         MATCH (doc:Document {id: $doc_id, project_number: $oenum})
@@ -459,6 +487,7 @@ class ProjectGraphInitializer:
             document_id: $doc_id,
             project_number: $oenum
         })
+        SET cat:Searchable
 
         MERGE (doc)-[:HAS_SPEC_CATEGORY]->(cat)
 
@@ -472,76 +501,72 @@ class ProjectGraphInitializer:
             category_name=category_name
         )
 
-        # Then create field nodes linking to project-level guides and creating values
-        for field_name, field_value in fields.items():
-            # Get extraction guide for this field
-            guide_data = get_extraction_guide(category_name, field_name)
-
-            query_field = """
-            MATCH (cat:SpecCategory {
-                name: $category_name,
-                document_id: $doc_id,
-                project_number: $oenum
-            })
-            MATCH (doc:Document {id: $doc_id, project_number: $oenum})
-
-            // Match existing project-level ExtractionGuide (no document_id - shared template)
-            MATCH (guide:ExtractionGuide {
-                field_name: $field_name,
-                category_name: $category_name,
-                project_number: $oenum
-            })
-            WHERE guide.document_id IS NULL  // Ensure it's project-level, not document-specific
+        # Then create all field nodes in one statement, linking to project-level guides
+        # and creating values
+        field_rows = [
+            {"field_name": field_name, "field_value": field_value}
+            for field_name, field_value in fields.items()
+        ]
+        if not field_rows:
+            return
+
+        query_fields = """
+        MATCH (cat:SpecCategory {
+            name: $category_name,
+            document_id: $doc_id,
+            project_number: $oenum
+        })
+        MATCH (doc:Document {id: $doc_id, project_number: $oenum})
+        UNWIND $rows AS row
 
-            // Create SpecField node
-            MERGE (field:SpecField {
-                name: $field_name,
-                category_name: $category_name,
-                document_id: $doc_id,
-                project_number: $oenum
-            })
-            SET field.updated_at = datetime()
+        // Match existing project-level ExtractionGuide (no document_id - shared template)
+        MATCH (guide:ExtractionGuide {
+            field_name: row.field_name,
+            category_name: $category_name,
+            project_number: $oenum
+        })
+        WHERE guide.document_id IS NULL  // Ensure it's project-level, not document-specific
 
-            MERGE (cat)-[:HAS_FIELD]->(field)
+        // Create SpecField node
+        MERGE (field:SpecField {
+            name: row.field_name,
+            category_name: $category_name,
+            document_id: $doc_id,
+            project_number: $oenum
+        })
+        SET field:Searchable, field.updated_at = datetime()
 
-            // Link field to project-level guide (not creating new guide)
-            MERGE (field)-[:REFERENCES_GUIDE]->(guide)
+        MERGE (cat)-[:HAS_FIELD]->(field)
 
-            // Create many-to-many Document ↔ ExtractionGuide relationships
-            MERGE (doc)-[:USES_GUIDE]->(guide)
-            MERGE (guide)-[:USED_IN_DOCUMENT]->(doc)
+        // Link field to project-level guide (not creating new guide)
+        MERGE (field)-[:REFERENCES_GUIDE]->(guide)
 
-            // Create ActualValue node for extracted value (document-specific)
-            MERGE (field)-[:HAS_VALUE]->(value:ActualValue {
-                field_name: $field_name,
-                category_name: $category_name,
-                document_id: $doc_id,
-                project_number: $oenum
-            })
-            SET value.extracted_value = $field_value,
-                value.extraction_method = 'enhanced_rag',
-                value.updated_at = datetime()
+        // Create many-to-many Document ↔ ExtractionGuide relationships
+        MERGE (doc)-[:USES_GUIDE]->(guide)
+        MERGE (guide)-[:USED_IN_DOCUMENT]->(doc)
 
-            // Link value back to guide for traceability
-            MERGE (value)-[:EXTRACTED_BY_GUIDE]->(guide)
+        // Create ActualValue node for extracted value (document-specific)
+        MERGE (field)-[:HAS_VALUE]->(value:ActualValue {
+            field_name: row.field_name,
+            category_name: $category_name,
+            document_id: $doc_id,
+            project_number: $oenum
+        })
+        SET value.extracted_value = row.field_value,
+            value.extraction_method = 'enhanced_rag',
+            value.updated_at = datetime()
 
-            RETURN field
-            """
+        // Link value back to guide for traceability
+        MERGE (value)-[:EXTRACTED_BY_GUIDE]->(guide)
+        """
 
-            session.run(
-                query_field,
-                doc_id=document_id,
-                oenum=project_oenum,
-                category_name=category_name,
-                field_name=field_name,
-                field_value=field_value,
-                definition=guide_data.get("definition", "") if guide_data else "",
-                instructions=guide_data.get("extraction_instructions", "") if guide_data else "",
-                examples=guide_data.get("examples", "") if guide_data else "",
-                common_values=guide_data.get("common_values", "") if guide_data else "",
-                relationships=guide_data.get("relationships", "") if guide_data else "",
-                notes=guide_data.get("notes", "") if guide_data else ""
-            )
+        session.run(
+            query_fields,
+            doc_id=document_id,
+            oenum=project_oenum,
+            category_name=category_name,
+            rows=field_rows
+        ).consume()
 
     def get_spec_structure(
         self,
@@ -666,32 +691,28 @@ class ProjectGraphInitializer:
 
         with self.driver.session() as session:
             try:
-                for category_name, fields in specifications.items():
-                    for field_name, field_value in fields.items():
-                        query = """
-                        MATCH (field:SpecField {
-                            name: $field_name,
-                            category_name: $category_name,
-                            document_id: $doc_id,
-                            project_number: $oenum
-                        })-[:HAS_VALUE]->(value:ActualValue)
-
-                        SET value.extracted_value = $new_value,
-                            value.updated_at = datetime(),
-                            value.reviewed = true,
-                            value.extraction_method = 'manual_review'
-
-                        RETURN value
-                        """
-
-                        session.run(
-                            query,
-                            doc_id=document_id,
-                            oenum=project_oenum,
-                            category_name=category_name,
-                            field_name=field_name,
-                            new_value=field_value
-                        )
+                rows = [
+                    {"category_name": category_name, "field_name": field_name, "new_value": field_value}
+                    for category_name, fields in specifications.items()
+                    for field_name, field_value in fields.items()
+                ]
+
+                query = """
+                UNWIND $rows AS row
+                MATCH (field:SpecField {
+                    name: row.field_name,
+                    category_name: row.category_name,
+                    document_id: $doc_id,
+                    project_number: $oenum
+                })-[:HAS_VALUE]->(value:ActualValue)
+
+                SET value.extracted_value = row.new_value,
+                    value.updated_at = datetime(),
+                    value.reviewed = true,
+                    value.extraction_method = 'manual_review'
+                """
+
+                session.run(query, doc_id=document_id, oenum=project_oenum, rows=rows).consume()
 
                 logger.info(f"✅ Spec structure updated successfully")
                 return True
@@ -873,88 +894,83 @@ class ProjectGraphInitializer:
             Statistics about created guides
         """
         logger.info(f"📚 Initializing extraction guides for project {project_oenum}")
+        self.ensure_spec_indexes()
+
+        rows = [
+            {
+                "category_name": category_name,
+                "field_name": field_name,
+                "definition": guide_content.get("definition", ""),
+                "instructions": guide_content.get("extraction_instructions", ""),
+                "examples": guide_content.get("examples", ""),
+                "common_values": guide_content.get("common_values", ""),
+                "relationships": guide_content.get("relationships", ""),
+                "notes": guide_content.get("notes", "")
+            }
+            for category_name, fields in guides_data.items()
+            for field_name, guide_content in fields.items()
+        ]
+
+        created = self._create_standalone_extraction_guides(project_oenum, rows)
 
         stats = {
-            "guides_created": 0,
-            "guides_failed": 0,
-            "categories_processed": 0
+            "guides_created": created,
+            "guides_failed": len(rows) - created,
+            "categories_processed": len(guides_data)
         }
 
-        for category_name, fields in guides_data.items():
-            for field_name, guide_content in fields.items():
-                # Create guide node (not linked to specific document yet)
-                success = self._create_standalone_extraction_guide(
-                    project_oenum,
-                    category_name,
-                    field_name,
-                    guide_content
-                )
-
-                if success:
-                    stats["guides_created"] += 1
-                else:
-                    stats["guides_failed"] += 1
-
-            stats["categories_processed"] += 1
-
         logger.info(f"✅ Extraction guides initialized: {stats}")
         return stats
 
-    def _create_standalone_extraction_guide(
+    def _create_standalone_extraction_guides(
         self,
         project_oenum: str,
-        category_name: str,
-        field_name: str,
-        guide_content: Dict[str, str]
-    ) -> bool:
+        rows: List[Dict[str, str]]
+    ) -> int:
         """
-        Create standalone extraction guide (not linked to specific document)
+        Create standalone extraction guides (not linked to specific documents)
 
         These guides are project-level resources that can be linked to any
-        spec document field of the same type.
+        spec document field of the same type. All guides are written with a
+        single UNWIND statement.
+
+        Returns:
+            Number of guides created or updated
         """
+        if not rows:
+            return 0
+
         with self.driver.session() as session:
             query = """
             MATCH (p:Project {project_number: $oenum})
+            UNWIND $rows AS row
 
             MERGE (guide:ExtractionGuide {
-                field_name: $field_name,
-                category_name: $category_name,
+                field_name: row.field_name,
+                category_name: row.category_name,
                 project_number: $oenum
             })
-            SET guide.definition = $definition,
-                guide.extraction_instructions = $instructions,
-                guide.examples = $examples,
-                guide.common_values = $common_values,
-                guide.relationships = $relationships,
-                guide.notes = $notes,
+            SET guide.definition = row.definition,
+                guide.extraction_instructions = row.instructions,
+                guide.examples = row.examples,
+                guide.common_values = row.common_values,
+                guide.relationships = row.relationships,
+                guide.notes = row.notes,
                 guide.created_at = datetime(),
                 guide.is_template = true
 
             MERGE (p)-[:HAS_EXTRACTION_GUIDE]->(guide)
 
-            RETURN guide
+            RETURN count(guide) AS created
             """
 
             try:
-                result = session.run(
-                    query,
-                    oenum=project_oenum,
-                    category_name=category_name,
-                    field_name=field_name,
-                    definition=guide_content.get("definition", ""),
-                    instructions=guide_content.get("extraction_instructions", ""),
-                    examples=guide_content.get("examples", ""),
-                    common_values=guide_content.get("common_values", ""),
-                    relationships=guide_content.get("relationships", ""),
-                    notes=guide_content.get("notes", "")
-                )
-
-                return result.single() is not None
+                record = session.run(query, oenum=project_oenum, rows=rows).single()
+                return record["created"] if record else 0
 
             except Exception as e:
-                logger.error(f"❌ Failed to create extraction guide: {e}")
-                return False
+                logger.error(f"❌ Failed to create extraction guides: {e}")
+                return 0
 
     def link_extraction_guides_to_document(
         self,
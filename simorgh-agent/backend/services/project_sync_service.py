@@ -9,12 +9,15 @@ Called when a project is selected to ensure data is up-to-date.
 Author: Simorgh Industrial Assistant
 """
 
+import time
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
 from datetime import datetime
 
 import psycopg2
 from psycopg2 import sql
+from psycopg2.extras import execute_values
+from neo4j.exceptions import Neo4jError
 
 from models.tpms_project_models import (
     TPMSProjectData,
@@ -34,9 +37,153 @@ from services.property_resolver import (
     get_property_resolver,
 )
 from services.redis_service import get_redis_service, RedisService
+from services.sync_delta import (
+    EntityHashes,
+    SyncDelta,
+    CATALOG_KIND,
+    compute_entity_hashes,
+    compute_delta,
+    panel_key,
+)
 
 logger = logging.getLogger(__name__)
 
+SYNC_STATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS sync_entity_state (
+        entity_type VARCHAR(50),
+        entity_key VARCHAR(255),
+        content_hash CHAR(64),
+        synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (entity_type, entity_key)
+    )
+"""
+
+
+def _int_keys(keys) -> List[int]:
+    """Entity keys as TPMS integer ids"""
+    return [int(key) for key in keys if key.lstrip("-").isdigit()]
+
+
+# ==============================================================================
+# BULK LOADING
+# ==============================================================================
+
+def _stage_rows(cursor, table: str, columns: Sequence[str], rows: List[tuple]) -> sql.Identifier:
+    """
+    Load rows into a temp table shaped like the target table.
+
+    All rows go in one execute_values round trip; the temp table is dropped
+    on commit.
+
+    Returns:
+        Identifier of the staging table
+    """
+    stage = sql.Identifier(f"_stage_{table}")
+    column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+
+    cursor.execute(sql.SQL("DROP TABLE IF EXISTS {stage}").format(stage=stage))
+    cursor.execute(
+        sql.SQL(
+            "CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {columns} FROM {target} WITH NO DATA"
+        ).format(stage=stage, columns=column_list, target=sql.Identifier(table))
+    )
+    execute_values(
+        cursor,
+        sql.SQL("INSERT INTO {stage} ({columns}) VALUES %s").format(stage=stage, columns=column_list),
+        rows,
+        page_size=len(rows)
+    )
+    return stage
+
+
+def _bulk_upsert(
+    cursor,
+    table: str,
+    columns: Sequence[str],
+    rows: List[tuple],
+    conflict_column: Optional[str] = None
+) -> int:
+    """
+    Write rows to a table with one set-based statement.
+
+    Rows are staged with _stage_rows and merged with INSERT ... SELECT.
+    With a conflict column, existing rows get every other column updated
+    (duplicates within the batch collapse to one row); without one, rows
+    are appended.
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    stage = _stage_rows(cursor, table, columns, rows)
+    column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+
+    if conflict_column is None:
+        merge = sql.SQL("INSERT INTO {target} ({columns}) SELECT {columns} FROM {stage}").format(
+            target=sql.Identifier(table), columns=column_list, stage=stage
+        )
+    else:
+        key = sql.Identifier(conflict_column)
+        updates = sql.SQL(", ").join(
+            sql.SQL("{column} = EXCLUDED.{column}").format(column=sql.Identifier(column))
+            for column in columns if column != conflict_column
+        )
+        merge = sql.SQL(
+            "INSERT INTO {target} ({columns}) "
+            "SELECT DISTINCT ON ({key}) {columns} FROM {stage} ORDER BY {key} "
+            "ON CONFLICT ({key}) DO UPDATE SET {updates}"
+        ).format(
+            target=sql.Identifier(table), columns=column_list, stage=stage, key=key, updates=updates
+        )
+
+    cursor.execute(merge)
+    return cursor.rowcount
+
+
+PANEL_COLUMNS = (
+    "tpms_id", "id_project_main", "id_project_scope",
+    "plane_name", "plane_type", "cell_count",
+    "height", "width", "depth",
+    "voltage_rate", "rated_voltage", "switch_amperage", "frequency",
+    "kabus", "abus", "main_busbar_size", "earth_size", "neutral_size",
+    "scm", "cpcts",
+    "ip_code", "ip_value", "ip_resolved",
+    "access_from_code", "access_from_value", "access_from_resolved",
+    "color_real_code", "color_real_value", "color_real_resolved",
+    "updated_at",
+)
+
+DRAFT_COLUMNS = (
+    "tpms_id", "project_id", "tablo_id", "scope_name",
+    "bus_section", "feeder_no", "tag", "designation",
+    "wiring_type", "rating_power", "flc", "module", "module_type",
+    "size", "cable_size", "cb_rating", "overload_rating", "contactor_rating",
+    "description", "revision", "ordering", "updated_at",
+)
+
+EQUIPMENT_COLUMNS = (
+    "draft_id", "label", "ecode", "equipment", "qty", "priority", "color",
+    "sec_des", "type_des", "brand_des", "shr_des", "shr_des_2", "scode", "eng_des",
+)
+
+MISSING_DATA_COLUMNS = ("table_name", "field_name", "record_id", "description", "created_at")
+
+# Node keys the graph sync MERGEs on: name -> (label, properties).
+# Uniqueness constraints fall back to plain indexes if they cannot be created.
+GRAPH_CONSTRAINTS = {
+    "sync_project_oenum": ("Project", ("oenum",)),
+    "sync_panel_key": ("Panel", ("oenum", "panel_id")),
+    "sync_feeder_key": ("Feeder", ("oenum", "feeder_id")),
+}
+GRAPH_INDEXES = {
+    "sync_equipment_key": ("Equipment", ("oenum", "feeder_id", "ecode")),
+}
+
+# Rows per UNWIND transaction
+GRAPH_BATCH_SIZE = 5000
+
 
 class ProjectSyncService:
     """
@@ -44,10 +191,11 @@ class ProjectSyncService:
 
     Flow:
     1. Fetch data from TPMS
-    2. Resolve property codes to values
-    3. Store in PostgreSQL (project-specific DB)
-    4. Build/Update Neo4j graph
-    5. Track missing data for LLM resolution
+    2. Detect changes against the entity hashes of the last sync
+    3. Resolve property codes to values
+    4. Apply the delta to PostgreSQL (project-specific DB)
+    5. Apply the delta to the Neo4j graph
+    6. Track missing data for LLM resolution
     """
 
     def __init__(
@@ -73,6 +221,7 @@ class ProjectSyncService:
         self.resolver = property_resolver or get_property_resolver()
         self.neo4j = neo4j_service
         self.redis = redis_service
+        self._graph_schema_ready = False
 
         logger.info("ProjectSyncService initialized")
 
@@ -80,6 +229,7 @@ class ProjectSyncService:
         """Set Neo4j service (for late initialization)."""
         self.neo4j = neo4j_service
         self.db_manager.neo4j = neo4j_service
+        self._graph_schema_ready = False
 
     def set_redis_service(self, redis_service: RedisService):
         """Set Redis service (for late initialization)."""
@@ -89,17 +239,20 @@ class ProjectSyncService:
     # MAIN SYNC METHOD
     # ==========================================================================
 
-    async def sync_project(self, oenum: str) -> Dict[str, Any]:
+    async def sync_project(self, oenum: str, full: bool = False) -> Dict[str, Any]:
         """
         Synchronize project data from TPMS.
 
         This is the main entry point called when a project is selected.
+        Only entities whose content changed since the last successful sync
+        are written; the first sync of a project is always full.
 
         Args:
             oenum: Project OENUM
+            full: Rewrite every entity even if unchanged
 
         Returns:
-            Dict with sync results
+            Dict with sync results, including the delta size
         """
         logger.info(f"Starting sync for project: {oenum}")
         start_time = datetime.utcnow()
@@ -142,6 +295,31 @@ class ProjectSyncService:
             if not db_status.get("all_ready"):
                 result["warnings"].append("Some databases failed to initialize")
 
+            # Step 2b: Detect changes since the last successful sync (a
+            # property catalog edit changes resolved values, so it counts too)
+            previous_hashes = self._load_entity_hashes(oenum)
+            try:
+                catalog_hash = self.resolver.catalog_fingerprint()
+            except Exception as e:
+                logger.warning(f"[{oenum}] Property catalog fingerprint failed, assuming unchanged: {e}")
+                catalog_hash = previous_hashes.get(CATALOG_KIND, {}).get("catalog")
+            current_hashes = compute_entity_hashes(tpms_data, catalog_hash=catalog_hash)
+            delta = compute_delta(previous_hashes, current_hashes, full=full or not previous_hashes)
+            result["delta"] = delta.summary()
+
+            if delta.is_empty:
+                result["status"] = "success"
+                result["completed_at"] = datetime.utcnow()
+                result["duration_seconds"] = (result["completed_at"] - start_time).total_seconds()
+                logger.info(
+                    f"✅ Sync for {oenum}: no changes since last sync "
+                    f"({delta.unchanged} entities, {result['duration_seconds']:.2f}s)"
+                )
+                self._record_sync_log(oenum, result, delta)
+                return result
+
+            logger.info(f"[{oenum}] Delta: {result['delta']}")
+
             # Step 3: Resolve property codes
             logger.info(f"[{oenum}] Step 3: Resolving property codes")
             resolved_data, missing = self._resolve_properties(tpms_data)
@@ -153,12 +331,12 @@ class ProjectSyncService:
 
             # Step 4: Store in PostgreSQL
             logger.info(f"[{oenum}] Step 4: Storing in PostgreSQL")
-            pg_result = self._store_in_postgresql(oenum, tpms_data, resolved_data)
+            pg_result = self._store_in_postgresql(oenum, tpms_data, resolved_data, delta)
             result["steps"]["postgresql_store"] = pg_result
 
             # Step 5: Build Neo4j graph
             logger.info(f"[{oenum}] Step 5: Building Neo4j graph")
-            neo4j_result = await self._build_neo4j_graph(oenum, tpms_data, resolved_data)
+            neo4j_result = await self._build_neo4j_graph(oenum, tpms_data, resolved_data, delta)
             result["steps"]["neo4j_graph"] = neo4j_result
 
             # Step 6: Track missing data
@@ -166,21 +344,34 @@ class ProjectSyncService:
                 logger.info(f"[{oenum}] Step 6: Recording {len(missing)} missing data items")
                 self._record_missing_data(oenum, missing)
 
-            # Step 7: Invalidate Redis cache (ensures fresh data for LLM context)
+            # Step 7: Bump the graph version and invalidate Redis cache (ensures
+            # fresh data for LLM context; version-keyed caches in every worker
+            # see the new version on their next read)
             logger.info(f"[{oenum}] Step 7: Invalidating Redis cache")
             if self.redis:
+                graph_version = self.redis.bump_project_graph_version(oenum)
                 self.redis.invalidate_project_cache(oenum)
-                result["steps"]["cache_invalidation"] = {"status": "success"}
+                result["steps"]["cache_invalidation"] = {"status": "success", "graph_version": graph_version}
             else:
                 # Try to get redis service if not set
                 try:
                     redis = get_redis_service()
+                    graph_version = redis.bump_project_graph_version(oenum)
                     redis.invalidate_project_cache(oenum)
-                    result["steps"]["cache_invalidation"] = {"status": "success"}
+                    result["steps"]["cache_invalidation"] = {"status": "success", "graph_version": graph_version}
                 except Exception as cache_err:
                     logger.warning(f"Cache invalidation skipped: {cache_err}")
                     result["steps"]["cache_invalidation"] = {"status": "skipped", "reason": str(cache_err)}
 
+            # Step 8: Remember entity hashes only once both stores hold the
+            # delta, otherwise the next sync re-applies it. Without Neo4j
+            # configured its step is "skipped" and only PostgreSQL counts
+            # (run a full sync after enabling Neo4j to build the graph).
+            if pg_result.get("status") == "success" and neo4j_result.get("status") in ("success", "skipped"):
+                self._save_entity_hashes(oenum, current_hashes)
+            else:
+                result["warnings"].append("Delta not fully applied, it will be retried on the next sync")
+
             # Complete
             result["status"] = "success"
             result["completed_at"] = datetime.utcnow()
@@ -188,7 +379,11 @@ class ProjectSyncService:
                 result["completed_at"] - start_time
             ).total_seconds()
 
-            logger.info(f"✅ Sync completed for {oenum} in {result['duration_seconds']:.2f}s")
+            logger.info(
+                f"✅ Sync completed for {oenum} in {result['duration_seconds']:.2f}s "
+                f"({result['delta']['mode']}, {delta.size} entities changed, {delta.unchanged} unchanged)"
+            )
+            self._record_sync_log(oenum, result, delta)
 
         except Exception as e:
             logger.error(f"Sync failed for {oenum}: {e}", exc_info=True)
@@ -410,54 +605,94 @@ class ProjectSyncService:
         self,
         oenum: str,
         data: TPMSProjectData,
-        resolved: Dict[str, Any]
+        resolved: Dict[str, Any],
+        delta: SyncDelta = None
     ) -> Dict[str, Any]:
-        """Store project data in PostgreSQL."""
+        """
+        Store project data in PostgreSQL.
+
+        With a delta only added/changed entities are upserted and removed
+        ones deleted; without one everything is written.
+        """
         result = {
             "status": "pending",
             "records_inserted": 0,
             "records_updated": 0,
+            "records_deleted": 0,
+            "tables": {},
+            "rows_per_second": 0,
         }
+        bulk_rows, bulk_seconds = 0, 0.0
+
+        def selected(kind: str, key: str) -> bool:
+            return delta is None or key in delta.upserts(kind)
 
         try:
             conn = self.db_manager._get_project_connection(oenum)
             cursor = conn.cursor()
 
+            # Delete removed entities (equipment first, it references view_draft)
+            if delta is not None:
+                replaced_equipment = _int_keys(
+                    delta.upserts("equipment") | delta.removed["equipment"] | delta.removed["drafts"]
+                )
+                if replaced_equipment:
+                    cursor.execute(
+                        "DELETE FROM view_draft_equipment WHERE draft_id = ANY(%s)",
+                        (replaced_equipment,)
+                    )
+                    result["records_deleted"] += cursor.rowcount
+
+                removed_drafts = _int_keys(delta.removed["drafts"])
+                if removed_drafts:
+                    cursor.execute("DELETE FROM view_draft WHERE tpms_id = ANY(%s)", (removed_drafts,))
+                    result["records_deleted"] += cursor.rowcount
+
+                removed_panels = _int_keys(delta.removed["panels"])
+                if removed_panels:
+                    cursor.execute(
+                        "DELETE FROM technical_panel_identity "
+                        "WHERE COALESCE(id_project_scope, tpms_id) = ANY(%s)",
+                        (removed_panels,)
+                    )
+                    result["records_deleted"] += cursor.rowcount
+
             # Store project main
-            cursor.execute("""
-                INSERT INTO project_main (
-                    id_project_main, oenum, order_category, oe_date,
-                    project_name, project_name_fa, project_expert_label,
-                    technical_supervisor_label, technical_expert_label,
-                    updated_at, sync_status
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (id_project_main) DO UPDATE SET
-                    oenum = EXCLUDED.oenum,
-                    order_category = EXCLUDED.order_category,
-                    project_name = EXCLUDED.project_name,
-                    project_name_fa = EXCLUDED.project_name_fa,
-                    project_expert_label = EXCLUDED.project_expert_label,
-                    technical_supervisor_label = EXCLUDED.technical_supervisor_label,
-                    technical_expert_label = EXCLUDED.technical_expert_label,
-                    updated_at = EXCLUDED.updated_at,
-                    sync_status = EXCLUDED.sync_status
-            """, (
-                data.project_main.id_project_main,
-                data.project_main.oenum,
-                data.project_main.order_category,
-                data.project_main.oe_date,
-                data.project_main.project_name,
-                data.project_main.project_name_fa,
-                data.project_main.project_expert_label,
-                data.project_main.technical_supervisor_label,
-                data.project_main.technical_expert_label,
-                datetime.utcnow(),
-                'synced'
-            ))
-            result["records_inserted"] += 1
+            if selected("project_main", "project"):
+                cursor.execute("""
+                    INSERT INTO project_main (
+                        id_project_main, oenum, order_category, oe_date,
+                        project_name, project_name_fa, project_expert_label,
+                        technical_supervisor_label, technical_expert_label,
+                        updated_at, sync_status
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (id_project_main) DO UPDATE SET
+                        oenum = EXCLUDED.oenum,
+                        order_category = EXCLUDED.order_category,
+                        project_name = EXCLUDED.project_name,
+                        project_name_fa = EXCLUDED.project_name_fa,
+                        project_expert_label = EXCLUDED.project_expert_label,
+                        technical_supervisor_label = EXCLUDED.technical_supervisor_label,
+                        technical_expert_label = EXCLUDED.technical_expert_label,
+                        updated_at = EXCLUDED.updated_at,
+                        sync_status = EXCLUDED.sync_status
+                """, (
+                    data.project_main.id_project_main,
+                    data.project_main.oenum,
+                    data.project_main.order_category,
+                    data.project_main.oe_date,
+                    data.project_main.project_name,
+                    data.project_main.project_name_fa,
+                    data.project_main.project_expert_label,
+                    data.project_main.technical_supervisor_label,
+                    data.project_main.technical_expert_label,
+                    datetime.utcnow(),
+                    'synced'
+                ))
+                result["records_inserted"] += 1
 
             # Store project identity with resolved values
-            if data.project_identity:
+            if data.project_identity and selected("project_identity", "project"):
                 pi = data.project_identity
                 pi_resolved = resolved.get("project_identity", {})
 
@@ -522,103 +757,87 @@ class ProjectSyncService:
                 ))
                 result["records_inserted"] += 1
 
-            # Store panels
+            # Panels, feeders and equipment: one staged bulk write per table
+            now = datetime.utcnow()
+
+            panel_rows = []
             for panel in data.panels:
+                if not selected("panels", panel_key(panel)):
+                    continue
                 panel_id = panel.id_project_scope or panel.id
                 panel_resolved = resolved.get("panels", {}).get(panel_id, {})
+                ip = panel_resolved.get("ip", ResolvedProperty())
+                access_from = panel_resolved.get("access_from", ResolvedProperty())
+                color_real = panel_resolved.get("color_real", ResolvedProperty())
 
-                cursor.execute("""
-                    INSERT INTO technical_panel_identity (
-                        tpms_id, id_project_main, id_project_scope,
-                        plane_name, plane_type, cell_count,
-                        height, width, depth,
-                        voltage_rate, rated_voltage, switch_amperage, frequency,
-                        kabus, abus, main_busbar_size, earth_size, neutral_size,
-                        scm, cpcts,
-                        ip_code, ip_value, ip_resolved,
-                        access_from_code, access_from_value, access_from_resolved,
-                        color_real_code, color_real_value, color_real_resolved,
-                        updated_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
-                    ON CONFLICT (tpms_id) DO UPDATE SET
-                        plane_name = EXCLUDED.plane_name,
-                        voltage_rate = EXCLUDED.voltage_rate,
-                        ip_value = EXCLUDED.ip_value,
-                        ip_resolved = EXCLUDED.ip_resolved,
-                        updated_at = EXCLUDED.updated_at
-                """, (
+                panel_rows.append((
                     panel.id, panel.id_project_main, panel.id_project_scope,
                     panel.plane_name_1, panel.plane_type, panel.cell_count,
                     panel.height, panel.width, panel.depth,
                     panel.voltage_rate, panel.rated_voltage, panel.switch_amperage, panel.frequency,
                     panel.kabus, panel.abus, panel.main_busbar_size, panel.earth_size, panel.neutral_size,
                     panel.scm, panel.cpcts,
-                    panel_resolved.get("ip", ResolvedProperty()).code,
-                    panel_resolved.get("ip", ResolvedProperty()).value,
-                    panel_resolved.get("ip", ResolvedProperty()).resolved,
-                    panel_resolved.get("access_from", ResolvedProperty()).code,
-                    panel_resolved.get("access_from", ResolvedProperty()).value,
-                    panel_resolved.get("access_from", ResolvedProperty()).resolved,
-                    panel_resolved.get("color_real", ResolvedProperty()).code,
-                    panel_resolved.get("color_real", ResolvedProperty()).value,
-                    panel_resolved.get("color_real", ResolvedProperty()).resolved,
-                    datetime.utcnow()
+                    ip.code, ip.value, ip.resolved,
+                    access_from.code, access_from.value, access_from.resolved,
+                    color_real.code, color_real.value, color_real.resolved,
+                    now
                 ))
-                result["records_inserted"] += 1
 
-            # Store feeders/drafts
-            for draft in data.drafts:
-                cursor.execute("""
-                    INSERT INTO view_draft (
-                        tpms_id, project_id, tablo_id, scope_name,
-                        bus_section, feeder_no, tag, designation,
-                        wiring_type, rating_power, flc, module, module_type,
-                        size, cable_size, cb_rating, overload_rating, contactor_rating,
-                        description, revision, ordering, updated_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
-                    ON CONFLICT (tpms_id) DO UPDATE SET
-                        feeder_no = EXCLUDED.feeder_no,
-                        tag = EXCLUDED.tag,
-                        rating_power = EXCLUDED.rating_power,
-                        flc = EXCLUDED.flc,
-                        cb_rating = EXCLUDED.cb_rating,
-                        updated_at = EXCLUDED.updated_at
-                """, (
+            draft_rows = [
+                (
                     draft.id, draft.project_id, draft.tablo_id, draft.scope_name,
                     draft.bus_section, draft.feeder_no, draft.tag, draft.designation,
                     draft.wiring_type, draft.rating_power, draft.flc, draft.module, draft.module_type,
                     draft.size, draft.cable_size, draft.cb_rating, draft.overload_rating, draft.contactor_rating,
-                    draft.description, draft.revision, draft.ordering, datetime.utcnow()
-                ))
-                result["records_inserted"] += 1
+                    draft.description, draft.revision, draft.ordering, now
+                )
+                for draft in data.drafts
+                if selected("drafts", str(draft.id))
+            ]
 
-            # Store equipment
-            for equip in data.draft_equipment:
-                cursor.execute("""
-                    INSERT INTO view_draft_equipment (
-                        draft_id, label, ecode, equipment, qty, priority, color,
-                        sec_des, type_des, brand_des, shr_des, shr_des_2, scode, eng_des
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
+            # A changed draft's equipment list is replaced as a whole (deleted above)
+            equipment_rows = [
+                (
                     equip.draft_id, equip.label, equip.ecode, equip.equipment,
                     equip.qty, equip.priority, equip.color,
                     equip.sec_des, equip.type_des, equip.brand_des,
                     equip.shr_des, equip.shr_des_2, equip.scode, equip.eng_des
-                ))
-                result["records_inserted"] += 1
+                )
+                for equip in data.draft_equipment
+                if equip.draft_id is not None and selected("equipment", str(equip.draft_id))
+            ]
+
+            for table, columns, rows, conflict_column in (
+                ("technical_panel_identity", PANEL_COLUMNS, panel_rows, "tpms_id"),
+                ("view_draft", DRAFT_COLUMNS, draft_rows, "tpms_id"),
+                ("view_draft_equipment", EQUIPMENT_COLUMNS, equipment_rows, None),
+            ):
+                if not rows:
+                    continue
+                table_start = time.perf_counter()
+                _bulk_upsert(cursor, table, columns, rows, conflict_column)
+                elapsed = time.perf_counter() - table_start
+
+                bulk_rows += len(rows)
+                bulk_seconds += elapsed
+                result["records_inserted"] += len(rows)
+                result["tables"][table] = {
+                    "rows": len(rows),
+                    "elapsed_ms": round(elapsed * 1000, 1),
+                }
 
             conn.commit()
             cursor.close()
             conn.close()
 
             result["status"] = "success"
-            logger.info(f"PostgreSQL sync: {result['records_inserted']} records")
+            if bulk_seconds > 0:
+                result["rows_per_second"] = round(bulk_rows / bulk_seconds)
+            logger.info(
+                f"PostgreSQL sync: {result['records_inserted']} records written, "
+                f"{result['records_deleted']} deleted "
+                f"(bulk load {bulk_rows} rows at {result['rows_per_second']} rows/s)"
+            )
 
         except Exception as e:
             logger.error(f"PostgreSQL storage failed: {e}", exc_info=True)
@@ -635,118 +854,78 @@ class ProjectSyncService:
         self,
         oenum: str,
         data: TPMSProjectData,
-        resolved: Dict[str, Any]
+        resolved: Dict[str, Any],
+        delta: SyncDelta = None
     ) -> Dict[str, Any]:
-        """Build Neo4j graph for the project."""
+        """
+        Build Neo4j graph for the project.
+
+        Panels, feeders and equipment are collected into row lists and each
+        kind is written with one UNWIND statement per transaction (batches of
+        GRAPH_BATCH_SIZE rows). With a delta only added/changed entities are
+        merged and removed ones detached; without one everything is written.
+        """
         result = {
             "status": "pending",
             "nodes_created": 0,
             "relationships_created": 0,
+            "nodes_deleted": 0,
+            "statements": {},
         }
 
+        def selected(kind: str, key: str) -> bool:
+            return delta is None or key in delta.upserts(kind)
+
         if not self.neo4j:
             result["status"] = "skipped"
             result["message"] = "Neo4j service not configured"
             return result
 
         try:
-            with self.neo4j.driver.session() as session:
-                # Update project node with full data
-                pm = data.project_main
-                session.run("""
-                    MERGE (p:Project {oenum: $oenum})
-                    SET p.id_project_main = $id_project_main,
-                        p.project_name = $project_name,
-                        p.project_name_fa = $project_name_fa,
-                        p.order_category = $order_category,
-                        p.oe_date = $oe_date,
-                        p.project_expert = $project_expert,
-                        p.technical_supervisor = $technical_supervisor,
-                        p.technical_expert = $technical_expert,
-                        p.sync_status = 'synced',
-                        p.synced_at = datetime()
-                """, {
-                    "oenum": oenum,
-                    "id_project_main": pm.id_project_main,
-                    "project_name": pm.project_name,
-                    "project_name_fa": pm.project_name_fa,
-                    "order_category": pm.order_category,
-                    "oe_date": pm.oe_date,
-                    "project_expert": pm.project_expert_label,
-                    "technical_supervisor": pm.technical_supervisor_label,
-                    "technical_expert": pm.technical_expert_label,
-                })
-                result["nodes_created"] += 1
-
-                # Create/Update project identity node
-                if data.project_identity:
-                    pi = data.project_identity
-                    pi_resolved = resolved.get("project_identity", {})
-
-                    session.run("""
-                        MATCH (p:Project {oenum: $oenum})
-                        MERGE (p)-[:HAS_IDENTITY]->(pi:ProjectIdentity {oenum: $oenum})
-                        SET pi.delivery_date = $delivery_date,
-                            pi.above_sea_level = $above_sea_level,
-                            pi.average_temperature = $average_temperature,
-                            pi.isolation_code = $isolation_code,
-                            pi.isolation_value = $isolation_value,
-                            pi.isolation_resolved = $isolation_resolved,
-                            pi.plating_type_value = $plating_type_value,
-                            pi.color_type_value = $color_type_value,
-                            pi.wire_brand = $wire_brand,
-                            pi.control_wire_brand = $control_wire_brand,
-                            pi.phase_wire_color = $phase_wire_color,
-                            pi.updated_at = datetime()
-                    """, {
-                        "oenum": oenum,
-                        "delivery_date": str(pi.delivery_date) if pi.delivery_date else None,
-                        "above_sea_level": pi.above_sea_level,
-                        "average_temperature": pi.average_temperature,
-                        "isolation_code": pi_resolved.get("isolation", ResolvedProperty()).code,
-                        "isolation_value": pi_resolved.get("isolation", ResolvedProperty()).value,
-                        "isolation_resolved": pi_resolved.get("isolation", ResolvedProperty()).resolved,
-                        "plating_type_value": pi_resolved.get("plating_type", ResolvedProperty()).value,
-                        "color_type_value": pi_resolved.get("color_type", ResolvedProperty()).value,
-                        "wire_brand": pi.wire_brand,
-                        "control_wire_brand": pi.control_wire_brand,
-                        "phase_wire_color": pi_resolved.get("phase_wire_color", ResolvedProperty()).value,
-                    })
-                    result["nodes_created"] += 1
+            self._ensure_graph_schema()
+
+            # Collect rows
+            pm = data.project_main
+            project_props = {
+                "id_project_main": pm.id_project_main,
+                "project_name": pm.project_name,
+                "project_name_fa": pm.project_name_fa,
+                "order_category": pm.order_category,
+                "oe_date": pm.oe_date,
+                "project_expert": pm.project_expert_label,
+                "technical_supervisor": pm.technical_supervisor_label,
+                "technical_expert": pm.technical_expert_label,
+            }
 
-                # Create panel nodes
-                for panel in data.panels:
-                    panel_id = panel.id_project_scope or panel.id
-                    panel_resolved = resolved.get("panels", {}).get(panel_id, {})
+            identity_props = None
+            if data.project_identity and selected("project_identity", "project"):
+                pi = data.project_identity
+                pi_resolved = resolved.get("project_identity", {})
+                identity_props = {
+                    "delivery_date": str(pi.delivery_date) if pi.delivery_date else None,
+                    "above_sea_level": pi.above_sea_level,
+                    "average_temperature": pi.average_temperature,
+                    "isolation_code": pi_resolved.get("isolation", ResolvedProperty()).code,
+                    "isolation_value": pi_resolved.get("isolation", ResolvedProperty()).value,
+                    "isolation_resolved": pi_resolved.get("isolation", ResolvedProperty()).resolved,
+                    "plating_type_value": pi_resolved.get("plating_type", ResolvedProperty()).value,
+                    "color_type_value": pi_resolved.get("color_type", ResolvedProperty()).value,
+                    "wire_brand": pi.wire_brand,
+                    "control_wire_brand": pi.control_wire_brand,
+                    "phase_wire_color": pi_resolved.get("phase_wire_color", ResolvedProperty()).value,
+                }
+
+            panel_rows = []
+            for panel in data.panels:
+                if not selected("panels", panel_key(panel)):
+                    continue
+                panel_id = panel.id_project_scope or panel.id
+                panel_resolved = resolved.get("panels", {}).get(panel_id, {})
+                ip = panel_resolved.get("ip", ResolvedProperty())
 
-                    session.run("""
-                        MATCH (p:Project {oenum: $oenum})
-                        MERGE (p)-[:HAS_PANEL]->(panel:Panel {
-                            oenum: $oenum,
-                            panel_id: $panel_id
-                        })
-                        SET panel.plane_name = $plane_name,
-                            panel.plane_type = $plane_type,
-                            panel.cell_count = $cell_count,
-                            panel.height = $height,
-                            panel.width = $width,
-                            panel.depth = $depth,
-                            panel.voltage_rate = $voltage_rate,
-                            panel.rated_voltage = $rated_voltage,
-                            panel.frequency = $frequency,
-                            panel.switch_amperage = $switch_amperage,
-                            panel.main_busbar_size = $main_busbar_size,
-                            panel.kabus = $kabus,
-                            panel.abus = $abus,
-                            panel.scm = $scm,
-                            panel.ip_code = $ip_code,
-                            panel.ip_value = $ip_value,
-                            panel.ip_resolved = $ip_resolved,
-                            panel.color_value = $color_value,
-                            panel.updated_at = datetime()
-                    """, {
-                        "oenum": oenum,
-                        "panel_id": panel_id,
+                panel_rows.append({
+                    "panel_id": panel_id,
+                    "props": {
                         "plane_name": panel.plane_name_1,
                         "plane_type": panel.plane_type,
                         "cell_count": panel.cell_count,
@@ -761,87 +940,182 @@ class ProjectSyncService:
                         "kabus": panel.kabus,
                         "abus": panel.abus,
                         "scm": panel.scm,
-                        "ip_code": panel_resolved.get("ip", ResolvedProperty()).code,
-                        "ip_value": panel_resolved.get("ip", ResolvedProperty()).value,
-                        "ip_resolved": panel_resolved.get("ip", ResolvedProperty()).resolved,
+                        "ip_code": ip.code,
+                        "ip_value": ip.value,
+                        "ip_resolved": ip.resolved,
                         "color_value": panel_resolved.get("color_real", ResolvedProperty()).value,
-                    })
-                    result["nodes_created"] += 1
-                    result["relationships_created"] += 1
-
-                    # Create feeder nodes for this panel
-                    panel_feeders = data.get_feeders_for_panel(panel_id)
-                    for feeder in panel_feeders:
-                        session.run("""
-                            MATCH (panel:Panel {oenum: $oenum, panel_id: $panel_id})
-                            MERGE (panel)-[:HAS_FEEDER]->(f:Feeder {
-                                oenum: $oenum,
-                                feeder_id: $feeder_id
-                            })
-                            SET f.feeder_no = $feeder_no,
-                                f.bus_section = $bus_section,
-                                f.tag = $tag,
-                                f.designation = $designation,
-                                f.wiring_type = $wiring_type,
-                                f.rating_power = $rating_power,
-                                f.flc = $flc,
-                                f.cable_size = $cable_size,
-                                f.cb_rating = $cb_rating,
-                                f.module = $module,
-                                f.module_type = $module_type,
-                                f.updated_at = datetime()
-                        """, {
-                            "oenum": oenum,
-                            "panel_id": panel_id,
-                            "feeder_id": feeder.id,
-                            "feeder_no": feeder.feeder_no,
-                            "bus_section": feeder.bus_section,
-                            "tag": feeder.tag,
-                            "designation": feeder.designation,
-                            "wiring_type": feeder.wiring_type,
-                            "rating_power": feeder.rating_power,
-                            "flc": feeder.flc,
-                            "cable_size": feeder.cable_size,
-                            "cb_rating": feeder.cb_rating,
-                            "module": feeder.module,
-                            "module_type": feeder.module_type,
-                        })
-                        result["nodes_created"] += 1
-                        result["relationships_created"] += 1
-
-                        # Create equipment nodes
-                        feeder_equipment = data.get_equipment_for_draft(feeder.id)
-                        for equip in feeder_equipment:
-                            session.run("""
-                                MATCH (f:Feeder {oenum: $oenum, feeder_id: $feeder_id})
-                                MERGE (f)-[:HAS_EQUIPMENT]->(e:Equipment {
-                                    oenum: $oenum,
-                                    feeder_id: $feeder_id,
-                                    ecode: $ecode
-                                })
-                                SET e.label = $label,
-                                    e.qty = $qty,
-                                    e.brand = $brand,
-                                    e.eng_des = $eng_des,
-                                    e.scode = $scode,
-                                    e.updated_at = datetime()
-                            """, {
-                                "oenum": oenum,
-                                "feeder_id": feeder.id,
-                                "ecode": equip.ecode or f"equip_{equip.equipment}",
-                                "label": equip.label,
-                                "qty": equip.qty,
-                                "brand": equip.brand_des,
-                                "eng_des": equip.eng_des,
-                                "scode": equip.scode,
-                            })
-                            result["nodes_created"] += 1
-                            result["relationships_created"] += 1
+                    },
+                })
+
+            # Feeders are attached to their panel via TabloId
+            panel_ids = {panel.id_project_scope or panel.id for panel in data.panels}
+            feeder_rows = [
+                {
+                    "panel_id": feeder.tablo_id,
+                    "feeder_id": feeder.id,
+                    "props": {
+                        "feeder_no": feeder.feeder_no,
+                        "bus_section": feeder.bus_section,
+                        "tag": feeder.tag,
+                        "designation": feeder.designation,
+                        "wiring_type": feeder.wiring_type,
+                        "rating_power": feeder.rating_power,
+                        "flc": feeder.flc,
+                        "cable_size": feeder.cable_size,
+                        "cb_rating": feeder.cb_rating,
+                        "module": feeder.module,
+                        "module_type": feeder.module_type,
+                    },
+                }
+                for feeder in data.drafts
+                if feeder.tablo_id in panel_ids and selected("drafts", str(feeder.id))
+            ]
+
+            equipment_rows = [
+                {
+                    "feeder_id": equip.draft_id,
+                    "ecode": equip.ecode or f"equip_{equip.equipment}",
+                    "props": {
+                        "label": equip.label,
+                        "qty": equip.qty,
+                        "brand": equip.brand_des,
+                        "eng_des": equip.eng_des,
+                        "scode": equip.scode,
+                    },
+                }
+                for equip in data.draft_equipment
+                if equip.draft_id is not None and selected("equipment", str(equip.draft_id))
+            ]
+
+            # Write: deletions first, then one UNWIND per kind
+            with self.neo4j.driver.session() as session:
+
+                def write(name: str, query: str, params: Dict[str, Any], rows: List[Dict] = None) -> int:
+                    """Run a statement in explicit write transactions, batching rows"""
+                    start = time.perf_counter()
+                    batches = [None] if rows is None else [
+                        rows[i:i + GRAPH_BATCH_SIZE] for i in range(0, len(rows), GRAPH_BATCH_SIZE)
+                    ]
+                    count = 0
+                    for batch in batches:
+                        batch_params = dict(params, oenum=oenum)
+                        if batch is not None:
+                            batch_params["rows"] = batch
+                        record = session.execute_write(lambda tx: tx.run(query, batch_params).single())
+                        count += record["count"] if record else 0
+
+                    result["statements"][name] = {
+                        "count": count,
+                        "transactions": len(batches),
+                        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+                    }
+                    return count
+
+                if delta is not None:
+                    removed_drafts = _int_keys(delta.removed["drafts"])
+                    if removed_drafts:
+                        result["nodes_deleted"] += write("delete_feeders", """
+                            MATCH (f:Feeder {oenum: $oenum})
+                            WHERE f.feeder_id IN $feeder_ids
+                            OPTIONAL MATCH (f)-[:HAS_EQUIPMENT]->(e:Equipment)
+                            WITH collect(DISTINCT f) + collect(DISTINCT e) AS nodes
+                            UNWIND nodes AS n
+                            DETACH DELETE n
+                            RETURN count(n) AS count
+                        """, {"feeder_ids": removed_drafts})
+
+                    removed_panels = _int_keys(delta.removed["panels"])
+                    if removed_panels:
+                        result["nodes_deleted"] += write("delete_panels", """
+                            MATCH (panel:Panel {oenum: $oenum})
+                            WHERE panel.panel_id IN $panel_ids
+                            DETACH DELETE panel
+                            RETURN count(*) AS count
+                        """, {"panel_ids": removed_panels})
+
+                    # A changed feeder's equipment list is replaced as a whole
+                    replaced_feeders = _int_keys(delta.upserts("equipment") | delta.removed["equipment"])
+                    if replaced_feeders:
+                        result["nodes_deleted"] += write("delete_equipment", """
+                            MATCH (f:Feeder {oenum: $oenum})-[:HAS_EQUIPMENT]->(e:Equipment)
+                            WHERE f.feeder_id IN $feeder_ids
+                            DETACH DELETE e
+                            RETURN count(*) AS count
+                        """, {"feeder_ids": replaced_feeders})
+
+                if selected("project_main", "project"):
+                    result["nodes_created"] += write("project", """
+                        MERGE (p:Project {oenum: $oenum})
+                        SET p += $props,
+                            p.sync_status = 'synced',
+                            p.synced_at = datetime()
+                        RETURN count(p) AS count
+                    """, {"props": project_props})
+
+                if identity_props is not None:
+                    count = write("project_identity", """
+                        MATCH (p:Project {oenum: $oenum})
+                        MERGE (p)-[:HAS_IDENTITY]->(pi:ProjectIdentity {oenum: $oenum})
+                        SET pi += $props,
+                            pi.updated_at = datetime()
+                        RETURN count(pi) AS count
+                    """, {"props": identity_props})
+                    result["nodes_created"] += count
+                    result["relationships_created"] += count
+
+                if panel_rows:
+                    count = write("panels", """
+                        MATCH (p:Project {oenum: $oenum})
+                        UNWIND $rows AS row
+                        MERGE (panel:Panel {oenum: $oenum, panel_id: row.panel_id})
+                        SET panel += row.props,
+                            panel.updated_at = datetime()
+                        MERGE (p)-[:HAS_PANEL]->(panel)
+                        RETURN count(panel) AS count
+                    """, {}, panel_rows)
+                    result["nodes_created"] += count
+                    result["relationships_created"] += count
+
+                if feeder_rows:
+                    # Feeders that moved to another panel lose their old HAS_FEEDER edge
+                    count = write("feeders", """
+                        UNWIND $rows AS row
+                        MATCH (panel:Panel {oenum: $oenum, panel_id: row.panel_id})
+                        MERGE (f:Feeder {oenum: $oenum, feeder_id: row.feeder_id})
+                        SET f += row.props,
+                            f.updated_at = datetime()
+                        MERGE (panel)-[:HAS_FEEDER]->(f)
+                        WITH panel, f
+                        OPTIONAL MATCH (other:Panel)-[old:HAS_FEEDER]->(f)
+                        WHERE other <> panel
+                        DELETE old
+                        RETURN count(DISTINCT f) AS count
+                    """, {}, feeder_rows)
+                    result["nodes_created"] += count
+                    result["relationships_created"] += count
+
+                if equipment_rows:
+                    count = write("equipment", """
+                        UNWIND $rows AS row
+                        MATCH (f:Feeder {oenum: $oenum, feeder_id: row.feeder_id})
+                        MERGE (e:Equipment {oenum: $oenum, feeder_id: row.feeder_id, ecode: row.ecode})
+                        SET e += row.props,
+                            e.updated_at = datetime()
+                        MERGE (f)-[:HAS_EQUIPMENT]->(e)
+                        RETURN count(e) AS count
+                    """, {}, equipment_rows)
+                    result["nodes_created"] += count
+                    result["relationships_created"] += count
+
+            transactions = sum(stmt["transactions"] for stmt in result["statements"].values())
+            elapsed_ms = sum(stmt["elapsed_ms"] for stmt in result["statements"].values())
 
             result["status"] = "success"
             logger.info(
                 f"Neo4j sync: {result['nodes_created']} nodes, "
-                f"{result['relationships_created']} relationships"
+                f"{result['relationships_created']} relationships, "
+                f"{result['nodes_deleted']} nodes deleted "
+                f"in {transactions} transactions ({elapsed_ms:.0f}ms)"
             )
 
         except Exception as e:
@@ -851,35 +1125,164 @@ class ProjectSyncService:
 
         return result
 
+    def _ensure_graph_schema(self):
+        """
+        Ensure the keys the graph sync MERGEs on are backed by constraints.
+
+        Runs once per Neo4j service; without these every MERGE in the UNWIND
+        statements is a label scan.
+        """
+        if self._graph_schema_ready:
+            return
+
+        with self.neo4j.driver.session() as session:
+            for name, (label, properties) in GRAPH_CONSTRAINTS.items():
+                props = ", ".join(f"n.{prop}" for prop in properties)
+                try:
+                    session.run(
+                        f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE ({props}) IS UNIQUE"
+                    ).consume()
+                except Neo4jError as e:
+                    logger.warning(f"⚠️ Uniqueness constraint {name} not created, using an index instead: {e}")
+                    session.run(f"CREATE INDEX {name}_idx IF NOT EXISTS FOR (n:{label}) ON ({props})").consume()
+
+            for name, (label, properties) in GRAPH_INDEXES.items():
+                props = ", ".join(f"n.{prop}" for prop in properties)
+                session.run(f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON ({props})").consume()
+
+        self._graph_schema_ready = True
+        logger.info("✅ Project graph constraints ensured")
+
+    # ==========================================================================
+    # SYNC STATE
+    # ==========================================================================
+
+    def _load_entity_hashes(self, oenum: str) -> EntityHashes:
+        """
+        Load the entity hashes stored by the last successful sync.
+
+        Returns an empty dict (forcing a full sync) if none are stored or
+        they cannot be read.
+        """
+        hashes: EntityHashes = {}
+
+        try:
+            conn = self.db_manager._get_project_connection(oenum)
+            cursor = conn.cursor()
+
+            cursor.execute(SYNC_STATE_TABLE_SQL)
+            cursor.execute("SELECT entity_type, entity_key, content_hash FROM sync_entity_state")
+            for entity_type, entity_key, digest in cursor.fetchall():
+                hashes.setdefault(entity_type, {})[entity_key] = digest
+
+            conn.commit()
+            cursor.close()
+            conn.close()
+
+        except Exception as e:
+            logger.warning(f"Could not load sync state for {oenum}, running full sync: {e}")
+            return {}
+
+        return hashes
+
+    def _save_entity_hashes(self, oenum: str, hashes: EntityHashes):
+        """Replace the stored entity hashes with those of the applied sync."""
+        try:
+            conn = self.db_manager._get_project_connection(oenum)
+            cursor = conn.cursor()
+
+            cursor.execute(SYNC_STATE_TABLE_SQL)
+            cursor.execute("DELETE FROM sync_entity_state")
+            cursor.executemany(
+                "INSERT INTO sync_entity_state (entity_type, entity_key, content_hash) VALUES (%s, %s, %s)",
+                [
+                    (entity_type, entity_key, digest)
+                    for entity_type, entities in hashes.items()
+                    for entity_key, digest in entities.items()
+                ]
+            )
+
+            conn.commit()
+            cursor.close()
+            conn.close()
+
+        except Exception as e:
+            logger.warning(f"Failed to save sync state for {oenum}: {e}")
+
+    def _record_sync_log(self, oenum: str, result: Dict[str, Any], delta: SyncDelta):
+        """Record a completed sync and its delta size in sync_log."""
+        try:
+            conn = self.db_manager._get_project_connection(oenum)
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                INSERT INTO sync_log (
+                    sync_type, started_at, completed_at,
+                    records_synced, records_updated, errors, status
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (
+                "full" if delta.full else "incremental",
+                result["started_at"],
+                result["completed_at"],
+                sum(len(delta.added[kind]) for kind in delta.added),
+                sum(len(delta.changed[kind]) for kind in delta.changed),
+                result["errors"] + result["warnings"],
+                result["status"]
+            ))
+
+            conn.commit()
+            cursor.close()
+            conn.close()
+
+        except Exception as e:
+            logger.warning(f"Failed to record sync log for {oenum}: {e}")
+
     # ==========================================================================
     # MISSING DATA TRACKING
     # ==========================================================================
 
     def _record_missing_data(self, oenum: str, missing: List[Dict[str, Any]]):
-        """Record missing data items for later resolution."""
+        """Record missing data items for later resolution (already tracked items are skipped)."""
+        if not missing:
+            return
+
         try:
             conn = self.db_manager._get_project_connection(oenum)
             cursor = conn.cursor()
 
-            for item in missing:
-                cursor.execute("""
-                    INSERT INTO missing_data (
-                        table_name, field_name, record_id, description, created_at
-                    ) VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT DO NOTHING
-                """, (
-                    item.get("table"),
-                    item.get("field"),
-                    item.get("record_id"),
-                    item.get("description"),
-                    datetime.utcnow()
-                ))
+            now = datetime.utcnow()
+            start = time.perf_counter()
+
+            # Stage all items, then insert those not already tracked as unresolved
+            stage = _stage_rows(cursor, "missing_data", MISSING_DATA_COLUMNS, [
+                (item.get("table"), item.get("field"), item.get("record_id"), item.get("description"), now)
+                for item in missing
+            ])
+            cursor.execute(sql.SQL("""
+                INSERT INTO missing_data (table_name, field_name, record_id, description, created_at)
+                SELECT DISTINCT ON (s.table_name, s.field_name, s.record_id)
+                    s.table_name, s.field_name, s.record_id, s.description, s.created_at
+                FROM {stage} s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM missing_data m
+                    WHERE m.resolved IS NOT TRUE
+                      AND m.table_name IS NOT DISTINCT FROM s.table_name
+                      AND m.field_name IS NOT DISTINCT FROM s.field_name
+                      AND m.record_id IS NOT DISTINCT FROM s.record_id
+                )
+                ORDER BY s.table_name, s.field_name, s.record_id
+            """).format(stage=stage))
+            inserted = cursor.rowcount
+            elapsed = time.perf_counter() - start
 
             conn.commit()
             cursor.close()
             conn.close()
 
-            logger.info(f"Recorded {len(missing)} missing data items")
+            logger.info(
+                f"Recorded {inserted} new missing data items of {len(missing)} "
+                f"({len(missing) / elapsed if elapsed > 0 else 0:.0f} rows/s)"
+            )
 
         except Exception as e:
             logger.error(f"Failed to record missing data: {e}")
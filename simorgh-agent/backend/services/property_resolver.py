@@ -7,6 +7,8 @@ using the TechnicalProperty lookup table from TPMS.
 Author: Simorgh Industrial Assistant
 """
 
+import hashlib
+import json
 import logging
 import os
 from typing import Optional, Dict, Any, List
@@ -15,6 +17,8 @@ import pymysql
 import pymysql.cursors
 from pymysql import Error as MySQLError
 
+from services.mysql_pool import get_mysql_pool
+
 from models.tpms_project_models import (
     TechnicalPropertyType,
     TechnicalProperty,
@@ -46,6 +50,7 @@ class PropertyResolver:
         self.user = user or os.getenv("MYSQL_USER", "root")
         self.password = password or os.getenv("MYSQL_PASSWORD", "")
         self.database = database or os.getenv("MYSQL_DATABASE", "TPMS")
+        self.pool = get_mysql_pool(self.host, self.port, self.user, self.password, self.database)
 
         # Local cache of property mappings
         self._property_cache: Dict[int, Dict[int, str]] = {}
@@ -54,34 +59,26 @@ class PropertyResolver:
         logger.info("PropertyResolver initialized")
 
     def _get_connection(self):
-        """Create database connection."""
+        """Borrow a pooled database connection (close() returns it to the pool)."""
         try:
-            connection = pymysql.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                charset='utf8mb4',
-                connect_timeout=10,
-                read_timeout=30,
-                write_timeout=30,
-                cursorclass=pymysql.cursors.DictCursor
-            )
-            return connection
+            return self.pool.connection()
         except pymysql.Error as e:
             logger.error(f"Failed to connect to TPMS database: {e}")
             raise
 
-    def load_property_cache(self) -> bool:
+    def load_property_cache(self, force: bool = False) -> bool:
         """
         Load all properties into cache for fast lookups.
         Call this once during application startup.
 
+        Args:
+            force: Re-read the table even if the cache is loaded; the old
+                cache is kept if the reload fails
+
         Returns:
             True if successful, False otherwise
         """
-        if self._cache_loaded:
+        if self._cache_loaded and not force:
             return True
 
         try:
@@ -99,19 +96,21 @@ class PropertyResolver:
             rows = cursor.fetchall()
 
             # Build cache: {type: {category_id: title}}
+            property_cache: Dict[int, Dict[int, str]] = {}
             for row in rows:
                 prop_type = row.get('Type')
                 category_id = row.get('CategoryId')
                 title = row.get('Title')
 
                 if prop_type is not None:
-                    if prop_type not in self._property_cache:
-                        self._property_cache[prop_type] = {}
-                    self._property_cache[prop_type][category_id] = title
+                    if prop_type not in property_cache:
+                        property_cache[prop_type] = {}
+                    property_cache[prop_type][category_id] = title
 
             cursor.close()
             connection.close()
 
+            self._property_cache = property_cache
             self._cache_loaded = True
             logger.info(f"PropertyResolver cache loaded: {len(self._property_cache)} property types")
 
@@ -180,6 +179,30 @@ class PropertyResolver:
 
         return result
 
+    def catalog_fingerprint(self, refresh: bool = True) -> str:
+        """
+        Content hash of the property catalog.
+
+        Resolved values depend on the catalog as well as on the codes, so a
+        sync compares this hash with the previous sync's to notice catalog
+        edits that leave the TPMS entities unchanged.
+
+        Args:
+            refresh: Re-read the catalog first (otherwise the process-lifetime
+                cache could hide edits made since it was loaded)
+
+        Returns:
+            SHA-256 hex digest
+        """
+        self.load_property_cache(force=refresh)
+        payload = {
+            str(prop_type): {str(code): title for code, title in values.items()}
+            for prop_type, values in self._property_cache.items()
+        }
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
     def _lookup_property(self, property_type: int, code: int) -> Optional[str]:
         """Direct database lookup for a property value."""
         try:
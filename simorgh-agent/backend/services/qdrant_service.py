@@ -9,8 +9,10 @@ Author: Simorgh Industrial Assistant
 """
 
 import os
+import time
 import logging
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Optional, Any, Callable
 from datetime import datetime
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -22,6 +24,8 @@ from sentence_transformers import SentenceTransformer
 import hashlib
 import uuid
 
+from services.embedding_cache import get_embedding_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,7 +40,9 @@ class QdrantService:
         qdrant_api_key: str = None,
         embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
         llm_service=None,
-        embedding_dim: Optional[int] = None
+        embedding_dim: Optional[int] = None,
+        embedding_batch_size: Optional[int] = None,
+        upsert_batch_size: Optional[int] = None
     ):
         """
         Initialize Qdrant service
@@ -47,10 +53,14 @@ class QdrantService:
             embedding_model: Sentence transformer model for embeddings (fallback if no llm_service)
             llm_service: Optional LLMService instance for LLM-based embeddings
             embedding_dim: Optional explicit embedding dimension (auto-detected if not provided)
+            embedding_batch_size: Texts per embedding request (default: EMBEDDING_BATCH_SIZE or 64)
+            upsert_batch_size: Points per Qdrant upsert (default: QDRANT_UPSERT_BATCH_SIZE or 256)
         """
         self.qdrant_url = qdrant_url or os.getenv("QDRANT_URL", "localhost")
         self.qdrant_port = int(os.getenv("QDRANT_PORT", "6333"))
         self.qdrant_api_key = qdrant_api_key or os.getenv("QDRANT_API_KEY")
+        self.embedding_batch_size = embedding_batch_size or int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+        self.upsert_batch_size = upsert_batch_size or int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
 
         # Initialize Qdrant client
         if self.qdrant_api_key:
@@ -79,6 +89,9 @@ class QdrantService:
         self.embedding_model = None
         self.embedding_model_name = None
 
+        # Shared content-addressed embedding cache (LLM embeddings are cached by LLMService)
+        self.embedding_cache = get_embedding_cache()
+
         if self.llm_service:
             # Use LLM-based embeddings (better for domain-specific content)
             logger.info(f"🔄 Using LLM-based embeddings for superior semantic understanding")
@@ -231,12 +244,114 @@ class QdrantService:
                 return embedding
             else:
                 # Fallback to SentenceTransformer (legacy mode)
-                embedding = self.embedding_model.encode(text, convert_to_numpy=True)
-                return embedding.tolist()
+                return self.embedding_cache.get_or_compute(
+                    self.embedding_model_name,
+                    text,
+                    lambda t: self.embedding_model.encode(t, convert_to_numpy=True).tolist()
+                )
         except Exception as e:
             logger.error(f"❌ Failed to generate embedding: {e}")
             raise
 
+    def generate_embeddings(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None
+    ) -> List[List[float]]:
+        """
+        Generate embedding vectors for many texts in batched requests
+
+        Args:
+            texts: Input texts
+            batch_size: Texts per request (default: self.embedding_batch_size)
+
+        Returns:
+            Embedding vectors in the same order as texts
+        """
+        if not texts:
+            return []
+
+        batch_size = batch_size or self.embedding_batch_size
+
+        try:
+            if self.llm_service:
+                return self.llm_service.generate_embeddings(texts, batch_size=batch_size)
+            else:
+                return self.embedding_cache.get_or_compute_many(
+                    self.embedding_model_name,
+                    texts,
+                    lambda missing: self.embedding_model.encode(
+                        missing,
+                        batch_size=batch_size,
+                        convert_to_numpy=True
+                    ).tolist()
+                )
+        except Exception as e:
+            logger.error(f"❌ Failed to generate batch embeddings: {e}")
+            raise
+
+    def _embed_and_upsert(
+        self,
+        collection_name: str,
+        texts: List[str],
+        build_point: Callable[[int, List[float]], PointStruct]
+    ) -> int:
+        """
+        Embed texts in batches and upsert the resulting points in bounded batches
+
+        Upserts run on a single background worker so the next embedding batch
+        is computed while the previous points are being written. At most one
+        upsert is in flight at a time.
+
+        Args:
+            collection_name: Target collection
+            texts: Texts to embed
+            build_point: Callback (index into texts, embedding) -> PointStruct
+
+        Returns:
+            Number of points written
+        """
+        start_time = time.time()
+        written = 0
+        pending: List[PointStruct] = []
+        inflight: Optional[Future] = None
+
+        def flush(executor: ThreadPoolExecutor, count: int):
+            nonlocal pending, inflight, written
+            if inflight is not None:
+                inflight.result()
+            batch, pending = pending[:count], pending[count:]
+            inflight = executor.submit(
+                self.client.upsert,
+                collection_name=collection_name,
+                points=batch
+            )
+            written += len(batch)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="qdrant-upsert") as executor:
+            for offset in range(0, len(texts), self.embedding_batch_size):
+                batch_texts = texts[offset:offset + self.embedding_batch_size]
+                embeddings = self.generate_embeddings(batch_texts)
+
+                for i, embedding in enumerate(embeddings):
+                    pending.append(build_point(offset + i, embedding))
+
+                while len(pending) >= self.upsert_batch_size:
+                    flush(executor, self.upsert_batch_size)
+
+            if pending:
+                flush(executor, len(pending))
+            if inflight is not None:
+                inflight.result()
+
+        elapsed = time.time() - start_time
+        logger.info(
+            f"📦 Embedded and upserted {written} points to {collection_name} "
+            f"in {elapsed:.2f}s (embed batch={self.embedding_batch_size}, "
+            f"upsert batch={self.upsert_batch_size})"
+        )
+        return written
+
     def add_document_chunks(
         self,
         user_id: str,
@@ -269,19 +384,20 @@ class QdrantService:
             return False
 
         try:
-            points = []
-
+            valid_chunks = []
             for chunk in chunks:
-                # Generate unique ID for chunk
-                chunk_id = str(uuid.uuid4())
-
-                # Generate embedding
-                text = chunk.get("text", "")
-                if not text:
+                if not chunk.get("text", ""):
                     logger.warning(f"⚠️ Empty chunk text, skipping")
                     continue
+                valid_chunks.append(chunk)
 
-                embedding = self.generate_embedding(text)
+            if not valid_chunks:
+                logger.warning(f"⚠️ No valid chunks to add")
+                return False
+
+            def build_point(index: int, embedding: List[float]) -> PointStruct:
+                chunk = valid_chunks[index]
+                text = chunk["text"]
 
                 # Prepare payload with session context
                 payload = {
@@ -302,25 +418,21 @@ class QdrantService:
                 if "metadata" in chunk:
                     payload["metadata"] = chunk["metadata"]
 
-                # Create point
-                point = PointStruct(
-                    id=chunk_id,
+                # Create point with a unique ID for the chunk
+                return PointStruct(
+                    id=str(uuid.uuid4()),
                     vector=embedding,
                     payload=payload
                 )
-                points.append(point)
 
-            # Upload points in batch
-            if points:
-                self.client.upsert(
-                    collection_name=collection_name,
-                    points=points
-                )
-                logger.info(f"✅ Added {len(points)} chunks to {collection_name}")
-                return True
-            else:
-                logger.warning(f"⚠️ No valid chunks to add")
-                return False
+            # Embed in batches and upload in bounded batches
+            written = self._embed_and_upsert(
+                collection_name,
+                [chunk["text"] for chunk in valid_chunks],
+                build_point
+            )
+            logger.info(f"✅ Added {written} chunks to {collection_name}")
+            return True
 
         except Exception as e:
             logger.error(f"❌ Failed to add document chunks: {e}")
@@ -334,7 +446,8 @@ class QdrantService:
         document_id: Optional[str] = None,
         score_threshold: float = 0.5,
         session_id: Optional[str] = None,
-        project_oenum: Optional[str] = None
+        project_oenum: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform semantic search in session-specific collection
@@ -347,6 +460,7 @@ class QdrantService:
             score_threshold: Minimum similarity score (0.0 to 1.0)
             session_id: Optional session ID for general chats
             project_oenum: Optional project OE number for project chats
+            query_embedding: Optional precomputed embedding of query (see QueryContext)
 
         Returns:
             List of search results with chunks and scores
@@ -354,8 +468,9 @@ class QdrantService:
         collection_name = self._get_collection_name(user_id, session_id, project_oenum)
 
         try:
-            # Generate query embedding
-            query_embedding = self.generate_embedding(query)
+            # Generate query embedding (unless the caller already has it)
+            if query_embedding is None:
+                query_embedding = self.generate_embedding(query)
 
             # Prepare filter if document_id specified
             search_filter = None
@@ -808,7 +923,8 @@ class QdrantService:
         project_filter: Optional[str] = None,
         chat_id: Optional[str] = None,
         fallback_to_recent: bool = True,
-        fallback_limit: int = 10
+        fallback_limit: int = 10,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve semantically similar past conversations for a user
@@ -823,6 +939,7 @@ class QdrantService:
             chat_id: Optional filter by chat ID (for session isolation)
             fallback_to_recent: If True and no semantic matches, return recent conversations
             fallback_limit: Number of recent conversations to return as fallback
+            query_embedding: Optional precomputed embedding of current_query (see QueryContext)
 
         Returns:
             List of similar past conversations with scores
@@ -838,8 +955,9 @@ class QdrantService:
                 logger.info(f"ℹ️ No memory collection exists yet for user {user_id}")
                 return []
 
-            # Generate query embedding
-            query_embedding = self.generate_embedding(current_query)
+            # Generate query embedding (unless the caller already has it)
+            if query_embedding is None:
+                query_embedding = self.generate_embedding(current_query)
 
             # Prepare filter for project and chat isolation
             search_filter = None
@@ -1035,20 +1153,24 @@ class QdrantService:
             return False
 
         try:
-            points = []
-
+            valid_sections = []
             for section_data in section_summaries:
-                section_id = section_data.get("section_id")
-                summary = section_data.get("summary", "")
-                full_content = section_data.get("full_content", "")
-
-                if not summary or not full_content:
-                    logger.warning(f"⚠️ Empty summary or content for section {section_id}, skipping")
+                if not section_data.get("summary", "") or not section_data.get("full_content", ""):
+                    logger.warning(
+                        f"⚠️ Empty summary or content for section {section_data.get('section_id')}, skipping"
+                    )
                     continue
+                valid_sections.append(section_data)
 
-                # Generate embedding from SUMMARY (not full content)
-                # This allows semantic search on high-level topics
-                embedding = self.generate_embedding(summary)
+            if not valid_sections:
+                logger.warning(f"⚠️ No valid section summaries to add")
+                return False
+
+            def build_point(index: int, embedding: List[float]) -> PointStruct:
+                section_data = valid_sections[index]
+                section_id = section_data.get("section_id")
+                summary = section_data["summary"]
+                full_content = section_data["full_content"]
 
                 # Prepare payload with both summary and full content
                 payload = {
@@ -1088,24 +1210,21 @@ class QdrantService:
                     payload["metadata"] = section_data["metadata"]
 
                 # Create point with section_id as the point ID
-                point = PointStruct(
+                return PointStruct(
                     id=section_id,  # Use section_id directly for easy retrieval
                     vector=embedding,
                     payload=payload
                 )
-                points.append(point)
 
-            # Upload points in batch
-            if points:
-                self.client.upsert(
-                    collection_name=collection_name,
-                    points=points
-                )
-                logger.info(f"✅ Added {len(points)} section summaries to {collection_name}")
-                return True
-            else:
-                logger.warning(f"⚠️ No valid section summaries to add")
-                return False
+            # Generate embeddings from SUMMARY (not full content)
+            # This allows semantic search on high-level topics
+            written = self._embed_and_upsert(
+                collection_name,
+                [section_data["summary"] for section_data in valid_sections],
+                build_point
+            )
+            logger.info(f"✅ Added {written} section summaries to {collection_name}")
+            return True
 
         except Exception as e:
             logger.error(f"❌ Failed to add section summaries: {e}")
@@ -1119,7 +1238,8 @@ class QdrantService:
         document_id: Optional[str] = None,
         score_threshold: float = 0.5,
         session_id: Optional[str] = None,
-        project_oenum: Optional[str] = None
+        project_oenum: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search section summaries and retrieve full section content from session-specific collection
@@ -1136,6 +1256,7 @@ class QdrantService:
             score_threshold: Minimum similarity score (0.0 to 1.0)
             session_id: Optional session ID for general chats
             project_oenum: Optional project OE number for project chats
+            query_embedding: Optional precomputed embedding of query (see QueryContext)
 
         Returns:
             List of results with full section content
@@ -1143,72 +1264,142 @@ class QdrantService:
         collection_name = self._get_collection_name(user_id, session_id, project_oenum)
 
         try:
-            # Generate query embedding
-            query_embedding = self.generate_embedding(query)
-
-            # Prepare filter for section summaries
-            filter_conditions = [
-                FieldCondition(
-                    key="storage_type",
-                    match=MatchValue(value="section_summary")
-                )
-            ]
-
-            if document_id:
-                filter_conditions.append(
-                    FieldCondition(
-                        key="document_id",
-                        match=MatchValue(value=document_id)
-                    )
-                )
-
-            search_filter = Filter(must=filter_conditions)
+            # Generate query embedding (unless the caller already has it)
+            if query_embedding is None:
+                query_embedding = self.generate_embedding(query)
 
             # Perform search
             results = self.client.search(
                 collection_name=collection_name,
                 query_vector=query_embedding,
                 limit=limit,
-                query_filter=search_filter,
+                query_filter=self._section_summary_filter(document_id),
                 score_threshold=score_threshold
             )
 
             # Format results with FULL CONTENT (not summary)
-            formatted_results = []
-            for result in results:
-                formatted_results.append({
-                    "section_id": result.payload.get("section_id", ""),
-                    "score": result.score,
+            formatted_results = [self._format_section_result(result) for result in results]
 
-                    # Return FULL content for context
-                    "text": result.payload.get("full_content", ""),
-                    "full_content": result.payload.get("full_content", ""),
+            logger.info(f"🔍 Found {len(formatted_results)} section matches for query")
+            return formatted_results
 
-                    # Also include summary for reference
-                    "summary": result.payload.get("summary", ""),
+        except Exception as e:
+            logger.error(f"❌ Section summary search failed: {e}")
+            return []
 
-                    # Section metadata
-                    "section_title": result.payload.get("section_title", ""),
-                    "heading_level": result.payload.get("heading_level", 0),
-                    "parent_section_id": result.payload.get("parent_section_id", ""),
+    def search_section_summaries_batch(
+        self,
+        user_id: str,
+        query_embeddings: List[List[float]],
+        limit: int = 5,
+        document_id: Optional[str] = None,
+        score_threshold: float = 0.5,
+        session_id: Optional[str] = None,
+        project_oenum: Optional[str] = None
+    ) -> Optional[List[List[Dict[str, Any]]]]:
+        """
+        Search section summaries for several query vectors in one request
 
-                    # Topics
-                    "subjects": result.payload.get("subjects", []),
-                    "key_topics": result.payload.get("key_topics", []),
+        Same filters and result format as search_section_summaries, with one
+        Qdrant search_batch call instead of a round trip per query.
 
-                    # Document reference
-                    "document_id": result.payload.get("document_id", ""),
+        Args:
+            user_id: User identifier
+            query_embeddings: Precomputed query embeddings
+            limit: Maximum number of results per query
+            document_id: Optional filter by specific document
+            score_threshold: Minimum similarity score (0.0 to 1.0)
+            session_id: Optional session ID for general chats
+            project_oenum: Optional project OE number for project chats
 
-                    # Metadata
-                    "metadata": result.payload.get("metadata", {})
-                })
+        Returns:
+            One result list per query embedding, in order, or None if the
+            batch search failed (callers may then search per query)
+        """
+        if not query_embeddings:
+            return []
 
-            logger.info(f"🔍 Found {len(formatted_results)} section matches for query")
-            return formatted_results
+        collection_name = self._get_collection_name(user_id, session_id, project_oenum)
+
+        try:
+            search_filter = self._section_summary_filter(document_id)
+            responses = self.client.search_batch(
+                collection_name=collection_name,
+                requests=[
+                    SearchRequest(
+                        vector=embedding,
+                        filter=search_filter,
+                        limit=limit,
+                        score_threshold=score_threshold,
+                        with_payload=True
+                    )
+                    for embedding in query_embeddings
+                ]
+            )
+
+            results = [
+                [self._format_section_result(result) for result in response]
+                for response in responses
+            ]
+            logger.info(
+                f"🔍 Batch section search: {len(results)} queries, "
+                f"{sum(1 for r in results if r)} with matches"
+            )
+            return results
 
         except Exception as e:
-            logger.error(f"❌ Section summary search failed: {e}")
-            return []
+            logger.error(f"❌ Batch section summary search failed: {e}")
+            return None
+
+    @staticmethod
+    def _section_summary_filter(document_id: Optional[str] = None) -> Filter:
+        """Filter for section summaries, optionally of one document"""
+        filter_conditions = [
+            FieldCondition(
+                key="storage_type",
+                match=MatchValue(value="section_summary")
+            )
+        ]
+
+        if document_id:
+            filter_conditions.append(
+                FieldCondition(
+                    key="document_id",
+                    match=MatchValue(value=document_id)
+                )
+            )
+
+        return Filter(must=filter_conditions)
+
+    @staticmethod
+    def _format_section_result(result) -> Dict[str, Any]:
+        """Section search hit with FULL content (not only the summary)"""
+        return {
+            "section_id": result.payload.get("section_id", ""),
+            "score": result.score,
+
+            # Return FULL content for context
+            "text": result.payload.get("full_content", ""),
+            "full_content": result.payload.get("full_content", ""),
+
+            # Also include summary for reference
+            "summary": result.payload.get("summary", ""),
+
+            # Section metadata
+            "section_title": result.payload.get("section_title", ""),
+            "heading_level": result.payload.get("heading_level", 0),
+            "parent_section_id": result.payload.get("parent_section_id", ""),
+
+            # Topics
+            "subjects": result.payload.get("subjects", []),
+            "key_topics": result.payload.get("key_topics", []),
+
+            # Document reference
+            "document_id": result.payload.get("document_id", ""),
+
+            # Metadata
+            "metadata": result.payload.get("metadata", {})
+        }
 
     def get_section_by_id(
         self,
@@ -0,0 +1,86 @@
+"""
+Query Context
+=============
+Per-request state for one chat turn, shared by every retriever.
+
+The user message is embedded at most once per turn; section search,
+user-memory search and memory-manager search all receive the same vector
+instead of each calling the embedding backend again.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import time
+import logging
+import threading
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueryContext:
+    """
+    Lazily computed, shared query embedding for a single chat turn
+
+    Usage:
+        query_context = QueryContext(_content, qdrant)
+        qdrant.search_section_summaries(..., query_embedding=query_context.embedding)
+        qdrant.retrieve_similar_conversations(..., query_embedding=query_context.embedding)
+    """
+
+    def __init__(self, query: str, qdrant_service):
+        """
+        Initialize query context
+
+        Args:
+            query: The user message for this turn
+            qdrant_service: QdrantService whose embedding model the retrievers search with
+        """
+        self.query = query
+        self.qdrant_service = qdrant_service
+
+        self._embedding: Optional[List[float]] = None
+        self._lock = threading.Lock()
+        self.embedding_ms: Optional[float] = None
+        self.embedding_requests = 0
+
+    @property
+    def embedding(self) -> List[float]:
+        """
+        Query embedding, computed on first access
+
+        Thread-safe so retrievers running in worker threads share one call.
+
+        Raises:
+            Exception: Propagates embedding failures to the first caller
+        """
+        with self._lock:
+            self.embedding_requests += 1
+            if self._embedding is None:
+                start_time = time.time()
+                self._embedding = self.qdrant_service.generate_embedding(self.query)
+                self.embedding_ms = (time.time() - start_time) * 1000
+                logger.debug(f"🧮 Query embedded once for this turn in {self.embedding_ms:.1f}ms")
+            return self._embedding
+
+    def try_embedding(self) -> Optional[List[float]]:
+        """
+        Query embedding, or None if it cannot be computed
+
+        For callers that pass the vector on to retrievers with their own
+        error handling - they fall back to embedding the query themselves.
+        """
+        try:
+            return self.embedding
+        except Exception as e:
+            logger.warning(f"⚠️ Query embedding failed, retrievers will embed individually: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-turn embedding statistics"""
+        return {
+            "embedding_computed": self._embedding is not None,
+            "embedding_ms": self.embedding_ms,
+            "embedding_requests": self.embedding_requests,
+            "embedding_calls_saved": max(0, self.embedding_requests - 1),
+        }
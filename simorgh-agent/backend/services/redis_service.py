@@ -8,7 +8,10 @@ Database Layout:
 - DB 1: Chat history
 - DB 2: LLM response caching
 - DB 3: Project authorization caching (1 hour TTL)
-- DB 4: Project TPMS data caching (Neo4j context cache for faster LLM responses)
+- DB 4: Project TPMS data caching (Neo4j context cache for faster LLM responses,
+  versioned by a per-project graph version bumped after each sync)
+- DB 5: Embedding cache (binary float32/float16 vectors)
+- DB 6: Rate limiter token buckets (middleware/rate_limiter.py)
 
 Author: Simorgh Industrial Assistant
 """
@@ -16,7 +19,7 @@ Author: Simorgh Industrial Assistant
 import os
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from datetime import timedelta
 import redis
 from redis.exceptions import RedisError, ConnectionError
@@ -46,17 +49,21 @@ class RedisService:
         self.cache_client = self._create_client(db=2)    # LLM response caching
         self.auth_client = self._create_client(db=3)     # Authorization caching
         self.project_client = self._create_client(db=4)  # Project TPMS data caching
+        self.embedding_client = self._create_client(db=5, decode_responses=False)  # Binary embeddings
+
+        # In-process caches to clear alongside invalidate_project_cache
+        self._project_invalidation_listeners: List[Callable[[str], Any]] = []
 
         logger.info(f"✅ Redis service initialized: {self.base_url}")
 
-    def _create_client(self, db: int) -> redis.Redis:
+    def _create_client(self, db: int, decode_responses: bool = True) -> redis.Redis:
         """Create a Redis client for a specific database"""
         url_parts = self.base_url.rsplit("/", 1)
         db_url = f"{url_parts[0]}/{db}"
 
         return redis.Redis.from_url(
             db_url,
-            decode_responses=True,
+            decode_responses=decode_responses,
             socket_connect_timeout=5,
             socket_timeout=5,
             retry_on_timeout=True,
@@ -72,7 +79,8 @@ class RedisService:
                 "chat_db": self.chat_client,
                 "cache_db": self.cache_client,
                 "auth_db": self.auth_client,
-                "project_db": self.project_client
+                "project_db": self.project_client,
+                "embedding_db": self.embedding_client
             }
 
             db_status = {}
@@ -474,6 +482,56 @@ class RedisService:
             logger.error(f"Failed to clear LLM cache: {e}")
             return False
 
+    # =========================================================================
+    # EMBEDDING CACHING (DB 5)
+    # =========================================================================
+
+    def cache_embeddings(
+        self,
+        entries: Dict[str, bytes],
+        ttl: int = 7 * 24 * 3600  # 7 days default
+    ) -> bool:
+        """
+        Cache embedding vectors as binary blobs
+
+        Args:
+            entries: Mapping of cache key -> packed vector bytes
+            ttl: Cache lifetime in seconds
+
+        Returns:
+            True if successful
+        """
+        try:
+            pipe = self.embedding_client.pipeline(transaction=False)
+            for key, blob in entries.items():
+                pipe.setex(key, ttl, blob)
+            pipe.execute()
+            logger.debug(f"Cached {len(entries)} embeddings")
+            return True
+        except RedisError as e:
+            logger.error(f"Failed to cache embeddings: {e}")
+            return False
+
+    def get_cached_embeddings(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Retrieve cached embedding blobs (None for misses), in key order"""
+        if not keys:
+            return []
+        try:
+            return self.embedding_client.mget(keys)
+        except RedisError as e:
+            logger.error(f"Failed to get cached embeddings: {e}")
+            return [None] * len(keys)
+
+    def clear_embedding_cache(self) -> bool:
+        """Clear all cached embeddings"""
+        try:
+            self.embedding_client.flushdb()
+            logger.info("Embedding cache cleared")
+            return True
+        except RedisError as e:
+            logger.error(f"Failed to clear embedding cache: {e}")
+            return False
+
     # =========================================================================
     # AUTHORIZATION CACHING (DB 3)
     # =========================================================================
@@ -595,11 +653,45 @@ class RedisService:
     # PROJECT TPMS DATA CACHING (DB 4)
     # =========================================================================
 
+    def get_project_graph_version(self, project_number: str) -> Optional[int]:
+        """
+        Get the graph version of a project.
+
+        The version is bumped after every sync that changed the project
+        graph, so caches keyed by it are invalidated exactly when the data
+        changes. The key has no TTL and survives invalidate_project_cache.
+
+        Returns:
+            Version (0 if the project was never synced here), None if Redis is unavailable
+        """
+        try:
+            value = self.project_client.get(f"project:graph_version:{project_number}")
+            return int(value) if value else 0
+        except (RedisError, ValueError) as e:
+            logger.error(f"Failed to get project graph version: {e}")
+            return None
+
+    def bump_project_graph_version(self, project_number: str) -> Optional[int]:
+        """
+        Increment the graph version of a project (call after the graph changed).
+
+        Returns:
+            New version, None if Redis is unavailable
+        """
+        try:
+            version = self.project_client.incr(f"project:graph_version:{project_number}")
+            logger.info(f"🔢 Project graph version bumped: {project_number} -> {version}")
+            return version
+        except RedisError as e:
+            logger.error(f"Failed to bump project graph version: {e}")
+            return None
+
     def cache_project_tpms_context(
         self,
         project_number: str,
         context: Dict[str, Any],
-        ttl: int = 1800  # 30 minutes default
+        ttl: int = 1800,  # 30 minutes default
+        graph_version: Optional[int] = None
     ) -> bool:
         """
         Cache project TPMS context from Neo4j for faster LLM responses.
@@ -614,6 +706,7 @@ class RedisService:
             project_number: Project OENUM
             context: Full project context from Neo4j
             ttl: Cache lifetime (default 30 minutes)
+            graph_version: Graph version the context was read at
 
         Returns:
             True if successful
@@ -622,6 +715,7 @@ class RedisService:
             key = f"project:tpms_context:{project_number}"
             value = json.dumps({
                 "context": context,
+                "graph_version": graph_version,
                 "cached_at": self._now()
             })
 
@@ -634,11 +728,16 @@ class RedisService:
 
     def get_cached_project_tpms_context(
         self,
-        project_number: str
+        project_number: str,
+        graph_version: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Get cached project TPMS context.
 
+        Args:
+            project_number: Project OENUM
+            graph_version: If given, only a context cached at this graph version is returned
+
         Returns:
             Cached context if available, None if cache miss
         """
@@ -648,6 +747,9 @@ class RedisService:
 
             if value:
                 data = json.loads(value)
+                if graph_version is not None and data.get("graph_version") != graph_version:
+                    logger.debug(f"📦 Project context cache STALE: {project_number} (graph version changed)")
+                    return None
                 logger.debug(f"📦 Project context cache HIT: {project_number}")
                 return data["context"]
 
@@ -805,10 +907,17 @@ class RedisService:
         Invalidate all cached data for a project.
 
         Should be called when project data is updated (e.g., after TPMS sync).
+        Also notifies listeners registered via add_project_invalidation_listener.
 
         Args:
             project_number: Project OENUM
         """
+        for listener in self._project_invalidation_listeners:
+            try:
+                listener(project_number)
+            except Exception as e:
+                logger.warning(f"Project invalidation listener failed: {e}")
+
         try:
             patterns = [
                 f"project:tpms_context:{project_number}",
@@ -833,6 +942,19 @@ class RedisService:
             logger.error(f"Failed to invalidate project cache: {e}")
             return False
 
+    def add_project_invalidation_listener(self, listener: Callable[[str], Any]) -> None:
+        """
+        Register a callback run by invalidate_project_cache
+
+        Lets in-process caches (e.g. the semantic response cache) drop
+        project data at the same time as the Redis project cache.
+
+        Args:
+            listener: Called with the project number
+        """
+        if listener not in self._project_invalidation_listeners:
+            self._project_invalidation_listeners.append(listener)
+
     def get_project_cache_stats(self, project_number: str) -> Dict[str, Any]:
         """
         Get cache statistics for a project.
@@ -1117,6 +1239,7 @@ class RedisService:
             self.cache_client.close()
             self.auth_client.close()
             self.project_client.close()
+            self.embedding_client.close()
             logger.info("Redis connections closed")
         except Exception as e:
             logger.error(f"Error closing Redis connections: {e}")
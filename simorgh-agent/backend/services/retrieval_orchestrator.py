@@ -0,0 +1,209 @@
+"""
+Retrieval Orchestrator
+======================
+Concurrent fan-out of the independent retrieval stages of a chat turn.
+
+Graph spec lookup, BFS subgraph, section vector search, user memory and
+Redis history do not depend on each other, so they run side by side and
+the turn waits for the slowest stage instead of the sum of all of them.
+
+Each stage has its own timeout, and the whole fan-out has a latency budget:
+stages still running when the budget expires are dropped and the turn
+continues with whatever context has arrived.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageResult:
+    """Outcome of a single retrieval stage"""
+    name: str
+    value: Any = None
+    status: str = "pending"  # ok | error | timeout | dropped
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+@dataclass
+class _Stage:
+    fn: Callable
+    args: tuple
+    kwargs: Dict[str, Any]
+    timeout: float
+    default: Any
+
+
+class RetrievalOrchestrator:
+    """
+    Run retrieval stages concurrently with per-stage timeouts and a budget
+
+    Blocking callables run in worker threads; coroutine functions run on the
+    event loop. A failed, timed-out or dropped stage yields its default value,
+    so callers handle it exactly like an empty retrieval result.
+
+    Note: a worker thread cannot be interrupted, so a timed-out blocking stage
+    keeps running in the background - its result is simply discarded.
+
+    Usage:
+        retrieval = RetrievalOrchestrator()
+        retrieval.add_stage("subgraph", graph_rag.find_related_subgraph, project_number=pn, query=q)
+        retrieval.add_stage("history", redis.get_chat_history, chat_id, limit=10, default=[])
+        await retrieval.run()
+        subgraph = retrieval.value("subgraph")
+    """
+
+    def __init__(
+        self,
+        budget_seconds: Optional[float] = None,
+        stage_timeout: Optional[float] = None
+    ):
+        """
+        Initialize orchestrator
+
+        Args:
+            budget_seconds: Overall latency budget (default: RETRIEVAL_BUDGET_SECONDS or 8s)
+            stage_timeout: Default per-stage timeout (default: RETRIEVAL_STAGE_TIMEOUT or 5s)
+        """
+        if budget_seconds is None:
+            budget_seconds = float(os.getenv("RETRIEVAL_BUDGET_SECONDS", "8"))
+        if stage_timeout is None:
+            stage_timeout = float(os.getenv("RETRIEVAL_STAGE_TIMEOUT", "5"))
+
+        self.budget_seconds = budget_seconds
+        self.stage_timeout = stage_timeout
+
+        self._stages: Dict[str, _Stage] = {}
+        self.results: Dict[str, StageResult] = {}
+        self.total_ms: Optional[float] = None
+
+    def add_stage(
+        self,
+        name: str,
+        fn: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        default: Any = None,
+        **kwargs
+    ) -> None:
+        """
+        Register a retrieval stage
+
+        Args:
+            name: Stage name, used to look up its result
+            fn: Blocking callable or coroutine function
+            *args, **kwargs: Arguments for fn
+            timeout: Per-stage timeout (default: orchestrator stage_timeout)
+            default: Value used when the stage fails, times out or is dropped
+        """
+        self._stages[name] = _Stage(
+            fn=fn,
+            args=args,
+            kwargs=kwargs,
+            timeout=self.stage_timeout if timeout is None else timeout,
+            default=default
+        )
+
+    async def run(self) -> Dict[str, StageResult]:
+        """
+        Run all registered stages concurrently
+
+        Returns:
+            Stage name -> StageResult, for every registered stage
+        """
+        start_time = time.perf_counter()
+
+        tasks = {
+            name: asyncio.ensure_future(self._run_stage(name, stage))
+            for name, stage in self._stages.items()
+        }
+
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=self.budget_seconds)
+        else:
+            pending = set()
+
+        for name, task in tasks.items():
+            if task in pending:
+                task.cancel()
+                self.results[name] = StageResult(
+                    name=name,
+                    value=self._stages[name].default,
+                    status="dropped",
+                    elapsed_ms=self.budget_seconds * 1000
+                )
+                logger.warning(f"⏱️ Retrieval stage '{name}' exceeded the {self.budget_seconds:.1f}s budget, result dropped")
+            else:
+                self.results[name] = task.result()
+
+        self.total_ms = (time.perf_counter() - start_time) * 1000
+
+        timings = ", ".join(
+            f"{name}={result.elapsed_ms:.0f}ms" + ("" if result.ok else f" ({result.status})")
+            for name, result in self.results.items()
+        )
+        logger.info(f"⚡ Retrieval fan-out finished in {self.total_ms:.0f}ms [{timings}]")
+
+        return self.results
+
+    def value(self, name: str, default: Any = None) -> Any:
+        """Get a stage's value, or default if the stage was not registered or produced nothing"""
+        result = self.results.get(name)
+        if result is None or result.value is None:
+            return default
+        return result.value
+
+    def get_timings(self) -> Dict[str, Any]:
+        """Get per-stage timings of the last run"""
+        return {
+            "total_ms": round(self.total_ms, 1) if self.total_ms is not None else None,
+            "budget_ms": self.budget_seconds * 1000,
+            "sequential_ms": round(sum(r.elapsed_ms for r in self.results.values()), 1),
+            "stages": {
+                name: {
+                    "status": result.status,
+                    "elapsed_ms": round(result.elapsed_ms, 1),
+                    **({"error": result.error} if result.error else {})
+                }
+                for name, result in self.results.items()
+            }
+        }
+
+    async def _run_stage(self, name: str, stage: _Stage) -> StageResult:
+        """Run one stage under its timeout, never raising"""
+        start_time = time.perf_counter()
+        result = StageResult(name=name, value=stage.default)
+
+        try:
+            if asyncio.iscoroutinefunction(stage.fn):
+                coro = stage.fn(*stage.args, **stage.kwargs)
+            else:
+                coro = asyncio.to_thread(stage.fn, *stage.args, **stage.kwargs)
+
+            result.value = await asyncio.wait_for(coro, timeout=stage.timeout)
+            result.status = "ok"
+
+        except asyncio.TimeoutError:
+            result.status = "timeout"
+            logger.warning(f"⏱️ Retrieval stage '{name}' timed out after {stage.timeout:.1f}s")
+
+        except Exception as e:
+            result.status = "error"
+            result.error = str(e)
+            logger.warning(f"⚠️ Retrieval stage '{name}' failed: {e}")
+
+        result.elapsed_ms = (time.perf_counter() - start_time) * 1000
+        return result
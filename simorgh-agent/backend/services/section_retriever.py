@@ -150,7 +150,8 @@ class SectionRetriever:
                 "sections_extracted": len(sections),
                 "summaries_generated": len(section_summaries),
                 "section_stats": section_stats,
-                "summary_stats": summary_stats
+                "summary_stats": summary_stats,
+                "summarization": self.summarizer.last_batch_stats
             }
 
         except Exception as e:
@@ -166,7 +167,8 @@ class SectionRetriever:
         query: str,
         limit: int = 5,
         document_id: Optional[str] = None,
-        score_threshold: float = 0.3
+        score_threshold: float = 0.3,
+        query_embedding: Optional[List[float]] = None
     ) -> Dict[str, Any]:
         """
         Retrieve relevant sections for a query
@@ -179,6 +181,7 @@ class SectionRetriever:
             limit: Maximum number of sections to retrieve
             document_id: Optional filter by specific document
             score_threshold: Minimum relevance score
+            query_embedding: Optional precomputed embedding of query
 
         Returns:
             Dictionary with retrieved sections and metadata
@@ -193,7 +196,8 @@ class SectionRetriever:
                 limit=limit,
                 document_id=document_id,
                 score_threshold=score_threshold,
-                project_oenum=project_number  # Project OE number for session isolation
+                project_oenum=project_number,  # Project OE number for session isolation
+                query_embedding=query_embedding
             )
 
             logger.info(f"✅ Retrieved {len(results)} relevant sections")
@@ -7,7 +7,15 @@ that capture all subjects and topics for semantic search.
 Author: Simorgh Industrial Assistant
 """
 
+import os
+import json
+import time
+import random
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
@@ -32,6 +40,11 @@ class SectionSummary:
 class SectionSummarizer:
     """
     Service for generating LLM-based summaries of document sections
+
+    Batches are summarized by a bounded thread pool (the LLM calls are I/O
+    bound); failed calls are retried with exponential backoff. Successful
+    analyses are kept in a small LRU keyed by a hash of the section content,
+    so repeated sections and re-ingested documents skip the LLM.
     """
 
     def __init__(self, llm_service):
@@ -43,13 +56,25 @@ class SectionSummarizer:
         """
         self.llm_service = llm_service
 
+        self.max_concurrent = int(os.getenv("SECTION_SUMMARY_CONCURRENCY", "3"))
+        self.max_retries = int(os.getenv("SECTION_SUMMARY_MAX_RETRIES", "2"))
+        self.retry_backoff = float(os.getenv("SECTION_SUMMARY_RETRY_BACKOFF", "1.0"))
+        self.cache_size = int(os.getenv("SECTION_SUMMARY_CACHE_SIZE", "2000"))
+
+        # content hash -> successful analysis
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self.last_batch_stats: Dict[str, Any] = {}
+
     def summarize_section(
         self,
         section_content: str,
         section_title: str,
         heading_level: int,
         context_hint: str = "",
-        llm_mode: Optional[str] = None
+        llm_mode: Optional[str] = None,
+        max_retries: int = 0
     ) -> Dict[str, Any]:
         """
         Generate comprehensive summary for a section
@@ -60,10 +85,37 @@ class SectionSummarizer:
             heading_level: Level of heading (1-6)
             context_hint: Optional context about document type
             llm_mode: Optional LLM mode (online/offline), auto-detected if None
+            max_retries: Extra attempts on failure, with exponential backoff
 
         Returns:
             Dictionary with summary, subjects, and key topics
         """
+        attempt = 0
+        while True:
+            result = self._summarize_once(
+                section_content, section_title, heading_level, context_hint, llm_mode
+            )
+            if result["success"] or attempt >= max_retries:
+                result["attempts"] = attempt + 1
+                return result
+
+            attempt += 1
+            delay = self.retry_backoff * (2 ** (attempt - 1)) * (1 + random.random() * 0.25)
+            logger.warning(
+                f"🔁 Retrying section '{section_title}' in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{max_retries + 1})"
+            )
+            time.sleep(delay)
+
+    def _summarize_once(
+        self,
+        section_content: str,
+        section_title: str,
+        heading_level: int,
+        context_hint: str,
+        llm_mode: Optional[str]
+    ) -> Dict[str, Any]:
+        """Single LLM analysis attempt, falling back to a basic summary on error"""
         try:
             # Construct prompt for LLM analysis
             system_prompt = """You are an expert technical document analyzer specializing in electrical engineering and industrial systems.
@@ -116,7 +168,6 @@ Make sure the summary is comprehensive and captures all important information fo
             response_text = result["response"]
 
             # Parse JSON response
-            import json
             import re
 
             # Extract JSON from response (handle markdown code blocks)
@@ -165,11 +216,15 @@ Make sure the summary is comprehensive and captures all important information fo
         sections: List[Dict[str, Any]],
         context_hint: str = "",
         llm_mode: Optional[str] = None,
-        max_concurrent: int = 3
+        max_concurrent: Optional[int] = None
     ) -> List[SectionSummary]:
         """
         Summarize multiple sections in batch
 
+        Sections are summarized concurrently; the result keeps the input
+        order (empty sections are dropped). Throughput and reuse counts of
+        the run are kept in last_batch_stats.
+
         Args:
             sections: List of section dictionaries with keys:
                 - section_id: Unique section identifier
@@ -180,64 +235,153 @@ Make sure the summary is comprehensive and captures all important information fo
                 - metadata: Optional additional metadata
             context_hint: Optional context about document type
             llm_mode: Optional LLM mode
-            max_concurrent: Maximum concurrent LLM calls (not implemented yet, sequential for now)
+            max_concurrent: Maximum concurrent LLM calls (default: SECTION_SUMMARY_CONCURRENCY or 3)
 
         Returns:
             List of SectionSummary objects
         """
-        logger.info(f"📚 Summarizing {len(sections)} sections...")
+        max_concurrent = max(1, max_concurrent or self.max_concurrent)
+        start_time = time.perf_counter()
 
-        summaries = []
+        logger.info(f"📚 Summarizing {len(sections)} sections ({max_concurrent} concurrent)...")
+
+        # Index sections by content hash; identical sections are summarized once
+        pending: Dict[str, List[int]] = {}
+        results: Dict[int, Dict[str, Any]] = {}
+        reused = 0
 
-        for idx, section in enumerate(sections, 1):
-            section_id = section.get("section_id")
+        for idx, section in enumerate(sections):
             heading = section.get("heading", "Untitled Section")
-            heading_level = section.get("heading_level", 0)
             content = section.get("content", "")
-            parent_section_id = section.get("parent_section_id")
-            metadata = section.get("metadata", {})
 
             if not content.strip():
                 logger.warning(f"⚠️ Section '{heading}' is empty, skipping")
                 continue
 
-            logger.info(f"📄 [{idx}/{len(sections)}] Analyzing section: '{heading}'")
-
-            # Generate summary
-            summary_result = self.summarize_section(
-                section_content=content,
-                section_title=heading,
-                heading_level=heading_level,
-                context_hint=context_hint,
-                llm_mode=llm_mode
-            )
+            key = self._content_key(content, heading, section.get("heading_level", 0), context_hint, llm_mode)
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[idx] = {**cached, "reused": True}
+                reused += 1
+            else:
+                pending.setdefault(key, []).append(idx)
+
+        # Summarize the remaining unique sections
+        completed = 0
+        with ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="section-summary") as executor:
+            futures = {}
+            for key, indices in pending.items():
+                section = sections[indices[0]]
+                future = executor.submit(
+                    self.summarize_section,
+                    section_content=section.get("content", ""),
+                    section_title=section.get("heading", "Untitled Section"),
+                    heading_level=section.get("heading_level", 0),
+                    context_hint=context_hint,
+                    llm_mode=llm_mode,
+                    max_retries=self.max_retries
+                )
+                futures[future] = key
+
+            for future in as_completed(futures):
+                key = futures[future]
+                summary_result = future.result()
+                completed += 1
+
+                if summary_result.get("success"):
+                    self._cache_put(key, summary_result)
+
+                indices = pending[key]
+                results[indices[0]] = summary_result
+                for duplicate_idx in indices[1:]:
+                    results[duplicate_idx] = {**summary_result, "reused": True}
+                    reused += 1
+
+                logger.info(
+                    f"📄 [{completed}/{len(pending)}] Analyzed section: "
+                    f"'{sections[indices[0]].get('heading', 'Untitled Section')}'"
+                )
+
+        # Assemble in input order
+        summaries = []
+        for idx in sorted(results):
+            section = sections[idx]
+            content = section.get("content", "")
+            summary_result = results[idx]
 
-            # Create SectionSummary object
-            section_summary = SectionSummary(
-                section_id=section_id,
-                section_title=heading,
-                heading_level=heading_level,
-                parent_section_id=parent_section_id,
+            summaries.append(SectionSummary(
+                section_id=section.get("section_id"),
+                section_title=section.get("heading", "Untitled Section"),
+                heading_level=section.get("heading_level", 0),
+                parent_section_id=section.get("parent_section_id"),
                 full_content=content,
                 summary=summary_result.get("summary", ""),
                 subjects=summary_result.get("subjects", []),
                 key_topics=summary_result.get("key_topics", []),
                 char_count=len(content),
                 metadata={
-                    **metadata,
+                    **section.get("metadata", {}),
                     "summarization_success": summary_result.get("success", False),
                     "llm_mode": summary_result.get("llm_mode"),
                     "tokens": summary_result.get("tokens", {}),
-                    "is_fallback": summary_result.get("fallback", False)
+                    "is_fallback": summary_result.get("fallback", False),
+                    "reused": summary_result.get("reused", False)
                 }
-            )
-
-            summaries.append(section_summary)
+            ))
+
+        elapsed = time.perf_counter() - start_time
+        self.last_batch_stats = {
+            "sections": len(sections),
+            "summarized": len(pending),
+            "reused": reused,
+            "failed": sum(1 for s in summaries if s.metadata["is_fallback"]),
+            "retries": sum(
+                results[idx].get("attempts", 1) - 1
+                for indices in pending.values() for idx in indices[:1]
+            ),
+            "max_concurrent": max_concurrent,
+            "elapsed_seconds": round(elapsed, 2),
+            "sections_per_second": round(len(summaries) / elapsed, 2) if elapsed > 0 else 0,
+        }
 
-        logger.info(f"✅ Summarization complete: {len(summaries)}/{len(sections)} sections processed")
+        logger.info(
+            f"✅ Summarization complete: {len(summaries)}/{len(sections)} sections processed "
+            f"in {elapsed:.1f}s ({self.last_batch_stats['sections_per_second']} sections/s, "
+            f"{len(pending)} LLM-summarized, {reused} reused)"
+        )
 
         return summaries
 
+    # =========================================================================
+    # SUMMARY CACHE
+    # =========================================================================
+
+    @staticmethod
+    def _content_key(
+        content: str,
+        heading: str,
+        heading_level: int,
+        context_hint: str,
+        llm_mode: Optional[str]
+    ) -> str:
+        """Hash of everything that goes into a section's prompt"""
+        payload = json.dumps([content, heading, heading_level, context_hint, llm_mode or ""])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+            return cached
+
+    def _cache_put(self, key: str, result: Dict[str, Any]) -> None:
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
     def get_summary_statistics(self, summaries: List[SectionSummary]) -> Dict[str, Any]:
         """
         Get statistics about summaries
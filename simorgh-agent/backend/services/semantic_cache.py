@@ -0,0 +1,335 @@
+"""
+Semantic Response Cache
+=======================
+Near-duplicate LLM response cache.
+
+The exact-match cache in LLMService hashes the full message list, so any
+whitespace change or rewording makes it miss. This cache keys responses by
+the *meaning* of the final user question instead:
+
+- Scope: project and its graph version + LLM mode/model/temperature +
+  fingerprints of the retrieved context and of the earlier chat turns (the
+  same question over different project data, or as a follow-up in a
+  different conversation, never matches)
+- Within a scope: cosine similarity of question embeddings above a threshold
+
+The graph version is the Redis-held counter bumped by every project sync,
+so every worker misses as soon as a sync in any process changed the
+project. Entries expire after a TTL, and the worker that ran the sync also
+frees them right away (hooked into RedisService.invalidate_project_cache).
+
+Author: Simorgh Industrial Assistant
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from services.embedding_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _SemanticEntry:
+    """One cached response"""
+    scope: str
+    project_number: Optional[str]
+    question: str
+    vector: np.ndarray  # unit-normalized question embedding
+    result: Dict[str, Any]
+    expires_at: float
+
+
+class SemanticResponseCache:
+    """
+    In-process semantic cache for LLM responses
+
+    Entries are grouped by scope; a lookup scans only its scope's vectors
+    (a handful to a few hundred), so a brute-force dot product is cheaper
+    than maintaining an ANN structure.
+
+    Usage:
+        scope, question = cache.make_scope(messages, project_number="P-1", ...)
+        hit = cache.lookup(scope, embedding)
+        if hit is None:
+            result = call_llm()
+            cache.store(scope, question, embedding, result, project_number="P-1")
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a hit (default: SEMANTIC_CACHE_THRESHOLD or 0.95)
+            ttl: Entry lifetime in seconds (default: SEMANTIC_CACHE_TTL or 1 hour)
+            max_entries: Total entry limit, oldest evicted first (default: SEMANTIC_CACHE_MAX_ENTRIES or 5000)
+            enabled: Master switch (default: SEMANTIC_CACHE_ENABLED or true)
+        """
+        self.threshold = threshold or float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        self.ttl = ttl or int(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+        self.max_entries = max_entries or int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000"))
+        if enabled is None:
+            enabled = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+        self.enabled = enabled
+
+        # entry id -> entry, in insertion order for eviction
+        self._entries: "OrderedDict[int, _SemanticEntry]" = OrderedDict()
+        self._scopes: Dict[str, List[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidated": 0,
+        }
+
+        logger.info(
+            f"✅ Semantic response cache initialized (threshold: {self.threshold}, "
+            f"ttl: {self.ttl}s, enabled: {self.enabled})"
+        )
+
+    # =========================================================================
+    # KEYS
+    # =========================================================================
+
+    def make_scope(
+        self,
+        messages: List[Dict[str, str]],
+        project_number: Optional[str] = None,
+        context: Optional[str] = None,
+        project_version: Optional[int] = None,
+        mode: str = "",
+        model: str = "",
+        temperature: float = 0.0
+    ) -> Tuple[str, str]:
+        """
+        Build the cache scope and normalized question for a request
+
+        Args:
+            messages: Chat messages; the last user message is the question and
+                the user/assistant turns before it are part of the scope
+            project_number: Project the answer is grounded in
+            context: Retrieved context the answer depends on (default: system message)
+            project_version: Graph version of the project (see
+                RedisService.get_project_graph_version)
+            mode, model, temperature: Generation settings
+
+        Returns:
+            Tuple of (scope, normalized question)
+        """
+        question = ""
+        question_index = len(messages)
+        for index in range(len(messages) - 1, -1, -1):
+            if messages[index].get("role") == "user":
+                question = messages[index].get("content", "")
+                question_index = index
+                break
+
+        # Follow-ups ("and its current rating?") only mean the same thing
+        # after the same conversation
+        history = [
+            f"{msg.get('role')}:{normalize_text(msg.get('content', ''))}"
+            for msg in messages[:question_index]
+            if msg.get("role") in ("user", "assistant")
+        ]
+        history_fingerprint = (
+            hashlib.sha256("\n".join(history).encode("utf-8")).hexdigest()[:16]
+            if history else "-"
+        )
+
+        if context is None:
+            context = next(
+                (msg.get("content", "") for msg in messages if msg.get("role") == "system"),
+                ""
+            )
+
+        context_fingerprint = hashlib.sha256(normalize_text(context).encode("utf-8")).hexdigest()[:16]
+        project = f"{project_number}@{project_version or 0}" if project_number else "-"
+        scope = (
+            f"{project}|{mode}|{model}|{temperature}|"
+            f"{context_fingerprint}|{history_fingerprint}"
+        )
+
+        return scope, normalize_text(question).lower()
+
+    # =========================================================================
+    # LOOKUP / STORE
+    # =========================================================================
+
+    def lookup(self, scope: str, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached response for a near-duplicate question
+
+        Returns:
+            Copy of the cached result with "cached"/"semantic_similarity" set, or None
+        """
+        if not self.enabled:
+            return None
+
+        query = self._unit(embedding)
+        now = time.time()
+
+        with self._lock:
+            self.stats["lookups"] += 1
+
+            best_entry, best_score = None, -1.0
+            for entry_id in list(self._scopes.get(scope, [])):
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                if entry.expires_at <= now:
+                    self._remove(entry_id)
+                    self.stats["expired"] += 1
+                    continue
+                if entry.vector.shape != query.shape:
+                    continue  # embedded by a different model
+                score = float(np.dot(entry.vector, query))
+                if score > best_score:
+                    best_entry, best_score = entry, score
+
+            if best_entry is None or best_score < self.threshold:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["hits"] += 1
+
+        logger.info(f"🧲 Semantic cache hit (similarity {best_score:.3f}): \"{best_entry.question[:80]}\"")
+        return {**best_entry.result, "cached": True, "semantic_similarity": best_score}
+
+    def store(
+        self,
+        scope: str,
+        question: str,
+        embedding: List[float],
+        result: Dict[str, Any],
+        project_number: Optional[str] = None
+    ) -> None:
+        """Store a generated response"""
+        if not self.enabled or not result.get("response"):
+            return
+
+        entry = _SemanticEntry(
+            scope=scope,
+            project_number=project_number,
+            question=question,
+            vector=self._unit(embedding),
+            result={k: v for k, v in result.items() if k not in ("cached", "semantic_similarity")},
+            expires_at=time.time() + self.ttl
+        )
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = entry
+            self._scopes.setdefault(scope, []).append(entry_id)
+            self.stats["stores"] += 1
+
+            while len(self._entries) > self.max_entries:
+                oldest_id = next(iter(self._entries))
+                self._remove(oldest_id)
+                self.stats["evictions"] += 1
+
+    # =========================================================================
+    # INVALIDATION
+    # =========================================================================
+
+    def invalidate_project(self, project_number: str) -> int:
+        """
+        Drop every cached response grounded in a project
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            stale = [
+                entry_id for entry_id, entry in self._entries.items()
+                if entry.project_number == project_number
+            ]
+            for entry_id in stale:
+                self._remove(entry_id)
+            self.stats["invalidated"] += len(stale)
+
+        if stale:
+            logger.info(f"🗑️ Semantic cache invalidated for project {project_number} ({len(stale)} entries)")
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+
+    # =========================================================================
+    # INTERNALS
+    # =========================================================================
+
+    @staticmethod
+    def _unit(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _remove(self, entry_id: int) -> None:
+        """Remove an entry (caller holds the lock)"""
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        ids = self._scopes.get(entry.scope)
+        if ids is not None:
+            ids.remove(entry_id)
+            if not ids:
+                del self._scopes[entry.scope]
+
+    # =========================================================================
+    # STATISTICS
+    # =========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.stats["lookups"]
+            return {
+                **self.stats,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0,
+                "entries": len(self._entries),
+                "scopes": len(self._scopes),
+                "threshold": self.threshold,
+                "enabled": self.enabled,
+            }
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_semantic_cache_instance: Optional[SemanticResponseCache] = None
+
+
+def get_semantic_cache() -> SemanticResponseCache:
+    """Get or create the shared semantic response cache"""
+    global _semantic_cache_instance
+
+    if _semantic_cache_instance is None:
+        _semantic_cache_instance = SemanticResponseCache()
+
+    return _semantic_cache_instance
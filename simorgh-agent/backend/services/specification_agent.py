@@ -13,9 +13,12 @@ The agent maintains state in Redis and runs entirely within the chat interface.
 REFACTORED: All Neo4j access now goes through CoCoIndex adapter.
 """
 
+import os
+import re
 import json
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from enum import Enum
 from datetime import datetime
 from pathlib import Path
@@ -30,6 +33,18 @@ from services.specification_extraction_scope import (
 
 logger = logging.getLogger(__name__)
 
+# Cheap prefilter for local-LLM extraction windows: a window is only sent to
+# the LLM if it contains a rated quantity (number + electrical unit), an IP
+# code or a switchgear term. Narrative text (scope, contract terms, revision
+# history) is skipped.
+SPEC_TOKEN_PATTERN = re.compile(
+    r"\d+(?:[.,]\d+)?\s*(?:kV|V|kA|A|Hz|kW|MW|kVA|MVA|mm²|mm2|°C|ms)\b"
+    r"|\bIP\s?\d{2}\b"
+    r"|\b(?:voltage|current|frequency|busbar|breaker|switchgear|enclosure|"
+    r"protection|relay|short[- ]circuit|insulation|earthing|IEC)\b",
+    re.IGNORECASE
+)
+
 
 class AgentState(str, Enum):
     """Agent workflow states"""
@@ -64,6 +79,9 @@ class SpecificationAgent:
         self.cocoindex = cocoindex_adapter  # CoCoIndex adapter for graph access
         self.qdrant = qdrant_service
 
+        # Concurrent local-LLM windows; nginx spreads them over the GPU nodes
+        self.extraction_concurrency = int(os.getenv("SPEC_EXTRACTION_CONCURRENCY", "4"))
+
         # Backward compatibility - log deprecation warning
         if neo4j_service is not None:
             logger.warning("SpecificationAgent: neo4j_service parameter is deprecated. Use cocoindex_adapter instead.")
@@ -207,7 +225,7 @@ Please upload your switchgear specification documents (PDF, Word, Excel, Images,
             return "⏳ Processing documents... Please wait."
 
         elif current_state == AgentState.EXTRACTING_SPECS:
-            return "🔍 Extracting specifications... This may take a moment."
+            return self._format_extraction_progress(state)
 
         elif current_state == AgentState.COMPLETED:
             return await self._handle_completed_state(chat_id, user_message, state)
@@ -455,7 +473,16 @@ Please upload at least one specification document to proceed."""
                 logger.warning(f"⚠️ Online LLM failed: {str(online_error)[:200]}")
                 logger.info("🔄 Falling back to simplified extraction for local LLM...")
                 use_simplified = True
-                extraction_table = await self._extract_with_local_llm_simplified(markdown_content)
+
+                async def report_progress(progress: Dict[str, Any]):
+                    # Persist partial results so the chat can show them while extraction runs
+                    state["extraction_progress"] = progress
+                    self._set_agent_state(chat_id, state)
+
+                extraction_table = await self._extract_with_local_llm_simplified(
+                    markdown_content,
+                    on_progress=report_progress
+                )
                 logger.info(f"✅ Extraction complete using local LLM ({len(extraction_table)} chars)")
 
             # Check if we got any results
@@ -471,6 +498,7 @@ Please upload at least one specification document to proceed."""
                 return self._format_error_response("Extraction completed but no parameters could be parsed from the output.")
 
             # Update state
+            state.pop("extraction_progress", None)
             state["extraction_results"] = extraction_results
             state["extraction_table_markdown"] = extraction_table
             state["state"] = AgentState.GENERATING_EXPORT
@@ -524,8 +552,24 @@ Be thorough and extract ALL parameters. Mark "NOT FOUND" for missing values."""
 
         return result.get("response", "")
 
-    async def _extract_with_local_llm_simplified(self, markdown_content: str) -> str:
-        """Simplified extraction for local LLM with chunked processing for complete coverage"""
+    async def _extract_with_local_llm_simplified(
+        self,
+        markdown_content: str,
+        on_progress: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> str:
+        """
+        Simplified extraction for local LLM as a map-reduce over document windows
+
+        Map: overlapping windows are extracted concurrently (at most
+        extraction_concurrency in flight, spread over the GPU nodes by the
+        load balancer); windows without spec-like tokens are skipped.
+        Reduce: window tables are merged and deduplicated in document order.
+
+        Args:
+            markdown_content: Document text
+            on_progress: Optional async callback receiving window counts and the
+                partial merged table each time a window finishes
+        """
 
         logger.info("📝 Using simplified extraction for local LLM with chunked processing...")
 
@@ -575,61 +619,100 @@ Only extract clear values."""
                 break
 
         total_chunks = len(chunks)
-        logger.info(f"📚 Processing {total_chunks} chunks ({CHUNK_SIZE} chars each) to cover entire {doc_length} char document")
 
-        # Process each chunk
-        all_results = []
-        for chunk_info in chunks:
-            chunk_num = chunk_info["chunk_num"]
-            chunk_content = chunk_info["content"]
+        # Prefilter: only windows that look like they hold specifications
+        windows = [chunk_info for chunk_info in chunks if SPEC_TOKEN_PATTERN.search(chunk_info["content"])]
+        skipped = total_chunks - len(windows)
+        concurrency = max(1, self.extraction_concurrency)
+
+        logger.info(
+            f"📚 Processing {len(windows)}/{total_chunks} chunks ({CHUNK_SIZE} chars each, "
+            f"{skipped} without spec tokens skipped, {concurrency} concurrent) "
+            f"to cover entire {doc_length} char document"
+        )
 
-            logger.info(f"📄 Processing chunk {chunk_num}/{total_chunks} (chars {chunk_info['start']}-{chunk_info['end']})")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def extract_window(chunk_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            chunk_num = chunk_info["chunk_num"]
 
             system_message = f"""{simplified_prompt}
 
 DOCUMENT (Chunk {chunk_num}/{total_chunks}):
-{chunk_content}
+{chunk_info["content"]}
 """
 
-            user_message = "Extract specifications as table."
-
             messages = [
                 {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
+                {"role": "user", "content": "Extract specifications as table."}
             ]
 
-            logger.info(f"📏 Chunk {chunk_num} - Prompt size: {len(system_message)} chars")
-
-            try:
-                result = self.llm.generate(
-                    messages=messages,
-                    mode="offline",
-                    temperature=0.3,
-                    use_cache=False,
-                    max_tokens=2000
+            async with semaphore:
+                logger.info(
+                    f"📄 Processing chunk {chunk_num}/{total_chunks} "
+                    f"(chars {chunk_info['start']}-{chunk_info['end']}, prompt {len(system_message)} chars)"
                 )
 
-                chunk_result = result.get("response", "")
-                if chunk_result and len(chunk_result) > 20:
-                    all_results.append({
-                        "chunk_num": chunk_num,
-                        "result": chunk_result
-                    })
-                    logger.info(f"✅ Chunk {chunk_num} extracted {len(chunk_result)} chars")
-                else:
-                    logger.warning(f"⚠️ Chunk {chunk_num} returned minimal output")
+                try:
+                    result = await self.llm.agenerate(
+                        messages=messages,
+                        mode="offline",
+                        temperature=0.3,
+                        use_cache=False,
+                        max_tokens=2000
+                    )
+                except Exception as e:
+                    logger.error(f"❌ Error processing chunk {chunk_num}: {e}")
+                    return None
+
+            chunk_result = result.get("response", "")
+            if chunk_result and len(chunk_result) > 20:
+                logger.info(f"✅ Chunk {chunk_num} extracted {len(chunk_result)} chars")
+                return {
+                    "chunk_num": chunk_num,
+                    "result": chunk_result
+                }
 
-            except Exception as e:
-                logger.error(f"❌ Error processing chunk {chunk_num}: {e}")
-                continue
+            logger.warning(f"⚠️ Chunk {chunk_num} returned minimal output")
+            return None
 
-        # Merge results from all chunks
+        # Map: windows run concurrently, results are collected as they finish
+        tasks = [asyncio.create_task(extract_window(chunk_info)) for chunk_info in windows]
+        all_results = []
+        windows_done = 0
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                chunk_data = await next_done
+                windows_done += 1
+                if chunk_data:
+                    all_results.append(chunk_data)
+
+                if on_progress:
+                    try:
+                        await on_progress({
+                            "windows_total": len(windows),
+                            "windows_done": windows_done,
+                            "windows_skipped": skipped,
+                            "windows_with_results": len(all_results),
+                            "partial_table": self._merge_chunk_results(
+                                sorted(all_results, key=lambda r: r["chunk_num"])
+                            )
+                        })
+                    except Exception as e:
+                        logger.warning(f"⚠️ Failed to report extraction progress: {e}")
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        # Reduce: merge results from all chunks in document order
         if not all_results:
             logger.error("❌ No results from any chunk")
             return ""
 
         logger.info(f"🔄 Merging results from {len(all_results)} successful chunks...")
-        merged_result = self._merge_chunk_results(all_results)
+        merged_result = self._merge_chunk_results(sorted(all_results, key=lambda r: r["chunk_num"]))
 
         logger.info(f"✅ Final merged result: {len(merged_result)} chars from {total_chunks} chunks")
         return merged_result
@@ -698,6 +781,29 @@ DOCUMENT (Chunk {chunk_num}/{total_chunks}):
 
 The agent has saved the current state. You can try uploading a different document."""
 
+    def _format_extraction_progress(self, state: Dict[str, Any]) -> str:
+        """Format the progress of a running extraction, with the partial results so far"""
+        progress = state.get("extraction_progress")
+        if not progress:
+            return "🔍 Extracting specifications... This may take a moment."
+
+        response = f"""🔍 **Extracting specifications...**
+
+- **Sections analyzed**: {progress.get("windows_done", 0)}/{progress.get("windows_total", 0)}
+- **Sections skipped** (no specifications): {progress.get("windows_skipped", 0)}
+"""
+
+        partial_table = progress.get("partial_table")
+        if partial_table:
+            response += f"""
+## 📋 Partial Results
+
+{partial_table}
+
+_The complete table and export will be ready when all sections are analyzed._"""
+
+        return response
+
     def _parse_extraction_table(self, markdown_table: str) -> List[Dict[str, Any]]:
         """Parse extraction results from markdown table (supports both 4 and 7 column formats)"""
 
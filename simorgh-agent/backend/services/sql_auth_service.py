@@ -17,6 +17,8 @@ from typing import List, Dict, Any, Optional
 import pymysql
 from contextlib import contextmanager
 
+from services.mysql_pool import get_mysql_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +30,7 @@ class SQLAuthService:
     - Read-only connection to external MySQL database
     - User authorization validation
     - Project list retrieval per user
-    - Connection pooling
+    - Connection pooling (shared MySQLPool)
     - Error handling and logging
     """
 
@@ -47,43 +49,30 @@ class SQLAuthService:
         self.password = password or os.getenv("MYSQL_PASSWORD", os.getenv("SQL_SERVER_PASSWORD"))
         self.database = database or os.getenv("MYSQL_DATABASE", os.getenv("SQL_SERVER_DATABASE"))
 
+        self.pool = None
         if not all([self.host, self.user, self.password, self.database]):
             logger.warning("⚠️ MySQL credentials not fully configured")
             self.enabled = False
         else:
             self.enabled = True
+            self.pool = get_mysql_pool(self.host, self.port, self.user, self.password, self.database)
             logger.info(f"✅ MySQL Auth Service initialized: {self.host}:{self.port}/{self.database}")
 
     @contextmanager
     def get_connection(self):
         """
-        Context manager for database connections
-        Ensures connections are properly closed
+        Context manager for pooled database connections
+        Returns the connection to the shared pool on exit
         """
         if not self.enabled:
             raise ValueError("MySQL authentication not configured")
 
-        conn = None
         try:
-            conn = pymysql.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                connect_timeout=10,
-                read_timeout=10,
-                write_timeout=10,
-                charset='utf8mb4',
-                cursorclass=pymysql.cursors.DictCursor  # Return rows as dictionaries
-            )
-            yield conn
+            with self.pool.acquire() as conn:
+                yield conn
         except pymysql.Error as e:
             logger.error(f"MySQL connection error: {e}")
             raise
-        finally:
-            if conn:
-                conn.close()
 
     def health_check(self) -> Dict[str, Any]:
         """Check SQL Server connectivity"""
@@ -103,6 +92,7 @@ class SQLAuthService:
                     "status": "healthy",
                     "database": self.database,
                     "host": self.host,
+                    "pool": self.pool.get_stats(),
                     "version": result["version"][:50] if result else "unknown"
                 }
         except Exception as e:
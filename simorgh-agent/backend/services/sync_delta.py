@@ -0,0 +1,170 @@
+"""
+Sync Delta
+==========
+Change detection for incremental TPMS project sync.
+
+TPMS tables carry no modification timestamps, so every entity fetched from
+TPMS is fingerprinted with a content hash. The hashes of the last successful
+sync are stored per project; comparing them with a fresh fetch yields the
+entities that were added, changed or removed, and only those are written to
+PostgreSQL and Neo4j.
+
+Entity kinds and keys:
+- project_main / project_identity: single entity, key "project"
+- panels: panel id (IdprojectScope, falling back to Id) - the Neo4j panel_id
+- drafts: draft/feeder Id
+- equipment: all equipment rows of one draft, keyed by DraftId (equipment
+  rows have no id of their own, so a draft's list is replaced as a unit)
+
+Resolved property values also depend on the TECHNICAL_PROPERTIES catalog,
+so its fingerprint is stored with the hashes (kind "property_catalog"); when
+it changes every entity is treated as changed.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import json
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Set
+
+from models.tpms_project_models import TPMSProjectData
+
+ENTITY_KINDS = ("project_main", "project_identity", "panels", "drafts", "equipment")
+
+# Fingerprint of the property catalog the entities were resolved with
+CATALOG_KIND = "property_catalog"
+
+# kind -> entity key -> content hash
+EntityHashes = Dict[str, Dict[str, str]]
+
+# Fields that are not content (panel date_created defaults to "now" when TPMS
+# leaves it empty, which would make every fetch look changed)
+VOLATILE_FIELDS = {"date_created"}
+
+
+def content_hash(value: Any) -> str:
+    """Stable SHA-256 of a model, dict or list of models"""
+    if isinstance(value, list):
+        payload = [item.model_dump(mode="json", exclude=VOLATILE_FIELDS) for item in value]
+    elif hasattr(value, "model_dump"):
+        payload = value.model_dump(mode="json", exclude=VOLATILE_FIELDS)
+    else:
+        payload = value
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def panel_key(panel) -> str:
+    """Key of a panel, matching the Neo4j Panel.panel_id"""
+    return str(panel.id_project_scope or panel.id)
+
+
+def compute_entity_hashes(data: TPMSProjectData, catalog_hash: Optional[str] = None) -> EntityHashes:
+    """
+    Fingerprint every entity of a fetched project
+
+    Args:
+        data: Complete project data from TPMS
+        catalog_hash: Fingerprint of the property catalog used to resolve it
+
+    Returns:
+        Entity kind -> entity key -> content hash
+    """
+    hashes: EntityHashes = {kind: {} for kind in ENTITY_KINDS}
+    if catalog_hash:
+        hashes[CATALOG_KIND] = {"catalog": catalog_hash}
+
+    hashes["project_main"]["project"] = content_hash(data.project_main)
+    if data.project_identity:
+        hashes["project_identity"]["project"] = content_hash(data.project_identity)
+
+    for panel in data.panels:
+        hashes["panels"][panel_key(panel)] = content_hash(panel)
+
+    for draft in data.drafts:
+        hashes["drafts"][str(draft.id)] = content_hash(draft)
+
+    # Equipment without a draft cannot be attached to a feeder and is not synced
+    equipment_by_draft: Dict[str, List[Any]] = {}
+    for equip in data.draft_equipment:
+        if equip.draft_id is None:
+            continue
+        equipment_by_draft.setdefault(str(equip.draft_id), []).append(equip)
+    for draft_id, items in equipment_by_draft.items():
+        hashes["equipment"][draft_id] = content_hash(items)
+
+    return hashes
+
+
+@dataclass
+class SyncDelta:
+    """Entities added, changed and removed since the last successful sync"""
+    added: Dict[str, Set[str]] = field(default_factory=lambda: {kind: set() for kind in ENTITY_KINDS})
+    changed: Dict[str, Set[str]] = field(default_factory=lambda: {kind: set() for kind in ENTITY_KINDS})
+    removed: Dict[str, Set[str]] = field(default_factory=lambda: {kind: set() for kind in ENTITY_KINDS})
+    full: bool = False
+    unchanged: int = 0
+
+    def upserts(self, kind: str) -> Set[str]:
+        """Keys of a kind that must be inserted or updated"""
+        return self.added[kind] | self.changed[kind]
+
+    @property
+    def size(self) -> int:
+        """Total number of entities to write or delete"""
+        return sum(
+            len(self.added[kind]) + len(self.changed[kind]) + len(self.removed[kind])
+            for kind in ENTITY_KINDS
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return self.size == 0
+
+    def summary(self) -> Dict[str, Any]:
+        """Delta size per kind, for sync results and logs"""
+        return {
+            "mode": "full" if self.full else "incremental",
+            "size": self.size,
+            "unchanged": self.unchanged,
+            "added": {kind: len(keys) for kind, keys in self.added.items() if keys},
+            "changed": {kind: len(keys) for kind, keys in self.changed.items() if keys},
+            "removed": {kind: len(keys) for kind, keys in self.removed.items() if keys},
+        }
+
+
+def compute_delta(previous: EntityHashes, current: EntityHashes, full: bool = False) -> SyncDelta:
+    """
+    Compare stored hashes with a fresh fetch
+
+    Args:
+        previous: Hashes stored by the last successful sync (empty for a first sync)
+        current: Hashes of the freshly fetched project
+        full: Treat every current entity as changed (forced resync)
+
+    Returns:
+        SyncDelta describing what has to be written
+    """
+    # Values resolved with a different property catalog are stale everywhere
+    if previous.get(CATALOG_KIND) != current.get(CATALOG_KIND):
+        full = True
+
+    delta = SyncDelta(full=full)
+
+    for kind in ENTITY_KINDS:
+        old = previous.get(kind, {})
+        new = current.get(kind, {})
+
+        for key, digest in new.items():
+            if key not in old:
+                delta.added[kind].add(key)
+            elif full or old[key] != digest:
+                delta.changed[kind].add(key)
+            else:
+                delta.unchanged += 1
+
+        delta.removed[kind] = set(old) - set(new)
+
+    return delta
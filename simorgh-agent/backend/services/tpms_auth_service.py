@@ -16,6 +16,7 @@ from typing import Optional, Dict, Any, Tuple, List
 import pymysql
 from contextlib import contextmanager
 from services.hash_detector import HashDetector
+from services.mysql_pool import get_mysql_pool, get_async_mysql_pool
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,7 @@ class TPMSAuthService:
     - Password verification with HashDetector
     - Project permission checking via draft_permission table
     - Secure, read-only database access
+    - Pooled connections; a* methods are the async variants for request handlers
     """
 
     def __init__(
@@ -47,43 +49,32 @@ class TPMSAuthService:
         self.password = password or os.getenv("MYSQL_PASSWORD", "")
         self.database = database or os.getenv("MYSQL_DATABASE", "TPMS")
 
+        self.pool = None
+        self.async_pool = None
         if not all([self.host, self.user, self.password, self.database]):
             logger.warning("⚠️ TPMS MySQL credentials not fully configured")
             self.enabled = False
         else:
             self.enabled = True
+            self.pool = get_mysql_pool(self.host, self.port, self.user, self.password, self.database)
+            self.async_pool = get_async_mysql_pool(self.host, self.port, self.user, self.password, self.database)
             logger.info(f"✅ TPMS Auth Service initialized: {self.host}:{self.port}/{self.database}")
 
     @contextmanager
     def get_connection(self):
         """
-        Context manager for database connections
-        Ensures connections are properly closed
+        Context manager for pooled database connections
+        Returns the connection to the shared pool on exit
         """
         if not self.enabled:
             raise ValueError("TPMS authentication not configured")
 
-        conn = None
         try:
-            conn = pymysql.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                connect_timeout=10,
-                read_timeout=10,
-                write_timeout=10,
-                charset='utf8mb4',
-                cursorclass=pymysql.cursors.DictCursor
-            )
-            yield conn
+            with self.pool.acquire() as conn:
+                yield conn
         except pymysql.Error as e:
             logger.error(f"TPMS MySQL connection error: {e}")
             raise
-        finally:
-            if conn:
-                conn.close()
 
     def health_check(self) -> Dict[str, Any]:
         """Check TPMS database connectivity"""
@@ -103,6 +94,7 @@ class TPMSAuthService:
                     "status": "healthy",
                     "database": self.database,
                     "host": self.host,
+                    "pool": self.pool.get_stats(),
                     "version": result["version"][:50] if result else "unknown"
                 }
         except Exception as e:
@@ -616,6 +608,54 @@ class TPMSAuthService:
             )
 
 
+    # =========================================================================
+    # ASYNC API (FastAPI request path)
+    # =========================================================================
+
+    async def _run_async(self, fn, *args, **kwargs):
+        """Run a lookup on the pool's worker threads without blocking the event loop"""
+        if self.async_pool is None:
+            # Auth disabled: the lookups short-circuit without touching MySQL
+            return fn(*args, **kwargs)
+        return await self.async_pool.run(fn, *args, **kwargs)
+
+    async def aauthenticate_user(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+        """Async variant of authenticate_user"""
+        return await self._run_async(self.authenticate_user, username, password)
+
+    async def aget_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_user_by_username"""
+        return await self._run_async(self.get_user_by_username, username)
+
+    async def acheck_project_permission(self, username: str, project_id: str) -> bool:
+        """Async variant of check_project_permission"""
+        return await self._run_async(self.check_project_permission, username, project_id)
+
+    async def aget_user_projects(self, username: str) -> list[str]:
+        """Async variant of get_user_projects"""
+        return await self._run_async(self.get_user_projects, username)
+
+    async def aget_project_by_id(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_project_by_id"""
+        return await self._run_async(self.get_project_by_id, project_id)
+
+    async def aget_project_by_oenum(self, oenum_suffix: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_project_by_oenum"""
+        return await self._run_async(self.get_project_by_oenum, oenum_suffix)
+
+    async def asearch_oenum_autocomplete(self, search_query: str = "", limit: int = 0) -> List[Dict[str, Any]]:
+        """Async variant of search_oenum_autocomplete"""
+        return await self._run_async(self.search_oenum_autocomplete, search_query, limit)
+
+    async def avalidate_project_access(
+        self,
+        username: str,
+        project_id: str
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Async variant of validate_project_access"""
+        return await self._run_async(self.validate_project_access, username, project_id)
+
+
 # =============================================================================
 # SINGLETON INSTANCE
 # =============================================================================
@@ -23,6 +23,8 @@ import pymysql
 import pymysql.cursors
 from pymysql import Error as MySQLError
 
+from services.mysql_pool import get_mysql_pool
+
 from models.tpms_project_models import (
     ViewProjectMain,
     TechnicalProjectIdentity,
@@ -60,25 +62,14 @@ class TPMSProjectDataService:
         self.user = user or os.getenv("MYSQL_USER", "root")
         self.password = password or os.getenv("MYSQL_PASSWORD", "")
         self.database = database or os.getenv("MYSQL_DATABASE", "TPMS")
+        self.pool = get_mysql_pool(self.host, self.port, self.user, self.password, self.database)
 
         logger.info(f"TPMSProjectDataService initialized for {self.host}:{self.port}/{self.database}")
 
     def _get_connection(self):
-        """Create database connection."""
+        """Borrow a pooled database connection (close() returns it to the pool)."""
         try:
-            connection = pymysql.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                charset='utf8mb4',
-                connect_timeout=10,
-                read_timeout=30,
-                write_timeout=30,
-                cursorclass=pymysql.cursors.DictCursor
-            )
-            return connection
+            return self.pool.connection()
         except pymysql.Error as e:
             logger.error(f"Failed to connect to TPMS database: {e}")
             raise
@@ -14,7 +14,6 @@ Author: Simorgh Industrial Assistant
 """
 
 import logging
-import asyncio
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import uuid
@@ -22,6 +21,7 @@ import uuid
 from .context_window_manager import ContextWindowManager, get_context_window_manager
 from .conversation_summarizer import ConversationSummarizer, get_conversation_summarizer
 from .message_persistence import MessagePersistenceService, get_message_persistence
+from .retrieval_orchestrator import RetrievalOrchestrator
 
 logger = logging.getLogger(__name__)
 
@@ -258,7 +258,8 @@ class UnifiedMemoryService:
         system_prompt: str = "",
         graph_context: Optional[str] = None,
         use_semantic_memory: bool = True,
-        use_summary: bool = True
+        use_summary: bool = True,
+        query_embedding: Optional[List[float]] = None
     ) -> Dict[str, Any]:
         """
         Build complete context for LLM call.
@@ -280,17 +281,19 @@ class UnifiedMemoryService:
             graph_context: Optional knowledge graph context
             use_semantic_memory: Whether to include semantic memories
             use_summary: Whether to include conversation summary
+            query_embedding: Optional precomputed embedding of current_query
 
         Returns:
             Dict with 'messages' list and 'metadata'
         """
-        # Gather all context sources in parallel
-        tasks = []
+        # Gather all context sources in parallel - the blocking Redis and
+        # Qdrant lookups run in worker threads so they actually overlap
+        retrieval = RetrievalOrchestrator()
 
         # Task 1: Get recent messages from Redis
         # For PROJECT chats: get history from ALL chats in the project
         # For GENERAL chats: get history from current chat only
-        async def get_redis_history():
+        def get_redis_history():
             if not self.redis:
                 return []
 
@@ -308,23 +311,26 @@ class UnifiedMemoryService:
                 # GENERAL CHAT: Use current chat history only (isolated)
                 return self.redis.get_chat_history(chat_id, limit=20)
 
-        tasks.append(get_redis_history())
+        retrieval.add_stage("chat_history", get_redis_history, default=[])
 
-        # Task 2: Get or generate summary
-        async def get_summary():
-            if not use_summary:
+        # Task 2: Read the stored summary; a due update is generated in the
+        # background after retrieval, never inside the latency budget
+        def get_summary():
+            if not use_summary or not self.redis:
                 return None
             try:
-                messages = self.redis.get_chat_history(chat_id, limit=50) if self.redis else []
-                return await self.summarizer.maybe_summarize(chat_id, messages)
+                messages = self.redis.get_chat_history(chat_id, limit=50)
+                summary, summarized_count = self.summarizer.load_summary(chat_id)
+                due = self.summarizer.summary_due(len(messages), summary, summarized_count)
+                return {"summary": summary, "messages": messages if due else None}
             except Exception as e:
                 logger.warning(f"Summary retrieval failed: {e}")
                 return None
 
-        tasks.append(get_summary())
+        retrieval.add_stage("summary", get_summary)
 
         # Task 3: Get semantic memories from Qdrant
-        async def get_semantic_memories():
+        def get_semantic_memories():
             if not use_semantic_memory or not self.qdrant:
                 return []
             try:
@@ -336,21 +342,26 @@ class UnifiedMemoryService:
                     project_filter=project_number,
                     chat_id=chat_id,
                     fallback_to_recent=True,
-                    fallback_limit=5
+                    fallback_limit=5,
+                    query_embedding=query_embedding
                 )
             except Exception as e:
                 logger.warning(f"Semantic memory retrieval failed: {e}")
                 return []
 
-        tasks.append(get_semantic_memories())
+        retrieval.add_stage("semantic_memories", get_semantic_memories, default=[])
 
         # Execute all tasks in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        await retrieval.run()
 
         # Process results
-        recent_messages = results[0] if not isinstance(results[0], Exception) else []
-        session_summary = results[1] if not isinstance(results[1], Exception) else None
-        semantic_memories = results[2] if not isinstance(results[2], Exception) else []
+        recent_messages = retrieval.value("chat_history", [])
+        summary_state = retrieval.value("summary", {})
+        session_summary = summary_state.get("summary")
+        semantic_memories = retrieval.value("semantic_memories", [])
+
+        if summary_state.get("messages"):
+            self.summarizer.schedule_summary(chat_id, summary_state["messages"])
 
         # Count unique source chats for project memory
         source_chats = set(m.get('source_chat_id', chat_id) for m in recent_messages)
@@ -393,7 +404,8 @@ class UnifiedMemoryService:
                 "has_graph_context": graph_context is not None,
                 "memory_type": memory_type,
                 "source_chat_count": len(source_chats),
-                "is_project_chat": project_number is not None
+                "is_project_chat": project_number is not None,
+                "retrieval_timings": retrieval.get_timings()
             }
         }
 
@@ -21,6 +21,8 @@ from qdrant_client.models import (
 )
 import openai
 
+from services.embedding_cache import get_embedding_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -105,6 +107,9 @@ class VectorRAG:
             self.embedding_dim = 1536
             logger.info(f"✅ Using OpenAI embeddings: {self.embedding_model}")
 
+        # Shared content-addressed embedding cache (LLM embeddings are cached by LLMService)
+        self.embedding_cache = get_embedding_cache()
+
         # Chunking configuration
         self.chunk_size = 1000  # characters
         self.chunk_overlap = 200  # characters
@@ -262,11 +267,14 @@ class VectorRAG:
                 return embedding
             else:
                 # Fallback to direct OpenAI API (legacy mode)
-                response = openai.Embedding.create(
-                    model=self.embedding_model,
-                    input=text
-                )
-                return response['data'][0]['embedding']
+                def _embed(t: str) -> List[float]:
+                    response = openai.Embedding.create(
+                        model=self.embedding_model,
+                        input=t
+                    )
+                    return response['data'][0]['embedding']
+
+                return self.embedding_cache.get_or_compute(self.embedding_model, text, _embed)
         except Exception as e:
             logger.error(f"❌ Embedding failed: {e}")
             raise
@@ -0,0 +1,74 @@
+"""
+Unit Tests for Conversation Summarizer
+======================================
+Tests that summaries are generated off the event loop and in the background.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import asyncio
+import pytest
+from services.conversation_summarizer import ConversationSummarizer
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, db=None):
+        return self.data.get(key)
+
+    def set(self, key, value, db=None, ttl=None):
+        self.data[key] = value
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    def generate(self, **kwargs):
+        raise AssertionError("blocking generate() called on the event loop")
+
+    async def agenerate(self, **kwargs):
+        self.calls += 1
+        await self.release.wait()
+        return {"response": "**Topic**: switchgear ratings"}
+
+
+def messages(count):
+    return [{"role": "user", "content": f"question {i}"} for i in range(count)]
+
+
+class TestConversationSummarizer:
+    """Test Conversation Summarizer"""
+
+    def test_summary_due(self):
+        """Test the summarization trigger"""
+        summarizer = ConversationSummarizer()
+
+        assert not summarizer.summary_due(0, None, 0, force=True)
+        assert not summarizer.summary_due(5, None, 0)
+        assert summarizer.summary_due(8, None, 0)
+        assert not summarizer.summary_due(12, "summary", 8)
+        assert summarizer.summary_due(12, None, 8, force=True)
+
+    @pytest.mark.asyncio
+    async def test_background_summary_does_not_block(self):
+        """Test a scheduled summary runs in the background, once per chat"""
+        redis, llm = FakeRedis(), FakeLLM()
+        summarizer = ConversationSummarizer(llm_service=llm, redis_service=redis)
+
+        assert summarizer.schedule_summary("chat-1", messages(10))
+        assert not summarizer.schedule_summary("chat-1", messages(11))
+        await asyncio.sleep(0.01)
+
+        assert llm.calls == 1
+        assert summarizer.load_summary("chat-1") == (None, 0)
+
+        llm.release.set()
+        await asyncio.gather(*summarizer._background_tasks)
+
+        assert summarizer.load_summary("chat-1") == ("**Topic**: switchgear ratings", 10)
+        assert summarizer.schedule_summary("chat-1", messages(20))
+        await asyncio.gather(*summarizer._background_tasks)
@@ -0,0 +1,95 @@
+"""
+Unit Tests for Embedding Cache
+==============================
+Tests the two-tier content-addressed embedding cache.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import pytest
+from unittest.mock import Mock
+from services.embedding_cache import EmbeddingCache, encode_vector, decode_vector
+
+
+class TestEmbeddingCache:
+    """Test Embedding Cache"""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Create a mock RedisService with an in-memory blob store"""
+        store = {}
+        mock = Mock()
+        mock.cache_embeddings = Mock(side_effect=lambda entries, ttl: store.update(entries))
+        mock.get_cached_embeddings = Mock(side_effect=lambda keys: [store.get(k) for k in keys])
+        mock.store = store
+        return mock
+
+    @pytest.fixture
+    def cache(self, mock_redis):
+        """Create EmbeddingCache with mocked Redis"""
+        return EmbeddingCache(redis_service=mock_redis, max_memory_bytes=1024 * 1024)
+
+    def test_vector_roundtrip_float32(self):
+        """Test float32 blobs decode to the original values"""
+        vector = [0.5, -0.25, 1.0]
+        blob = encode_vector(vector, "float32")
+
+        assert len(blob) == 12
+        assert decode_vector(blob, "float32") == vector
+
+    def test_vector_roundtrip_float16(self):
+        """Test float16 blobs are half the size of float32"""
+        vector = [0.5, -0.25, 1.0]
+        blob = encode_vector(vector, "float16")
+
+        assert len(blob) == 6
+        assert decode_vector(blob, "float16") == vector
+
+    def test_key_normalizes_whitespace(self, cache):
+        """Test keys ignore whitespace differences but not model"""
+        assert cache.make_key("m", "rated  voltage\n 400V ") == cache.make_key("m", "rated voltage 400V")
+        assert cache.make_key("m", "text") != cache.make_key("other", "text")
+
+    def test_get_or_compute_hits_memory(self, cache):
+        """Test second lookup is served from memory without recomputing"""
+        compute = Mock(return_value=[0.1, 0.2])
+
+        cache.get_or_compute("m", "hello", compute)
+        cache.get_or_compute("m", "hello", compute)
+
+        compute.assert_called_once_with("hello")
+        assert cache.get_stats()["memory_hits"] == 1
+
+    def test_redis_tier_shared(self, mock_redis):
+        """Test a fresh process-local cache is filled from Redis"""
+        first = EmbeddingCache(redis_service=mock_redis)
+        first.put("m", "hello", [0.5, 0.25])
+
+        second = EmbeddingCache(redis_service=mock_redis)
+        assert second.get("m", "hello") == [0.5, 0.25]
+        assert second.get_stats()["redis_hits"] == 1
+
+    def test_get_or_compute_many_only_computes_misses(self, cache):
+        """Test batch lookups compute only missing and deduplicated texts"""
+        cache.put("m", "a", [1.0])
+        compute_many = Mock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+
+        result = cache.get_or_compute_many("m", ["a", "bb", "bb", "ccc"], compute_many)
+
+        assert result == [[1.0], [2.0], [2.0], [3.0]]
+        compute_many.assert_called_once_with(["bb", "ccc"])
+
+    def test_lru_evicts_by_bytes(self):
+        """Test least recently used entries are evicted once the byte limit is reached"""
+        cache = EmbeddingCache(max_memory_bytes=16)  # room for two 2-dim float32 vectors
+
+        cache.put("m", "a", [1.0, 1.0])
+        cache.put("m", "b", [2.0, 2.0])
+        cache.get("m", "a")  # "a" becomes most recently used
+        cache.put("m", "c", [3.0, 3.0])
+
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["memory_bytes"] <= 16
+        assert cache.get("m", "b") is None
+        assert cache.get("m", "a") == [1.0, 1.0]
@@ -0,0 +1,135 @@
+"""
+Unit Tests for Guide Executor
+=============================
+Tests section-grouped extraction planning and structured extraction.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import json
+import pytest
+from services.guide_executor import GuideExecutor
+
+
+GUIDES = [
+    {"category": "Switchgear", "field_name": "rated_voltage", "instruction": "rated voltage", "definition": "", "common_values": ""},
+    {"category": "Switchgear", "field_name": "rated_current", "instruction": "rated current", "definition": "", "common_values": ""},
+    {"category": "Cabling", "field_name": "cable_type", "instruction": "cable type", "definition": "", "common_values": ""},
+    {"category": "Painting", "field_name": "ral_color", "instruction": "paint color", "definition": "", "common_values": ""},
+]
+
+SECTIONS = {
+    "rated": {"section_id": "s-ratings", "section_title": "Ratings", "full_content": "400V, 630A", "score": 0.9},
+    "cable": {"section_id": "s-cables", "section_title": "Cables", "full_content": "XLPE", "score": 0.8},
+}
+
+
+class FakeQdrant:
+    def __init__(self):
+        self.embedding_batches = 0
+        self.batch_searches = 0
+        self.searches = []
+        self._queries = {}
+
+    def generate_embeddings(self, texts):
+        self.embedding_batches += 1
+        embeddings = [[float(len(self._queries) + i)] for i, _ in enumerate(texts)]
+        self._queries.update({embedding[0]: text for embedding, text in zip(embeddings, texts)})
+        return embeddings
+
+    def search_section_summaries_batch(self, user_id, query_embeddings, **kwargs):
+        self.batch_searches += 1
+        return [self._search(self._queries[embedding[0]]) for embedding in query_embeddings]
+
+    def search_section_summaries(self, user_id, query, query_embedding=None, **kwargs):
+        self.searches.append(query)
+        return self._search(query)
+
+    @staticmethod
+    def _search(query):
+        for prefix, section in SECTIONS.items():
+            if query.startswith(prefix):
+                return [section]
+        return []
+
+
+class FakeLLM:
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = 0
+
+    def generate(self, messages, **kwargs):
+        self.calls += 1
+        content = messages[-1]["content"]
+        title = content.split("**Section:** ")[1].split("\n")[0]
+        return {"response": self.answers[title]}
+
+
+class TestGuideExecutor:
+    """Test Guide Executor"""
+
+    @pytest.fixture
+    def qdrant(self):
+        return FakeQdrant()
+
+    def _executor(self, qdrant, llm, guides=GUIDES):
+        executor = GuideExecutor(llm_service=llm, qdrant_service=qdrant, neo4j_driver=None)
+        executor.get_extraction_guides = lambda project_number, category=None: guides
+        return executor
+
+    def test_one_llm_call_per_section(self, qdrant):
+        """Test guides sharing a section are extracted together, in guide order"""
+        llm = FakeLLM({
+            "Ratings": json.dumps({"fields": {
+                "1": {"value": "400V", "confidence": "high"},
+                "2": {"value": "630A", "confidence": "high"},
+            }}),
+            "Cables": "```json\n" + json.dumps({"fields": {"1": {"value": "NOT_FOUND"}}}) + "\n```",
+        })
+
+        result = self._executor(qdrant, llm).execute_all_guides("P-1", "doc-1")
+
+        assert qdrant.embedding_batches == 1
+        assert qdrant.batch_searches == 1
+        assert qdrant.searches == []
+        assert llm.calls == 2
+        assert [r["field_name"] for r in result["results"]] == [g["field_name"] for g in GUIDES]
+        assert [r["extracted_value"] for r in result["results"]] == ["400V", "630A", None, None]
+        assert result["results"][0]["source_section"] == "Ratings"
+        assert result["results"][3]["error"] == "No relevant sections found"
+        assert result["successful_extractions"] == 2
+        assert result["stats"]["section_groups"] == 2
+
+    def test_unparseable_response_falls_back_per_field(self, qdrant):
+        """Test a malformed structured answer is retried field by field"""
+        guides = GUIDES[:2]
+        llm = FakeLLM({"Ratings": "no json here"})
+
+        result = self._executor(qdrant, llm, guides).execute_all_guides("P-1", "doc-1")
+
+        assert llm.calls == 3
+        assert all(r["success"] and r["extracted_value"] is None for r in result["results"])
+
+    def test_fields_are_chunked(self, qdrant):
+        """Test large section groups are split into several structured calls"""
+        guides = [dict(GUIDES[0], field_name=f"f{i}") for i in range(5)]
+        llm = FakeLLM({"Ratings": json.dumps({"fields": {"1": {"value": "x"}}})})
+        executor = self._executor(qdrant, llm, guides)
+        executor.fields_per_call = 2
+
+        result = executor.execute_all_guides("P-1", "doc-1")
+
+        assert llm.calls == 3
+        assert [r["extracted_value"] for r in result["results"]] == ["x", None, "x", None, "x"]
+
+    def test_batch_failure_searches_per_guide(self, qdrant):
+        """Test guides are still planned when the batch search is unavailable"""
+        # QdrantService.search_section_summaries_batch logs the error and returns None
+        qdrant.search_section_summaries_batch = lambda *args, **kwargs: None
+        executor = self._executor(qdrant, FakeLLM({}))
+
+        groups, unmatched = executor.plan_guides(GUIDES, "P-1", "doc-1")
+
+        assert len(qdrant.searches) == len(GUIDES)
+        assert [group["guide_indices"] for group in groups] == [[0, 1], [2]]
+        assert unmatched == [3]
@@ -0,0 +1,145 @@
+"""
+Unit Tests for the Tiered Intent Classifier
+===========================================
+Tests rules/kNN agreement on held-out questions and the LLM fallback.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "CocoIndex", "rag_system"))
+
+from intent_classifier import INTENT_EXAMPLES, IntentClassifier, normalize_question  # noqa: E402
+
+
+LABELLED = [(question, intent) for intent, questions in INTENT_EXAMPLES.items() for question in questions]
+
+# Paraphrases that are NOT among the kNN examples
+HELD_OUT = [
+    ("What is the rated voltage of switchboard MDB-05?", "equipment_spec"),
+    ("Give me the specifications of transformer TR-07", "equipment_spec"),
+    ("What current rating does MCC-09 have?", "equipment_spec"),
+    ("Which panel supplies pump P-310?", "load_tracing"),
+    ("What feeds motor M-33?", "load_tracing"),
+    ("Where does load LD-40 get its supply from?", "load_tracing"),
+    ("List the outgoing circuits of MDB-07", "circuit_topology"),
+    ("Show me the circuits of panel LP-5", "circuit_topology"),
+    ("How many feeders does SMDB-2 have?", "circuit_topology"),
+    ("Where is panel SDB-12 located?", "equipment_location"),
+    ("In which room is transformer TR-05?", "equipment_location"),
+    ("Where can I find MCC-11?", "equipment_location"),
+    ("Does MDB-03 comply with IEC 61439?", "compliance_check"),
+    ("Is transformer TR-04 certified to IEC 60076?", "compliance_check"),
+    ("Which standards does switchgear SWGR-4 meet?", "compliance_check"),
+    ("Trace the power flow from the utility to the lighting panels", "power_flow"),
+    ("How is power distributed in Building C?", "power_flow"),
+    ("Which signals are wired to PLC-07?", "io_mapping"),
+    ("What does input DI-220 monitor?", "io_mapping"),
+    ("List the analog inputs of PLC-04", "io_mapping"),
+    ("Find all information about switchgear SWGR-6", "cross_reference"),
+    ("Summarize what the documents say about TR-08", "cross_reference"),
+    ("Collect all data on motor M-41 across documents", "cross_reference"),
+    ("What is installed in Room 305?", "proximity_search"),
+    ("Which panels are inside substation 4?", "proximity_search"),
+    ("List all equipment in Building D", "proximity_search"),
+    ("Compare the rated currents of MDB-01 and MDB-03", "comparison"),
+    ("Which transformer has the highest rating?", "comparison"),
+    ("Which motor has the lowest power?", "comparison"),
+]
+
+
+class FakeLLM:
+    def __init__(self, intent="cross_reference", entities=None):
+        self.intent = intent
+        self.entities = entities or []
+        self.questions = []
+
+    def __call__(self, question):
+        self.questions.append(question)
+        return {"intent": self.intent, "entities": list(self.entities), "confidence": 0.7}
+
+
+class TestIntentClassifier:
+    """Test Tiered Intent Classifier"""
+
+    def test_held_out_set_is_unseen(self):
+        """Test no held-out question is one of the kNN examples"""
+        examples = {normalize_question(question) for question, _ in LABELLED}
+
+        assert not [q for q, _ in HELD_OUT if normalize_question(q) in examples]
+
+    @pytest.mark.parametrize("question,intent", HELD_OUT)
+    def test_held_out_questions(self, question, intent):
+        """Test paraphrased questions outside the examples are classified without the LLM"""
+        result = IntentClassifier(llm_classify=FakeLLM(intent="LLM")).classify(question)
+
+        assert result["intent"] == intent
+        assert result["tier"] in ("rules", "knn")
+
+    @pytest.mark.parametrize("question,intent", LABELLED)
+    def test_labelled_examples(self, question, intent):
+        """Test the examples themselves are consistent with the rules (training-set check)"""
+        result = IntentClassifier(llm_classify=None).classify(question)
+
+        assert result["intent"] == intent
+
+    @pytest.mark.parametrize("question,intent", [
+        ("Which circuit is load XYZ-200 connected to?", "load_tracing"),
+        ("What equipment is in Room 101?", "equipment_location"),
+        ("What is the short circuit rating of SWGR-1?", "equipment_spec"),
+    ])
+    def test_keyword_alone_does_not_decide(self, question, intent):
+        """Test a keyword hit the kNN does not support loses to the supported intent"""
+        result = IntentClassifier(llm_classify=FakeLLM()).classify(question)
+
+        assert result["intent"] == intent
+        assert result["confidence"] < 0.9
+
+    def test_agreement_needs_vote_share(self):
+        """Test a rule hit needs min_agreement of the kNN vote, and its confidence reflects the share"""
+        question = "Which circuit is load XYZ-200 connected to?"
+        classifier = IntentClassifier(llm_classify=FakeLLM(intent="LLM"))
+        share = classifier.knn.votes(question)["load_tracing"][0]
+
+        result = classifier.classify(question)
+        strict = IntentClassifier(llm_classify=FakeLLM(intent="LLM"), min_agreement=share + 0.01)
+
+        assert result["tier"] == "rules"
+        assert result["confidence"] == round((0.6 + share) / 2, 2)
+        assert strict.classify(question)["tier"] != "rules"
+
+    def test_unconfident_question_goes_to_llm(self):
+        """Test a question no tier is confident about is classified by the LLM once"""
+        llm = FakeLLM(intent="equipment_spec")
+        classifier = IntentClassifier(llm_classify=llm)
+
+        first = classifier.classify("Tell me about the weather on site MDB-01")
+        second = classifier.classify("tell me about the weather on site MDB-01.")
+
+        assert first["tier"] == "llm"
+        assert first["intent"] == "equipment_spec"
+        assert first["entities"] == [{"text": "MDB-01", "type": "Panel"}]
+        assert second == first
+        assert llm.questions == ["Tell me about the weather on site MDB-01"]
+        assert classifier.get_stats()["cache_hits"] == 1
+
+    def test_entityless_question_goes_to_llm(self):
+        """Test an intent that needs an entity falls back to the LLM when none is found"""
+        llm = FakeLLM(intent="compliance_check", entities=[{"text": "IEC 61439", "type": "Standard"}])
+
+        result = IntentClassifier(llm_classify=llm).classify("What standards apply?")
+
+        assert result["tier"] == "llm"
+        assert result["entities"] == [{"text": "IEC 61439", "type": "Standard"}]
+        assert llm.questions == ["What standards apply?"]
+
+    def test_no_llm_uses_default(self):
+        """Test without an LLM an unclassifiable question gets the default intent"""
+        result = IntentClassifier(llm_classify=None).classify("Tell me about the weather")
+
+        assert result["intent"] == "cross_reference"
+        assert result["tier"] == "default"
@@ -0,0 +1,75 @@
+"""
+Unit Tests for MySQL Connection Pool
+====================================
+Tests connection reuse, bounding and health checks.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import pytest
+import pymysql
+
+from services.mysql_pool import MySQLPool, MySQLPoolTimeout
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.open = True
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def ping(self, reconnect=False):
+        if not self.open:
+            raise pymysql.err.OperationalError("gone away")
+
+    def close(self):
+        self.open = False
+
+
+class TestMySQLPool:
+    """Test MySQL Pool"""
+
+    @pytest.fixture
+    def pool(self, monkeypatch):
+        """Create a two-connection pool over fake connections"""
+        monkeypatch.setattr(pymysql, "connect", lambda **kwargs: _FakeConnection())
+        return MySQLPool("db", 3306, "user", "secret", "tpms", max_size=2, acquire_timeout=0.05, ping_interval=1e-9)
+
+    def test_close_returns_connection_for_reuse(self, pool):
+        """Test close() hands the connection back instead of closing it"""
+        conn = pool.connection()
+        raw = conn._entry.conn
+        conn.close()
+
+        with pool.acquire() as again:
+            assert again._entry.conn is raw
+
+        stats = pool.get_stats()
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 1
+        assert raw.rollbacks == 2
+
+    def test_pool_is_bounded(self, pool):
+        """Test checkout fails after the timeout when every connection is borrowed"""
+        first, second = pool.connection(), pool.connection()
+
+        with pytest.raises(MySQLPoolTimeout):
+            pool.connection()
+
+        first.close()
+        second.close()
+        assert pool.get_stats()["acquire_timeouts"] == 1
+
+    def test_broken_idle_connection_is_replaced(self, pool):
+        """Test a connection that fails its ping is discarded"""
+        conn = pool.connection()
+        raw = conn._entry.conn
+        conn.close()
+        raw.open = False
+
+        with pool.acquire() as fresh:
+            assert fresh._entry.conn is not raw
+
+        assert pool.get_stats()["health_check_failures"] == 1
@@ -0,0 +1,56 @@
+"""
+Unit Tests for Rate Limiter
+===========================
+Tests token buckets and the fallback when Redis is unreachable.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import pytest
+
+from middleware.rate_limiter import DistributedRateLimiter, LocalTokenBucketLimiter
+
+
+class TestLocalTokenBucketLimiter:
+    """Test Local Token Bucket Limiter"""
+
+    def test_bucket_allows_limit_then_rejects(self):
+        """Test a bucket serves `limit` requests and then asks the client to wait"""
+        limiter = LocalTokenBucketLimiter()
+
+        results = [limiter.hit("api:ip:1.2.3.4", limit=3, window_seconds=60) for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[2].remaining == 0
+        assert 0 < results[3].retry_after <= 20
+
+    def test_keys_are_independent_and_bounded(self):
+        """Test clients have separate buckets and the bucket map stays capped"""
+        limiter = LocalTokenBucketLimiter(max_keys=2)
+
+        assert limiter.hit("auth:ip:a", 1, 60).allowed
+        assert limiter.hit("auth:ip:b", 1, 60).allowed
+        assert limiter.hit("auth:ip:c", 1, 60).allowed
+        assert not limiter.hit("auth:ip:c", 1, 60).allowed
+        assert len(limiter) == 2
+
+
+class TestDistributedRateLimiter:
+    """Test Distributed Rate Limiter"""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_redis_unavailable(self):
+        """Test limits are still enforced in process when Redis cannot be reached"""
+        # Keep a DB suffix: the limiter replaces the URL's last path segment with its DB
+        limiter = DistributedRateLimiter(redis_url="redis://127.0.0.1:1/0", retry_seconds=60)
+        connection = limiter.redis.connection_pool.connection_kwargs
+        assert (connection["host"], connection["port"], connection["db"]) == ("127.0.0.1", 1, 6)
+
+        results = [await limiter.hit("api:user:alice", 2, 60) for _ in range(3)]
+
+        assert [r.allowed for r in results] == [True, True, False]
+        stats = limiter.get_stats()
+        assert stats["redis_errors"] == 1
+        assert stats["local_checks"] == 3
+        assert stats["backend"] == "local"
+        await limiter.aclose()
@@ -0,0 +1,89 @@
+"""
+Unit Tests for Retrieval Orchestrator
+=====================================
+Tests concurrent retrieval stages, timeouts and the latency budget.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import time
+import asyncio
+import pytest
+from services.retrieval_orchestrator import RetrievalOrchestrator
+
+
+class TestRetrievalOrchestrator:
+    """Test Retrieval Orchestrator"""
+
+    @pytest.mark.asyncio
+    async def test_stages_run_concurrently(self):
+        """Test blocking stages overlap instead of running back to back"""
+        retrieval = RetrievalOrchestrator(budget_seconds=5, stage_timeout=5)
+        for name in ("graph", "vector", "history"):
+            retrieval.add_stage(name, lambda n=name: time.sleep(0.2) or n)
+
+        start = time.perf_counter()
+        await retrieval.run()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5
+        assert retrieval.value("vector") == "vector"
+        assert all(result.ok for result in retrieval.results.values())
+
+    @pytest.mark.asyncio
+    async def test_failed_stage_uses_default(self):
+        """Test a failing stage yields its default and does not affect others"""
+        def fail():
+            raise RuntimeError("neo4j down")
+
+        retrieval = RetrievalOrchestrator()
+        retrieval.add_stage("graph", fail, default={})
+        retrieval.add_stage("history", lambda: ["msg"], default=[])
+        await retrieval.run()
+
+        assert retrieval.value("graph") == {}
+        assert retrieval.results["graph"].status == "error"
+        assert retrieval.value("history") == ["msg"]
+
+    @pytest.mark.asyncio
+    async def test_stage_timeout(self):
+        """Test a stage slower than its timeout is reported as timed out"""
+        async def slow():
+            await asyncio.sleep(1)
+            return "late"
+
+        retrieval = RetrievalOrchestrator(budget_seconds=5)
+        retrieval.add_stage("slow", slow, timeout=0.05, default=[])
+        await retrieval.run()
+
+        assert retrieval.results["slow"].status == "timeout"
+        assert retrieval.value("slow") == []
+
+    @pytest.mark.asyncio
+    async def test_budget_drops_late_stages(self):
+        """Test stages still running at the budget are dropped"""
+        async def slow():
+            await asyncio.sleep(1)
+            return "late"
+
+        retrieval = RetrievalOrchestrator(budget_seconds=0.1, stage_timeout=5)
+        retrieval.add_stage("slow", slow)
+        retrieval.add_stage("fast", lambda: "ok")
+        await retrieval.run()
+
+        assert retrieval.results["slow"].status == "dropped"
+        assert retrieval.value("slow") is None
+        assert retrieval.value("fast") == "ok"
+        assert retrieval.get_timings()["stages"]["slow"]["status"] == "dropped"
+
+    def test_explicit_zero_is_not_unset(self, monkeypatch):
+        """Test an explicit 0 budget or timeout is kept instead of the env default"""
+        monkeypatch.setenv("RETRIEVAL_BUDGET_SECONDS", "8")
+        monkeypatch.setenv("RETRIEVAL_STAGE_TIMEOUT", "5")
+
+        retrieval = RetrievalOrchestrator(budget_seconds=0, stage_timeout=0)
+        retrieval.add_stage("graph", lambda: None)
+
+        assert retrieval.budget_seconds == 0
+        assert retrieval.stage_timeout == 0
+        assert RetrievalOrchestrator().budget_seconds == 8
@@ -0,0 +1,72 @@
+"""
+Unit Tests for Section Summarizer
+=================================
+Tests concurrent batch summarization, ordering, retries and reuse.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import json
+import threading
+
+from services.section_summarizer import SectionSummarizer
+
+
+class _FakeLLM:
+    """Answers with the section title as summary; optionally fails first calls"""
+
+    def __init__(self, failures: int = 0):
+        self.calls = 0
+        self.failures = failures
+        self._lock = threading.Lock()
+
+    def generate(self, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("LLM unavailable")
+        title = messages[1]["content"].split("**Section Title:** ")[1].split("\n")[0]
+        return {"response": json.dumps({"summary": title, "subjects": [title], "key_topics": []}), "mode": "offline"}
+
+
+def _sections(*contents):
+    return [
+        {"section_id": f"s{i}", "heading": f"Section {i}", "heading_level": 1, "content": content}
+        for i, content in enumerate(contents)
+    ]
+
+
+class TestSectionSummarizer:
+    """Test Section Summarizer"""
+
+    def test_batch_preserves_order_and_skips_empty(self):
+        """Test concurrent results come back in input order without empty sections"""
+        summarizer = SectionSummarizer(_FakeLLM())
+
+        summaries = summarizer.summarize_sections_batch(_sections("a", "b", " ", "c", "d"), max_concurrent=4)
+
+        assert [s.section_id for s in summaries] == ["s0", "s1", "s3", "s4"]
+        assert [s.summary for s in summaries] == ["Section 0", "Section 1", "Section 3", "Section 4"]
+
+    def test_repeated_sections_are_reused(self):
+        """Test a second run over the same sections makes no LLM calls"""
+        llm = _FakeLLM()
+        summarizer = SectionSummarizer(llm)
+
+        summarizer.summarize_sections_batch(_sections("a", "b"))
+        summaries = summarizer.summarize_sections_batch(_sections("a", "b"))
+
+        assert llm.calls == 2
+        assert all(s.metadata["reused"] for s in summaries)
+        assert summarizer.last_batch_stats["reused"] == 2
+
+    def test_failed_call_is_retried(self):
+        """Test a transient LLM failure is retried instead of falling back"""
+        summarizer = SectionSummarizer(_FakeLLM(failures=1))
+        summarizer.retry_backoff = 0.01
+
+        summaries = summarizer.summarize_sections_batch(_sections("a"))
+
+        assert summaries[0].metadata["summarization_success"] is True
+        assert summarizer.last_batch_stats["retries"] == 1
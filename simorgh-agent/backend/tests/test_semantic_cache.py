@@ -0,0 +1,108 @@
+"""
+Unit Tests for Semantic Response Cache
+======================================
+Tests near-duplicate lookups, scoping, TTL and project invalidation.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import pytest
+from services.semantic_cache import SemanticResponseCache
+
+
+def _messages(question, system="Project specs: rated voltage 400V"):
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": "earlier question"},
+        {"role": "assistant", "content": "earlier answer"},
+        {"role": "user", "content": question},
+    ]
+
+
+class TestSemanticResponseCache:
+    """Test Semantic Response Cache"""
+
+    @pytest.fixture
+    def cache(self):
+        """Create an enabled SemanticResponseCache"""
+        return SemanticResponseCache(threshold=0.95, ttl=3600, max_entries=10, enabled=True)
+
+    def test_near_duplicate_hits(self, cache):
+        """Test a similar question in the same scope is served from the cache"""
+        scope, question = cache.make_scope(_messages("What is the rated voltage?"), project_number="P-1")
+        cache.store(scope, question, [1.0, 0.0, 0.0], {"response": "400V", "mode": "online"}, project_number="P-1")
+
+        hit = cache.lookup(scope, [0.99, 0.05, 0.0])
+
+        assert hit["response"] == "400V"
+        assert hit["cached"] is True
+        assert cache.get_stats()["hits"] == 1
+
+    def test_dissimilar_question_misses(self, cache):
+        """Test a question below the similarity threshold misses"""
+        scope, question = cache.make_scope(_messages("What is the rated voltage?"), project_number="P-1")
+        cache.store(scope, question, [1.0, 0.0], {"response": "400V"}, project_number="P-1")
+
+        assert cache.lookup(scope, [0.5, 0.5]) is None
+
+    def test_scope_ignores_whitespace_but_not_context(self, cache):
+        """Test whitespace doesn't change the scope, retrieved context does"""
+        scope_a, question_a = cache.make_scope(_messages("Rated  voltage?"), project_number="P-1")
+        scope_b, question_b = cache.make_scope(
+            [{"role": "system", "content": "Project specs:  rated voltage 400V"},
+             {"role": "user", "content": " earlier  question"},
+             {"role": "assistant", "content": "earlier answer "},
+             {"role": "user", "content": "rated voltage? "}],
+            project_number="P-1"
+        )
+        scope_c, _ = cache.make_scope(_messages("Rated voltage?", system="Other specs"), project_number="P-1")
+
+        assert scope_a == scope_b
+        assert question_a == question_b == "rated voltage?"
+        assert scope_a != scope_c
+
+    def test_follow_up_in_other_conversation_misses(self, cache):
+        """Test the same follow-up after different earlier turns doesn't collide"""
+        def conversation(earlier):
+            return [
+                {"role": "user", "content": f"Show panel {earlier}"},
+                {"role": "assistant", "content": f"Panel {earlier} details"},
+                {"role": "user", "content": "What is its rated current?"},
+            ]
+
+        scope_a, question_a = cache.make_scope(conversation("MDB-1"), project_number="P-1")
+        scope_b, question_b = cache.make_scope(conversation("MDB-2"), project_number="P-1")
+        scope_c, _ = cache.make_scope(conversation("MDB-2")[-1:], project_number="P-1")
+        cache.store(scope_a, question_a, [1.0, 0.0], {"response": "630A"}, project_number="P-1")
+
+        assert question_a == question_b
+        assert len({scope_a, scope_b, scope_c}) == 3
+        assert cache.lookup(scope_b, [1.0, 0.0]) is None
+        assert cache.lookup(scope_a, [1.0, 0.0])["response"] == "630A"
+
+    def test_expired_entries_miss(self):
+        """Test entries are not served after their TTL"""
+        cache = SemanticResponseCache(threshold=0.9, ttl=-1, enabled=True)
+        cache.store("scope", "q", [1.0], {"response": "old"})
+
+        assert cache.lookup("scope", [1.0]) is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_invalidate_project(self, cache):
+        """Test project invalidation removes only that project's answers"""
+        cache.store("s1", "q", [1.0], {"response": "a"}, project_number="P-1")
+        cache.store("s2", "q", [1.0], {"response": "b"}, project_number="P-2")
+
+        assert cache.invalidate_project("P-1") == 1
+        assert cache.lookup("s1", [1.0]) is None
+        assert cache.lookup("s2", [1.0])["response"] == "b"
+
+    def test_graph_version_change_misses(self, cache):
+        """Test a sync in another worker (a new graph version) makes the answer miss"""
+        scope_v1, question = cache.make_scope(_messages("Rated voltage?"), project_number="P-1", project_version=1)
+        scope_v2, _ = cache.make_scope(_messages("Rated voltage?"), project_number="P-1", project_version=2)
+        cache.store(scope_v1, question, [1.0], {"response": "400V"}, project_number="P-1")
+
+        assert scope_v1 != scope_v2
+        assert cache.lookup(scope_v2, [1.0]) is None
+        assert cache.lookup(scope_v1, [1.0])["response"] == "400V"
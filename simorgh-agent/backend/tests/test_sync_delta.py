@@ -0,0 +1,92 @@
+"""
+Unit Tests for Sync Delta
+=========================
+Tests change detection between TPMS fetches.
+
+Author: Simorgh Industrial Assistant
+"""
+
+from models.tpms_project_models import (
+    TPMSProjectData,
+    ViewProjectMain,
+    TechnicalPanelIdentity,
+    ViewDraft,
+    ViewDraftEquipment,
+)
+from services.sync_delta import compute_entity_hashes, compute_delta
+
+
+def _project(feeder_tag="F-1", equipment_qty=1, with_second_panel=True):
+    panels = [TechnicalPanelIdentity(Id=1, IdprojectMain=100, IdprojectScope=10, PlaneName1="MDB")]
+    if with_second_panel:
+        panels.append(TechnicalPanelIdentity(Id=2, IdprojectMain=100, IdprojectScope=20, PlaneName1="SDB"))
+
+    return TPMSProjectData(
+        project_main=ViewProjectMain(IdprojectMain=100, Oenum="OE-1", ProjectName="Plant"),
+        panels=panels,
+        drafts=[
+            ViewDraft(Id=5, TabloId=10, Tag=feeder_tag),
+            ViewDraft(Id=6, TabloId=10, Tag="F-2"),
+        ],
+        draft_equipment=[
+            ViewDraftEquipment(DraftId=5, Ecode="CB", Qty=equipment_qty),
+            ViewDraftEquipment(DraftId=6, Ecode="CT", Qty=3),
+        ],
+    )
+
+
+class TestSyncDelta:
+    """Test Sync Delta"""
+
+    def test_first_sync_adds_everything(self):
+        """Test a project without stored hashes is synced in full"""
+        delta = compute_delta({}, compute_entity_hashes(_project()), full=True)
+
+        assert delta.full is True
+        assert delta.added["panels"] == {"10", "20"}
+        assert delta.added["drafts"] == {"5", "6"}
+        assert delta.size == 7
+
+    def test_unchanged_project_has_empty_delta(self):
+        """Test refetching identical data yields nothing to write"""
+        hashes = compute_entity_hashes(_project())
+        delta = compute_delta(hashes, compute_entity_hashes(_project()))
+
+        assert delta.is_empty
+        assert delta.unchanged == 7
+
+    def test_changes_and_removals_are_detected(self):
+        """Test only the changed feeder, equipment group and removed panel are reported"""
+        previous = compute_entity_hashes(_project())
+        current = compute_entity_hashes(_project(feeder_tag="F-1A", equipment_qty=2, with_second_panel=False))
+
+        delta = compute_delta(previous, current)
+
+        assert delta.changed["drafts"] == {"5"}
+        assert delta.changed["equipment"] == {"5"}
+        assert delta.removed["panels"] == {"20"}
+        assert delta.upserts("panels") == set()
+        assert delta.summary()["size"] == 3
+
+    def test_forced_full_sync_rewrites_and_removes(self):
+        """Test a forced full sync rewrites unchanged entities but still deletes removed ones"""
+        previous = compute_entity_hashes(_project())
+        current = compute_entity_hashes(_project(with_second_panel=False))
+
+        delta = compute_delta(previous, current, full=True)
+
+        assert delta.changed["drafts"] == {"5", "6"}
+        assert delta.removed["panels"] == {"20"}
+        assert delta.unchanged == 0
+
+    def test_catalog_change_rewrites_everything(self):
+        """Test a property catalog edit makes every entity changed"""
+        previous = compute_entity_hashes(_project(), catalog_hash="catalog-v1")
+
+        same = compute_delta(previous, compute_entity_hashes(_project(), catalog_hash="catalog-v1"))
+        edited = compute_delta(previous, compute_entity_hashes(_project(), catalog_hash="catalog-v2"))
+
+        assert same.is_empty
+        assert edited.full
+        assert edited.changed["panels"] == {"10", "20"}
+        assert edited.unchanged == 0
@@ -0,0 +1,91 @@
+"""
+Unit Tests for Project TPMS Context Cache
+=========================================
+Tests the graph-versioned read-through cache of CoCoIndexAdapter.
+
+Author: Simorgh Industrial Assistant
+"""
+
+import pytest
+from cocoindex_flows import cocoindex_adapter
+from cocoindex_flows.cocoindex_adapter import CoCoIndexAdapter
+
+
+class FakeRedis:
+    def __init__(self):
+        self.versions = {}
+        self.contexts = {}
+
+    def get_project_graph_version(self, project_number):
+        return self.versions.get(project_number, 0)
+
+    def bump_project_graph_version(self, project_number):
+        self.versions[project_number] = self.versions.get(project_number, 0) + 1
+        return self.versions[project_number]
+
+    def cache_project_tpms_context(self, project_number, context, ttl=1800, graph_version=None):
+        self.contexts[project_number] = (graph_version, context)
+
+    def get_cached_project_tpms_context(self, project_number, graph_version=None):
+        version, context = self.contexts.get(project_number, (None, None))
+        return context if version == graph_version else None
+
+    def cache_project_panels(self, project_number, panels, ttl=1800):
+        pass
+
+
+class TestTPMSContextCache:
+    """Test Project TPMS Context Cache"""
+
+    @pytest.fixture
+    def adapter(self):
+        """Adapter whose Neo4j read returns the current panel count"""
+        cocoindex_adapter._tpms_context_cache.clear()
+        adapter = CoCoIndexAdapter(driver=object(), redis_service=FakeRedis())
+        adapter.reads = 0
+        adapter.panel_count = 3
+
+        def fetch(project_number):
+            adapter.reads += 1
+            return {"project_info": {}, "panels": [], "panel_count": adapter.panel_count}
+
+        adapter._fetch_project_tpms_context = fetch
+        return adapter
+
+    def test_repeated_reads_skip_neo4j(self, adapter):
+        """Test only the first read of an unchanged project reaches Neo4j"""
+        for _ in range(3):
+            assert adapter.get_project_tpms_context("OE-1")["panel_count"] == 3
+
+        assert adapter.reads == 1
+
+    def test_version_bump_invalidates(self, adapter):
+        """Test a sync that bumps the graph version makes the next read fetch fresh data"""
+        adapter.get_project_tpms_context("OE-1")
+        adapter.panel_count = 4
+        adapter.redis_service.bump_project_graph_version("OE-1")
+
+        assert adapter.get_project_tpms_context("OE-1")["panel_count"] == 4
+        assert adapter.reads == 2
+
+    def test_redis_tier_serves_other_workers(self, adapter):
+        """Test a worker with an empty in-process tier is served from Redis"""
+        adapter.get_project_tpms_context("OE-1")
+        cocoindex_adapter._tpms_context_cache.clear()
+
+        adapter.get_project_tpms_context("OE-1")
+
+        assert adapter.reads == 1
+        assert cocoindex_adapter.get_tpms_context_cache_stats()["redis_hits"] >= 1
+
+    def test_callers_get_their_own_copy(self, adapter):
+        """Test modifying a returned context does not change the cached one"""
+        first = adapter.get_project_tpms_context("OE-1")
+        first["panels"].append({"panel_id": "bogus"})
+        first["panel_count"] = 99
+
+        second = adapter.get_project_tpms_context("OE-1")
+
+        assert second["panels"] == []
+        assert second["panel_count"] == 3
+        assert adapter.reads == 1
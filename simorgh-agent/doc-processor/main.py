@@ -5,9 +5,14 @@
 import os
 import time
 import uuid
+import hashlib
+import threading
 import warnings
 import re
 import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 
@@ -21,7 +26,6 @@ from fastapi.middleware.cors import CORSMiddleware
 
 # Document processing imports
 import pdfplumber
-import easyocr
 from pdf2image import convert_from_path
 import pandas as pd
 from PIL import Image, ImageEnhance
@@ -32,10 +36,12 @@ from docx import Document
 # ------------------------------------------------------------------
 # FastAPI App Configuration
 # ------------------------------------------------------------------
+APP_VERSION = "1.2.0"
+
 app = FastAPI(
     title="Universal Document → Markdown Converter",
     description="Convert PDF, Images, Word, Excel, and Text files to Markdown with Persian/English OCR support",
-    version="1.2.0"
+    version=APP_VERSION
 )
 
 app.add_middleware(
@@ -76,7 +82,9 @@ class PerformanceMonitor:
             'successful': 0,
             'failed': 0,
             'total_time': 0.0,
-            'by_type': {}
+            'by_type': {},
+            'cache_hits': 0,
+            'cache_misses': 0
         }
 
     def record(self, success: bool, duration: float, file_type: str = None):
@@ -89,18 +97,315 @@ class PerformanceMonitor:
         if file_type:
             self.metrics['by_type'][file_type] = self.metrics['by_type'].get(file_type, 0) + 1
 
+    def record_cache(self, hit: bool):
+        self.metrics['cache_hits' if hit else 'cache_misses'] += 1
+
     def get_stats(self) -> dict:
         total = self.metrics['total_requests']
+        lookups = self.metrics['cache_hits'] + self.metrics['cache_misses']
         return {
             **self.metrics,
             'avg_time': round(self.metrics['total_time'] / total, 2) if total > 0 else 0,
-            'success_rate': round((self.metrics['successful'] / total * 100), 2) if total > 0 else 0
+            'success_rate': round((self.metrics['successful'] / total * 100), 2) if total > 0 else 0,
+            'cache_hit_rate': round((self.metrics['cache_hits'] / lookups * 100), 2) if lookups > 0 else 0
         }
 
 
 monitor = PerformanceMonitor()
 
 
+# ------------------------------------------------------------------
+# Conversion Cache
+# ------------------------------------------------------------------
+# Converted markdown (without the per-upload header) keyed by the SHA-256 of
+# the uploaded bytes, the file type and CONVERTER_VERSION. Bump the version
+# whenever extraction output changes so stale conversions are not served.
+CONVERTER_VERSION = f"{APP_VERSION}-1"
+
+
+class ConversionCache:
+    """
+    Content-addressed markdown cache on disk, LRU-evicted by total size.
+
+    The directory is the only source of truth: every uvicorn worker reads,
+    writes and evicts the same files, so entries written by one worker are
+    hits in the others. File mtime is the recency used for eviction.
+    """
+
+    # Temp files older than this are leftovers of crashed writers
+    STALE_TMP_SECONDS = 3600
+
+    def __init__(self, folder: str, max_bytes: int):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(content_hash: str, suffix: str) -> str:
+        return f"{content_hash}{suffix.replace('.', '_')}_{CONVERTER_VERSION.replace('.', '_')}"
+
+    def _path(self, key: str) -> Path:
+        return self.folder / f"{key}.md"
+
+    def _scan(self) -> list:
+        """(mtime, size, path) of every cached entry, oldest first"""
+        entries = []
+        for path in self.folder.glob("*.md"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Evicted by another worker meanwhile
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            content = path.read_text(encoding="utf-8")
+            os.utime(path)  # recency shared with the other workers
+            return content
+        except OSError:
+            return None
+
+    def put(self, key: str, content: str):
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)  # atomic for concurrent writers
+
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+        cutoff = time.time() - self.STALE_TMP_SECONDS
+        for tmp_path in self.folder.glob("*.tmp"):
+            try:
+                if tmp_path.stat().st_mtime < cutoff:
+                    tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def get_stats(self) -> dict:
+        entries = self._scan()
+        return {
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+            'version': CONVERTER_VERSION
+        }
+
+
+conversion_cache = ConversionCache(
+    os.getenv("CONVERSION_CACHE_DIR", "conversion_cache"),
+    int(os.getenv("CONVERSION_CACHE_MAX_MB", "1024")) * 1024 * 1024
+)
+
+
+# ------------------------------------------------------------------
+# Worker Pools
+# ------------------------------------------------------------------
+# PDFs are split into page ranges extracted in parallel by a process pool;
+# OCR runs in one dedicated process that keeps the EasyOCR reader loaded.
+# Both keep CPU-bound work off the event loop, so uploads stay responsive.
+# Pools use "spawn" (no forked event loop/threads); easyocr/torch are only
+# imported in the OCR process.
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+OCR_QUEUE_SIZE = int(os.getenv("OCR_QUEUE_SIZE", "8"))
+OCR_WARMUP = os.getenv("OCR_WARMUP", "true").lower() == "true"
+
+
+def fix_text(text: str) -> str:
+    """Clean and normalize text (Persian numbers to Latin, spacing fixes)"""
+    if not text:
+        return text
+    # Convert Persian digits to Latin
+    text = text.translate(str.maketrans('۰۱۲۳۴۵۶۷۸۹', '0123456789'))
+    # Fix common spacing issues
+    text = re.sub(r'([0-9]+)\s+([a-zA-Z]+)', r'\2 \1', text)
+    text = re.sub(r'([0-9]+)\s*[kK]\s*[Vv]', r'\1kV', text)
+    text = re.sub(r'([0-9]+)\s*[kK]\s*[Aa]', r'\1kA', text)
+    text = re.sub(r'([0-9]+)\s*[Hh]z', r'\1Hz', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def count_pdf_pages(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pdf_pages(file_path: str, start: int, end: int) -> str:
+    """Markdown for pages [start, end) of a PDF (runs in a pool process)"""
+    parts = []
+    with pdfplumber.open(file_path) as pdf:
+        for num in range(start, end):
+            page = pdf.pages[num]
+            parts.append(f"## Page {num + 1}\n\n")
+
+            # Extract tables
+            tables = page.extract_tables()
+            if tables:
+                for table in tables:
+                    cleaned = [[fix_text(str(c)) if c else "" for c in row] for row in table]
+                    if len(cleaned) > 1:
+                        header = cleaned[0]
+                        parts.append("| " + " | ".join(header) + " |\n")
+                        parts.append("| " + " | ".join(["---"] * len(header)) + " |\n")
+                        for row in cleaned[1:]:
+                            while len(row) < len(header):
+                                row.append("")
+                            parts.append("| " + " | ".join(row) + " |\n")
+                        parts.append("\n")
+
+            # Extract text
+            text = page.extract_text()
+            if text:
+                lines = [fix_text(l.strip()) for l in text.split('\n') if l.strip()]
+                if lines:
+                    parts.append("\n\n".join(lines) + "\n\n")
+
+            parts.append("---\n\n")
+
+            # Release parsed page objects; long PDFs otherwise grow the worker
+            page.flush_cache()
+    return ''.join(parts)
+
+
+_ocr_reader = None
+
+
+def init_ocr_worker():
+    """Load the EasyOCR reader once per OCR process"""
+    global _ocr_reader
+    import easyocr
+    print("Loading EasyOCR in OCR worker...")
+    _ocr_reader = easyocr.Reader(['fa', 'en'], gpu=False, verbose=False)
+    print("OCR Ready!")
+
+
+def ocr_image(file_path: str) -> str:
+    """OCR an image file (runs in the OCR process)"""
+    image = Image.open(file_path)
+    img_array = np.array(image)
+
+    # Convert to grayscale and enhance contrast
+    if len(img_array.shape) == 3:
+        gray = np.dot(img_array[..., :3], [0.2989, 0.5870, 0.1140]).astype(np.uint8)
+    else:
+        gray = img_array
+    pil_gray = Image.fromarray(gray)
+    enhancer = ImageEnhance.Contrast(pil_gray)
+    enhanced = enhancer.enhance(2.0)
+    img_final = np.array(enhanced)
+
+    results = _ocr_reader.readtext(img_final, paragraph=False, detail=1)
+    # Sort top-to-bottom, left-to-right
+    results = sorted(results, key=lambda x: (x[0][0][1], x[0][0][0]))
+
+    texts = [fix_text(r[1]) for r in results if len(r) >= 3 and r[2] > 0.2]
+    return '\n\n'.join(texts) if texts else "*No text detected*"
+
+
+class OCRQueueFull(Exception):
+    """More OCR jobs are waiting than OCR_QUEUE_SIZE allows"""
+
+
+class WorkerPools:
+    def __init__(self):
+        self.pdf_pool = None
+        self.ocr_pool = None
+        self.ocr_pending = 0
+        self.ocr_rejected = 0
+        self.pdf_tasks = 0
+
+    def get_pdf_pool(self) -> ProcessPoolExecutor:
+        if self.pdf_pool is None:
+            self.pdf_pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self.pdf_pool
+
+    def get_ocr_pool(self) -> ProcessPoolExecutor:
+        if self.ocr_pool is None:
+            self.ocr_pool = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_ocr_worker
+            )
+        return self.ocr_pool
+
+    def _discard_broken(self, name: str, pool: ProcessPoolExecutor):
+        # Stop the broken pool's processes and queued futures; another request
+        # may already have replaced it, so only clear the attribute if it's still ours
+        pool.shutdown(wait=False, cancel_futures=True)
+        if getattr(self, name) is pool:
+            setattr(self, name, None)
+
+    async def run_pdf(self, fn, *args):
+        self.pdf_tasks += 1
+        pool = self.get_pdf_pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a fresh pool for the next request
+            self._discard_broken("pdf_pool", pool)
+            raise
+
+    async def run_ocr(self, file_path: Path) -> str:
+        # Bounded queue: reject instead of piling up work behind a slow OCR process
+        if self.ocr_pending >= OCR_QUEUE_SIZE:
+            self.ocr_rejected += 1
+            raise OCRQueueFull(f"OCR queue is full ({OCR_QUEUE_SIZE} jobs), try again later")
+        self.ocr_pending += 1
+        pool = self.get_ocr_pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, ocr_image, str(file_path)
+            )
+        except BrokenProcessPool:
+            self._discard_broken("ocr_pool", pool)
+            raise
+        finally:
+            self.ocr_pending -= 1
+
+    def warm_up(self):
+        # Starts the OCR process now so the reader is loaded before the first image
+        self.get_ocr_pool().submit(len, "")
+
+    def shutdown(self):
+        for pool in (self.pdf_pool, self.ocr_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self.pdf_pool = self.ocr_pool = None
+
+    def get_stats(self) -> dict:
+        return {
+            'pdf_workers': PDF_WORKERS,
+            'pdf_pages_per_task': PDF_PAGES_PER_TASK,
+            'pdf_tasks': self.pdf_tasks,
+            'ocr_pending': self.ocr_pending,
+            'ocr_queue_size': OCR_QUEUE_SIZE,
+            'ocr_rejected': self.ocr_rejected,
+        }
+
+
+pools = WorkerPools()
+
+
 # ------------------------------------------------------------------
 # Main Document Processor
 # ------------------------------------------------------------------
@@ -108,86 +413,35 @@ class UniversalDocumentProcessor:
     def __init__(self, output_folder="processed_docs"):
         self.output_folder = Path(output_folder)
         self.output_folder.mkdir(exist_ok=True)
-        self.ocr_reader = None
         print(f"Output directory: {self.output_folder.absolute()}")
 
-    def get_ocr_reader(self):
-        if self.ocr_reader is None:
-            print("Loading EasyOCR (first time only, may take a while)...")
-            self.ocr_reader = easyocr.Reader(['fa', 'en'], gpu=False, verbose=False)
-            print("OCR Ready!")
-        return self.ocr_reader
-
     def fix_text(self, text: str) -> str:
         """Clean and normalize text (Persian numbers to Latin, spacing fixes)"""
-        if not text:
-            return text
-        # Convert Persian digits to Latin
-        text = text.translate(str.maketrans('۰۱۲۳۴۵۶۷۸۹', '0123456789'))
-        # Fix common spacing issues
-        text = re.sub(r'([0-9]+)\s+([a-zA-Z]+)', r'\2 \1', text)
-        text = re.sub(r'([0-9]+)\s*[kK]\s*[Vv]', r'\1kV', text)
-        text = re.sub(r'([0-9]+)\s*[kK]\s*[Aa]', r'\1kA', text)
-        text = re.sub(r'([0-9]+)\s*[Hh]z', r'\1Hz', text)
-        return re.sub(r'\s+', ' ', text).strip()
+        return fix_text(text)
 
     async def process_pdf(self, file_path: Path) -> str:
-        """Process PDF using pdfplumber for text and tables"""
-        parts = []
-        with pdfplumber.open(file_path) as pdf:
-            for num, page in enumerate(pdf.pages, 1):
-                parts.append(f"## Page {num}\n\n")
-
-                # Extract tables
-                tables = page.extract_tables()
-                if tables:
-                    for table in tables:
-                        cleaned = [[self.fix_text(str(c)) if c else "" for c in row] for row in table]
-                        if len(cleaned) > 1:
-                            header = cleaned[0]
-                            parts.append("| " + " | ".join(header) + " |\n")
-                            parts.append("| " + " | ".join(["---"] * len(header)) + " |\n")
-                            for row in cleaned[1:]:
-                                while len(row) < len(header):
-                                    row.append("")
-                                parts.append("| " + " | ".join(row) + " |\n")
-                            parts.append("\n")
-
-                # Extract text
-                text = page.extract_text()
-                if text:
-                    lines = [self.fix_text(l.strip()) for l in text.split('\n') if l.strip()]
-                    if lines:
-                        parts.append("\n\n".join(lines) + "\n\n")
-
-                parts.append("---\n\n")
+        """Process PDF using pdfplumber for text and tables (page ranges in parallel)"""
+        page_count = await pools.run_pdf(count_pdf_pages, str(file_path))
+        ranges = [
+            (start, min(start + PDF_PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PDF_PAGES_PER_TASK)
+        ]
+        # gather keeps range order, so pages are reassembled in sequence
+        parts = await asyncio.gather(*[
+            pools.run_pdf(extract_pdf_pages, str(file_path), start, end)
+            for start, end in ranges
+        ])
         return ''.join(parts)
 
     async def process_image(self, file_path: Path) -> str:
-        """Process image using EasyOCR"""
-        reader = self.get_ocr_reader()
-        image = Image.open(file_path)
-        img_array = np.array(image)
-
-        # Convert to grayscale and enhance contrast
-        if len(img_array.shape) == 3:
-            gray = np.dot(img_array[..., :3], [0.2989, 0.5870, 0.1140]).astype(np.uint8)
-        else:
-            gray = img_array
-        pil_gray = Image.fromarray(gray)
-        enhancer = ImageEnhance.Contrast(pil_gray)
-        enhanced = enhancer.enhance(2.0)
-        img_final = np.array(enhanced)
-
-        results = reader.readtext(img_final, paragraph=False, detail=1)
-        # Sort top-to-bottom, left-to-right
-        results = sorted(results, key=lambda x: (x[0][0][1], x[0][0][0]))
-
-        texts = [self.fix_text(r[1]) for r in results if len(r) >= 3 and r[2] > 0.2]
-        return '\n\n'.join(texts) if texts else "*No text detected*"
+        """Process image using EasyOCR (in the OCR worker)"""
+        return await pools.run_ocr(file_path)
 
     async def process_word(self, file_path: Path) -> str:
         """Process Word document"""
+        return await asyncio.to_thread(self._process_word, file_path)
+
+    def _process_word(self, file_path: Path) -> str:
         doc = Document(file_path)
         parts = []
         for para in doc.paragraphs:
@@ -206,6 +460,9 @@ class UniversalDocumentProcessor:
 
     async def process_excel(self, file_path: Path) -> str:
         """Process Excel/CSV file"""
+        return await asyncio.to_thread(self._process_excel, file_path)
+
+    def _process_excel(self, file_path: Path) -> str:
         parts = []
         if file_path.suffix.lower() == '.csv':
             df = pd.read_csv(file_path)
@@ -222,8 +479,8 @@ class UniversalDocumentProcessor:
         async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
             return await f.read()
 
-    async def process(self, file_path: Path, user_id: str, original_name: str) -> dict:
-        """Main processing function"""
+    async def process(self, file_path: Path, user_id: str, original_name: str, content_hash: str = None) -> dict:
+        """Main processing function (content_hash: SHA-256 of the file, enables the conversion cache)"""
         start = time.time()
         try:
             is_valid, msg = FileValidator.validate(file_path)
@@ -231,24 +488,40 @@ class UniversalDocumentProcessor:
                 raise ValueError(msg)
 
             suffix = file_path.suffix.lower()
+            cache_key = ConversionCache.make_key(content_hash, suffix) if content_hash else None
+            content = await asyncio.to_thread(conversion_cache.get, cache_key) if cache_key else None
+            cached = content is not None
+            if cache_key:
+                monitor.record_cache(cached)
+
             if suffix == '.pdf':
-                content = await self.process_pdf(file_path)
                 doc_type = 'pdf'
             elif suffix in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}:
-                content = await self.process_image(file_path)
                 doc_type = 'image'
             elif suffix in {'.docx', '.doc'}:
-                content = await self.process_word(file_path)
                 doc_type = 'word'
             elif suffix in {'.xlsx', '.xls', '.csv'}:
-                content = await self.process_excel(file_path)
                 doc_type = 'excel'
             elif suffix in {'.txt', '.md'}:
-                content = await self.process_text(file_path)
                 doc_type = 'text'
             else:
                 raise ValueError(f"Format {suffix} not supported")
 
+            if not cached:
+                if doc_type == 'pdf':
+                    content = await self.process_pdf(file_path)
+                elif doc_type == 'image':
+                    content = await self.process_image(file_path)
+                elif doc_type == 'word':
+                    content = await self.process_word(file_path)
+                elif doc_type == 'excel':
+                    content = await self.process_excel(file_path)
+                else:
+                    content = await self.process_text(file_path)
+
+                if cache_key:
+                    await asyncio.to_thread(conversion_cache.put, cache_key, content)
+
             header = f"# {original_name}\n\n"
             header += f"**Source:** {original_name}\n"
             header += f"**User:** {user_id}\n"
@@ -264,7 +537,7 @@ class UniversalDocumentProcessor:
             duration = time.time() - start
             monitor.record(True, duration, doc_type)
 
-            print(f"✅ Processed: {original_name} ({duration:.2f}s)")
+            print(f"✅ Processed: {original_name} ({duration:.2f}s{', cached' if cached else ''})")
 
             return {
                 "success": True,
@@ -276,9 +549,14 @@ class UniversalDocumentProcessor:
                 "chars": len(markdown),
                 "content": markdown,  # Return markdown content
                 "duration": round(duration, 2),
+                "cached": cached,
                 "message": "Processing successful"
             }
 
+        except OCRQueueFull:
+            monitor.record(False, time.time() - start)
+            raise
+
         except Exception as e:
             duration = time.time() - start
             monitor.record(False, duration)
@@ -299,6 +577,17 @@ processor = UniversalDocumentProcessor()
 # ------------------------------------------------------------------
 # API Routes
 # ------------------------------------------------------------------
+@app.on_event("startup")
+async def startup():
+    if OCR_WARMUP:
+        pools.warm_up()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    pools.shutdown()
+
+
 @app.get("/")
 async def root():
     return {
@@ -313,7 +602,7 @@ async def health():
     return {
         "status": "healthy",
         "service": "doc-processor",
-        "version": "1.2.0"
+        "version": APP_VERSION
     }
 
 
@@ -332,11 +621,16 @@ async def upload_file(
     temp_path.parent.mkdir(exist_ok=True)
 
     try:
+        digest = hashlib.sha256()
         async with aiofiles.open(temp_path, 'wb') as out_file:
             while content := await file.read(1024 * 1024):  # 1MB chunks
+                digest.update(content)
                 await out_file.write(content)
 
-        result = await processor.process(temp_path, user_id, file.filename)
+        try:
+            result = await processor.process(temp_path, user_id, file.filename, digest.hexdigest())
+        except OCRQueueFull as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
 
         if result["success"]:
             return JSONResponse(content=result)
@@ -360,11 +654,16 @@ async def upload_and_download(
     temp_path.parent.mkdir(exist_ok=True)
 
     try:
+        digest = hashlib.sha256()
         async with aiofiles.open(temp_path, 'wb') as out_file:
             while content := await file.read(1024 * 1024):
+                digest.update(content)
                 await out_file.write(content)
 
-        result = await processor.process(temp_path, user_id, file.filename)
+        try:
+            result = await processor.process(temp_path, user_id, file.filename, digest.hexdigest())
+        except OCRQueueFull as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
 
         if result["success"]:
             return FileResponse(
@@ -383,7 +682,7 @@ async def upload_and_download(
 @app.get("/stats")
 async def stats():
     """Get processing statistics"""
-    return monitor.get_stats()
+    return {**monitor.get_stats(), 'workers': pools.get_stats(), 'cache': conversion_cache.get_stats()}
 
 
 if __name__ == "__main__":
@@ -5,8 +5,8 @@ Runs on CPU to avoid GPU memory conflicts with vLLM.
 
 Features:
 - Real-time audio transcription
-- Support for multiple audio formats (webm, wav, mp3, ogg)
-- Streaming transcription via WebSocket
+- Support for multiple audio formats (webm, wav, mp3, ogg), decoded in memory
+- Streaming transcription via WebSocket (partial + final hypotheses)
 - Language detection
 
 Author: Simorgh Industrial Assistant
@@ -14,10 +14,13 @@ Author: Simorgh Industrial Assistant
 
 import os
 import io
+import json
+import time
 import logging
-import tempfile
 import asyncio
-from typing import Optional
+import subprocess
+import tempfile
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, WebSocket, WebSocketDisconnect
@@ -27,7 +30,6 @@ from pydantic import BaseModel
 
 import numpy as np
 import soundfile as sf
-from pydub import AudioSegment
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,6 +40,13 @@ MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")  # tiny, base, small, mediu
 DEVICE = os.getenv("WHISPER_DEVICE", "cpu")  # cpu or cuda
 COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # int8, float16, float32
 
+# Streaming configuration
+SAMPLE_RATE = 16000
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+STREAM_PARTIAL_INTERVAL = float(os.getenv("STT_PARTIAL_INTERVAL", "0.8"))  # seconds of new speech per partial
+STREAM_ENDPOINT_SILENCE_MS = int(os.getenv("STT_ENDPOINT_SILENCE_MS", "600"))  # silence that ends a segment
+STREAM_MAX_SEGMENT_SECONDS = float(os.getenv("STT_MAX_SEGMENT_SECONDS", "15"))
+
 # FastAPI app
 app = FastAPI(
     title="Simorgh STT Service",
@@ -81,48 +90,112 @@ def get_whisper_model():
     return _whisper_model
 
 
-def convert_audio_to_wav(audio_bytes: bytes, source_format: str = "webm") -> np.ndarray:
-    """
-    Convert audio bytes to numpy array for Whisper.
+# ffmpeg demuxers for formats that cannot always be probed from a pipe
+FFMPEG_INPUT_FORMATS = {"webm": "matroska", "ogg": "ogg", "mp3": "mp3", "wav": "wav"}
 
-    Supports: webm, mp3, ogg, wav, m4a
-    Returns: numpy array with 16kHz mono audio
-    """
+# MP4 containers may keep the moov atom at the end (Safari/iOS recordings),
+# which ffmpeg can only reach by seeking, so they are decoded from a file
+SEEKABLE_INPUT_FORMATS = {"m4a", "mp4", "mov"}
+
+
+class AudioDecodeError(ValueError):
+    """Audio bytes could not be decoded"""
+
+
+def ffmpeg_decode_args(source_format: Optional[str], input_path: str = "pipe:0") -> List[str]:
+    """ffmpeg command reading input_path (stdin by default) and writing 16 kHz mono float32 PCM to stdout"""
+    args = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error"]
+    if source_format in FFMPEG_INPUT_FORMATS:
+        args += ["-f", FFMPEG_INPUT_FORMATS[source_format]]
+    return args + ["-i", input_path, "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "f32le", "pipe:1"]
+
+
+def _run_ffmpeg(args: List[str], audio_bytes: Optional[bytes] = None) -> np.ndarray:
+    """Run an ffmpeg decode command and return its float32 samples"""
     try:
-        # Create temp file with source format
-        with tempfile.NamedTemporaryFile(suffix=f".{source_format}", delete=False) as temp_in:
-            temp_in.write(audio_bytes)
-            temp_in_path = temp_in.name
+        completed = subprocess.run(args, input=audio_bytes, capture_output=True, timeout=120)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise AudioDecodeError(f"ffmpeg failed: {e}") from e
 
-        # Load audio with pydub (handles various formats via ffmpeg)
-        audio = AudioSegment.from_file(temp_in_path, format=source_format)
+    if completed.returncode != 0:
+        raise AudioDecodeError(completed.stderr.decode(errors="replace").strip() or "ffmpeg failed")
 
-        # Convert to mono and 16kHz (Whisper requirement)
-        audio = audio.set_channels(1)
-        audio = audio.set_frame_rate(16000)
+    usable = len(completed.stdout) - len(completed.stdout) % 4
+    audio_array = np.frombuffer(completed.stdout[:usable], dtype="<f4")
+    if not len(audio_array):
+        raise AudioDecodeError("No audio samples decoded")
+    return audio_array
 
-        # Export to WAV
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_out:
-            audio.export(temp_out.name, format="wav")
-            temp_out_path = temp_out.name
 
-        # Read WAV to numpy array
-        audio_array, sample_rate = sf.read(temp_out_path)
+def _decode_from_file(audio_bytes: bytes, source_format: str) -> np.ndarray:
+    """Decode through a seekable temp file (for inputs ffmpeg cannot read from a pipe)"""
+    with tempfile.NamedTemporaryFile(suffix=f".{source_format}") as tmp:
+        tmp.write(audio_bytes)
+        tmp.flush()
+        # No forced demuxer: a file can be probed, and the declared format may be wrong
+        return _run_ffmpeg(ffmpeg_decode_args(None, tmp.name))
 
-        # Cleanup temp files
-        os.unlink(temp_in_path)
-        os.unlink(temp_out_path)
 
-        # Ensure float32
-        if audio_array.dtype != np.float32:
-            audio_array = audio_array.astype(np.float32)
+def _decode_wav_fast(audio_bytes: bytes) -> Optional[np.ndarray]:
+    """Decode 16 kHz WAV in-process; None if the input needs ffmpeg (other rate/codec)"""
+    try:
+        with sf.SoundFile(io.BytesIO(audio_bytes)) as wav:
+            if wav.samplerate != SAMPLE_RATE:
+                return None
+            audio_array = wav.read(dtype="float32", always_2d=True)
+    except RuntimeError:  # not a WAV libsndfile can read
+        return None
+    return audio_array.mean(axis=1, dtype=np.float32) if audio_array.shape[1] > 1 else audio_array[:, 0]
 
-        logger.info(f"Audio converted: {len(audio_array)} samples at {sample_rate}Hz")
-        return audio_array
 
-    except Exception as e:
-        logger.error(f"Audio conversion failed: {e}")
-        raise HTTPException(status_code=400, detail=f"Audio conversion failed: {str(e)}")
+def convert_audio_to_wav(audio_bytes: bytes, source_format: str = "webm") -> np.ndarray:
+    """
+    Convert audio bytes to numpy array for Whisper.
+
+    16 kHz WAV and raw PCM ("pcm": 16-bit mono 16 kHz) are decoded directly,
+    other inputs are piped through ffmpeg (stdin -> float32 stdout) which
+    also downmixes and resamples. MP4 containers, and any input the pipe
+    fails on, are decoded from a seekable temp file instead.
+
+    Supports: webm, mp3, ogg, wav, m4a, mp4, mov, pcm
+    Returns: numpy array with 16kHz mono float32 audio
+    Raises: AudioDecodeError if the audio cannot be decoded
+    """
+    if source_format == "pcm":
+        usable = len(audio_bytes) - len(audio_bytes) % 2
+        return np.frombuffer(audio_bytes[:usable], dtype="<i2").astype(np.float32) / 32768.0
+
+    if source_format == "wav" or audio_bytes[:4] == b"RIFF":
+        audio_array = _decode_wav_fast(audio_bytes)
+        if audio_array is not None:
+            logger.info(f"Audio decoded (WAV fast path): {len(audio_array)} samples at {SAMPLE_RATE}Hz")
+            return audio_array
+
+    if source_format in SEEKABLE_INPUT_FORMATS:
+        audio_array = _decode_from_file(audio_bytes, source_format)
+    else:
+        try:
+            audio_array = _run_ffmpeg(ffmpeg_decode_args(source_format), audio_bytes)
+        except AudioDecodeError as e:
+            logger.warning(f"Pipe decoding failed ({e}), retrying from a temp file")
+            audio_array = _decode_from_file(audio_bytes, source_format)
+
+    logger.info(f"Audio decoded: {len(audio_array)} samples at {SAMPLE_RATE}Hz")
+    return audio_array
+
+
+def transcribe_file(audio_array: np.ndarray, language: Optional[str]):
+    """Transcribe a complete recording (blocking, run in a thread)"""
+    model = get_whisper_model()
+    segments, info = model.transcribe(
+        audio_array,
+        language=language,
+        beam_size=5,
+        vad_filter=True,  # Filter out non-speech
+        vad_parameters=dict(min_silence_duration_ms=500)
+    )
+    # Segments are generated lazily; consuming them runs the decoding
+    return " ".join(segment.text.strip() for segment in segments), info
 
 
 class TranscriptionResponse(BaseModel):
@@ -155,7 +228,7 @@ async def model_info():
         "model_size": MODEL_SIZE,
         "device": DEVICE,
         "compute_type": COMPUTE_TYPE,
-        "supported_formats": ["webm", "wav", "mp3", "ogg", "m4a"],
+        "supported_formats": ["webm", "wav", "mp3", "ogg", "m4a", "mp4", "mov", "pcm"],
         "sample_rate": 16000
     }
 
@@ -169,7 +242,7 @@ async def transcribe_audio(
     Transcribe audio file to text.
 
     Args:
-        audio: Audio file (webm, wav, mp3, ogg, m4a)
+        audio: Audio file (webm, wav, mp3, ogg, m4a, mp4, mov)
         language: Optional language code (e.g., 'en', 'fa', 'ar'). Auto-detect if not provided.
 
     Returns:
@@ -193,6 +266,8 @@ async def transcribe_audio(
         source_format = "ogg"
     elif filename.endswith(".m4a"):
         source_format = "m4a"
+    elif filename.endswith((".mp4", ".mov")):
+        source_format = filename.rsplit(".", 1)[1]
     else:
         # Try to infer from content type
         content_type = audio.content_type or ""
@@ -204,6 +279,10 @@ async def transcribe_audio(
             source_format = "mp3"
         elif "ogg" in content_type:
             source_format = "ogg"
+        elif "mp4" in content_type or "m4a" in content_type:
+            source_format = "mp4"
+        elif "quicktime" in content_type:
+            source_format = "mov"
         else:
             source_format = "webm"  # Default to webm (browser recording format)
 
@@ -217,26 +296,12 @@ async def transcribe_audio(
             raise HTTPException(status_code=400, detail="Audio file too small")
 
         # Convert to numpy array
-        audio_array = convert_audio_to_wav(audio_bytes, source_format)
-
-        # Get model
-        model = get_whisper_model()
-
-        # Transcribe
-        segments, info = model.transcribe(
-            audio_array,
-            language=language,
-            beam_size=5,
-            vad_filter=True,  # Filter out non-speech
-            vad_parameters=dict(min_silence_duration_ms=500)
-        )
-
-        # Collect all segments
-        text_parts = []
-        for segment in segments:
-            text_parts.append(segment.text.strip())
+        try:
+            audio_array = await asyncio.to_thread(convert_audio_to_wav, audio_bytes, source_format)
+        except AudioDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Audio conversion failed: {e}")
 
-        full_text = " ".join(text_parts)
+        full_text, info = await asyncio.to_thread(transcribe_file, audio_array, language)
 
         # Calculate processing time
         processing_time = (datetime.now() - start_time).total_seconds()
@@ -258,36 +323,322 @@ async def transcribe_audio(
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
 
 
+# =============================================================================
+# STREAMING TRANSCRIPTION
+# =============================================================================
+
+class StreamDecoder:
+    """
+    Incremental decoder for one audio stream.
+
+    - "pcm": raw 16-bit little-endian mono PCM at the given sample rate,
+      converted directly (no ffmpeg)
+    - anything else (webm/Opus from MediaRecorder, ogg, ...): bytes are piped
+      into one long-lived ffmpeg process that emits float32 16 kHz mono PCM
+    """
+
+    def __init__(self, source_format: str = "webm", sample_rate: int = SAMPLE_RATE):
+        self.source_format = source_format
+        self.sample_rate = sample_rate
+        self._process = None
+        self._reader_task = None
+        self._decoded = bytearray()
+        self._pcm_remainder = b""
+
+    async def _start(self):
+        self._process = await asyncio.create_subprocess_exec(
+            *ffmpeg_decode_args(self.source_format),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        # Drain stdout continuously so ffmpeg never blocks on a full pipe
+        self._reader_task = asyncio.create_task(self._read_output())
+
+    async def _read_output(self):
+        while True:
+            chunk = await self._process.stdout.read(65536)
+            if not chunk:
+                break
+            self._decoded.extend(chunk)
+
+    def _take_decoded(self) -> np.ndarray:
+        usable = len(self._decoded) - len(self._decoded) % 4
+        samples = np.frombuffer(bytes(self._decoded[:usable]), dtype="<f4").copy()
+        del self._decoded[:usable]
+        return samples
+
+    def _decode_pcm(self, data: bytes) -> np.ndarray:
+        data = self._pcm_remainder + data
+        usable = len(data) - len(data) % 2
+        self._pcm_remainder = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+        if self.sample_rate != SAMPLE_RATE and len(samples):
+            target = int(round(len(samples) * SAMPLE_RATE / self.sample_rate))
+            samples = np.interp(
+                np.linspace(0, len(samples) - 1, target), np.arange(len(samples)), samples
+            ).astype(np.float32)
+        return samples
+
+    async def feed(self, data: bytes) -> np.ndarray:
+        """Decode a chunk; returns the samples that became available"""
+        if self.source_format == "pcm":
+            return self._decode_pcm(data)
+
+        if self._process is None:
+            await self._start()
+        self._process.stdin.write(data)
+        await self._process.stdin.drain()
+        # Give the reader a turn to collect what ffmpeg already produced
+        await asyncio.sleep(0)
+        return self._take_decoded()
+
+    async def finish(self) -> np.ndarray:
+        """Flush the decoder at the end of an utterance"""
+        if self._process is None:
+            return np.zeros(0, dtype=np.float32)
+
+        self._process.stdin.close()
+        await self._reader_task
+        await self._process.wait()
+        self._process = None
+        return self._take_decoded()
+
+    async def close(self):
+        if self._process is not None:
+            self._process.kill()
+            await self._process.wait()
+            self._process = None
+
+
+def transcribe_segment(audio: np.ndarray, language: Optional[str], beam_size: int, prompt: Optional[str] = None):
+    """Transcribe one speech segment (blocking, run in a thread)"""
+    model = get_whisper_model()
+    segments, info = model.transcribe(
+        audio,
+        language=language,
+        beam_size=beam_size,
+        vad_filter=False,  # already segmented by the stream VAD
+        condition_on_previous_text=False,
+        initial_prompt=prompt,
+        without_timestamps=True
+    )
+    return " ".join(segment.text.strip() for segment in segments).strip(), info
+
+
+class StreamingTranscriber:
+    """
+    VAD-segmented incremental transcription of one stream.
+
+    Audio is split into 30 ms frames classified by energy against an adaptive
+    noise floor. While speech continues, the open segment is re-transcribed
+    with greedy decoding every STREAM_PARTIAL_INTERVAL seconds (partial
+    hypotheses). A pause of STREAM_ENDPOINT_SILENCE_MS (or a segment reaching
+    STREAM_MAX_SEGMENT_SECONDS) finalizes the segment with beam search; its
+    audio is then dropped, so finalized audio is never transcribed again.
+    """
+
+    FRAME = SAMPLE_RATE * 30 // 1000
+    PRE_ROLL = SAMPLE_RATE * 300 // 1000
+    MIN_SPEECH_RMS = 0.006
+
+    def __init__(self, language: Optional[str] = None):
+        self.language = language
+        self.detected_language: Optional[str] = None
+        self.finals: List[str] = []
+        self.duration = 0.0
+        self.reset_segment(offset=0.0)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._noise_floor = 0.002
+        self._partial_interval = STREAM_PARTIAL_INTERVAL
+
+    def reset_segment(self, offset: float):
+        self.segment = np.zeros(0, dtype=np.float32)
+        self.segment_offset = offset
+        self.in_speech = False
+        self.silence = 0
+        self.since_partial = 0
+
+    async def push(self, samples: np.ndarray) -> List[Dict[str, Any]]:
+        """Add decoded samples; returns partial/final events to send"""
+        events = []
+        self.duration += len(samples) / SAMPLE_RATE
+        audio = np.concatenate([self._pending, samples])
+        usable = len(audio) - len(audio) % self.FRAME
+        self._pending = audio[usable:]
+
+        for start in range(0, usable, self.FRAME):
+            frame = audio[start:start + self.FRAME]
+            rms = float(np.sqrt(np.mean(frame * frame)))
+            is_speech = rms > max(self.MIN_SPEECH_RMS, self._noise_floor * 3)
+            self.segment = np.concatenate([self.segment, frame])
+
+            if is_speech:
+                self.in_speech = True
+                self.silence = 0
+            else:
+                self._noise_floor = 0.95 * self._noise_floor + 0.05 * rms
+                if self.in_speech:
+                    self.silence += self.FRAME
+                elif len(self.segment) > self.PRE_ROLL:
+                    # Before speech: keep only a short pre-roll
+                    drop = len(self.segment) - self.PRE_ROLL
+                    self.segment = self.segment[drop:]
+                    self.segment_offset += drop / SAMPLE_RATE
+
+            if self.in_speech:
+                self.since_partial += self.FRAME
+
+            if self.in_speech and (
+                self.silence >= SAMPLE_RATE * STREAM_ENDPOINT_SILENCE_MS // 1000
+                or len(self.segment) >= SAMPLE_RATE * STREAM_MAX_SEGMENT_SECONDS
+            ):
+                event = await self.finalize()
+                if event:
+                    events.append(event)
+
+        if self.in_speech and self.silence == 0 and self.since_partial >= SAMPLE_RATE * self._partial_interval:
+            event = await self.partial()
+            if event:
+                events.append(event)
+
+        return events
+
+    async def partial(self) -> Optional[Dict[str, Any]]:
+        """Greedy hypothesis for the open segment"""
+        self.since_partial = 0
+        started = time.perf_counter()
+        text, _ = await asyncio.to_thread(
+            transcribe_segment, self.segment, self.language or self.detected_language, 1, self._prompt()
+        )
+        # Back off when the CPU cannot keep up with the partial rate
+        self._partial_interval = max(STREAM_PARTIAL_INTERVAL, 2 * (time.perf_counter() - started))
+        if not text:
+            return None
+        return {"type": "partial", "segment": len(self.finals), "text": text, "is_final": False}
+
+    async def finalize(self) -> Optional[Dict[str, Any]]:
+        """Final hypothesis for the open segment; its audio is released"""
+        if not self.in_speech:
+            self.reset_segment(self.segment_offset + len(self.segment) / SAMPLE_RATE)
+            return None
+
+        # Keep a little of the trailing silence, drop the rest
+        keep = len(self.segment) - max(0, self.silence - SAMPLE_RATE // 5)
+        audio = self.segment[:keep]
+        start = self.segment_offset
+        end = start + len(self.segment) / SAMPLE_RATE
+        self.reset_segment(end)
+
+        text, info = await asyncio.to_thread(
+            transcribe_segment, audio, self.language or self.detected_language, 5, self._prompt()
+        )
+        if not self.language and not self.detected_language:
+            self.detected_language = info.language
+        if not text:
+            return None
+
+        self.finals.append(text)
+        return {
+            "type": "final",
+            "segment": len(self.finals) - 1,
+            "text": text,
+            "start": round(start, 2),
+            "end": round(start + len(audio) / SAMPLE_RATE, 2),
+            "language": info.language,
+            "is_final": False  # only the closing transcript is final
+        }
+
+    async def flush(self, samples: np.ndarray) -> List[Dict[str, Any]]:
+        """End of utterance: consume remaining samples and finalize"""
+        events = await self.push(samples)
+        self.segment = np.concatenate([self.segment, self._pending])
+        self._pending = np.zeros(0, dtype=np.float32)
+        event = await self.finalize()
+        if event:
+            events.append(event)
+        return events
+
+    def _prompt(self) -> Optional[str]:
+        """Previous final as decoding context across segment boundaries"""
+        return self.finals[-1] if self.finals else None
+
+    def transcript(self) -> Dict[str, Any]:
+        return {
+            "type": "transcript",
+            "text": " ".join(self.finals),
+            "language": self.language or self.detected_language,
+            "duration": round(self.duration, 2),
+            "is_final": True
+        }
+
+
 @app.websocket("/ws/transcribe")
 async def websocket_transcribe(websocket: WebSocket):
     """
     WebSocket endpoint for real-time streaming transcription.
 
-    Protocol:
-    1. Client connects
-    2. Client sends audio chunks as binary
-    3. Client sends {"action": "transcribe"} to trigger transcription
-    4. Server responds with {"text": "...", "is_final": true/false}
-    5. Client sends {"action": "close"} to end session
+    Streaming protocol (version 2):
+    1. Client connects and sends
+       {"action": "start", "format": "webm|ogg|pcm", "sample_rate": 16000, "language": "fa"}
+       ("pcm" = raw 16-bit mono; default format is webm); the server answers
+       {"status": "started", "protocol": 2}
+    2. Client streams audio chunks as binary; while the user speaks the server sends
+       {"type": "partial", "segment": n, "text": "...", "is_final": false}
+       and after each pause
+       {"type": "final", "segment": n, "text": "...", "start": s, "end": e, "is_final": false}
+    3. Client sends {"action": "transcribe"} at the end of the utterance; the server
+       finalizes the remaining audio and sends
+       {"type": "transcript", "text": "<all finals>", "language": "..", "is_final": true}
+    4. {"action": "clear"} discards the current utterance, {"action": "close"} ends the session
+
+    Only the closing "transcript" message has "is_final": true; segment finals
+    are marked by their "type".
+
+    Buffered protocol (version 1, clients that never send "start"): binary
+    chunks are buffered and acknowledged with {"status": "chunk_received"},
+    and {"action": "transcribe", "format": "webm", "language": "fa"} decodes
+    the buffer and sends the segment finals followed by the transcript.
     """
     await websocket.accept()
     logger.info("WebSocket connection established")
 
-    audio_buffer = io.BytesIO()
+    options: Dict[str, Any] = {}
+    streaming = False
+    decoder: Optional[StreamDecoder] = None
+    transcriber = StreamingTranscriber()
+    audio_buffer = bytearray()  # buffered (version 1) clients
+
+    async def send_events(events):
+        for event in events:
+            await websocket.send_json(event)
 
     try:
         while True:
             # Receive data
             data = await websocket.receive()
 
-            if "bytes" in data:
-                # Audio chunk received
-                audio_buffer.write(data["bytes"])
-                await websocket.send_json({"status": "chunk_received", "buffer_size": audio_buffer.tell()})
+            if data.get("type") == "websocket.disconnect":
+                break
+
+            if data.get("bytes") and not streaming:
+                # Buffered client: audio is decoded when it asks for the transcript
+                audio_buffer.extend(data["bytes"])
+                await websocket.send_json({"status": "chunk_received", "buffer_size": len(audio_buffer)})
+
+            elif data.get("bytes"):
+                # Audio chunk received: decode and transcribe incrementally
+                if decoder is None:
+                    decoder = StreamDecoder(options.get("format", "webm"), int(options.get("sample_rate", SAMPLE_RATE)))
+                try:
+                    samples = await decoder.feed(data["bytes"])
+                    await send_events(await transcriber.push(samples))
+                except Exception as e:
+                    logger.error(f"Streaming transcription failed: {e}")
+                    await websocket.send_json({"error": str(e), "is_final": False})
 
-            elif "text" in data:
+            elif data.get("text"):
                 # JSON command received
-                import json
                 try:
                     command = json.loads(data["text"])
                 except json.JSONDecodeError:
@@ -296,59 +647,48 @@ async def websocket_transcribe(websocket: WebSocket):
 
                 action = command.get("action")
 
-                if action == "transcribe":
-                    # Get audio from buffer
-                    audio_bytes = audio_buffer.getvalue()
+                if action == "start":
+                    options = command
+                    streaming = True
+                    audio_buffer = bytearray()
+                    transcriber = StreamingTranscriber(language=command.get("language"))
+                    await websocket.send_json({"status": "started", "protocol": 2})
 
-                    if len(audio_bytes) < 1000:
+                elif action == "transcribe" and not streaming:
+                    if len(audio_buffer) < 1000:
                         await websocket.send_json({"error": "Audio too short", "is_final": True})
                         continue
 
+                    transcriber = StreamingTranscriber(language=command.get("language"))
                     try:
-                        # Convert and transcribe
-                        source_format = command.get("format", "webm")
-                        audio_array = convert_audio_to_wav(audio_bytes, source_format)
-
-                        model = get_whisper_model()
-                        segments, info = model.transcribe(
-                            audio_array,
-                            language=command.get("language"),
-                            beam_size=5,
-                            vad_filter=True
+                        samples = await asyncio.to_thread(
+                            convert_audio_to_wav, bytes(audio_buffer), command.get("format", "webm")
                         )
+                        await send_events(await transcriber.flush(samples))
+                        await websocket.send_json(transcriber.transcript())
+                        audio_buffer = bytearray()
+                    except Exception as e:
+                        logger.error(f"WebSocket transcription failed: {e}")
+                        await websocket.send_json({"error": str(e), "is_final": True})
 
-                        # Collect text
-                        text_parts = []
-                        for segment in segments:
-                            text_parts.append(segment.text.strip())
-                            # Send intermediate results
-                            await websocket.send_json({
-                                "text": segment.text.strip(),
-                                "start": segment.start,
-                                "end": segment.end,
-                                "is_final": False
-                            })
-
-                        full_text = " ".join(text_parts)
-
-                        # Send final result
-                        await websocket.send_json({
-                            "text": full_text,
-                            "language": info.language,
-                            "duration": info.duration,
-                            "is_final": True
-                        })
-
-                        # Clear buffer after successful transcription
-                        audio_buffer = io.BytesIO()
-
+                elif action == "transcribe":
+                    try:
+                        remaining = await decoder.finish() if decoder else np.zeros(0, dtype=np.float32)
+                        decoder = None
+                        await send_events(await transcriber.flush(remaining))
+                        await websocket.send_json(transcriber.transcript())
                     except Exception as e:
                         logger.error(f"WebSocket transcription failed: {e}")
                         await websocket.send_json({"error": str(e), "is_final": True})
 
+                    transcriber = StreamingTranscriber(language=options.get("language") or command.get("language"))
+
                 elif action == "clear":
-                    # Clear buffer
-                    audio_buffer = io.BytesIO()
+                    audio_buffer = bytearray()
+                    if decoder:
+                        await decoder.close()
+                        decoder = None
+                    transcriber = StreamingTranscriber(language=options.get("language"))
                     await websocket.send_json({"status": "buffer_cleared"})
 
                 elif action == "close":
@@ -360,7 +700,8 @@ async def websocket_transcribe(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
-        audio_buffer.close()
+        if decoder:
+            await decoder.close()
 
 
 @app.on_event("startup")